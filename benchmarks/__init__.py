@@ -0,0 +1,15 @@
+"""
+Benchmarks of the backtest and data paths.
+
+The benchmarks run against synthetic exchanges generated locally, they do
+not require any network access. Usage, from the root of the repository::
+
+    # run the suite against the working tree
+    python -m benchmarks run
+
+    # compare two commits, the working tree if the second one is omitted
+    python -m benchmarks compare master HEAD
+
+Each benchmark reports the time of its fastest run and the peak memory
+allocated by a single run.
+"""
@@ -0,0 +1,273 @@
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+
+import click
+
+from .core import BENCHMARKS, format_memory, format_time, get_max_rss, \
+    run_benchmarks, set_catalyst_root
+
+SUITE_FOLDER = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(SUITE_FOLDER)
+
+
+def _generate(root):
+    set_catalyst_root(root)
+    from .data import generate
+
+    click.echo('generating the synthetic exchanges in {}'.format(root))
+    generate()
+
+
+def _git(*args, **kwargs):
+    return subprocess.check_output(
+        ('git',) + args, cwd=kwargs.pop('cwd', REPO_ROOT), **kwargs
+    ).decode('utf-8').strip()
+
+
+@click.group()
+def main():
+    """Benchmarks of the backtest and data paths.
+    """
+
+
+@main.command()
+@click.argument('root', type=click.Path(file_okay=False))
+def generate(root):
+    """Generate the synthetic exchanges in ROOT.
+    """
+    _generate(os.path.abspath(root))
+
+
+@main.command('list')
+def list_():
+    """List the benchmarks.
+    """
+    from . import suite  # noqa: F401
+
+    for name in BENCHMARKS:
+        click.echo(name)
+
+
+@main.command()
+@click.option(
+    '-k', '--select',
+    multiple=True,
+    help='Only run the benchmarks matching this shell pattern.',
+)
+@click.option(
+    '--root',
+    type=click.Path(exists=True, file_okay=False),
+    help='The catalyst root of existing synthetic exchanges.',
+)
+@click.option(
+    '--repeat',
+    type=int,
+    help='Override the number of timed runs of each benchmark.',
+)
+@click.option(
+    '-o', '--output',
+    type=click.Path(dir_okay=False, writable=True),
+    help='Write the results to this JSON file.',
+)
+@click.option(
+    '--label',
+    help='The label of the results, the current revision by default.',
+)
+def run(select, root, repeat, output, label):
+    """Run the benchmarks against the importable catalyst.
+    """
+    tmp_root = None
+    if root is None:
+        tmp_root = root = tempfile.mkdtemp(prefix='catalyst-benchmarks-')
+        _generate(root)
+
+    set_catalyst_root(os.path.abspath(root))
+    from . import suite  # noqa: F401
+    from .data import BenchmarkData
+
+    try:
+        results = run_benchmarks(BenchmarkData(root), select, repeat)
+
+    finally:
+        if tmp_root is not None:
+            shutil.rmtree(tmp_root, ignore_errors=True)
+
+    if output is not None:
+        if label is None:
+            label = _git('rev-parse', '--short', 'HEAD')
+
+        with open(output, 'w') as f:
+            json.dump(dict(
+                label=label,
+                python=platform.python_version(),
+                max_rss=get_max_rss(),
+                benchmarks=results,
+            ), f, indent=2)
+
+
+def _checkout(revision, folder, build):
+    _git('worktree', 'add', '--detach', folder, revision)
+    if build:
+        # The Cython extensions are not versioned.
+        subprocess.check_call(
+            [sys.executable, 'setup.py', 'build_ext', '--inplace'],
+            cwd=folder,
+        )
+
+
+def _run_revision(tree, suite_root, data_root, select, repeat, output,
+                  label):
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join([suite_root, tree])
+
+    command = [
+        sys.executable, '-m', 'benchmarks', 'run',
+        '--root', data_root,
+        '--output', output,
+        '--label', label,
+    ]
+    for pattern in select:
+        command += ['-k', pattern]
+    if repeat is not None:
+        command += ['--repeat', str(repeat)]
+
+    # Running from the copy of the suite, the benchmarks package of the
+    # checked out revision must not shadow it.
+    subprocess.check_call(command, cwd=suite_root, env=env)
+
+    with open(output) as f:
+        return json.load(f)
+
+
+def _format_comparison(base, target, threshold):
+    lines = ['{:<45} {:>10} {:>10} {:>7} {:>10} {:>10}'.format(
+        'benchmark', base['label'], target['label'], 'ratio',
+        'base mem', 'target mem',
+    )]
+
+    regressions = []
+    for name, base_result in base['benchmarks'].items():
+        target_result = target['benchmarks'].get(name, dict(error='missing'))
+
+        base_time = base_result.get('best')
+        target_time = target_result.get('best')
+        if base_time and target_time:
+            ratio = target_time / base_time
+            flag = ''
+            if ratio > 1 + threshold:
+                flag = ' slower'
+                regressions.append(name)
+
+            elif ratio < 1 - threshold:
+                flag = ' faster'
+
+            ratio = '{:.2f}{}'.format(ratio, flag)
+
+        else:
+            ratio = 'failed'
+
+        lines.append('{:<45} {:>10} {:>10} {:>7} {:>10} {:>10}'.format(
+            name,
+            format_time(base_time),
+            format_time(target_time),
+            ratio,
+            format_memory(base_result.get('peak_memory')),
+            format_memory(target_result.get('peak_memory')),
+        ))
+
+    return '\n'.join(lines), regressions
+
+
+@main.command()
+@click.argument('base')
+@click.argument('target', required=False)
+@click.option(
+    '-k', '--select',
+    multiple=True,
+    help='Only run the benchmarks matching this shell pattern.',
+)
+@click.option(
+    '--repeat',
+    type=int,
+    help='Override the number of timed runs of each benchmark.',
+)
+@click.option(
+    '--threshold',
+    type=float,
+    default=0.1,
+    show_default=True,
+    help='The relative slowdown reported as a regression.',
+)
+@click.option(
+    '--build/--no-build',
+    default=True,
+    show_default=True,
+    help='Build the Cython extensions of the checked out revisions.',
+)
+def compare(base, target, select, repeat, threshold, build):
+    """Compare the BASE and TARGET revisions.
+
+    TARGET is the working tree by default. Both revisions run the suite of
+    the working tree against the same synthetic exchanges. The command
+    fails when a benchmark is slower than the threshold.
+    """
+    workdir = tempfile.mkdtemp(prefix='catalyst-benchmarks-')
+    suite_root = os.path.join(workdir, 'suite')
+    data_root = os.path.join(workdir, 'data')
+    shutil.copytree(
+        SUITE_FOLDER,
+        os.path.join(suite_root, 'benchmarks'),
+        ignore=shutil.ignore_patterns('*.pyc', '__pycache__'),
+    )
+
+    worktrees = []
+    try:
+        # The generation is not timed, it uses the working tree.
+        _generate(data_root)
+
+        results = []
+        for index, revision in enumerate((base, target)):
+            if revision is None:
+                tree = REPO_ROOT
+                label = 'working'
+
+            else:
+                tree = os.path.join(workdir, 'tree{}'.format(index))
+                _checkout(revision, tree, build)
+                worktrees.append(tree)
+                label = revision
+
+            click.echo('benchmarking {}'.format(label))
+            results.append(_run_revision(
+                tree=tree,
+                suite_root=suite_root,
+                data_root=data_root,
+                select=select,
+                repeat=repeat,
+                output=os.path.join(workdir, 'results{}.json'.format(index)),
+                label=label[:10],
+            ))
+
+    finally:
+        for tree in worktrees:
+            _git('worktree', 'remove', '--force', tree)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    table, regressions = _format_comparison(results[0], results[1], threshold)
+    click.echo(table)
+
+    if regressions:
+        raise click.ClickException(
+            '{} benchmarks slower than the threshold: {}'.format(
+                len(regressions), ', '.join(regressions)
+            )
+        )
+
+
+if __name__ == '__main__':
+    main()
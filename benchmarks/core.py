@@ -0,0 +1,213 @@
+import fnmatch
+import os
+import sys
+import traceback
+from collections import OrderedDict
+from timeit import default_timer
+
+try:
+    import tracemalloc
+except ImportError:
+    # Python 2, only the maximum resident set size is reported.
+    tracemalloc = None
+
+try:
+    import resource
+except ImportError:
+    # Windows
+    resource = None
+
+BENCHMARKS = OrderedDict()
+
+
+class Benchmark(object):
+    """A function timed against the synthetic exchanges.
+
+    Parameters
+    ----------
+    name: str
+    setup: callable[BenchmarkData -> callable]
+        Prepares the benchmark and returns the function to time.
+    repeat: int
+        The number of timed runs.
+    warmup: bool
+        Run the function once before timing it, filling the caches.
+
+    """
+
+    def __init__(self, name, setup, repeat=5, warmup=True):
+        self.name = name
+        self.setup = setup
+        self.repeat = repeat
+        self.warmup = warmup
+
+    def run(self, data, repeat=None):
+        """
+        Time the benchmark.
+
+        Parameters
+        ----------
+        data: BenchmarkData
+        repeat: int, optional
+            Overrides the number of timed runs.
+
+        Returns
+        -------
+        dict[str, Object]
+
+        """
+        func = self.setup(data)
+        if self.warmup:
+            func()
+
+        times = []
+        for _ in range(repeat or self.repeat):
+            start = default_timer()
+            func()
+            times.append(default_timer() - start)
+
+        times.sort()
+        return dict(
+            best=times[0],
+            median=times[len(times) // 2],
+            runs=len(times),
+            peak_memory=measure_peak_memory(func),
+        )
+
+
+def benchmark(name, repeat=5, warmup=True):
+    """
+    Register a benchmark.
+
+    The decorated function receives the synthetic data and returns the
+    function to time.
+
+    """
+
+    def decorator(setup):
+        BENCHMARKS[name] = Benchmark(name, setup, repeat, warmup)
+        return setup
+
+    return decorator
+
+
+def measure_peak_memory(func):
+    """
+    The peak memory allocated by a function, in bytes.
+
+    Returns
+    -------
+    int
+        None when tracemalloc is not available.
+
+    """
+    if tracemalloc is None:
+        func()
+        return None
+
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+
+    finally:
+        tracemalloc.stop()
+
+    return peak
+
+
+def get_max_rss():
+    """
+    The maximum resident set size of the process, in bytes.
+
+    """
+    if resource is None:
+        return None
+
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Reported in kilobytes on Linux and in bytes on macOS
+    return max_rss if sys.platform == 'darwin' else max_rss * 1024
+
+
+def select_benchmarks(patterns=None):
+    if not patterns:
+        return list(BENCHMARKS.values())
+
+    return [
+        bench for name, bench in BENCHMARKS.items()
+        if any(fnmatch.fnmatch(name, pattern) for pattern in patterns)
+    ]
+
+
+def run_benchmarks(data, patterns=None, repeat=None, out=sys.stdout):
+    """
+    Run the selected benchmarks.
+
+    A failing benchmark is reported but does not stop the suite, older
+    revisions may not support every benchmark.
+
+    Parameters
+    ----------
+    data: BenchmarkData
+    patterns: list[str], optional
+        Shell patterns matched against the benchmark names.
+    repeat: int, optional
+    out: file
+
+    Returns
+    -------
+    dict[str, dict[str, Object]]
+
+    """
+    results = OrderedDict()
+    for bench in select_benchmarks(patterns):
+        out.write('{}... '.format(bench.name))
+        out.flush()
+        try:
+            result = bench.run(data, repeat)
+
+        except Exception as e:
+            traceback.print_exc()
+            result = dict(error='{}: {}'.format(type(e).__name__, e))
+            out.write('failed\n')
+
+        else:
+            out.write('{} ({})\n'.format(
+                format_time(result['best']),
+                format_memory(result['peak_memory']),
+            ))
+
+        results[bench.name] = result
+
+    return results
+
+
+def format_time(seconds):
+    if seconds is None:
+        return '-'
+
+    for unit, scale in (('s', 1), ('ms', 1e-3), ('us', 1e-6)):
+        if seconds >= scale:
+            return '{:.2f}{}'.format(seconds / scale, unit)
+
+    return '{:.2f}us'.format(seconds / 1e-6)
+
+
+def format_memory(size):
+    if size is None:
+        return '-'
+
+    for unit, scale in (('GB', 1 << 30), ('MB', 1 << 20), ('KB', 1 << 10)):
+        if size >= scale:
+            return '{:.1f}{}'.format(float(size) / scale, unit)
+
+    return '{}B'.format(size)
+
+
+def set_catalyst_root(root):
+    """
+    Point catalyst to the synthetic data, must be called before the
+    benchmarks are set up.
+
+    """
+    os.environ['CATALYST_ROOT'] = root
@@ -0,0 +1,60 @@
+import pandas as pd
+
+# The markets of the synthetic exchanges, including the markets of the
+# examples and the btc_usd benchmark of load_crypto_market_data.
+SYMBOLS = {
+    'poloniex': ['btc_usdt', 'eth_usdt', 'ltc_usdt', 'xrp_usdt'],
+    'bitfinex': ['btc_usd', 'eth_usd', 'ltc_usd'],
+}
+QUOTE_CURRENCIES = {
+    'poloniex': 'usdt',
+    'bitfinex': 'usd',
+}
+
+# The range of the minute bars, the daily bars start with the OPEN
+# calendar.
+START = pd.Timestamp('2017-09-15', tz='UTC')
+END = pd.Timestamp('2017-09-24', tz='UTC')
+
+
+def generate(seed=0):
+    """
+    Write the synthetic exchanges to the current catalyst root.
+
+    Only the generating revision needs the synthetic generators, the
+    compared revisions read the same files.
+
+    """
+    from catalyst.testing.synthetic_exchange import make_synthetic_exchanges
+
+    make_synthetic_exchanges(SYMBOLS, START, END, seed=seed)
+
+
+class BenchmarkData(object):
+    """Access to the synthetic exchanges from the benchmarks.
+
+    Parameters
+    ----------
+    root: str
+        The catalyst root of the synthetic data.
+
+    """
+
+    def __init__(self, root):
+        self.root = root
+        self.start = START
+        self.end = END
+
+    def get_exchange(self, exchange_name):
+        from catalyst.exchange.utils.factory import get_exchange
+
+        return get_exchange(
+            exchange_name,
+            quote_currency=QUOTE_CURRENCIES[exchange_name],
+        )
+
+    def get_assets(self, exchange_name):
+        exchange = self.get_exchange(exchange_name)
+        return [
+            exchange.get_asset(symbol) for symbol in SYMBOLS[exchange_name]
+        ]
@@ -0,0 +1,204 @@
+"""
+The benchmarked hot spots.
+
+Each benchmark prepares its inputs from the synthetic exchanges and
+returns the function to time. The catalyst modules are imported by the
+setup functions, the suite is imported before the catalyst root is set.
+"""
+from importlib import import_module
+
+import pandas as pd
+from numpy.random import RandomState
+
+from .core import benchmark
+
+FIELDS = ['open', 'high', 'low', 'close', 'volume']
+
+
+@benchmark('minute_bar_reader.load_raw_arrays', repeat=10)
+def load_raw_arrays(data):
+    from catalyst.exchange.exchange_bundle import ExchangeBundle
+
+    reader = ExchangeBundle('poloniex').get_reader('minute')
+    sids = [asset.sid for asset in data.get_assets('poloniex')]
+    start_dt = data.start
+    end_dt = reader.calendar.session_close(data.end)
+
+    return lambda: reader.load_raw_arrays(FIELDS, start_dt, end_dt, sids)
+
+
+@benchmark('exchange_bundle.get_history_window_series', repeat=10)
+def get_history_window_series(data):
+    from catalyst.exchange.exchange_bundle import ExchangeBundle
+
+    bundle = ExchangeBundle('poloniex')
+    assets = data.get_assets('poloniex')
+    end_dt = data.end - pd.Timedelta(minutes=1)
+
+    return lambda: bundle.get_history_window_series(
+        assets=assets,
+        end_dt=end_dt,
+        bar_count=1440 * 3,
+        field='close',
+        data_frequency='minute',
+    )
+
+
+def _make_bar_data(data, exchange_name, dt):
+    from catalyst import get_calendar
+    from catalyst._protocol import BarData
+    from catalyst.exchange.exchange_data_portal import \
+        DataPortalExchangeBacktest
+    from catalyst.finance.asset_restrictions import NoRestrictions
+
+    calendar = get_calendar('OPEN')
+    data_portal = DataPortalExchangeBacktest(
+        exchange_names=[exchange_name],
+        asset_finder=None,
+        trading_calendar=calendar,
+        first_trading_day=data.start,
+        last_available_session=data.end,
+    )
+    return BarData(
+        data_portal=data_portal,
+        simulation_dt_func=lambda: dt,
+        data_frequency='minute',
+        trading_calendar=calendar,
+        restrictions=NoRestrictions(),
+    )
+
+
+@benchmark('bar_data.history', repeat=20)
+def bar_data_history(data):
+    assets = data.get_assets('poloniex')
+    bar_data = _make_bar_data(
+        data, 'poloniex', data.end - pd.Timedelta(hours=12)
+    )
+
+    def history():
+        bar_data.history(assets, 'price', bar_count=200, frequency='1T')
+        bar_data.history(assets, FIELDS, bar_count=50, frequency='5T')
+
+    return history
+
+
+@benchmark('bar_data.current', repeat=20)
+def bar_data_current(data):
+    assets = data.get_assets('poloniex')
+    bar_data = _make_bar_data(
+        data, 'poloniex', data.end - pd.Timedelta(hours=12)
+    )
+
+    def current():
+        for _ in range(100):
+            bar_data.current(assets, 'price')
+        bar_data.current(assets, FIELDS)
+
+    return current
+
+
+@benchmark('risk_metrics_cumulative.update', repeat=3)
+def risk_metrics_update(data):
+    from catalyst import get_calendar
+    from catalyst.finance.risk.cumulative import RiskMetricsCumulative
+    from catalyst.utils.factory import create_simulation_parameters
+
+    calendar = get_calendar('OPEN')
+    start = pd.Timestamp('2016-01-01', tz='UTC')
+    sim_params = create_simulation_parameters(
+        start=start,
+        end=data.end,
+        trading_calendar=calendar,
+    )
+    # Flat curves, the synthetic generators may not exist in the
+    # benchmarked revision.
+    treasury_curves = pd.DataFrame(
+        0.02,
+        index=pd.date_range('1990-01-02', data.end, freq='D', tz='UTC'),
+        columns=['1month', '3month', '1year', '10year', '30year'],
+    )
+
+    sessions = calendar.sessions_in_range(start, data.end)
+    rand = RandomState(0)
+    algorithm_returns = rand.normal(0, 0.02, size=len(sessions))
+    benchmark_returns = rand.normal(0, 0.03, size=len(sessions))
+
+    def update():
+        metrics = RiskMetricsCumulative(sim_params, treasury_curves, calendar)
+        for index, dt in enumerate(sessions):
+            metrics.update(
+                dt, algorithm_returns[index], benchmark_returns[index], 1.0
+            )
+
+    return update
+
+
+@benchmark('pipeline_engine.run_pipeline', repeat=3)
+def run_pipeline(data):
+    from catalyst import get_calendar
+    from catalyst.exchange.exchange_asset_finder import ExchangeAssetFinder
+    from catalyst.exchange.exchange_pricing_loader import \
+        ExchangePricingLoader, TradingPairPricing
+    from catalyst.pipeline import Pipeline
+    from catalyst.pipeline.engine import SimplePipelineEngine
+    from catalyst.pipeline.factors.crypto import Returns, SimpleMovingAverage
+
+    calendar = get_calendar('OPEN')
+    loader = ExchangePricingLoader('daily')
+    engine = SimplePipelineEngine(
+        get_loader=lambda column: loader,
+        calendar=calendar.all_sessions,
+        asset_finder=ExchangeAssetFinder(
+            exchanges=dict(bitfinex=data.get_exchange('bitfinex'))
+        ),
+    )
+
+    close = TradingPairPricing.close
+    pipeline = Pipeline(columns=dict(
+        sma_short=SimpleMovingAverage(inputs=[close], window_length=10),
+        sma_long=SimpleMovingAverage(inputs=[close], window_length=60),
+        returns=Returns(inputs=[close], window_length=30),
+    ))
+    start = pd.Timestamp('2017-06-01', tz='UTC')
+    end = data.end - pd.Timedelta(days=1)
+
+    return lambda: engine.run_pipeline(pipeline, start, end)
+
+
+def _backtest(example, exchange_name, capital_base, start, end):
+    from catalyst import run_algorithm
+    from .data import QUOTE_CURRENCIES
+
+    algo = import_module('catalyst.examples.{}'.format(example))
+
+    return lambda: run_algorithm(
+        capital_base=capital_base,
+        data_frequency='minute',
+        initialize=algo.initialize,
+        handle_data=algo.handle_data,
+        analyze=None,
+        exchange_name=exchange_name,
+        algo_namespace='benchmark_{}'.format(example),
+        quote_currency=QUOTE_CURRENCIES[exchange_name],
+        start=start,
+        end=end,
+    )
+
+
+@benchmark('run_algorithm.buy_and_hodl', repeat=1, warmup=False)
+def buy_and_hodl(data):
+    return _backtest(
+        'buy_and_hodl', 'poloniex', 10000,
+        start=data.end - pd.Timedelta(days=3),
+        end=data.end - pd.Timedelta(days=1),
+    )
+
+
+@benchmark('run_algorithm.dual_moving_average', repeat=1, warmup=False)
+def dual_moving_average(data):
+    # The range of the example.
+    return _backtest(
+        'dual_moving_average', 'bitfinex', 1000,
+        start=pd.Timestamp('2017-09-22', tz='UTC'),
+        end=pd.Timestamp('2017-09-23', tz='UTC'),
+    )
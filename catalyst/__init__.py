@@ -13,38 +13,71 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 import os
+import sys
+from importlib import import_module
+from types import ModuleType
 
 
 # This is *not* a place to dump arbitrary classes/modules for convenience,
 # it is a place to expose the public interfaces.
-from . import data
-from . import finance
-from . import gens
-from . import utils
-from .utils.calendars import get_calendar
-from .utils.run_algo import run_algorithm
-from ._version import get_versions
-
-# These need to happen after the other imports.
-from . algorithm import TradingAlgorithm
-from . import api
-
-from catalyst.utils.calendars.calendar_utils import global_calendar_dispatcher
-
-__version__ = get_versions()['version']
-del get_versions
-
-# PERF: Fire a warning if calendars were instantiated during catalyst import.
-# Having calendars doesn't break anything per-se, but it makes catalyst imports
-# noticeably slower, which becomes particularly noticeable in the Zipline CLI.
-if global_calendar_dispatcher._calendars:
-    import warnings
-    warnings.warn(
-        "Found TradingCalendar instances after catalyst import.\n"
-        "Zipline startup will be much slower until this is fixed!",
-    )
-    del warnings
-del global_calendar_dispatcher
+#
+# The public interfaces are imported on first access. Importing catalyst
+# itself is cheap, the command line and the live algorithms only pay for
+# the subsystems they use.
+_lazy_attributes = {
+    'TradingAlgorithm': ('catalyst.algorithm', 'TradingAlgorithm'),
+    'api': ('catalyst.api', None),
+    'data': ('catalyst.data', None),
+    'finance': ('catalyst.finance', None),
+    'get_calendar': ('catalyst.utils.calendars', 'get_calendar'),
+    'gens': ('catalyst.gens', None),
+    'run_algorithm': ('catalyst.utils.run_algo', 'run_algorithm'),
+    'utils': ('catalyst.utils', None),
+}
+
+
+def _get_version():
+    from ._version import get_versions
+    return get_versions()['version']
+
+
+def _load_attribute(name):
+    if name == '__version__':
+        value = _get_version()
+    else:
+        module_name, attribute = _lazy_attributes[name]
+        value = import_module(module_name)
+        if attribute is not None:
+            value = getattr(value, attribute)
+
+    setattr(sys.modules[__name__], name, value)
+    return value
+
+
+class _CatalystModule(ModuleType):
+    def __getattr__(self, name):
+        if name == '__version__' or name in _lazy_attributes:
+            return _load_attribute(name)
+
+        raise AttributeError(
+            "module '{}' has no attribute '{}'".format(__name__, name)
+        )
+
+    def __dir__(self):
+        return sorted(
+            set(self.__dict__) | set(_lazy_attributes) | {'__version__'}
+        )
+
+
+try:
+    sys.modules[__name__].__class__ = _CatalystModule
+except TypeError:
+    # The class of a module can only be changed on Python 3.5+, the public
+    # interfaces are imported eagerly on older versions.
+    for _name in ['data', 'finance', 'gens', 'utils', 'get_calendar',
+                  'run_algorithm', 'TradingAlgorithm', 'api', '__version__']:
+        _load_attribute(_name)
+    del _name
 
 
 def load_ipython_extension(ipython):
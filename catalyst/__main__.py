@@ -6,17 +6,15 @@ import re
 import click
 import sys
 import logbook
-import pandas as pd
-from catalyst.marketplace.marketplace import Marketplace
 from six import text_type
 
-from catalyst.data import bundles as bundles_module
-from catalyst.exchange.exchange_bundle import ExchangeBundle
-from catalyst.exchange.utils.exchange_utils import delete_algo_folder
 from catalyst.utils.cli import Date, Timestamp
-from catalyst.utils.run_algo import _run, load_extensions
-from catalyst.exchange.utils.bundle_utils import EXCHANGE_NAMES
-from catalyst.utils.remote import remote_backtest, get_remote_status
+from catalyst.utils.extensions import load_extensions
+from catalyst.utils.startup_profiler import ImportProfiler
+
+# The subcommands import their dependencies when invoked, the pipeline,
+# the exchanges, the marketplace and the live graph are heavy and most
+# commands only need one of them.
 
 try:
     __IPYTHON__
@@ -24,7 +22,7 @@ except NameError:
     __IPYTHON__ = False
 
 
-@click.group()
+@click.group(invoke_without_command=True)
 @click.option(
     '-e',
     '--extension',
@@ -46,10 +44,30 @@ except NameError:
     help="Don't load the default catalyst extension.py file "
          "in $CATALYST_HOME.",
 )
+@click.option(
+    '--profile-startup',
+    is_flag=True,
+    default=False,
+    help='Print the time spent importing each module once the command '
+         'completes. Without a command, profile the modules imported to '
+         'run an algorithm.',
+)
 @click.version_option()
-def main(extension, strict_extensions, default_extension):
+@click.pass_context
+def main(ctx, extension, strict_extensions, default_extension,
+         profile_startup):
     """Top level catalyst entry point.
     """
+    if profile_startup:
+        profiler = ImportProfiler()
+        profiler.install()
+
+        def print_report():
+            profiler.uninstall()
+            click.echo(profiler.get_report(), sys.stderr)
+
+        ctx.call_on_close(print_report)
+
     # install a logbook handler before performing any other operations
     logbook.StderrHandler().push_application()
     load_extensions(
@@ -59,6 +77,14 @@ def main(extension, strict_extensions, default_extension):
         os.environ,
     )
 
+    if ctx.invoked_subcommand is None:
+        if not profile_startup:
+            click.echo(ctx.get_help())
+            ctx.exit()
+
+        # The modules needed by the run and live commands.
+        import catalyst.utils.run_algo  # noqa: F401
+
 
 def extract_option_object(option):
     """Convert a click.option call into a click.Option object.
@@ -157,7 +183,7 @@ def ipython_only(option):
 @click.option(
     '--bundle-timestamp',
     type=Timestamp(),
-    default=pd.Timestamp.utcnow(),
+    default=None,
     show_default=False,
     help='The date to lookup data on or before.\n'
          '[default: <current-time>]'
@@ -211,6 +237,27 @@ def ipython_only(option):
     help='The quote currency used to calculate statistics '
          '(e.g. usd, btc, eth).',
 )
+@click.option(
+    '--benchmark',
+    default=None,
+    help='The benchmark, a constant daily return (e.g. 0) or a trading '
+         'pair read from the local daily bundle (e.g. bitfinex:btc_usd).',
+)
+@click.option(
+    '--profile',
+    is_flag=True,
+    default=False,
+    help='Time the stages of each bar and print a summary at exit. The '
+         'histograms are exported in the profile folder of the algorithm, '
+         'or in ./profile without an algo namespace.',
+)
+@click.option(
+    '--profile-format',
+    type=click.Choice(['prometheus', 'jsonl']),
+    default='prometheus',
+    show_default=True,
+    help='The format of the exported histograms.',
+)
 @click.pass_context
 def run(ctx,
         algofile,
@@ -227,7 +274,10 @@ def run(ctx,
         local_namespace,
         exchange_name,
         algo_namespace,
-        quote_currency):
+        quote_currency,
+        benchmark,
+        profile,
+        profile_format):
     """Run a backtest for the given algorithm.
     """
 
@@ -259,11 +309,16 @@ def run(ctx,
     if quote_currency is None:
         ctx.fail("must specify a quote currency with '-c' in backtest mode")
 
+    if bundle_timestamp is None:
+        import pandas as pd
+        bundle_timestamp = pd.Timestamp.utcnow()
+
     if capital_base is None:
         ctx.fail("must specify a capital base with '--capital-base'")
 
     click.echo('Running in backtesting mode.', sys.stdout)
 
+    from catalyst.utils.run_algo import _run
     perf = _run(
         initialize=None,
         handle_data=None,
@@ -292,6 +347,9 @@ def run(ctx,
         simulate_orders=True,
         auth_aliases=None,
         stats_output=None,
+        benchmark=benchmark,
+        profile=profile,
+        profile_format=profile_format,
     )
 
     if output == '--':
@@ -437,6 +495,39 @@ def catalyst_magic(line, cell=None):
          'specified like this: "[exchange_name],[alias],..." For example, '
          '"binance,auth2" or "binance,auth2,bittrex,auth2".',
 )
+@click.option(
+    '--bar-interval',
+    default=None,
+    help='The interval between bars, e.g. "15s". Defaults to one minute.',
+)
+@click.option(
+    '--market-data-socket',
+    default=None,
+    help='Receive the market data from the daemon started by '
+         '"catalyst market-data-daemon" on this unix socket.',
+)
+@click.option(
+    '--replay-folder',
+    default=None,
+    type=click.Path(exists=True, file_okay=False),
+    help='Replay the market data recorded in this folder as fast as '
+         'possible, the orders are matched locally.',
+)
+@click.option(
+    '--profile',
+    is_flag=True,
+    default=False,
+    help='Time the stages of each bar and print a summary at exit. The '
+         'histograms are exported in the profile folder of the algorithm, '
+         'or in ./profile without an algo namespace.',
+)
+@click.option(
+    '--profile-format',
+    type=click.Choice(['prometheus', 'jsonl']),
+    default='prometheus',
+    show_default=True,
+    help='The format of the exported histograms.',
+)
 @click.pass_context
 def live(ctx,
          algofile,
@@ -453,7 +544,12 @@ def live(ctx,
          end,
          live_graph,
          auth_aliases,
-         simulate_orders):
+         simulate_orders,
+         bar_interval,
+         market_data_socket,
+         replay_folder,
+         profile,
+         profile_format):
     """Trade live with the given algorithm.
     """
     if (algotext is not None) == (algofile is not None):
@@ -474,12 +570,16 @@ def live(ctx,
     if capital_base is None:
         ctx.fail("must specify a capital base with '--capital-base'")
 
-    if simulate_orders:
+    if replay_folder is not None:
+        click.echo('Running in replay mode.', sys.stdout)
+
+    elif simulate_orders:
         click.echo('Running in paper trading mode.', sys.stdout)
 
     else:
         click.echo('Running in live trading mode.', sys.stdout)
 
+    from catalyst.utils.run_algo import _run
     perf = _run(
         initialize=None,
         handle_data=None,
@@ -508,6 +608,11 @@ def live(ctx,
         simulate_orders=simulate_orders,
         auth_aliases=auth_aliases,
         stats_output=None,
+        bar_interval=bar_interval,
+        market_data_socket=market_data_socket,
+        replay_folder=replay_folder,
+        profile=profile,
+        profile_format=profile_format,
     )
 
     if output == '-':
@@ -518,6 +623,51 @@ def live(ctx,
     return perf
 
 
+@main.command(name='market-data-daemon')
+@click.option(
+    '-x',
+    '--exchange-name',
+    multiple=True,
+    help='The name of an exchange served by the daemon.',
+)
+@click.option(
+    '--socket',
+    'socket_path',
+    default=None,
+    help='The unix socket of the daemon. Defaults to market_data.sock in '
+         'the catalyst data root.',
+)
+@click.option(
+    '--poll-interval',
+    default='5s',
+    show_default=True,
+    help='The interval between two polls of the tickers and order books.',
+)
+@click.pass_context
+def market_data_daemon(ctx, exchange_name, socket_path, poll_interval):
+    """Share the market data of the exchanges with the live algorithms
+    of this host.
+    """
+    if not exchange_name:
+        ctx.fail("must specify at least one exchange name '-x'")
+
+    from catalyst.exchange.market_data_daemon import MarketDataDaemon
+    from catalyst.exchange.utils.factory import get_exchange
+
+    daemon = MarketDataDaemon(
+        exchanges={name: get_exchange(name) for name in exchange_name},
+        socket_path=socket_path,
+        poll_interval=poll_interval,
+    )
+    click.echo(
+        'Serving market data on {}'.format(daemon.socket_path), sys.stdout
+    )
+    try:
+        daemon.serve_forever()
+    except KeyboardInterrupt:
+        click.echo('Done', sys.stdout)
+
+
 @main.command(name='remote-run')
 @click.option(
     '-f',
@@ -564,7 +714,7 @@ def live(ctx,
 @click.option(
     '--bundle-timestamp',
     type=Timestamp(),
-    default=pd.Timestamp.utcnow(),
+    default=None,
     show_default=False,
     help='The date to lookup data on or before.\n'
          '[default: <current-time>]'
@@ -663,12 +813,17 @@ def remote_run(ctx,
     if quote_currency is None:
         ctx.fail("must specify a quote currency with '-c' in backtest mode")
 
+    if bundle_timestamp is None:
+        import pandas as pd
+        bundle_timestamp = pd.Timestamp.utcnow()
+
     if capital_base is None:
         ctx.fail("must specify a capital base with '--capital-base'")
 
     if mail is None or not re.match(r"[^@]+@[^@]+\.[^@]+", mail):
         ctx.fail("must specify a valid email with '--mail'")
 
+    from catalyst.utils.remote import remote_backtest
     algo_id = remote_backtest(
         initialize=None,
         handle_data=None,
@@ -736,6 +891,7 @@ def remote_status(ctx, algo_id, data_output, log_output):
     if algo_id is None:
         ctx.fail("must specify an id of your running algorithm with '--id'")
 
+    from catalyst.utils.remote import get_remote_status
     status_response = get_remote_status(
         algo_id=algo_id
     )
@@ -834,6 +990,8 @@ def ingest_exchange(ctx, exchange_name, data_frequency, start, end,
 
     if exchange_name is None:
         ctx.fail("must specify an exchange name '-x'")
+    from catalyst.exchange.utils.bundle_utils import EXCHANGE_NAMES
+
     if not csv and exchange_name not in EXCHANGE_NAMES:
         ctx.fail(
             "ingest-exchange does not support {}, "
@@ -841,6 +999,7 @@ def ingest_exchange(ctx, exchange_name, data_frequency, start, end,
                 exchange_name,
                 EXCHANGE_NAMES))
 
+    from catalyst.exchange.exchange_bundle import ExchangeBundle
     exchange_bundle = ExchangeBundle(exchange_name)
 
     click.echo('Trying to ingest exchange bundle {}...'.format(exchange_name),
@@ -870,6 +1029,7 @@ def clean_algo(ctx, algo_namespace):
         'Cleaning algo state: {}'.format(algo_namespace),
         sys.stdout
     )
+    from catalyst.exchange.utils.exchange_utils import delete_algo_folder
     delete_algo_folder(algo_namespace)
     click.echo('Done', sys.stdout)
 
@@ -896,6 +1056,7 @@ def clean_exchange(ctx, exchange_name, data_frequency):
     if exchange_name is None:
         ctx.fail("must specify an exchange name '-x'")
 
+    from catalyst.exchange.exchange_bundle import ExchangeBundle
     exchange_bundle = ExchangeBundle(exchange_name)
 
     click.echo('Cleaning exchange bundle {}...'.format(exchange_name),
@@ -943,6 +1104,8 @@ def ingest(ctx, bundle, exchange_name, compile_locally, assets_version,
            show_progress):
     """Ingest the data for the given bundle.
     """
+    import pandas as pd
+    from catalyst.data import bundles as bundles_module
 
     bundles_module.ingest(
         bundle,
@@ -995,6 +1158,7 @@ def ingest(ctx, bundle, exchange_name, compile_locally, assets_version,
 def clean(bundle, before, after, keep_last):
     """Clean up bundles from 'ingest'.
     """
+    from catalyst.data import bundles as bundles_module
     bundles_module.clean(
         bundle,
         before,
@@ -1007,6 +1171,8 @@ def clean(bundle, before, after, keep_last):
 def bundles():
     """List all of the available data bundles.
     """
+    from catalyst.data import bundles as bundles_module
+
     for bundle in sorted(bundles_module.bundles.keys()):
         if bundle.startswith('.'):
             # hide the test data
@@ -1044,6 +1210,7 @@ def ls(ctx):
     """
     click.echo('Listing of available data sources on the marketplace:',
                sys.stdout)
+    from catalyst.marketplace.marketplace import Marketplace
     marketplace = Marketplace()
     marketplace.list()
 
@@ -1058,6 +1225,7 @@ def ls(ctx):
 def subscribe(ctx, dataset):
     """Subscribe to an existing dataset.
     """
+    from catalyst.marketplace.marketplace import Marketplace
     marketplace = Marketplace()
     marketplace.subscribe(dataset)
 
@@ -1094,6 +1262,7 @@ def subscribe(ctx, dataset):
 def ingest(ctx, dataset, data_frequency, start, end):
     """Ingest a dataset (requires subscription).
     """
+    from catalyst.marketplace.marketplace import Marketplace
     marketplace = Marketplace()
     marketplace.ingest(dataset, data_frequency, start, end)
 
@@ -1108,6 +1277,7 @@ def ingest(ctx, dataset, data_frequency, start, end):
 def clean(ctx, dataset):
     """Clean/Remove local data for a given dataset.
     """
+    from catalyst.marketplace.marketplace import Marketplace
     marketplace = Marketplace()
     marketplace.clean(dataset)
 
@@ -1117,6 +1287,7 @@ def clean(ctx, dataset):
 def register(ctx):
     """Register a new dataset.
     """
+    from catalyst.marketplace.marketplace import Marketplace
     marketplace = Marketplace()
     marketplace.register()
 
@@ -1131,6 +1302,7 @@ def register(ctx):
 def get_withdraw_amount(ctx, dataset):
     """Get withdraw amount owner is entitled to.
     """
+    from catalyst.marketplace.marketplace import Marketplace
     marketplace = Marketplace()
     marketplace.get_withdraw_amount(dataset)
 
@@ -1145,6 +1317,7 @@ def get_withdraw_amount(ctx, dataset):
 def withdraw(ctx, dataset):
     """Withdraw amount you are entitled to.
     """
+    from catalyst.marketplace.marketplace import Marketplace
     marketplace = Marketplace()
     marketplace.withdraw(dataset)
 
@@ -1170,6 +1343,7 @@ def withdraw(ctx, dataset):
 def publish(ctx, dataset, datadir, watch):
     """Publish data for a registered dataset.
     """
+    from catalyst.marketplace.marketplace import Marketplace
     marketplace = Marketplace()
     if dataset is None:
         ctx.fail("must specify a dataset to publish data for "
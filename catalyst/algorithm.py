@@ -87,18 +87,15 @@ from catalyst.finance.asset_restrictions import (
 )
 from catalyst.assets import Asset, Equity, Future
 from catalyst.gens.tradesimulation import AlgorithmSimulator
-from catalyst.pipeline import Pipeline
-from catalyst.pipeline.engine import (
-    ExplodingPipelineEngine,
-    SimplePipelineEngine,
-)
 from catalyst.utils.api_support import (
     api_method,
     require_initialized,
     require_not_initialized,
     ZiplineAPI,
     disallowed_in_before_trading_start)
+from catalyst.utils.bar_profiler import profile_span
 from catalyst.utils.input_validation import (
+    _qualified_name,
     coerce_string,
     ensure_upper_case,
     error_keywords,
@@ -143,6 +140,25 @@ from catalyst.constants import LOG_LEVEL
 log = logbook.Logger("CatalystLog", level=LOG_LEVEL)
 
 
+def _expect_pipeline(func, argname, argvalue):
+    # Checked on use, the pipeline package is not imported with the
+    # algorithm.
+    from catalyst.pipeline import Pipeline
+
+    if not isinstance(argvalue, Pipeline):
+        raise TypeError(
+            "{funcname}() expected a value of type {type_} for argument "
+            "'{argname}', but got {actual} instead.".format(
+                funcname=_qualified_name(func),
+                type_=_qualified_name(Pipeline),
+                argname=argname,
+                actual=_qualified_name(type(argvalue)),
+            )
+        )
+
+    return argvalue
+
+
 class TradingAlgorithm(object):
     """A class that represents a trading strategy and parameters to execute
     the strategy.
@@ -440,14 +456,37 @@ class TradingAlgorithm(object):
                     'Cannot initialize engine with '
                     'data frequency: {}'.format(data_frequency)
                 )
+        else:
+            all_dates = None
+
+        # The pipeline package is heavy, the engine is created on first use
+        # so that only the algorithms using pipelines import it.
+        self._engine = None
+        self._engine_args = get_loader, all_dates
 
-            self.engine = SimplePipelineEngine(
-                get_loader,
-                all_dates,
-                self.asset_finder,
+    @property
+    def engine(self):
+        if self._engine is None:
+            from catalyst.pipeline.engine import (
+                ExplodingPipelineEngine,
+                SimplePipelineEngine,
             )
-        else:
-            self.engine = ExplodingPipelineEngine()
+
+            get_loader, all_dates = self._engine_args
+            if get_loader is not None:
+                self._engine = SimplePipelineEngine(
+                    get_loader,
+                    all_dates,
+                    self.asset_finder,
+                )
+            else:
+                self._engine = ExplodingPipelineEngine()
+
+        return self._engine
+
+    @engine.setter
+    def engine(self, engine):
+        self._engine = engine
 
     def initialize(self, *args, **kwargs):
         """
@@ -471,7 +510,8 @@ class TradingAlgorithm(object):
 
     def handle_data(self, data):
         if self._handle_data:
-            self._handle_data(self, data)
+            with profile_span('handle_data'):
+                self._handle_data(self, data)
 
         # Unlike trading controls which remain constant unless placing an
         # order, account controls can change each bar. Thus, must check
@@ -2377,8 +2417,8 @@ class TradingAlgorithm(object):
     ##############
     @api_method
     @require_not_initialized(AttachPipelineAfterInitialize())
+    @preprocess(pipeline=_expect_pipeline)
     @expect_types(
-        pipeline=Pipeline,
         name=string_types,
         chunks=(int, Iterable, type(None)),
     )
@@ -16,6 +16,9 @@
 # Note that part of the API is implemented in TradingAlgorithm as
 # methods (e.g. order). These are added to this namespace via the
 # decorator ``api_method`` inside of algorithm.py.
+import sys as _sys
+from types import ModuleType as _ModuleType
+
 from .finance.asset_restrictions import (
     Restriction,
     StaticRestrictions,
@@ -57,3 +60,33 @@ __all__ = [
     'time_rules',
     'calendars',
 ]
+
+
+def _register_api_methods():
+    # Importing the algorithms registers their ``api_method`` in this
+    # namespace.
+    import catalyst.exchange.exchange_algorithm  # noqa: F401
+
+
+class _APIModule(_ModuleType):
+    """The api methods are registered on first access, importing the api
+    does not import the algorithms and their dependencies.
+    """
+    _registered = False
+
+    def __getattr__(self, name):
+        if name.startswith('__') or _APIModule._registered:
+            raise AttributeError(
+                "module '{}' has no attribute '{}'".format(__name__, name)
+            )
+
+        _APIModule._registered = True
+        _register_api_methods()
+        return getattr(self, name)
+
+
+try:
+    _sys.modules[__name__].__class__ = _APIModule
+except TypeError:
+    # Python < 3.5, the algorithms are imported eagerly by ``catalyst``.
+    pass
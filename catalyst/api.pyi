@@ -860,7 +860,7 @@ def symbols(*args):
     """
 
 
-def get_dataset(ds_name, start=None, end=None):
+def get_dataset(ds_name, start=None, end=None, symbols=None):
     """
     Lookup a data source from the marketplace
 
@@ -869,6 +869,7 @@ def get_dataset(ds_name, start=None, end=None):
     ds_name: str
     start: pd.Timestamp
     end: pd.Timestamp
+    symbols: list[str]
 
     Returns
     -------
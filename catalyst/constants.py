@@ -47,6 +47,9 @@ SUPPORTED_WALLETS = ['metamask', 'ledger', 'trezor', 'bitbox', 'keystore',
 
 DISABLE_ALPHA_WARNING = bool(os.environ.get('CATALYST_DISABLE_ALPHA_WARNING'))
 
+# Coordinate the rate limit of the exchange requests of all the processes.
+SHARED_RATE_LIMIT = bool(os.environ.get('CATALYST_SHARED_RATE_LIMIT'))
+
 ALPHA_WARNING_MESSAGE = 'Catalyst is currently in ALPHA. It is going ' \
                         'through rapid development and it is subject to ' \
                         'errors. Please use carefully. We encourage you to ' \
@@ -1,22 +1,49 @@
-import csv
 import json
 import os
 import shutil
 import time
 from datetime import datetime
+from multiprocessing.pool import ThreadPool
 
+import bcolz
 import logbook
+import numpy as np
 import pandas as pd
 import requests
 
 from catalyst.exchange.utils.exchange_utils import \
     get_exchange_symbols_filename
+from catalyst.utils.paths import ensure_directory
+from catalyst.utils.rate_limit import RateLimiter
 
 DT_START = int(time.mktime(datetime(2010, 1, 1, 0, 0).timetuple()))
 DT_END = pd.to_datetime('today').value // 10 ** 9
 CSV_OUT_FOLDER = os.environ.get('CSV_OUT_FOLDER', '/efs/exchanges/poloniex/')
 CONN_RETRIES = 2
 
+# Poloniex API limits querying TradeHistory to intervals smaller than 1
+# month, and returns at most TRADE_HISTORY_LIMIT trades per request.
+WINDOW = 2419200    # 60s/min * 60min/hr * 24hr/day * 28days
+TRADE_HISTORY_LIMIT = 50000
+
+# The public API allows 6 requests per second.
+WAIT_TIME = pd.Timedelta(milliseconds=170)
+DEFAULT_THREADS = 4
+
+# The pairs whose history does not start with the trade 1.
+FIRST_TRADE_IDS = {
+    'BTC_HUC': 2,
+    'BTC_RIC': 2,
+    'BTC_XCP': 2,
+    'BTC_NAV': 4569,
+    'BTC_POT': 23511,
+}
+
+TRADE_COLUMNS = [
+    'tradeID', 'date', 'type', 'rate', 'amount', 'total', 'globalTradeID',
+]
+OHLCV_COLUMNS = ['date', 'open', 'high', 'low', 'close', 'volume']
+
 logbook.StderrHandler().push_application()
 log = logbook.Logger(__name__)
 
@@ -24,18 +51,38 @@ log = logbook.Logger(__name__)
 class PoloniexCurator(object):
     '''
     OHLCV data feed generator for crypto data. Based on Poloniex market data
+
+    The trade history of each currency pair is stored in monthly bcolz
+    partitions, sorted by tradeID, under ``<folder>/trades/<pair>``. A
+    ``state.json`` file records the range of the stored trades and the
+    partitions changed since the 1-minute OHLCV bars were generated, so
+    the curation resumes where it stopped and only regenerates the bars
+    of the changed months, under ``<folder>/1min/<pair>``.
     '''
 
     _api_path = 'https://poloniex.com/public?'
     currency_pairs = []
 
-    def __init__(self):
-        if not os.path.exists(CSV_OUT_FOLDER):
+    def __init__(self,
+                 folder=CSV_OUT_FOLDER,
+                 api_path=None,
+                 wait_time=WAIT_TIME,
+                 threads=DEFAULT_THREADS,
+                 trade_history_limit=TRADE_HISTORY_LIMIT):
+        self.folder = folder
+        if api_path is not None:
+            self._api_path = api_path
+
+        # Shared by the threads of all the pairs.
+        self.rate_limiter = RateLimiter(wait_time)
+        self.threads = threads
+        self.trade_history_limit = trade_history_limit
+
+        if not os.path.exists(folder):
             try:
-                os.makedirs(CSV_OUT_FOLDER)
+                os.makedirs(folder)
             except Exception as e:
-                log.error('Failed to create data folder: {}'.format(
-                    CSV_OUT_FOLDER))
+                log.error('Failed to create data folder: {}'.format(folder))
                 log.exception(e)
 
     def get_currency_pairs(self):
@@ -60,274 +107,338 @@ class PoloniexCurator(object):
         log.debug('Currency pairs retrieved successfully: {}'.format(
             len(self.currency_pairs)))
 
-    def _retrieve_tradeID_date(self, row):
-        '''
-        Helper function that reads tradeID and date fields from CSV readline
-        '''
-        tId = int(row.split(',')[0])
-        d = pd.to_datetime(row.split(',')[1],
-                           infer_datetime_format=True).value // 10 ** 9
-        return tId, d
+    def _pair_folder(self, kind, currencyPair):
+        return os.path.join(self.folder, kind, currencyPair)
 
-    def retrieve_trade_history(self, currencyPair, start=DT_START,
-                               end=DT_END, temp=None):
-        '''
-        Retrieves TradeHistory from exchange for a given currencyPair
-        between start and end dates. If no start date is provided, uses
-        a system-wide one (beginning of time for cryptotrading).
-        If no end date is provided, 'now' is used.
+    def _partition_path(self, kind, currencyPair, month):
+        return os.path.join(
+            self._pair_folder(kind, currencyPair), '{}.bcolz'.format(month)
+        )
 
-        Stores results in CSV file on disk.
-
-        This function is called recursively to work around the
-        limitations imposed by the provider API.
-        '''
-        csv_fn = CSV_OUT_FOLDER + 'crypto_trades-' + currencyPair + '.csv'
+    def _state_path(self, currencyPair):
+        return os.path.join(
+            self._pair_folder('trades', currencyPair), 'state.json'
+        )
 
+    def get_state(self, currencyPair):
         '''
-        Check what data we already have on disk, reading first and last
-        lines from file. Data is stored on file from NEWEST to OLDEST.
+        The range of the stored trades of a currencyPair, and the months
+        whose OHLCV bars must be generated again. The trades of the legacy
+        CSV file are imported the first time.
         '''
         try:
-            with open(csv_fn, 'ab+') as f:
-                f.seek(0, os.SEEK_END)
-                if(f.tell() > 2):                   # Check file size is not 0
-                    f.seek(0)                       # Go to start to read
-                    last_tradeID, end_file = self._retrieve_tradeID_date(
-                        f.readline())
-                    f.seek(-2, os.SEEK_END)         # Jump to the 2nd last byte
-                    while f.read(1) != b"\n":       # Until EOL is found...
-                        # ...jump back the read byte plus one more.
-                        f.seek(-2, os.SEEK_CUR)
-                    first_tradeID, start_file = self._retrieve_tradeID_date(
-                        f.readline())
-
-                    if(end_file + 3600 * 6 > DT_END and
-                        (first_tradeID == 1 or
-                         (currencyPair == 'BTC_HUC' and
-                          first_tradeID == 2) or
-                         (currencyPair == 'BTC_RIC' and
-                          first_tradeID == 2) or
-                         (currencyPair == 'BTC_XCP' and
-                          first_tradeID == 2) or
-                         (currencyPair == 'BTC_NAV' and
-                          first_tradeID == 4569) or
-                         (currencyPair == 'BTC_POT' and
-                          first_tradeID == 23511))):
-                        return
-
-        except Exception as e:
-            log.error('Error opening file: {}'.format(csv_fn))
-            log.exception(e)
-
-        '''
-        Poloniex API limits querying TradeHistory to intervals smaller
-        than 1 month, so we make sure that start date is never more than
-        1 month apart from end date
-        '''
-        if(end - start > 2419200):   # 60s/min * 60min/hr * 24hr/day * 28days
-            newstart = end - 2419200
-        else:
-            newstart = start
-
-        log.debug('{}: Retrieving from {} to {}\t {} - {}'.format(
-            currencyPair, str(newstart), str(end),
-            time.ctime(newstart), time.ctime(end)))
-
+            with open(self._state_path(currencyPair)) as f:
+                return json.load(f)
+        except IOError:
+            pass
+
+        state = dict(
+            oldest_trade_id=None,
+            oldest_date=None,
+            newest_trade_id=None,
+            newest_date=None,
+            complete=False,
+            dirty_months=[],
+        )
+
+        csv_fn = os.path.join(
+            self.folder, 'crypto_trades-{}.csv'.format(currencyPair)
+        )
+        if os.path.isfile(csv_fn):
+            trades = pd.read_csv(csv_fn, names=TRADE_COLUMNS)
+            self._store_trades(
+                currencyPair, _trades_frame(trades.to_dict('records')), state,
+            )
+
+        return state
+
+    def _save_state(self, currencyPair, state):
+        path = self._state_path(currencyPair)
+        ensure_directory(os.path.dirname(path))
+        with open(path + '.tmp', 'w') as f:
+            json.dump(state, f, sort_keys=True, indent=2)
+
+        os.rename(path + '.tmp', path)
+
+    def _request_trade_history(self, currencyPair, start, end):
         url = '{path}command=returnTradeHistory&currencyPair={pair}' \
               '&start={start}&end={end}'.format(
                   path=self._api_path,
                   pair=currencyPair,
-                  start=str(newstart),
+                  start=str(start),
                   end=str(end))
 
-        attempts = 0
-        success = 0
-        while attempts < CONN_RETRIES:
+        for _ in range(CONN_RETRIES):
+            self.rate_limiter.wait()
             try:
-                response = requests.get(url)
+                data = requests.get(url).json()
             except Exception as e:
-                log.error('Failed to retrieve trade history data'
+                log.error('Failed to retrieve trade history data '
                           'for {}'.format(currencyPair))
                 log.exception(e)
-                attempts += 1
-            else:
-                try:
-                    if(isinstance(response.json(), dict) and
-                       response.json()['error']):
-                        log.error('Failed to to retrieve trade history data '
-                                  'for {}: {}'.format(
-                                      currencyPair,
-                                      response.json()['error']))
-                        attempts += 1
-                except Exception as e:
-                    log.exception(e)
-                    attempts += 1
-                else:
-                    success = 1
-                    break
+                continue
 
-        if not success:
-            return None
+            if isinstance(data, dict):
+                log.error('Failed to to retrieve trade history data '
+                          'for {}: {}'.format(currencyPair, data.get('error')))
+                continue
 
-        '''
-        If we get to transactionId == 1, and we already have that on
-        disk, we got to the end of TradeHistory for this coin.
-        '''
-        if('first_tradeID' in locals() and
-           response.json()[-1]['tradeID'] == first_tradeID):
-            return
+            return data
+
+        raise ValueError(
+            'Failed to retrieve trade history data for {} from {} to {} '
+            'after {} attempts.'.format(
+                currencyPair, start, end, CONN_RETRIES,
+            )
+        )
 
+    def _retrieve_window(self, currencyPair, start, end):
         '''
-            There are primarily two scenarios:
-                a) There is newer data available that we need to add at
-                   the beginning of the file. We'll retrieve all what we
-                   need until we get to what we already have, writing it
-                   to a temporary file; and we will write that at the
-                   beginning of our existing file.
-                b) We are going back in time, appending at the end of
-                   our existing TradeHistory until the first transaction
-                   for this currencyPair
+        All the trades between start and end, sorted by tradeID. The API
+        returns the newest trades of the window first, older trades are
+        requested until the window is exhausted.
         '''
-        try:
-            if(temp is not None or
-                    ('end_file' in locals() and end_file + 3600 < end)):
-                if (temp is None):
-                    temp = os.tmpfile()
-                tempcsv = csv.writer(temp)
-                for item in response.json():
-                    if(item['tradeID'] <= last_tradeID):
-                        continue
-                    tempcsv.writerow([
-                        item['tradeID'],
-                        item['date'],
-                        item['type'],
-                        item['rate'],
-                        item['amount'],
-                        item['total'],
-                        item['globalTradeID'],
-                    ])
-                if(response.json()[-1]['tradeID'] > last_tradeID):
-                    end = pd.to_datetime(response.json()[-1]['date'],
-                                         infer_datetime_format=True
-                                         ).value // 10**9
-                    self.retrieve_trade_history(currencyPair, start,
-                                                end, temp=temp)
-                else:
-                    with open(csv_fn, 'rb+') as f:
-                        shutil.copyfileobj(f, temp)
-                        f.seek(0)
-                        temp.seek(0)
-                        shutil.copyfileobj(temp, f)
-                    temp.close()
-                    end = start_file
-            else:
-                with open(csv_fn, 'ab') as csvfile:
-                    csvwriter = csv.writer(csvfile)
-                    for item in response.json():
-                        if('first_tradeID' in locals() and
-                                item['tradeID'] >= first_tradeID):
-                            continue
-                        csvwriter.writerow([
-                            item['tradeID'],
-                            item['date'],
-                            item['type'],
-                            item['rate'],
-                            item['amount'],
-                            item['total'],
-                            item['globalTradeID']
-                        ])
-                end = pd.to_datetime(response.json()[-1]['date'],
-                                     infer_datetime_format=True
-                                     ).value // 10 ** 9
-
-        except Exception as e:
-            log.error('Error opening {}'.format(csv_fn))
-            log.exception(e)
-
+        frames = []
+        while True:
+            log.debug('{}: Retrieving from {} to {}\t {} - {}'.format(
+                currencyPair, str(start), str(end),
+                time.ctime(start), time.ctime(end)))
+
+            items = self._request_trade_history(currencyPair, start, end)
+            if not items:
+                break
+
+            frames.append(_trades_frame(items))
+            if len(items) < self.trade_history_limit:
+                break
+
+            # Trades of the oldest second may have been left out, they are
+            # requested again.
+            oldest = frames[-1]['date'].min().value // 10 ** 9
+            if oldest >= end:
+                break
+            end = oldest
+
+        if not frames:
+            return _trades_frame([])
+
+        trades = pd.concat(frames, ignore_index=True)
+        return trades.drop_duplicates('tradeID').sort_values('tradeID')
+
+    def _append_trades(self, currencyPair, trades):
+        '''
+        Stores the trades in their monthly partitions, returns the changed
+        months.
         '''
-            If we got here, we aren't done yet. Call recursively with
-            'end' times that go sequentially back in time.
+        months = trades['date'].dt.strftime('%Y-%m')
+        for month, group in trades.groupby(months):
+            path = self._partition_path('trades', currencyPair, month)
+            if os.path.isdir(path):
+                z = bcolz.open(path, mode='a')
+                if group['tradeID'].iloc[0] > z.cols['tradeID'][-1]:
+                    # Newer trades are appended in place.
+                    z.append([_column_values(group, c) for c in TRADE_COLUMNS])
+                    z.flush()
+                    continue
+
+                group = pd.concat([_read_table(path), group])
+                group = group.drop_duplicates('tradeID', keep='last') \
+                    .sort_values('tradeID')
+
+            _write_table(path, group, TRADE_COLUMNS)
+
+        return set(months.unique())
+
+    def _store_trades(self, currencyPair, trades, state):
+        if len(trades) > 0:
+            months = self._append_trades(currencyPair, trades)
+            state['dirty_months'] = sorted(
+                set(state['dirty_months']) | months
+            )
+
+            oldest = trades.iloc[0]
+            if state['oldest_trade_id'] is None or \
+                    oldest['tradeID'] < state['oldest_trade_id']:
+                state['oldest_trade_id'] = int(oldest['tradeID'])
+                state['oldest_date'] = oldest['date'].value // 10 ** 9
+
+            newest = trades.iloc[-1]
+            if state['newest_trade_id'] is None or \
+                    newest['tradeID'] > state['newest_trade_id']:
+                state['newest_trade_id'] = int(newest['tradeID'])
+                state['newest_date'] = newest['date'].value // 10 ** 9
+
+        if state['oldest_trade_id'] is not None and \
+                state['oldest_trade_id'] <= FIRST_TRADE_IDS.get(
+                    currencyPair, 1):
+            state['complete'] = True
+
+        self._save_state(currencyPair, state)
+
+    def retrieve_trade_history(self, currencyPair, start=DT_START, end=None):
         '''
-        self.retrieve_trade_history(currencyPair, start, end)
+        Retrieves TradeHistory from exchange for a given currencyPair
+        between start and end dates. If no start date is provided, uses
+        a system-wide one (beginning of time for cryptotrading).
+        If no end date is provided, 'now' is used.
 
-    def generate_ohlcv(self, df):
+        The trades newer than the stored ones are retrieved first, then
+        the history is walked back one window at a time until the first
+        trade of the pair. The state is saved after each window, an
+        interrupted curation resumes from there.
+        '''
+        if end is None:
+            end = int(time.time())
+
+        state = self.get_state(currencyPair)
+
+        window_start = state['newest_date']
+        while window_start is not None and window_start < end:
+            window_end = min(window_start + WINDOW, end)
+            trades = self._retrieve_window(
+                currencyPair, window_start, window_end,
+            )
+            self._store_trades(
+                currencyPair,
+                trades[trades['tradeID'] > state['newest_trade_id']],
+                state,
+            )
+            window_start = window_end
+
+        window_end = state['oldest_date']
+        if window_end is None:
+            window_end = end
+
+        while not state['complete'] and window_end > start:
+            window_start = max(window_end - WINDOW, start)
+            trades = self._retrieve_window(
+                currencyPair, window_start, window_end,
+            )
+            if state['oldest_trade_id'] is not None:
+                trades = trades[trades['tradeID'] < state['oldest_trade_id']]
+
+            if window_start <= start:
+                state['complete'] = True
+
+            self._store_trades(currencyPair, trades, state)
+            window_end = window_start
+
+    def generate_ohlcv(self, df, index=None, last_close=None):
         '''
-        Generates OHLCV dataframe from a dataframe containing all TradeHistory
-        by resampling with 1-minute period
+        Generates OHLCV dataframe from a dataframe containing TradeHistory
+        by resampling with 1-minute period. The bars can be reindexed, the
+        missing prices before the first trade are filled with last_close.
         '''
-        df.set_index('date', inplace=True)             # Index by date
-        vol = df['total'].to_frame('volume')           # set Vol aside
-        df.drop('total', axis=1, inplace=True)         # Drop volume data
-        ohlc = df.resample('T').ohlc()                 # Resample OHLC 1min
-        ohlc.columns = ohlc.columns.map(lambda t: t[1])  # Rename cols
+        df = df.set_index('date')                      # Index by date
+        if len(df) > 0:
+            ohlc = df['rate'].resample('T').ohlc()     # Resample OHLC 1min
+            vol = df['total'].resample('T').sum()      # Add volumes by bin
+        else:
+            ohlc = pd.DataFrame(columns=['open', 'high', 'low', 'close'],
+                                index=df.index, dtype='float64')
+            vol = df['total']
+
+        if index is not None:
+            ohlc = ohlc.reindex(index)
+            vol = vol.reindex(index)
+
         closes = ohlc['close'].fillna(method='pad')    # Pad fwd missing close
+        if last_close is not None:
+            closes = closes.fillna(last_close)
         ohlc = ohlc.apply(lambda x: x.fillna(closes))  # Fill NA w/ last close
-        vol = vol.resample('T').sum().fillna(0)        # Add volumes by bin
+        vol = vol.fillna(0).to_frame('volume')
         ohlcv = pd.concat([ohlc, vol], axis=1)         # Concat OHLC + Vol
         return ohlcv
 
     def write_ohlcv_file(self, currencyPair):
         '''
-        Generates OHLCV data file with 1minute bars from TradeHistory on disk
+        Generates the 1minute bars of the months whose trades changed.
+
+        The bars span from the first to the last stored trade, the months
+        following a regenerated month whose last close changed are
+        regenerated as well.
         '''
-        csv_trades = CSV_OUT_FOLDER + 'crypto_trades-' + currencyPair + '.csv'
-        csv_1min = CSV_OUT_FOLDER + 'crypto_1min-' + currencyPair + '.csv'
-        if(os.path.getmtime(csv_1min) > time.time() - 7200):
-            log.debug(currencyPair + ': 1min data file already up to date. '
-                      'Delete the file if you want to rebuild it.')
-        else:
-            df = pd.read_csv(csv_trades,
-                             names=['tradeID',
-                                    'date',
-                                    'type',
-                                    'rate',
-                                    'amount',
-                                    'total',
-                                    'globalTradeID'],
-                             dtype={'tradeID': int,
-                                    'date': str,
-                                    'type': str,
-                                    'rate': float,
-                                    'amount': float,
-                                    'total': float,
-                                    'globalTradeID': int}
-                             )
-            df.drop(['tradeID', 'type', 'amount', 'globalTradeID'],
-                    axis=1, inplace=True)
-            df['date'] = pd.to_datetime(df['date'], infer_datetime_format=True)
-            ohlcv = self.generate_ohlcv(df)
-            try:
-                with open(csv_1min, 'w') as csvfile:
-                    csvwriter = csv.writer(csvfile)
-                    for item in ohlcv.itertuples():
-                        if item.Index == 0:
-                            continue
-                        csvwriter.writerow([
-                            item.Index.value // 10 ** 9,
-                            item.open,
-                            item.high,
-                            item.low,
-                            item.close,
-                            item.volume,
-                        ])
-            except Exception as e:
-                log.error('Error opening {}'.format(csv_1min))
-                log.exception(e)
-            log.debug('{}: Generated 1min OHLCV data.'.format(currencyPair))
+        state = self.get_state(currencyPair)
+        if state['oldest_date'] is None:
+            return
+
+        first_minute = pd.Timestamp(state['oldest_date'], unit='s') \
+            .floor('T')
+        last_minute = pd.Timestamp(state['newest_date'], unit='s') \
+            .floor('T')
+        dirty = set(state['dirty_months'])
+
+        last_close = None
+        force = False
+        for month_start in pd.date_range(
+                first_minute.strftime('%Y-%m'), last_minute, freq='MS'):
+            month = month_start.strftime('%Y-%m')
+            path = self._partition_path('1min', currencyPair, month)
+            start = max(month_start, first_minute)
+            end = min(
+                month_start + pd.offsets.MonthBegin() - pd.Timedelta('1T'),
+                last_minute,
+            )
+
+            previous_close = None
+            if os.path.isdir(path):
+                z = bcolz.open(path, mode='r')
+                stored_range = (z.cols['date'][0], z.cols['date'][-1])
+                previous_close = z.cols['close'][-1]
+                if not (force or month in dirty) and \
+                        stored_range == (start.value, end.value):
+                    last_close = previous_close
+                    continue
+
+            trades_path = self._partition_path('trades', currencyPair, month)
+            if os.path.isdir(trades_path):
+                trades = _read_table(trades_path)
+            else:
+                trades = _trades_frame([])
+
+            ohlcv = self.generate_ohlcv(
+                trades[['date', 'rate', 'total']],
+                index=pd.date_range(start, end, freq='T'),
+                last_close=last_close,
+            )
+            _write_table(
+                path, ohlcv.rename_axis('date').reset_index(), OHLCV_COLUMNS,
+            )
+            log.debug('{}: Generated 1min OHLCV data for {}.'.format(
+                currencyPair, month))
+
+            last_close = ohlcv['close'].iloc[-1]
+            force = previous_close is None or previous_close != last_close
+
+        state['dirty_months'] = []
+        self._save_state(currencyPair, state)
 
     def onemin_to_dataframe(self, currencyPair, start, end):
         '''
         Returns a data frame for a given currencyPair from data on disk
         '''
-        csv_fn = CSV_OUT_FOLDER + 'crypto_1min-' + currencyPair + '.csv'
-        df = pd.read_csv(csv_fn, names=['date',
-                                        'open',
-                                        'high',
-                                        'low',
-                                        'close',
-                                        'volume'])
-        df['date'] = pd.to_datetime(df['date'], unit='s')
+        start = _naive_utc(start)
+        end = _naive_utc(end)
+
+        folder = self._pair_folder('1min', currencyPair)
+        months = sorted(
+            name[:-len('.bcolz')] for name in os.listdir(folder)
+            if name.endswith('.bcolz')
+        ) if os.path.isdir(folder) else []
+
+        frames = [
+            _read_table(self._partition_path('1min', currencyPair, month))
+            for month in months
+            if month >= start.strftime('%Y-%m') and
+            month <= end.strftime('%Y-%m')
+        ]
+        if not frames:
+            return pd.DataFrame(
+                columns=OHLCV_COLUMNS[1:],
+                index=pd.DatetimeIndex([], name='date'),
+            )
+
+        df = pd.concat(frames, ignore_index=True)
         df.set_index('date', inplace=True)
         return df[start:end]
 
@@ -343,21 +454,12 @@ class PoloniexCurator(object):
 
         with open(filename, 'w') as symbols:
             for currencyPair in self.currency_pairs:
-                start = None
-                csv_fn = '{}crypto_trades-{}.csv'.format(CSV_OUT_FOLDER,
-                                                         currencyPair)
-                with open(csv_fn, 'r') as f:
-                    f.seek(0, os.SEEK_END)
-                    if(f.tell() > 2):               # Check file size is not 0
-                        f.seek(-2, os.SEEK_END)     # Jump to 2nd last byte
-                        while f.read(1) != b"\n":   # Until EOL is found...
-                            # ...jump back the read byte plus one more.
-                            f.seek(-2, os.SEEK_CUR)
-                        start = pd.to_datetime(f.readline().split(',')[1],
-                                               infer_datetime_format=True)
-
-                if(start is None):
-                    start = time.gmtime()
+                oldest_date = self.get_state(currencyPair)['oldest_date']
+                if oldest_date is None:
+                    start = pd.Timestamp.utcnow()
+                else:
+                    start = pd.Timestamp(oldest_date, unit='s')
+
                 quote, base = currencyPair.lower().split('_')
                 symbol = '{base}_{quote}'.format(base=base, quote=quote)
                 symbol_map[currencyPair] = dict(
@@ -367,13 +469,101 @@ class PoloniexCurator(object):
             json.dump(symbol_map, symbols, sort_keys=True, indent=2,
                       separators=(',', ':'))
 
+    def curate(self, currency_pairs=None):
+        '''
+        Brings the trades and the 1minute bars of the currency pairs up to
+        date, several pairs at a time. Returns the pairs which failed.
+        '''
+        if currency_pairs is None:
+            if not self.currency_pairs:
+                self.get_currency_pairs()
+            currency_pairs = self.currency_pairs
+
+        def update(currencyPair):
+            try:
+                self.retrieve_trade_history(currencyPair)
+                self.write_ohlcv_file(currencyPair)
+            except Exception as e:
+                log.error('Failed to curate {}'.format(currencyPair))
+                log.exception(e)
+                return currencyPair, False
+
+            log.debug('{} up to date.'.format(currencyPair))
+            return currencyPair, True
+
+        pool = ThreadPool(max(self.threads, 1))
+        try:
+            results = pool.map(update, currency_pairs)
+        finally:
+            pool.close()
+            pool.join()
+
+        return [currencyPair for currencyPair, ok in results if not ok]
+
+
+def _trades_frame(items):
+    '''
+    The trades returned by returnTradeHistory as typed columns.
+    '''
+    df = pd.DataFrame(list(items), columns=TRADE_COLUMNS)
+    df['date'] = pd.to_datetime(df['date'], format='%Y-%m-%d %H:%M:%S')
+    df['type'] = np.where(df['type'] == 'buy', 1, -1).astype('int8')
+    for column in ('rate', 'amount', 'total'):
+        df[column] = df[column].astype('float64')
+    for column in ('tradeID', 'globalTradeID'):
+        df[column] = df[column].astype('int64')
+
+    return df.sort_values('tradeID')
+
+
+def _column_values(df, column):
+    values = df[column].values
+    if values.dtype.kind == 'M':
+        return values.astype('datetime64[ns]').astype('int64')
+
+    return values
+
+
+def _read_table(path):
+    z = bcolz.open(path, mode='r')
+    df = pd.DataFrame({name: z.cols[name][:] for name in z.names},
+                      columns=z.names)
+    df['date'] = pd.to_datetime(df['date'])
+    return df
+
+
+def _write_table(path, df, columns):
+    # Written next to the partition and swapped, an interrupted write does
+    # not corrupt it.
+    tmp_path = path + '.tmp'
+    ensure_directory(os.path.dirname(path))
+    shutil.rmtree(tmp_path, ignore_errors=True)
+
+    z = bcolz.ctable(
+        columns=[_column_values(df, column) for column in columns],
+        names=columns,
+        rootdir=tmp_path,
+        mode='w',
+    )
+    z.flush()
+
+    shutil.rmtree(path, ignore_errors=True)
+    os.rename(tmp_path, path)
+
+
+def _naive_utc(dt):
+    dt = pd.Timestamp(dt)
+    if dt.tzinfo is not None:
+        dt = dt.tz_convert('UTC').tz_localize(None)
+
+    return dt
+
 
 if __name__ == '__main__':
     pc = PoloniexCurator()
     pc.get_currency_pairs()
     # pc.generate_symbols_json()
 
-    for currencyPair in pc.currency_pairs:
-        pc.retrieve_trade_history(currencyPair)
-        log.debug('{} up to date.'.format(currencyPair))
-        pc.write_ohlcv_file(currencyPair)
+    failed = pc.curate()
+    if failed:
+        log.error('Failed to curate {}'.format(', '.join(failed)))
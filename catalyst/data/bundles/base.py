@@ -14,20 +14,22 @@
 # limitations under the License.
 
 from itertools import count
+from multiprocessing.pool import ThreadPool
 import tarfile
-from time import sleep
 
 from abc import abstractmethod, abstractproperty
 import logbook
 import pandas as pd
 
 from . import core as bundles
+from .symbol_store import SymbolFrameStore
 
 from catalyst.utils.cli import (
     item_show_count,
     maybe_show_progress
 )
 from catalyst.utils.memoize import lazyval
+from catalyst.utils.rate_limit import RateLimiter
 
 from catalyst.constants import LOG_LEVEL
 
@@ -35,6 +37,10 @@ logbook.StderrHandler().push_application()
 log = logbook.Logger(__name__, level=LOG_LEVEL)
 
 DEFAULT_RETRIES = 5
+DEFAULT_DOWNLOAD_THREADS = 4
+
+# The age of the last cached bar after which a symbol is updated.
+CACHE_EXPIRATION = pd.Timedelta(days=2)
 
 
 class BaseBundle(object):
@@ -126,8 +132,17 @@ class BaseBundle(object):
         try:
             api_key = environ.get('CATALYST_API_KEY')
             retries = environ.get('CATALYST_DOWNLOAD_ATTEMPTS', 5)
+            threads = int(environ.get(
+                'CATALYST_DOWNLOAD_THREADS', DEFAULT_DOWNLOAD_THREADS,
+            ))
 
             if is_compile:
+                # The symbol frames outlive the ingestions, only the bars
+                # after the last stored ones are downloaded.
+                store = SymbolFrameStore(
+                    bundles.symbol_store_path(self.name, environ=environ)
+                )
+
                 # User has instructed local compilation & ingestion of bundle.
                 # Fetch raw metadata for all symbols.
                 raw_metadata = self._fetch_metadata_frame(
@@ -145,13 +160,14 @@ class BaseBundle(object):
                     daily_bar_writer.write(
                         self._fetch_symbol_iter(
                             api_key,
-                            cache,
+                            store,
                             symbol_map,
                             calendar,
                             start_session,
                             end_session,
                             'daily',
                             retries,
+                            threads,
                         ),
                         assets=raw_metadata.index,
                         show_progress=show_progress,
@@ -162,7 +178,7 @@ class BaseBundle(object):
                 # to write minute data.
                 metadata = self._post_process_metadata(
                     raw_metadata,
-                    cache,
+                    store,
                     show_progress=show_progress,
                 )
                 asset_db_writer.write(metadata)
@@ -173,13 +189,14 @@ class BaseBundle(object):
                     minute_bar_writer.write(
                         self._fetch_symbol_iter(
                             api_key,
-                            cache,
+                            store,
                             symbol_map,
                             calendar,
                             start_session,
                             end_session,
                             'minute',
                             retries,
+                            threads,
                         ),
                         show_progress=show_progress,
                     )
@@ -299,7 +316,7 @@ class BaseBundle(object):
             # Return metadata frame to application.
             yield raw
 
-    def _post_process_metadata(self, metadata, cache, show_progress=False):
+    def _post_process_metadata(self, metadata, store, show_progress=False):
         # Create empty data frame using target metadata column names and dtypes
         final_metadata = pd.DataFrame(
             columns=self.md_column_names,
@@ -318,13 +335,11 @@ class BaseBundle(object):
             show_percent=False,
         ) as symbols_map:
             for asset_id, symbol in symbols_map:
-                # Attempt to load data from disk, the cache should have an
+                # Attempt to load data from disk, the store should have an
                 # entry for each symbol at this point of the execution. If one
                 # does not exist, we should fail.
-                key = '{sym}.daily.frame'.format(sym=symbol)
-                try:
-                    raw_data = cache[key]
-                except KeyError:
+                raw_data = store.read(symbol, 'daily')
+                if raw_data is None:
                     raise ValueError(
                       'Unable to find cached data for symbol:'
                       ' {0}'.format(symbol))
@@ -346,104 +361,89 @@ class BaseBundle(object):
 
     def _fetch_symbol_iter(self,
                            api_key,
-                           cache,
+                           store,
                            symbol_map,
                            calendar,
                            start_session,
                            end_session,
                            data_frequency,
-                           retries):
-
-        for asset_id, symbol in symbol_map.iteritems():
-            # Record start time of iteration, compare at end of iteration to
-            # adhere to the datas source's rate limit policy.
-            start_time = pd.Timestamp.utcnow()
-
-            # Fetch new data if cached data is absent or stale, otherwise
-            # returns the cached data unaltered.  The `should_sleep` flag
-            # indicates that an API call was attempted, and that we should be
-            # ensure aren't exceeding our rate limit before proceeding to the
-            # next symbol. If the raw_data is updated, it is cached before
-            # being returned.
-            raw_data, should_sleep = self._maybe_update_symbol_frame(
+                           retries,
+                           threads=DEFAULT_DOWNLOAD_THREADS):
+
+        # All the symbols share the rate limit of the data source, the
+        # requests are spaced by `wait_time` whatever the number of threads
+        # sending them.
+        rate_limiter = RateLimiter(self.wait_time)
+        start_time = pd.Timestamp.utcnow()
+
+        def update(item):
+            asset_id, symbol = item
+
+            # Fetch the bars missing from the store if the stored data is
+            # absent or stale, otherwise returns the stored data unaltered.
+            raw_data = self._maybe_update_symbol_frame(
                 start_time,
                 api_key,
-                cache,
+                store,
                 symbol,
                 calendar,
                 start_session,
                 end_session,
                 data_frequency,
                 retries,
+                rate_limiter,
             )
 
             # TODO(cfromknecht) further data validation?
 
-            # Pass asset_id and symbol data to writer.
-            yield asset_id, raw_data
+            return asset_id, raw_data
+
+        pool = ThreadPool(max(threads, 1))
+        try:
+            # Pass asset_id and symbol data to writer, in the order of the
+            # symbol map.
+            for item in pool.imap(update, symbol_map.iteritems()):
+                yield item
 
-            # If an API call was made during this iteration and the time to
-            # reach this point was less than the inter-request `wait_time`,
-            # sleep until after enough time has elapsed to prevent getting rate
-            # limited.
-            if should_sleep:
-                remaining = pd.Timestamp.utcnow() - start_time + self.wait_time
-                if remaining.value > 0:
-                    sleep(remaining.value / 10**9)
+        finally:
+            pool.terminate()
 
     def _maybe_update_symbol_frame(self,
                                    start_time,
                                    api_key,
-                                   cache,
+                                   store,
                                    symbol,
                                    calendar,
                                    start_session,
                                    end_session,
                                    data_frequency,
-                                   retries):
+                                   retries,
+                                   rate_limiter=None):
 
-        # Attempt to load pre-existing symbol data from cache.
-        key = '{sym}.{freq}.frame'.format(sym=symbol, freq=data_frequency)
-        try:
-            raw_data = cache[key]
-        except KeyError:
-            raw_data = None
-
-        # Select the most recent date in cached dataset if it exists,
+        # Select the most recent date in the stored dataset if it exists,
         # otherwise use the provided `start_session`.
-        last = start_session
-        if raw_data is not None and len(raw_data) > 0:
-            last = raw_data.index[-1].tz_localize('UTC')
-
-        should_sleep = False
-
-        # Determine time at which cached data will be considered stale.
-        cache_expiration = last + pd.Timedelta(days=2)
-        if start_time <= cache_expiration and raw_data is not None:
-            # Data is fresh enough to reuse, no need to update. Iterator can
-            # proceed to next symbol directly since no API call was required.
-            return raw_data, should_sleep
-
-        # If we arrive here, we must have attempted an API call.
-        # Setting this flag tells the iterator to pause before starting
-        # the next asset, that we don't exceed the data source's rate
-        # limit.
-        should_sleep = True
-
+        last = store.last_dt(symbol, data_frequency)
+        if last is not None and start_time <= last + CACHE_EXPIRATION:
+            # Data is fresh enough to reuse, no need to update. No API call
+            # is required.
+            return store.read(symbol, data_frequency)
+
+        # Only the bars from the last stored one, which may have been
+        # incomplete, are downloaded and appended.
         raw_data = self._fetch_symbol_frame(
             api_key,
             symbol,
             calendar,
-            start_session,
+            last if last is not None and last > start_session
+            else start_session,
             end_session,
             data_frequency,
             retries=retries,
+            rate_limiter=rate_limiter,
         )
+        store.append(symbol, data_frequency, raw_data)
 
-        # Cache latest symbol data.
-        cache[key] = raw_data
-
-        return raw_data, should_sleep
+        return store.read(symbol, data_frequency)
 
     def _fetch_symbol_frame(self,
                             api_key,
@@ -452,12 +452,16 @@ class BaseBundle(object):
                             start_session,
                             end_session,
                             data_frequency,
-                            retries=DEFAULT_RETRIES):
+                            retries=DEFAULT_RETRIES,
+                            rate_limiter=None):
 
         # Data for symbol is old enough to attempt an update or is not
-        # present in the cache.  Fetch raw data for a single symbol
+        # present in the store.  Fetch raw data for a single symbol
         # with requested intervals and frequency. Retry as necessary.
         for _ in range(retries):
+            if rate_limiter is not None:
+                rate_limiter.wait()
+
             try:
                 raw_data = self.fetch_raw_symbol_frame(
                     api_key,
@@ -73,6 +73,13 @@ def cache_path(bundle_name, environ=None):
     )
 
 
+def symbol_store_path(bundle_name, environ=None):
+    return pth.data_path(
+        symbol_store_relative(bundle_name),
+        environ=environ,
+    )
+
+
 def adjustment_db_relative(bundle_name, timestr, environ=None):
     return bundle_name, timestr, 'adjustments.sqlite'
 
@@ -81,6 +88,10 @@ def cache_relative(bundle_name, timestr, environ=None):
     return bundle_name, '.cache'
 
 
+def symbol_store_relative(bundle_name):
+    return bundle_name, '.symbols'
+
+
 def daily_relative(bundle_name, timestr, environ=None):
     return bundle_name, timestr, 'daily_equities.bcolz'
 
@@ -0,0 +1,157 @@
+#
+# Copyright 2017 Enigma MPC, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import os
+import shutil
+
+import bcolz
+import numpy as np
+import pandas as pd
+
+from catalyst.utils.paths import ensure_directory
+
+DATE_COLUMN = 'date'
+
+
+class SymbolFrameStore(object):
+    """An appendable, columnar store of the raw frames of a bundle.
+
+    Each (symbol, data frequency) pair is a bcolz ctable with an int64
+    ``date`` column and one float64 column per column of the first frame
+    written. Updates only write the new rows, and reading the last date of
+    a symbol does not load its history.
+
+    Parameters
+    ----------
+    path : str
+        The directory of the ctables, it is created if needed.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        ensure_directory(path)
+
+    def _rootdir(self, symbol, data_frequency):
+        return os.path.join(
+            self.path, '{sym}.{freq}.bcolz'.format(
+                sym=symbol, freq=data_frequency,
+            )
+        )
+
+    def _open(self, symbol, data_frequency, mode='r'):
+        rootdir = self._rootdir(symbol, data_frequency)
+        if not os.path.isdir(rootdir):
+            return None
+
+        return bcolz.open(rootdir, mode=mode)
+
+    def __contains__(self, key):
+        symbol, data_frequency = key
+        return os.path.isdir(self._rootdir(symbol, data_frequency))
+
+    def last_dt(self, symbol, data_frequency):
+        """The date of the last row of a symbol.
+
+        Returns
+        -------
+        dt : pd.Timestamp or None
+            None if the symbol was never written or has no rows.
+        """
+        table = self._open(symbol, data_frequency)
+        if table is None or len(table) == 0:
+            return None
+
+        return pd.Timestamp(table.cols[DATE_COLUMN][-1], tz='UTC')
+
+    def read(self, symbol, data_frequency):
+        """Load the frame of a symbol.
+
+        Returns
+        -------
+        frame : pd.DataFrame or None
+            The rows indexed by their UTC date, None if the symbol was never
+            written.
+        """
+        table = self._open(symbol, data_frequency)
+        if table is None:
+            return None
+
+        columns = [name for name in table.names if name != DATE_COLUMN]
+        return pd.DataFrame(
+            {name: table.cols[name][:] for name in columns},
+            index=pd.DatetimeIndex(
+                table.cols[DATE_COLUMN][:], tz='UTC', name=DATE_COLUMN,
+            ),
+            columns=columns,
+        )
+
+    def write(self, symbol, data_frequency, frame):
+        """Replace the frame of a symbol.
+        """
+        rootdir = self._rootdir(symbol, data_frequency)
+        if os.path.isdir(rootdir):
+            shutil.rmtree(rootdir)
+
+        # Non numeric columns are dropped, unless the frame is empty and
+        # its columns have no meaningful dtype yet.
+        columns = [
+            name for name in frame.columns
+            if name != DATE_COLUMN and (
+                len(frame) == 0 or frame[name].dtype.kind in 'biuf'
+            )
+        ]
+        table = bcolz.ctable(
+            columns=[_date_values(frame)] + [
+                frame[name].values.astype('float64') for name in columns
+            ],
+            names=[DATE_COLUMN] + columns,
+            rootdir=rootdir,
+            mode='w',
+        )
+        table.flush()
+
+    def append(self, symbol, data_frequency, frame):
+        """Add the rows of a frame sorted by date to a symbol.
+
+        The stored rows at or after the first date of the frame are
+        replaced, the last stored bar may have been incomplete when it was
+        fetched.
+        """
+        table = self._open(symbol, data_frequency, mode='a')
+        if table is None:
+            return self.write(symbol, data_frequency, frame)
+
+        if len(frame) == 0:
+            return
+
+        dates = _date_values(frame)
+        position = np.searchsorted(table.cols[DATE_COLUMN][:], dates[0])
+        if position < len(table):
+            table.resize(position)
+
+        table.append([dates] + [
+            frame[name].values.astype('float64')
+            if name in frame.columns else
+            np.full(len(frame), np.nan)
+            for name in table.names if name != DATE_COLUMN
+        ])
+        table.flush()
+
+
+def _date_values(frame):
+    index = pd.DatetimeIndex(frame.index)
+    if index.tz is not None:
+        index = index.tz_convert('UTC').tz_localize(None)
+
+    return index.values.astype('int64')
@@ -159,6 +159,11 @@ class DataPortal(object):
         self.trading_calendar = trading_calendar
         self.asset_finder = asset_finder
 
+        # The minute of the simulation clock and the label of its session,
+        # set for each bar so that its lookups skip the calendar.
+        self._current_minute_nanos = None
+        self._current_session_label = None
+
         self._adjustment_reader = adjustment_reader
 
         # caches of sid -> adjustment list
@@ -447,6 +452,26 @@ class DataPortal(object):
         except KeyError:
             return np.NaN
 
+    def set_current_minute(self, minute_nanos, session_label):
+        """
+        Set the position of the simulation clock.
+
+        Parameters
+        ----------
+        minute_nanos : int
+            The int64 nanoseconds of the current minute.
+        session_label : pd.Timestamp
+            The label of the session of the minute.
+        """
+        self._current_minute_nanos = minute_nanos
+        self._current_session_label = session_label
+
+    def _minute_to_session_label(self, dt):
+        if dt.value == self._current_minute_nanos:
+            return self._current_session_label
+
+        return self.trading_calendar.minute_to_session_label(dt)
+
     def get_spot_value(self, assets, field, dt, data_frequency):
         """
         Public API method that returns a scalar value representing the value
@@ -488,7 +513,7 @@ class DataPortal(object):
                     .format(type(assets))
                 )
 
-        session_label = self.trading_calendar.minute_to_session_label(dt)
+        session_label = self._minute_to_session_label(dt)
 
         def get_single_asset_value(asset):
             if self._is_extra_source(
@@ -771,7 +796,7 @@ class DataPortal(object):
         Internal method that returns a dataframe containing history bars
         of daily frequency for the given sids.
         """
-        session = self.trading_calendar.minute_to_session_label(end_dt)
+        session = self._minute_to_session_label(end_dt)
         days_for_window = self._get_days_for_window(session, bar_count)
 
         if len(assets) == 0:
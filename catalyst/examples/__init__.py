@@ -1,3 +1,4 @@
+from collections import Mapping
 from importlib import import_module
 import os
 
@@ -9,17 +10,40 @@ from catalyst import run_algorithm
 # These are used by test_examples.py to discover the examples to run.
 from catalyst.utils.calendars import register_calendar, get_calendar
 
-EXAMPLE_MODULES = {}
-for f in os.listdir(os.path.dirname(__file__)):
-    if not f.endswith('.py') or f == '__init__.py':
-        continue
-    modname = f[:-len('.py')]
-    mod = import_module('.' + modname, package=__name__)
-    EXAMPLE_MODULES[modname] = mod
-    globals()[modname] = mod
-
-    # Remove noise from loop variables.
-    del f, modname, mod
+
+class _ExampleModules(Mapping):
+    """The example modules by name.
+
+    The modules are imported on access, some examples depend on optional
+    packages like talib.
+    """
+
+    def __init__(self, names):
+        self._names = sorted(names)
+        self._modules = {}
+
+    def __getitem__(self, name):
+        if name not in self._names:
+            raise KeyError(name)
+
+        if name not in self._modules:
+            self._modules[name] = import_module(
+                '.' + name, package=__name__,
+            )
+
+        return self._modules[name]
+
+    def __iter__(self):
+        return iter(self._names)
+
+    def __len__(self):
+        return len(self._names)
+
+
+EXAMPLE_MODULES = _ExampleModules(
+    f[:-len('.py')] for f in os.listdir(os.path.dirname(__file__))
+    if f.endswith('.py') and f != '__init__.py'
+)
 
 
 # Columns that we expect to be able to reliably deterministic
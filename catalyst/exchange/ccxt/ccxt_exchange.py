@@ -1,5 +1,4 @@
 import copy
-import json
 import os
 import re
 from collections import defaultdict
@@ -8,14 +7,16 @@ import ccxt
 import pandas as pd
 import six
 from ccxt import InvalidOrder, NetworkError, \
-    ExchangeError, RequestTimeout
+    ExchangeError, RequestTimeout, DDoSProtection
 from logbook import Logger
 from six import string_types
 
 from catalyst.algorithm import MarketOrder
 from catalyst.assets._assets import TradingPair
-from catalyst.constants import LOG_LEVEL
+from catalyst.constants import LOG_LEVEL, SHARED_RATE_LIMIT
 from catalyst.exchange.exchange import Exchange
+from catalyst.exchange.exchange_asset_cache import ExchangeAssetCache, \
+    get_etag, get_files_etag
 from catalyst.exchange.exchange_bundle import ExchangeBundle
 from catalyst.exchange.exchange_errors import InvalidHistoryFrequencyError, \
     ExchangeSymbolsNotFound, ExchangeRequestError, InvalidOrderStyle, \
@@ -23,13 +24,15 @@ from catalyst.exchange.exchange_errors import InvalidHistoryFrequencyError, \
     UnsupportedHistoryFrequencyError
 from catalyst.exchange.exchange_execution import ExchangeLimitOrder
 from catalyst.exchange.utils.exchange_utils import mixin_market_params, \
-    get_exchange_folder, get_catalyst_symbol, \
-    get_exchange_auth
+    get_catalyst_symbol, get_exchange_auth, get_exchange_symbols_filename
 from catalyst.exchange.utils.datetime_utils import from_ms_timestamp, \
     get_epoch, \
     get_periods_range
+from catalyst.exchange.utils.request_scheduler import ScheduledExchangeAPI, \
+    get_scheduler
 from catalyst.finance.order import Order, ORDER_STATUS
 from catalyst.finance.transaction import Transaction
+from catalyst.utils.paths import data_root, ensure_directory
 import crix_to_ccxt
 from redo import retry
 
@@ -68,16 +71,33 @@ class CCXT(Exchange):
             else:
                 exchange_attr = getattr(ccxt, exchange_name)
 
-            self.api = exchange_attr({
+            api = exchange_attr({
                 'apiKey': key,
                 'secret': secret,
                 'password': password,
             })
-            self.api.enableRateLimit = True
 
         except Exception:
             raise ExchangeNotFoundError(exchange_name=exchange_name)
 
+        # The requests of all the instances of the exchange are paced by
+        # its scheduler instead of the throttling of each ccxt instance.
+        api.enableRateLimit = False
+        shared_folder = None
+        if SHARED_RATE_LIMIT:
+            shared_folder = os.path.join(data_root(), 'rate_limits')
+            ensure_directory(shared_folder)
+
+        self.api = ScheduledExchangeAPI(
+            api,
+            get_scheduler(
+                exchange_name,
+                getattr(api, 'rateLimit', 2000) / 1000.0,
+                shared_folder,
+            ),
+            backoff_exceptions=(DDoSProtection,),
+        )
+
         self._symbol_maps = [None, None]
 
         self.name = exchange_name
@@ -99,47 +119,117 @@ class CCXT(Exchange):
 
         self.bundle = ExchangeBundle(self.name)
         self.markets = None
+        self._assets = []
         self._is_init = False
 
+    @property
+    def assets(self):
+        # Markets are loaded on first use rather than when the exchange
+        # is created, algorithms often use a fraction of their exchanges.
+        if not self._is_init:
+            self.init()
+
+        return self._assets
+
+    @assets.setter
+    def assets(self, assets):
+        self._assets = assets
+
+    @property
+    def is_init(self):
+        return self._is_init
+
+    def _get_symbols_etag(self):
+        filenames = [
+            get_exchange_symbols_filename(self.name, is_local)
+            for is_local in (False, True)
+        ]
+        return get_files_etag(filenames)
+
+    def _fetch_markets(self):
+        try:
+            markets_symbols = self.api.load_markets()
+            log.debug(
+                'fetching {} markets:\n{}'.format(
+                    self.name, markets_symbols
+                )
+            )
+            # load_markets() already contains the markets returned by
+            # fetch_markets(), saving a request.
+            return list(self.api.markets.values())
+
+        except (ExchangeError, NetworkError) as e:
+            log.warn(
+                'unable to fetch markets {}: {}'.format(
+                    self.name, e
+                )
+            )
+            raise ExchangeRequestError(error=e)
+
+    def _init_from_cache(self, cached):
+        self.markets = cached.markets
+        if hasattr(self.api, 'set_markets'):
+            # Required by the precision helpers of ccxt
+            self.api.set_markets(cached.markets)
+
+        self._assets = [
+            TradingPair(**params) for params in cached.assets_params
+        ]
+        log.debug('loaded {} cached assets for {}'.format(
+            len(self._assets), self.name
+        ))
+
     def init(self):
         if self._is_init:
             return
 
-        exchange_folder = get_exchange_folder(self.name)
-        filename = os.path.join(exchange_folder, 'cctx_markets.json')
+        cache = ExchangeAssetCache(self.name)
+        cached = cache.load()
 
-        if os.path.exists(filename):
-            timestamp = os.path.getmtime(filename)
-            dt = pd.to_datetime(timestamp, unit='s', utc=True)
+        if cached is not None and not cache.is_expired(cached) \
+                and cached.symbols_etag == self._get_symbols_etag():
+            self._init_from_cache(cached)
+            self._is_init = True
+            return
 
-            if dt >= pd.Timestamp.utcnow().floor('1D'):
-                with open(filename) as f:
-                    self.markets = json.load(f)
+        try:
+            markets = self._fetch_markets()
 
-                log.debug('loaded markets for {}'.format(self.name))
+        except ExchangeRequestError:
+            if cached is None:
+                raise
 
-        if self.markets is None:
-            try:
-                markets_symbols = self.api.load_markets()
-                log.debug(
-                    'fetching {} markets:\n{}'.format(
-                        self.name, markets_symbols
-                    )
-                )
+            log.warn(
+                'unable to validate the cached markets of {}, using the '
+                'cache from {}'.format(self.name, cached.validated)
+            )
+            self._init_from_cache(cached)
+            self._is_init = True
+            return
 
-                self.markets = self.api.fetch_markets()
-                with open(filename, 'w+') as f:
-                    json.dump(self.markets, f, indent=4)
+        # Refreshing the symbols files before fingerprinting them
+        for is_local in (False, True):
+            self._fetch_symbol_map(is_local)
 
-            except (ExchangeError, NetworkError) as e:
-                log.warn(
-                    'unable to fetch markets {}: {}'.format(
-                        self.name, e
-                    )
-                )
-                raise ExchangeRequestError(error=e)
+        markets_etag = get_etag(markets)
+        symbols_etag = self._get_symbols_etag()
+
+        if cached is not None and cached.markets_etag == markets_etag \
+                and cached.symbols_etag == symbols_etag:
+            cache.touch()
+            self._init_from_cache(cached)
+
+        else:
+            self.markets = markets
+            assets_params = self.load_assets()
+            try:
+                cache.save(markets, assets_params, markets_etag, symbols_etag)
+
+            except Exception as e:
+                log.warn('unable to save the {} asset cache: {}'.format(
+                    self.name, e
+                ))
 
-        self.load_assets()
         self._is_init = True
 
     @staticmethod
@@ -565,9 +655,10 @@ class CCXT(Exchange):
         else:
             return None
 
-    def create_trading_pair(self, market, asset_def=None, is_local=False):
+    def get_trading_pair_params(self, market, asset_def=None,
+                                is_local=False):
         """
-        Creating a TradingPair from market and asset data.
+        The TradingPair parameters from market and asset data.
 
         Parameters
         ----------
@@ -577,6 +668,7 @@ class CCXT(Exchange):
 
         Returns
         -------
+        dict[str, Object]
 
         """
         data_source = 'local' if is_local else 'catalyst'
@@ -615,11 +707,45 @@ class CCXT(Exchange):
             # TODO: add as an optional column
             params['leverage'] = 1.0
 
-        return TradingPair(**params)
+        return params
+
+    def create_trading_pair(self, market, asset_def=None, is_local=False):
+        """
+        Creating a TradingPair from market and asset data.
+
+        Parameters
+        ----------
+        market: dict[str, Object]
+        asset_def: dict[str, Object]
+        is_local: bool
+
+        Returns
+        -------
+
+        """
+        return TradingPair(
+            **self.get_trading_pair_params(market, asset_def, is_local)
+        )
 
     def load_assets(self):
+        """
+        Create the assets of the loaded markets.
+
+        Returns
+        -------
+        list[dict[str, Object]]
+            The parameters of each asset, for caching.
+
+        """
         log.debug('loading assets for {}'.format(self.name))
-        self.assets = []
+        assets = []
+        assets_params = []
+
+        def add_asset(params):
+            asset = TradingPair(**params)
+            assets.append(asset)
+            assets_params.append(params)
+            return asset
 
         for market in self.markets:
             if 'id' not in market:
@@ -632,19 +758,20 @@ class CCXT(Exchange):
             for asset_def in asset_defs:
                 if asset_def[0] is not None or not asset_defs[1]:
                     try:
-                        asset = self.create_trading_pair(
+                        asset = add_asset(self.get_trading_pair_params(
                             market=market,
                             asset_def=asset_def[0],
                             is_local=asset_def[1]
-                        )
-                        self.assets.append(asset)
+                        ))
 
                     except TypeError as e:
                         log.warn('unable to add asset: {}'.format(e))
 
             if asset is None:
-                asset = self.create_trading_pair(market=market)
-                self.assets.append(asset)
+                add_asset(self.get_trading_pair_params(market=market))
+
+        self._assets = assets
+        return assets_params
 
     def get_balances(self):
         try:
@@ -768,17 +895,27 @@ class CCXT(Exchange):
 
         return order, executed_price
 
-    def _check_order_found(self, previous_orders):
+    def _check_order_found(self, previous_orders, symbol=None):
         """
         check if .orders was updated after the fetch api method was called
         and if so extract the new order which should be returned to the user
 
         :param previous_orders: dict(dict())
+        :param symbol: str, the orders of other markets are ignored, e.g.
+            those of a batch sent concurrently
         :return: order: Order if an order was found, otherwise, None
         """
         if len(previous_orders) != len(self.api.orders):
             new_orders = [self.api.orders[order_id] for order_id in
                           set(self.api.orders) - set(previous_orders)]
+            if symbol is not None:
+                new_orders = [
+                    order for order in new_orders
+                    if order.get('symbol') in (None, symbol)
+                ]
+                if not new_orders:
+                    return None
+
             if len(new_orders) != 1:
                 # todo handle this case (not sure we ever will get to this
                 # case, since we assume that in this period of
@@ -812,19 +949,25 @@ class CCXT(Exchange):
             # if method available for this exchange,
             # it's enough to check it.
             self.api.fetch_orders()
-            missing_order = self._check_order_found(previous_orders)
+            missing_order = self._check_order_found(
+                previous_orders, symbol
+            )
 
         else:
             if 'fetchOpenOrders' in self.api.has and \
                     self.api.has['fetchOpenOrders'] is True:
                 self.api.fetch_open_orders()
-                missing_order = self._check_order_found(previous_orders)
+                missing_order = self._check_order_found(
+                    previous_orders, symbol
+                )
 
             if missing_order is None and \
                     'fetchClosedOrders' in self.api.has and \
                     self.api.has['fetchClosedOrders'] is True:
                 self.api.fetch_closed_orders()
-                missing_order = self._check_order_found(previous_orders)
+                missing_order = self._check_order_found(
+                    previous_orders, symbol
+                )
 
         if missing_order is None and self.api.has['fetchMyTrades']:
             recent_trades = [x for x in self.api.fetch_my_trades(symbol=symbol)
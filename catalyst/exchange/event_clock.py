@@ -0,0 +1,125 @@
+import threading
+from time import sleep
+
+import pandas as pd
+from catalyst.constants import LOG_LEVEL
+from catalyst.gens.sim_engine import (
+    BAR,
+    SESSION_START,
+    SESSION_END,
+)
+from logbook import Logger
+
+log = Logger('EventClock', level=LOG_LEVEL)
+
+
+class EventClock(object):
+    """Realtime clock emitting bars on sub-minute intervals or on data events.
+
+    This class is a drop-in replacement for
+    :class:`catalyst.exchange.simple_clock.SimpleClock`.
+
+    A bar is emitted at each boundary of the ``interval``. When
+    ``on_data`` is set, the clock also listens to the given market data
+    feeds and emits a bar as soon as an event is received, at most once
+    per ``min_interval``. Bars triggered by data events carry the exact
+    time of the event instead of an interval boundary.
+
+    Parameters
+    ----------
+    sessions: DatetimeIndex
+    interval: str or Timedelta
+        The bar interval, e.g. '1T' or '15s'.
+    feeds: list[MarketDataFeed], optional
+        The feeds triggering bars when ``on_data`` is set.
+    on_data: bool
+        Emit bars on data events in addition to the interval boundaries.
+    min_interval: str or Timedelta
+        The minimum time between two bars triggered by data events.
+    start: Timestamp, optional
+    end: Timestamp, optional
+
+    """
+
+    def __init__(self, sessions, interval='1T', feeds=None, on_data=False,
+                 min_interval='1s', time_skew=pd.Timedelta('0s'),
+                 start=None, end=None):
+        self.sessions = sessions
+        self.interval = pd.Timedelta(interval)
+        self.min_interval = pd.Timedelta(min_interval)
+        self.on_data = on_data
+        self.time_skew = time_skew
+        self.start = start
+        self.end = end
+
+        self._last_emit = None
+        self._last_boundary = None
+        self._before_trading_start_bar_yielded = True
+
+        self._data_event = threading.Event()
+        self.feeds = feeds if feeds is not None else []
+        if self.on_data:
+            for feed in self.feeds:
+                feed.add_listener(self._on_feed_event)
+
+    def _on_feed_event(self, event):
+        self._data_event.set()
+
+    def _wait(self, seconds):
+        if self.on_data:
+            self._data_event.wait(seconds)
+        else:
+            sleep(seconds)
+
+    def __iter__(self):
+        self.handle_late_start()
+        yield pd.Timestamp.utcnow(), SESSION_START
+
+        while True:
+            current_time = pd.Timestamp.utcnow()
+            if self.end is not None and current_time >= self.end:
+                break
+
+            boundary = current_time.floor(self.interval)
+            if self._last_boundary is None or boundary > self._last_boundary:
+                log.debug('emitting bar: {}'.format(boundary))
+
+                # The bar covers the events received until the boundary.
+                self._data_event.clear()
+                self._last_boundary = boundary
+                self._last_emit = boundary
+                yield boundary, BAR
+
+            elif self.on_data and self._data_event.is_set() and \
+                    current_time - self._last_emit >= self.min_interval:
+                log.debug('emitting data event bar: {}'.format(current_time))
+
+                self._data_event.clear()
+                self._last_emit = current_time
+                yield current_time, BAR
+
+            else:
+                next_boundary = boundary + self.interval
+                if self.on_data and self._data_event.is_set():
+                    # Throttled, waiting for the min interval to elapse.
+                    next_dt = min(
+                        next_boundary, self._last_emit + self.min_interval
+                    )
+                    sleep(max((next_dt - current_time).total_seconds(), 0))
+                else:
+                    self._wait(
+                        max((next_boundary - current_time).total_seconds(), 0)
+                    )
+
+        yield current_time.floor(self.interval), SESSION_END
+
+    def handle_late_start(self):
+        if self.start:
+            time_diff = (self.start - pd.Timestamp.utcnow())
+            log.info(
+                'The algorithm is waiting for the specified '
+                'start date: {}'.format(self.start))
+            sleep(max(time_diff.total_seconds(), 0))
+
+            while pd.Timestamp.utcnow() < self.start:
+                pass
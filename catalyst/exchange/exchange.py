@@ -30,6 +30,10 @@ class Exchange:
 
     MIN_MINUTES_REQUESTED = 150
 
+    # An optional source of candles shared with other algorithms, e.g. a
+    # DaemonMarketDataFeed, the exchange api is the fallback.
+    candle_source = None
+
     def __init__(self):
         self.name = None
         self.assets = []
@@ -517,12 +521,22 @@ class Exchange:
             requested_bar_count = min_candles_number
 
         # The get_history method supports multiple asset
-        candles = self.get_candles(
-            freq=freq,
-            assets=assets,
-            bar_count=requested_bar_count,
-            end_dt=end_dt if not is_current else None,
-        )
+        candles = None
+        if self.candle_source is not None:
+            candles = self.candle_source.get_candles(
+                freq=freq,
+                assets=assets,
+                bar_count=requested_bar_count,
+                end_dt=end_dt if not is_current else None,
+            )
+
+        if candles is None:
+            candles = self.get_candles(
+                freq=freq,
+                assets=assets,
+                bar_count=requested_bar_count,
+                end_dt=end_dt if not is_current else None,
+            )
 
         # candles sanity check - verify no empty candles were received:
         for asset in candles:
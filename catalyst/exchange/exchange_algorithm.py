@@ -12,6 +12,7 @@
 # limitations under the License.
 import copy
 import pickle
+import shutil
 import signal
 import sys
 from datetime import timedelta
@@ -21,6 +22,7 @@ from os.path import isfile, join, exists
 import catalyst.protocol as zp
 import logbook
 import pandas as pd
+from six import iteritems
 from catalyst.algorithm import TradingAlgorithm
 from catalyst.constants import LOG_LEVEL
 from catalyst.exchange.exchange_blotter import ExchangeBlotter
@@ -28,7 +30,7 @@ from catalyst.exchange.exchange_errors import (
     ExchangeRequestError,
     OrderTypeNotSupported)
 from catalyst.exchange.exchange_execution import ExchangeLimitOrder
-from catalyst.exchange.live_graph_clock import LiveGraphClock
+from catalyst.exchange.event_clock import EventClock
 from catalyst.exchange.simple_clock import SimpleClock
 from catalyst.exchange.utils.exchange_utils import (
     save_algo_object,
@@ -39,6 +41,8 @@ from catalyst.exchange.utils.exchange_utils import (
     clear_frame_stats_directory,
     remove_old_files,
     group_assets_by_exchange, )
+from catalyst.exchange.utils.persistence_worker import PersistenceWorker
+from catalyst.exchange.utils.state_journal import AlgoStateJournal
 from catalyst.exchange.utils.stats_utils import \
     get_pretty_stats, stats_to_s3, stats_to_algo_folder
 from catalyst.finance.execution import MarketOrder
@@ -46,7 +50,7 @@ from catalyst.finance.performance import PerformanceTracker
 from catalyst.finance.performance.period import calc_period_stats
 from catalyst.finance.order import Order
 from catalyst.gens.tradesimulation import AlgorithmSimulator
-from catalyst.marketplace.marketplace import Marketplace
+from catalyst.utils.bar_profiler import profile_span
 from catalyst.utils.api_support import api_method
 from catalyst.utils.input_validation import error_keywords, ensure_upper_case
 from catalyst.utils.math_utils import round_nearest
@@ -211,12 +215,16 @@ class ExchangeTradingAlgorithmBase(TradingAlgorithm):
         return round_nearest(amount, asset.min_trade_size)
 
     @api_method
-    def get_dataset(self, data_source_name, start=None, end=None):
+    def get_dataset(self, data_source_name, start=None, end=None,
+                    symbols=None):
         if self._marketplace is None:
+            # The marketplace depends on web3, it is only imported by the
+            # algorithms using it.
+            from catalyst.marketplace.marketplace import Marketplace
             self._marketplace = Marketplace()
 
         return self._marketplace.get_dataset(
-            data_source_name, start, end,
+            data_source_name, start, end, symbols,
         )
 
     @api_method
@@ -419,8 +427,11 @@ class ExchangeTradingAlgorithmLive(ExchangeTradingAlgorithmBase):
         self.is_start = kwargs.pop('is_start', True)
         self.end = kwargs.pop('end', None)
         self.is_end = kwargs.pop('is_end', True)
+        self.bar_interval = kwargs.pop('bar_interval', None)
+        self.trigger_on_data = kwargs.pop('trigger_on_data', False)
 
-        self._clock = None
+        # A clock provided by the caller, e.g. the ReplayClock of a replay.
+        self._clock = kwargs.pop('clock', None)
         self.frame_stats = list()
 
         # erase the frame_stats folder to avoid overloading the disk
@@ -428,23 +439,45 @@ class ExchangeTradingAlgorithmLive(ExchangeTradingAlgorithmBase):
         if error:
             log.warning(error)
 
-        # in order to save paper & live files separately
-        self.mode_name = 'paper' if kwargs['simulate_orders'] else 'live'
+        # in order to save paper, live & replay files separately
+        self.mode_name = kwargs.pop('mode_name', None)
+        if self.mode_name is None:
+            self.mode_name = 'paper' if kwargs['simulate_orders'] else 'live'
+
+        # A replay does not resume the previous one.
+        is_replay = (self.mode_name == 'replay')
 
         self.pnl_stats = get_algo_df(
             self.algo_namespace,
             'pnl_stats_{}'.format(self.mode_name),
-        )
+        ) if not is_replay else pd.DataFrame()
 
         self.custom_signals_stats = get_algo_df(
             self.algo_namespace,
             'custom_signals_stats_{}'.format(self.mode_name)
-        )
+        ) if not is_replay else pd.DataFrame()
 
         self.exposure_stats = get_algo_df(
             self.algo_namespace,
             'exposure_stats_{}'.format(self.mode_name)
-        )
+        ) if not is_replay else pd.DataFrame()
+
+        # Writes the stats and state off the trading thread.
+        self.persistence = PersistenceWorker()
+
+        # Replaces the pickles of the performance objects saved every bar.
+        self.state_journal = None
+        if self.algo_namespace is not None:
+            journal_folder = join(
+                get_algo_folder(self.algo_namespace),
+                'state_{}'.format(self.mode_name),
+            )
+            if is_replay:
+                shutil.rmtree(journal_folder, ignore_errors=True)
+
+            self.state_journal = AlgoStateJournal(
+                journal_folder, submit=self.persistence.submit,
+            )
 
         self.is_running = True
 
@@ -467,6 +500,9 @@ class ExchangeTradingAlgorithmLive(ExchangeTradingAlgorithmBase):
         preparing the stats before analyze
         :return: stats: pd.Dataframe
         """
+        # the previous days may still be written by the worker
+        self.persistence.flush()
+
         # add the last day stats which is not saved in the directory
         current_stats = pd.DataFrame(self.frame_stats)
         current_stats.set_index('period_close', drop=False, inplace=True)
@@ -509,6 +545,12 @@ class ExchangeTradingAlgorithmLive(ExchangeTradingAlgorithmBase):
         """
         self.is_running = False
 
+        if getattr(self.data_portal, 'feeds', None):
+            self.data_portal.stop_feeds()
+
+        # The last state must be on disk before exiting.
+        self.persistence.stop()
+
         if self._analyze is None:
             log.info('Exiting the algorithm.')
 
@@ -564,6 +606,7 @@ class ExchangeTradingAlgorithmLive(ExchangeTradingAlgorithmBase):
 
         log.debug('creating clock')
         if self.live_graph or self._analyze_live is not None:
+            from catalyst.exchange.live_graph_clock import LiveGraphClock
             self._clock = LiveGraphClock(
                 self.sim_params.sessions,
                 context=self,
@@ -571,6 +614,17 @@ class ExchangeTradingAlgorithmLive(ExchangeTradingAlgorithmBase):
                 start=self.start if self.is_start else None,
                 end=self.end if self.is_end else None
             )
+        elif self.bar_interval is not None or self.trigger_on_data:
+            feeds = getattr(self.data_portal, 'feeds', dict())
+            self._clock = EventClock(
+                self.sim_params.sessions,
+                interval=self.bar_interval
+                if self.bar_interval is not None else '1T',
+                feeds=list(feeds.values()),
+                on_data=self.trigger_on_data,
+                start=self.start if self.is_start else None,
+                end=self.end if self.is_end else None
+            )
         else:
             self._clock = SimpleClock(
                 self.sim_params.sessions,
@@ -587,10 +641,16 @@ class ExchangeTradingAlgorithmLive(ExchangeTradingAlgorithmBase):
         This allows us to stop/start algos without loosing their state.
 
         """
-        self.state = get_algo_object(
-            algo_name=self.algo_namespace,
-            key='context.state_{}'.format(self.mode_name),
-        )
+        recovered = self.state_journal.recover() \
+            if self.state_journal is not None else None
+
+        if recovered is not None:
+            self.state = recovered['state']
+        else:
+            self.state = get_algo_object(
+                algo_name=self.algo_namespace,
+                key='context.state_{}'.format(self.mode_name),
+            )
         if self.state is None:
             self.state = {}
 
@@ -609,22 +669,30 @@ class ExchangeTradingAlgorithmLive(ExchangeTradingAlgorithmBase):
             new_position_tracker = tracker.position_tracker
             tracker.position_tracker = None
 
+            today = pd.Timestamp.utcnow().floor('1D')
+            if recovered is not None:
+                cum_perf = recovered['cumulative']
+                todays_perf = recovered['today'] \
+                    if recovered['day'] == today else None
+
+            else:
+                # The pickles saved before the state journal
+                cum_perf = get_algo_object(
+                    algo_name=self.algo_namespace,
+                    key='cumulative_performance_{}'.format(self.mode_name),
+                )
+                todays_perf = get_algo_object(
+                    algo_name=self.algo_namespace,
+                    key=today.strftime('%Y-%m-%d'),
+                    rel_path='daily_performance_{}'.format(self.mode_name),
+                )
+
             # Unpacking the perf_tracker and positions if available
-            cum_perf = get_algo_object(
-                algo_name=self.algo_namespace,
-                key='cumulative_performance_{}'.format(self.mode_name),
-            )
             if cum_perf is not None:
                 tracker.cumulative_performance = cum_perf
                 # Ensure single common position tracker
                 tracker.position_tracker = cum_perf.position_tracker
 
-            today = pd.Timestamp.utcnow().floor('1D')
-            todays_perf = get_algo_object(
-                algo_name=self.algo_namespace,
-                key=today.strftime('%Y-%m-%d'),
-                rel_path='daily_performance_{}'.format(self.mode_name),
-            )
             if todays_perf is not None:
                 # Ensure single common position tracker
                 if tracker.position_tracker is not None:
@@ -657,6 +725,9 @@ class ExchangeTradingAlgorithmLive(ExchangeTradingAlgorithmBase):
         if self.trading_client is None:
             self._init_trading_client()
 
+        if getattr(self.data_portal, 'feeds', None):
+            self.data_portal.start_feeds()
+
         return self.trading_client.transform()
 
     def updated_portfolio(self):
@@ -760,10 +831,15 @@ class ExchangeTradingAlgorithmLive(ExchangeTradingAlgorithmBase):
         )
         self.pnl_stats = pd.concat([self.pnl_stats, df])
 
-        save_algo_df(
-            self.algo_namespace,
-            'pnl_stats_{}'.format(self.mode_name),
-            self.pnl_stats,
+        # The frame is replaced by the next bar, not mutated.
+        self.persistence.submit(
+            save_algo_df,
+            args=(
+                self.algo_namespace,
+                'pnl_stats_{}'.format(self.mode_name),
+                self.pnl_stats,
+            ),
+            key='pnl_stats',
         )
 
     def add_custom_signals_stats(self, period_stats):
@@ -785,10 +861,14 @@ class ExchangeTradingAlgorithmLive(ExchangeTradingAlgorithmBase):
         )
         self.custom_signals_stats = pd.concat([self.custom_signals_stats, df])
 
-        save_algo_df(
-            self.algo_namespace,
-            'custom_signals_stats_{}'.format(self.mode_name),
-            self.custom_signals_stats,
+        self.persistence.submit(
+            save_algo_df,
+            args=(
+                self.algo_namespace,
+                'custom_signals_stats_{}'.format(self.mode_name),
+                self.custom_signals_stats,
+            ),
+            key='custom_signals_stats',
         )
 
     def add_exposure_stats(self, period_stats):
@@ -815,10 +895,14 @@ class ExchangeTradingAlgorithmLive(ExchangeTradingAlgorithmBase):
         )
         self.exposure_stats = pd.concat([self.exposure_stats, df])
 
-        save_algo_df(
-            self.algo_namespace,
-            'exposure_stats_{}'.format(self.mode_name),
-            self.exposure_stats
+        self.persistence.submit(
+            save_algo_df,
+            args=(
+                self.algo_namespace,
+                'exposure_stats_{}'.format(self.mode_name),
+                self.exposure_stats,
+            ),
+            key='exposure_stats',
         )
 
     def nullify_frame_stats(self, now):
@@ -836,10 +920,16 @@ class ExchangeTradingAlgorithmLive(ExchangeTradingAlgorithmBase):
         -------
 
         """
+        self.persistence.submit(
+            self._save_frame_stats, args=(self.frame_stats, now),
+        )
+        self.frame_stats = list()
+
+    def _save_frame_stats(self, frame_stats, now):
         save_algo_object(
             algo_name=self.algo_namespace,
             key=now.floor('1D').strftime('%Y-%m-%d'),
-            obj=self.frame_stats,
+            obj=frame_stats,
             rel_path='frame_stats'
         )
 
@@ -851,8 +941,6 @@ class ExchangeTradingAlgorithmLive(ExchangeTradingAlgorithmBase):
         if error:
             log.warning(error)
 
-        self.frame_stats = list()
-
     def handle_data(self, data):
         """
         Wrapper around the handle_data method of each algo.
@@ -884,17 +972,19 @@ class ExchangeTradingAlgorithmLive(ExchangeTradingAlgorithmBase):
         self._last_open_orders = copy.deepcopy(open_orders_list)
 
         if self.performance_needs_update:
-            self.perf_tracker.update_performance()
+            with profile_span('risk'):
+                self.perf_tracker.update_performance()
             self.performance_needs_update = False
 
         if self.portfolio_needs_update:
-            cash, positions_value = retry(
-                action=self.synchronize_portfolio,
-                attempts=self.attempts['synchronize_portfolio_attempts'],
-                sleeptime=self.attempts['retry_sleeptime'],
-                retry_exceptions=(ExchangeRequestError,),
-                cleanup=lambda: log.warn('Syncing portfolio again.')
-            )
+            with profile_span('synchronize_portfolio'):
+                cash, positions_value = retry(
+                    action=self.synchronize_portfolio,
+                    attempts=self.attempts['synchronize_portfolio_attempts'],
+                    sleeptime=self.attempts['retry_sleeptime'],
+                    retry_exceptions=(ExchangeRequestError,),
+                    cleanup=lambda: log.warn('Syncing portfolio again.')
+                )
             self.portfolio_needs_update = False
 
         log.info(
@@ -903,45 +993,38 @@ class ExchangeTradingAlgorithmLive(ExchangeTradingAlgorithmBase):
             )
         )
         if self._handle_data:
-            self._handle_data(self, data)
+            with profile_span('handle_data'):
+                self._handle_data(self, data)
 
         # Unlike trading controls which remain constant unless placing an
         # order, account controls can change each bar. Thus, must check
         # every bar no matter if the algorithm places an order or not.
         self.validate_account_controls()
 
-        self._save_algo_state(data)
+        with profile_span('save_state'):
+            self._save_algo_state(data)
         self.current_day = data.current_dt.floor('1D')
 
     def _save_algo_state(self, data):
-        today = data.current_dt.floor('1D')
         try:
-            self._save_stats_csv(self._process_stats(data))
+            recorded_cols = self._process_stats(data)
         except Exception as e:
             log.warn('unable to calculate performance: {}'.format(e))
+        else:
+            # Only the latest stats are written when the writes lag.
+            self.persistence.submit(
+                self._save_stats_csv,
+                args=(list(self.frame_stats), recorded_cols),
+                key='stats',
+            )
 
-        log.debug('saving cumulative performance object')
-        save_algo_object(
-            algo_name=self.algo_namespace,
-            key='cumulative_performance_{}'.format(self.mode_name),
-            obj=self.perf_tracker.cumulative_performance,
-        )
-        log.debug('saving todays performance object')
-        save_algo_object(
-            algo_name=self.algo_namespace,
-            key=today.strftime('%Y-%m-%d'),
-            obj=self.perf_tracker.todays_performance,
-            rel_path='daily_performance_{}'.format(self.mode_name)
-        )
-        log.debug('saving context.state object')
-        save_algo_object(
-            algo_name=self.algo_namespace,
-            key='context.state_{}'.format(self.mode_name),
-            obj=self.state)
+        if self.state_journal is not None:
+            log.debug('journaling the performance and context.state objects')
+            self.state_journal.record(
+                data.current_dt, self.perf_tracker, self.state,
+            )
 
     def _process_stats(self, data):
-        today = data.current_dt.floor('1D')
-
         # Since the clock runs 24/7, I trying to disable the daily
         # Performance tracker and keep only minute and cumulative
         self.perf_tracker.update_performance()
@@ -976,21 +1059,14 @@ class ExchangeTradingAlgorithmLive(ExchangeTradingAlgorithmBase):
                 )
             ))
 
-        # Since live mode does not use daily frequency,
-        # there is no need to save the output of this method.
-        self.prepare_period_stats(
-            start_dt=today,
-            end_dt=data.current_dt
-        )
-
         return recorded_cols
 
-    def _save_stats_csv(self, recorded_cols):
+    def _save_stats_csv(self, frame_stats, recorded_cols):
         # Writing the stats output
         csv_bytes = None
         try:
             csv_bytes = stats_to_algo_folder(
-                stats=self.frame_stats,
+                stats=frame_stats,
                 algo_namespace=self.algo_namespace,
                 folder_name='stats_{}'.format(self.mode_name),
                 recorded_cols=recorded_cols,
@@ -1003,7 +1079,7 @@ class ExchangeTradingAlgorithmLive(ExchangeTradingAlgorithmBase):
                 if 's3://' in self.stats_output:
                     stats_to_s3(
                         uri=self.stats_output,
-                        stats=self.frame_stats,
+                        stats=frame_stats,
                         algo_namespace=self.algo_namespace,
                         recorded_cols=recorded_cols,
                         bytes_to_write=csv_bytes
@@ -1017,7 +1093,51 @@ class ExchangeTradingAlgorithmLive(ExchangeTradingAlgorithmBase):
 
     @api_method
     def batch_market_order(self, share_counts):
-        raise NotImplementedError()
+        """Place market orders for multiple assets at once.
+
+        The trading controls are validated for all the orders before any
+        of them is sent. The orders are then sent concurrently to each
+        exchange, a failed order does not abort the others.
+
+        Parameters
+        ----------
+        share_counts : pd.Series[TradingPair -> float] or dict
+            The amount to order for each TradingPair.
+
+        Returns
+        -------
+        order_ids : list[str or None]
+            The order ids in the order of ``share_counts``, None for the
+            orders which failed or were not placed.
+        """
+        style = MarketOrder()
+        order_args = []
+        indexes = []
+        for index, (asset, amount) in enumerate(iteritems(share_counts)):
+            if not amount or not self._can_order_asset(asset):
+                continue
+
+            current_position = 0.0
+            if asset in self.portfolio.positions:
+                current_position = self.portfolio.positions[asset].amount
+
+            if amount + current_position < 0.0:
+                log.error(
+                    'Insufficient position amount for asset: {}'.format(asset)
+                )
+                continue
+
+            # Raises a ZiplineError if a trading control is violated.
+            amount, style = self._calculate_order(asset, amount, style=style)
+            order_args.append((asset, amount, style))
+            indexes.append(index)
+
+        order_ids = [None] * len(share_counts)
+        for index, order_id in zip(indexes,
+                                   self.blotter.batch_order(order_args)):
+            order_ids[index] = order_id
+
+        return order_ids
 
     def _get_open_orders(self, asset=None):
         if self.simulate_orders:
@@ -1048,9 +1168,14 @@ class ExchangeTradingAlgorithmLive(ExchangeTradingAlgorithmBase):
         data.attempts = self.attempts
         # Since live mode does not use daily frequency,
         # there is no need to save the output of this method.
-        super(ExchangeTradingAlgorithmLive, self).run(
-            data, overwrite_sim_params
-        )
+        try:
+            super(ExchangeTradingAlgorithmLive, self).run(
+                data, overwrite_sim_params
+            )
+        finally:
+            # The journal must be written when the algorithm fails too.
+            self.persistence.stop()
+
         # Rebuilding the stats to support minute data
         stats = self.get_frame_stats()
         return stats
@@ -1156,6 +1281,9 @@ class ExchangeTradingAlgorithmLive(ExchangeTradingAlgorithmBase):
             self.blotter.cancel(order_id)
 
     def _get_orderbook(self, asset, order_type='all', limit=None):
+        if getattr(self.data_portal, 'feeds', None):
+            return self.data_portal.get_orderbook(asset, order_type, limit)
+
         exchange = self.exchanges[asset.exchange]
         return exchange.get_orderbook(asset, order_type, limit)
 
@@ -0,0 +1,252 @@
+import hashlib
+import json
+import os
+import sqlite3
+import time
+
+import pandas as pd
+from catalyst.constants import LOG_LEVEL
+from catalyst.exchange.utils.exchange_utils import get_exchange_folder
+from catalyst.exchange.utils.serialization_utils import ExchangeJSONEncoder, \
+    ExchangeJSONDecoder
+from logbook import Logger
+
+log = Logger('ExchangeAssetCache', level=LOG_LEVEL)
+
+# Increment when the layout of the cache or the TradingPair parameters
+# change, existing caches are rebuilt on mismatch.
+ASSET_CACHE_VERSION = 1
+
+
+def get_etag(*items):
+    """
+    A digest of JSON serializable items.
+
+    Parameters
+    ----------
+    items: Object
+
+    Returns
+    -------
+    str
+
+    """
+    digest = hashlib.md5()
+    for item in items:
+        # Some exchanges return raw objects in their markets, their string
+        # representation is good enough for fingerprinting.
+        digest.update(
+            json.dumps(item, sort_keys=True, default=str).encode('utf-8')
+        )
+
+    return digest.hexdigest()
+
+
+def get_files_etag(filenames):
+    """
+    A digest of the size and modification time of the files.
+
+    Parameters
+    ----------
+    filenames: list[str]
+
+    Returns
+    -------
+    str
+
+    """
+    stats = []
+    for filename in filenames:
+        if os.path.isfile(filename):
+            stat = os.stat(filename)
+            stats.append([filename, stat.st_size, stat.st_mtime])
+        else:
+            stats.append([filename, None, None])
+
+    return get_etag(stats)
+
+
+class CachedAssets(object):
+    """The content of an exchange asset cache.
+
+    Parameters
+    ----------
+    markets: list[dict[str, Object]]
+        The CCXT markets.
+    assets_params: list[dict[str, Object]]
+        The parameters of each TradingPair.
+    markets_etag: str
+    symbols_etag: str
+    validated: Timestamp
+        When the markets were last validated against the exchange.
+
+    """
+
+    def __init__(self, markets, assets_params, markets_etag, symbols_etag,
+                 validated):
+        self.markets = markets
+        self.assets_params = assets_params
+        self.markets_etag = markets_etag
+        self.symbols_etag = symbols_etag
+        self.validated = validated
+
+
+class ExchangeAssetCache(object):
+    """Persistent cache of the markets and TradingPair definitions of an
+    exchange.
+
+    The cache is a single sqlite file in the exchange folder. Entries are
+    trusted for ``ttl`` after their last validation. Once expired, the
+    markets are fetched again and compared with the cached digest. The
+    TradingPair definitions are only rebuilt when the markets or the
+    symbols files changed.
+
+    Parameters
+    ----------
+    exchange_name: str
+    ttl: str or Timedelta
+        The time during which the cache is used without validation.
+    path: str, optional
+        The path of the cache file.
+
+    """
+
+    def __init__(self, exchange_name, ttl='1D', path=None):
+        self.exchange_name = exchange_name
+        self.ttl = pd.Timedelta(ttl)
+        self.path = path if path is not None else os.path.join(
+            get_exchange_folder(exchange_name), 'assets_cache.sqlite'
+        )
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path)
+        conn.execute(
+            'CREATE TABLE IF NOT EXISTS metadata ('
+            'key TEXT PRIMARY KEY, value TEXT)'
+        )
+        conn.execute(
+            'CREATE TABLE IF NOT EXISTS assets ('
+            'position INTEGER PRIMARY KEY, params TEXT)'
+        )
+        return conn
+
+    def _get_metadata(self, conn):
+        return dict(conn.execute('SELECT key, value FROM metadata'))
+
+    def is_expired(self, cached, now=None):
+        now = now if now is not None else pd.Timestamp.utcnow()
+        return now - cached.validated > self.ttl
+
+    def load(self):
+        """
+        Load the cached markets and assets.
+
+        Returns
+        -------
+        CachedAssets
+            None if the cache is missing, invalid or from another version.
+
+        """
+        if not os.path.isfile(self.path):
+            return None
+
+        try:
+            conn = self._connect()
+            try:
+                metadata = self._get_metadata(conn)
+                if metadata.get('version') != str(ASSET_CACHE_VERSION):
+                    log.debug('ignoring asset cache of version {}'.format(
+                        metadata.get('version')
+                    ))
+                    return None
+
+                rows = conn.execute(
+                    'SELECT params FROM assets ORDER BY position'
+                ).fetchall()
+
+            finally:
+                conn.close()
+
+            decoder = ExchangeJSONDecoder()
+            return CachedAssets(
+                markets=json.loads(metadata['markets']),
+                assets_params=[decoder.decode(row[0]) for row in rows],
+                markets_etag=metadata['markets_etag'],
+                symbols_etag=metadata['symbols_etag'],
+                validated=pd.to_datetime(
+                    float(metadata['validated']), unit='s', utc=True
+                ),
+            )
+
+        except (sqlite3.DatabaseError, KeyError, ValueError) as e:
+            log.warn('unable to read the {} asset cache: {}'.format(
+                self.exchange_name, e
+            ))
+            return None
+
+    def save(self, markets, assets_params, markets_etag, symbols_etag):
+        """
+        Replace the content of the cache.
+
+        The cache is written to a temporary file first and renamed, readers
+        never see a partially written cache.
+
+        Parameters
+        ----------
+        markets: list[dict[str, Object]]
+        assets_params: list[dict[str, Object]]
+        markets_etag: str
+        symbols_etag: str
+
+        """
+        tmp_path = '{}.{}.tmp'.format(self.path, os.getpid())
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+        cache = ExchangeAssetCache(self.exchange_name, self.ttl, tmp_path)
+        conn = cache._connect()
+        try:
+            with conn:
+                conn.executemany(
+                    'INSERT INTO metadata VALUES (?, ?)', [
+                        ('version', str(ASSET_CACHE_VERSION)),
+                        # Encoded like get_etag, the raw objects of some
+                        # exchanges are kept as strings.
+                        ('markets', json.dumps(markets, default=str)),
+                        ('markets_etag', markets_etag),
+                        ('symbols_etag', symbols_etag),
+                        ('validated', str(time.time())),
+                    ]
+                )
+                conn.executemany(
+                    'INSERT INTO assets VALUES (?, ?)', [
+                        (index, json.dumps(params, cls=ExchangeJSONEncoder))
+                        for index, params in enumerate(assets_params)
+                    ]
+                )
+        finally:
+            conn.close()
+
+        if os.path.exists(self.path):
+            # os.rename does not overwrite on Windows
+            os.remove(self.path)
+        os.rename(tmp_path, self.path)
+
+    def touch(self):
+        """
+        Mark the cached markets as validated now.
+
+        """
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute(
+                    'UPDATE metadata SET value = ? WHERE key = ?',
+                    (str(time.time()), 'validated'),
+                )
+        finally:
+            conn.close()
+
+    def clear(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
@@ -1,28 +1,40 @@
+from collections import OrderedDict
+
+import numpy as np
 import pandas as pd
 from catalyst.constants import LOG_LEVEL
 from catalyst.exchange.utils.factory import find_exchanges
+from catalyst.utils.numpy_utils import as_column
 from logbook import Logger
 
 log = Logger('ExchangeAssetFinder', level=LOG_LEVEL)
 
+# The number of date ranges whose lifetimes are kept, the pipeline engine
+# computes one per chunk.
+LIFETIMES_CACHE_SIZE = 16
+
 
 class ExchangeAssetFinder(object):
     def __init__(self, exchanges):
         self.exchanges = exchanges
 
+        self._asset_lifetimes = None
+        self._lifetimes_cache = OrderedDict()
+
     @property
     def sids(self):
         """
         This seems to be used to pre-fetch assets.
         I don't think that we need this for live-trading.
-        Leaving the list empty.
+
+        Exchanges are initialized on first symbol use, only the assets of
+        exchanges already initialized are listed here.
         """
         all_sids = []
         for exchange_name in self.exchanges:
-            # This is what initializes each exchanges at the beginning
-            # of an algo
             exchange = self.exchanges[exchange_name]
-            exchange.init()
+            if not getattr(exchange, 'is_init', True):
+                continue
 
             all_sids += [asset.sid for asset in exchange.assets]
 
@@ -115,6 +127,61 @@ class ExchangeAssetFinder(object):
 
         return exchange.get_asset(symbol, data_frequency)
 
+    def _get_bundle_exchanges(self):
+        exchanges = [
+            exchange for exchange in self.exchanges.values()
+            if exchange.has_bundle('minute')
+        ]
+        if not exchanges:
+            # Algorithms trading on exchanges without bundles use the
+            # pipeline data of all the exchanges bundled locally.
+            exchanges = find_exchanges(features=['minuteBundle'])
+
+        if not exchanges:
+            raise ValueError('exchange with minute bundles not found')
+
+        return exchanges
+
+    def _compute_asset_lifetimes(self):
+        """
+        The assets of the exchanges with their lifetimes as nanoseconds
+        since the epoch.
+
+        The sids of the assets are derived from their symbol, the same
+        market on several exchanges shares a sid. Only the first exchange
+        listing a sid keeps it.
+
+        Returns
+        -------
+        list[TradingPair], np.ndarray[int64], np.ndarray[int64]
+
+        """
+        assets = []
+        seen = set()
+        for exchange in self._get_bundle_exchanges():
+            exchange.init()
+
+            for asset in exchange.assets:
+                if asset.sid in seen:
+                    log.debug('skipping {} on {}, sid {} already used'.format(
+                        asset.symbol, exchange.name, asset.sid
+                    ))
+                    continue
+
+                seen.add(asset.sid)
+                assets.append(asset)
+
+        starts = np.array(
+            [asset.start_date.value for asset in assets], dtype=np.int64
+        )
+        # Markets without minute bars never exist for the pipeline.
+        ends = np.array([
+            asset.end_minute.value if asset.end_minute is not None
+            else np.iinfo(np.int64).min for asset in assets
+        ], dtype=np.int64)
+
+        return assets, starts, ends
+
     def lifetimes(self, dates, include_start_date):
         """
         Compute a DataFrame representing asset lifetimes for the specified date
@@ -142,38 +209,37 @@ class ExchangeAssetFinder(object):
             False, then lifetimes.loc[date, asset] will be false when date ==
             asset.start_date.
 
+            The frames are cached per date range and must not be modified.
+
         See Also
         --------
         numpy.putmask
         catalyst.pipeline.engine.SimplePipelineEngine._compute_root_mask
         """
-        exchanges = find_exchanges(features=['minuteBundle'])
-        if not exchanges:
-            raise ValueError('exchange with minute bundles not found')
-
-        # TODO: find a way to support multiple exchanges
-        exchange = exchanges[0]
-        # Using a single exchange for now because are not unique for the
-        # same asset in different exchanges. I'd like to avoid binding
-        # pipeline to a single exchange.
-        exchange.init()
-
-        data = []
-        for dt in dates:
-            exists = []
-
-            for asset in exchange.assets:
-                if include_start_date:
-                    condition = (asset.start_date <= dt < asset.end_minute)
-
-                else:
-                    condition = (asset.start_date < dt < asset.end_minute)
-
-                exists.append(condition)
-
-            data.append(exists)
-
-        # sids = [asset.sid for asset in exchange.assets]
-        df = pd.DataFrame(data, index=dates, columns=exchange.assets)
+        key = (dates[0].value, dates[-1].value, len(dates),
+               include_start_date)
+        if key in self._lifetimes_cache:
+            return self._lifetimes_cache[key]
+
+        if self._asset_lifetimes is None:
+            self._asset_lifetimes = self._compute_asset_lifetimes()
+        assets, starts, ends = self._asset_lifetimes
+
+        # The first and last position of each asset in the dates, both
+        # bounds are exclusive of the end date.
+        raw_dates = dates.asi8
+        first = np.searchsorted(
+            raw_dates, starts, side='left' if include_start_date else 'right'
+        )
+        last = np.searchsorted(raw_dates, ends, side='left')
+
+        positions = as_column(np.arange(len(raw_dates)))
+        mask = (positions >= first) & (positions < last)
+
+        df = pd.DataFrame(mask, index=dates, columns=assets)
+
+        if len(self._lifetimes_cache) >= LIFETIMES_CACHE_SIZE:
+            self._lifetimes_cache.popitem(last=False)
+        self._lifetimes_cache[key] = df
 
         return df
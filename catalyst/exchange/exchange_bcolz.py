@@ -1,8 +1,27 @@
+import os
+import shutil
+import threading
+from collections import OrderedDict
+
+import bcolz
 import numpy as np
+import pandas as pd
 
 from catalyst import get_calendar
+from catalyst.data.bar_reader import NoDataAfterDate, NoDataBeforeDate
 from catalyst.data.minute_bars import BcolzMinuteBarReader, \
-    BcolzMinuteBarWriter
+    BcolzMinuteBarWriter, BcolzMinuteBarMetadata, _sid_subdir_path
+from catalyst.data.us_equity_pricing import BcolzDailyBarReader, \
+    BcolzDailyBarWriter
+from catalyst.utils.memoize import lazyval
+
+# The number of readers kept open by the registry once they are released.
+MAX_UNUSED_READERS = 8
+
+# The attributes of a bcolz ctable, rewritten with the table.
+CTABLE_ATTRS_FILENAME = '__attrs__'
+
+OHLCV_FIELDS = ('open', 'high', 'low', 'close', 'volume')
 
 
 class BcolzExchangeBarWriter(BcolzMinuteBarWriter):
@@ -72,7 +91,7 @@ class BcolzExchangeBarReader(BcolzMinuteBarReader):
         if len(all_fields) == 1 and all_fields[0] == 'volume':
             all_fields.insert(0, 'close')
 
-        mask = None
+        masks = dict()
         data = []
         for field in all_fields:
             if field != 'volume':
@@ -84,8 +103,10 @@ class BcolzExchangeBarReader(BcolzMinuteBarReader):
                 carray = self._open_minute_file(field, sid)
                 a = carray[start_idx:end_idx + 1]
 
-                if mask is None:
-                    mask = a != 0
+                # The bars of each sid are masked by its first field.
+                if i not in masks:
+                    masks[i] = a != 0
+                mask = masks[i]
 
                 inverse_ratio = self._ohlc_ratio_inverse_for_sid(sid)
                 out[:len(mask), i][mask] = (
@@ -96,3 +117,472 @@ class BcolzExchangeBarReader(BcolzMinuteBarReader):
                 data.append(out)
 
         return data
+
+
+class BcolzExchangeDailyBarWriter(BcolzDailyBarWriter):
+    """
+    Writes the daily bars of all the sids of an exchange in a single
+    ctable, in the layout of BcolzDailyBarWriter.
+
+    The prices and volumes are kept as the integers of the per-sid bundle,
+    scaled by the ohlc ratio of their sid, which is saved in the
+    attributes of the table.
+
+    Parameters
+    ----------
+    filename: str
+    start_session: pd.Timestamp
+    end_session: pd.Timestamp
+    default_ohlc_ratio: int
+    ohlc_ratios_per_sid: dict[int, int], optional
+    source_version: float, optional
+        The version of the per-sid bundle the table is imported from.
+
+    """
+
+    def __init__(self, filename, start_session, end_session,
+                 default_ohlc_ratio, ohlc_ratios_per_sid=None,
+                 source_version=None):
+        super(BcolzExchangeDailyBarWriter, self).__init__(
+            filename, get_calendar('OPEN'), start_session, end_session,
+        )
+        self._default_ohlc_ratio = default_ohlc_ratio
+        self._ohlc_ratios_per_sid = ohlc_ratios_per_sid or dict()
+        self._source_version = source_version
+
+    def _write_internal(self, iterator, assets):
+        table = super(BcolzExchangeDailyBarWriter, self)._write_internal(
+            iterator, assets,
+        )
+        table.attrs['default_ohlc_ratio'] = self._default_ohlc_ratio
+        table.attrs['ohlc_ratios_per_sid'] = {
+            str(sid): ratio
+            for sid, ratio in self._ohlc_ratios_per_sid.items()
+        }
+        table.attrs['source_version'] = self._source_version
+        table.flush()
+        return table
+
+
+class BcolzExchangeDailyBarReader(BcolzDailyBarReader):
+    """
+    Reads the daily bars written by BcolzExchangeDailyBarWriter.
+
+    All the sids are read from the same carrays: a window of several sids
+    slices the rows of the sids in one read of each field, instead of
+    opening the carrays of each sid.
+
+    Parameters
+    ----------
+    rootdir: str
+
+    """
+
+    def __init__(self, rootdir):
+        super(BcolzExchangeDailyBarReader, self).__init__(rootdir)
+        self._rootdir = rootdir
+
+    @property
+    def data_frequency(self):
+        return 'daily'
+
+    @lazyval
+    def source_version(self):
+        return self._table.attrs.attrs.get('source_version')
+
+    @lazyval
+    def _ohlc_inverses_per_sid(self):
+        return {
+            int(sid): 1.0 / ratio
+            for sid, ratio in self._table.attrs['ohlc_ratios_per_sid'].items()
+        }
+
+    def _ohlc_ratio_inverse_for_sid(self, sid):
+        try:
+            return self._ohlc_inverses_per_sid[sid]
+        except KeyError:
+            return 1.0 / self._table.attrs['default_ohlc_ratio']
+
+    def _row_slices(self, start_idx, end_idx, sids):
+        """
+        The rows of the sids in a range of sessions.
+
+        Returns
+        -------
+        tuple[np.ndarray, np.ndarray, np.ndarray]
+            For each bar in the table, its row in the table, its session
+            relative to start_idx and the position of its sid.
+
+        """
+        rows = []
+        days = []
+        columns = []
+        for column, sid in enumerate(sids):
+            try:
+                first_row = self._first_rows[sid]
+                last_row = self._last_rows[sid]
+                offset = self._calendar_offsets[sid]
+            except KeyError:
+                continue
+
+            start = max(start_idx, offset)
+            end = min(end_idx, offset + last_row - first_row + 1)
+            if start >= end:
+                continue
+
+            rows.append(np.arange(
+                first_row + start - offset, first_row + end - offset,
+            ))
+            days.append(np.arange(start - start_idx, end - start_idx))
+            columns.append(np.full(end - start, column, dtype=np.intp))
+
+        if not rows:
+            empty = np.empty(0, dtype=np.intp)
+            return empty, empty, empty
+
+        return np.concatenate(rows), np.concatenate(days), \
+            np.concatenate(columns)
+
+    def load_raw_arrays(self, fields, start_dt, end_dt, sids):
+        """
+        Parameters
+        ----------
+        fields : list of str
+           'open', 'high', 'low', 'close', or 'volume'
+        start_dt: Timestamp
+           Beginning of the window range.
+        end_dt: Timestamp
+           End of the window range.
+        sids : list of int
+           The asset identifiers in the window.
+
+        Returns
+        -------
+        list of np.ndarray
+            A list with an entry per field of ndarrays with shape
+            (sessions in range, sids) with a dtype of float64, containing the
+            values for the respective field over start and end dt range.
+        """
+        periods = self.trading_calendar.sessions_in_range(
+            start_dt.floor('1d'), end_dt.floor('1d'),
+        )
+        sids = [int(sid) for sid in sids]
+        shape = len(periods), len(sids)
+
+        # The sessions of the window which are in the table.
+        rows = days = columns = np.empty(0, dtype=np.intp)
+        if len(periods):
+            start_idx = self.sessions.searchsorted(periods[0])
+            end_idx = self.sessions.searchsorted(periods[-1], side='right')
+            if start_idx < end_idx:
+                rows, days, columns = self._row_slices(
+                    start_idx, end_idx, sids,
+                )
+                days += periods.searchsorted(self.sessions[start_idx])
+
+        mask = None
+        values = dict()
+        if len(rows):
+            # A single slice of each carray spans the rows of all the sids.
+            first_row, last_row = rows.min(), rows.max()
+            rows -= first_row
+
+            mask_field = next(
+                (field for field in fields if field != 'volume'), 'close'
+            )
+            for field in set(fields) | {mask_field}:
+                values[field] = \
+                    self._table[field][first_row:last_row + 1][rows]
+
+            mask = values[mask_field] != 0
+            inverse_ratios = np.array(
+                [self._ohlc_ratio_inverse_for_sid(sid) for sid in sids],
+                dtype=np.float64,
+            )[columns[mask]]
+
+        data = []
+        for field in fields:
+            if field != 'volume':
+                out = np.full(shape, np.nan)
+            else:
+                out = np.zeros(shape, dtype=np.float64)
+
+            if mask is not None:
+                out[days[mask], columns[mask]] = \
+                    values[field][mask] * inverse_ratios
+
+            data.append(out)
+
+        return data
+
+    def get_value(self, sid, dt, field):
+        """
+        Retrieve the pricing info for the given sid, dt, and field.
+
+        Parameters
+        ----------
+        sid : int
+            Asset identifier.
+        dt : datetime-like
+            The session of the bar.
+        field : string
+            The type of pricing data to retrieve.
+            ('open', 'high', 'low', 'close', 'volume')
+
+        Returns
+        -------
+        out : float|int
+            NaN for the prices, 0 for the volume, of the sessions without
+            a bar.
+
+        """
+        sid = int(sid)
+        try:
+            ix = self.sid_day_index(sid, pd.Timestamp(dt).floor('1d'))
+        except (NoDataBeforeDate, NoDataAfterDate):
+            value = 0
+        else:
+            value = self._spot_col(field)[ix]
+
+        if value == 0:
+            return 0 if field == 'volume' else np.nan
+
+        return value * self._ohlc_ratio_inverse_for_sid(sid)
+
+
+def _bundle_sids(rootdir):
+    """The sids with carrays in a per-sid bundle."""
+    sids = []
+    for _, dirnames, _ in os.walk(rootdir):
+        for dirname in dirnames:
+            name, extension = os.path.splitext(dirname)
+            if extension == '.bcolz' and name.isdigit():
+                sids.append(int(name))
+
+    return sorted(sids)
+
+
+def import_daily_bundle(source, rootdir, source_version=None):
+    """
+    Compile a daily bundle written by BcolzExchangeBarWriter, with
+    carrays per sid, into the single ctable of BcolzExchangeDailyBarReader.
+
+    The empty sessions before the first bar and after the last bar of each
+    sid are left out. The table is written aside and moved into place.
+
+    Parameters
+    ----------
+    source: str
+        The rootdir of the per-sid bundle.
+    rootdir: str
+        The rootdir of the ctable.
+    source_version: float, optional
+        The version of the source, saved in the attributes of the table.
+
+    Returns
+    -------
+    bcolz.ctable
+
+    """
+    metadata = BcolzMinuteBarMetadata.read(source)
+    sessions = get_calendar('OPEN').sessions_in_range(
+        metadata.start_session, metadata.end_session,
+    )
+    days = sessions.values.astype('datetime64[s]').astype(np.uint32)
+
+    def iter_tables():
+        for sid in _bundle_sids(source):
+            table = bcolz.ctable(
+                rootdir=os.path.join(source, _sid_subdir_path(sid)),
+                mode='r',
+            )
+            closes = table['close'][:len(days)]
+            bars = np.flatnonzero(closes)
+            if not len(bars):
+                continue
+
+            first, last = bars[0], bars[-1] + 1
+            columns = [table[field][first:last] for field in OHLCV_FIELDS]
+            yield sid, bcolz.ctable(
+                columns=columns + [days[first:last]],
+                names=list(OHLCV_FIELDS) + ['day'],
+            )
+
+    temp_rootdir = '{}.tmp'.format(rootdir)
+    shutil.rmtree(temp_rootdir, ignore_errors=True)
+
+    writer = BcolzExchangeDailyBarWriter(
+        temp_rootdir,
+        metadata.start_session,
+        metadata.end_session,
+        default_ohlc_ratio=metadata.default_ohlc_ratio,
+        ohlc_ratios_per_sid=metadata.ohlc_ratios_per_sid,
+        source_version=source_version,
+    )
+    writer.write(iter_tables())
+
+    shutil.rmtree(rootdir, ignore_errors=True)
+    os.rename(temp_rootdir, rootdir)
+
+    return bcolz.ctable(rootdir=rootdir, mode='r')
+
+
+class _RegisteredReader(object):
+    def __init__(self, reader, data_frequency, version):
+        self.reader = reader
+        self.data_frequency = data_frequency
+        self.version = version
+        self.refcount = 0
+
+
+class BundleReaderRegistry(object):
+    """Process-wide registry of the exchange bundle readers.
+
+    The ExchangeBundle instances of an exchange share one reader per
+    bundle path, with its carray handles and decoded metadata. A reader is
+    replaced when the mtime of the bundle metadata changes or when the
+    bundle is written through ``notify_write``. The readers released by
+    all their users are kept open up to ``max_unused``.
+
+    The paths of the bundles with carrays per sid get a
+    BcolzExchangeBarReader, the paths of the columnar daily tables a
+    BcolzExchangeDailyBarReader.
+
+    Parameters
+    ----------
+    max_unused: int
+        The number of released readers kept open.
+    """
+
+    def __init__(self, max_unused=MAX_UNUSED_READERS):
+        self.max_unused = max_unused
+        self._entries = OrderedDict()
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def version(path):
+        """
+        The mtime of the metadata of a bundle, None if there is no bundle.
+
+        Parameters
+        ----------
+        path: str
+
+        Returns
+        -------
+        float
+
+        """
+        for filename in (BcolzMinuteBarMetadata.metadata_path(path),
+                         os.path.join(path, CTABLE_ATTRS_FILENAME)):
+            try:
+                return os.stat(filename).st_mtime
+            except OSError:
+                pass
+
+        return None
+
+    def acquire(self, path, data_frequency):
+        """
+        A reader of the bundle, None if there is no bundle at the path.
+        Each acquired reader must be released.
+
+        Parameters
+        ----------
+        path: str
+        data_frequency: str
+
+        Returns
+        -------
+        BcolzExchangeBarReader | BcolzExchangeDailyBarReader
+
+        """
+        path = os.path.abspath(path)
+        version = self.version(path)
+        if version is None:
+            return None
+
+        with self._lock:
+            entry = self._entries.pop(path, None)
+            if entry is None or entry.version != version or \
+                    entry.data_frequency != data_frequency:
+                try:
+                    if os.path.isfile(
+                            BcolzMinuteBarMetadata.metadata_path(path)):
+                        reader = BcolzExchangeBarReader(
+                            rootdir=path,
+                            data_frequency=data_frequency,
+                        )
+                    else:
+                        reader = BcolzExchangeDailyBarReader(path)
+                        # Opens the table.
+                        reader.sessions
+                except IOError:
+                    return None
+
+                entry = _RegisteredReader(reader, data_frequency, version)
+
+            # The most recently acquired readers are the last ones.
+            entry.refcount += 1
+            self._entries[path] = entry
+            self._evict()
+
+            return entry.reader
+
+    def release(self, reader):
+        """
+        Release an acquired reader.
+
+        Parameters
+        ----------
+        reader: BcolzExchangeBarReader | BcolzExchangeDailyBarReader
+
+        """
+        if reader is None:
+            return
+
+        with self._lock:
+            entry = self._entries.get(os.path.abspath(reader._rootdir))
+            if entry is not None and entry.reader is reader:
+                entry.refcount -= 1
+                self._evict()
+
+    def invalidate(self, path):
+        """
+        Forget the reader of a bundle, the next users open a new one.
+
+        Parameters
+        ----------
+        path: str
+
+        """
+        with self._lock:
+            self._entries.pop(os.path.abspath(path), None)
+
+    def notify_write(self, path):
+        """
+        Invalidate the reader of a bundle which was written, including in
+        the other processes through the mtime of its metadata.
+
+        Parameters
+        ----------
+        path: str
+
+        """
+        try:
+            os.utime(BcolzMinuteBarMetadata.metadata_path(path), None)
+        except OSError:
+            pass
+
+        self.invalidate(path)
+
+    def _evict(self):
+        unused = [
+            path for path, entry in self._entries.items()
+            if entry.refcount <= 0
+        ]
+        for path in unused[:max(len(unused) - self.max_unused, 0)]:
+            del self._entries[path]
+
+
+reader_registry = BundleReaderRegistry()
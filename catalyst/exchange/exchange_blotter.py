@@ -1,3 +1,6 @@
+from collections import OrderedDict
+from multiprocessing.pool import ThreadPool
+
 import numpy as np
 import pandas as pd
 from logbook import Logger
@@ -8,6 +11,7 @@ from catalyst.constants import LOG_LEVEL
 from catalyst.exchange.exchange_errors import (
     ExchangeRequestError, NoValueForField
 )
+from catalyst.exchange.simulated_order_book import SimulatedOrderBook
 from catalyst.finance.blotter import Blotter
 from catalyst.finance.commission import CommissionModel
 from catalyst.finance.order import ORDER_STATUS
@@ -17,6 +21,10 @@ from catalyst.utils.input_validation import expect_types
 
 log = Logger('exchange_blotter', level=LOG_LEVEL)
 
+# The orders of a batch sent at the same time to an exchange, the requests
+# are still paced by the rate limit of the exchange.
+BATCH_ORDER_THREADS = 8
+
 
 class TradingPairFeeSchedule(CommissionModel):
     """
@@ -183,6 +191,9 @@ class ExchangeBlotter(Blotter):
             TradingPair: TradingPairFeeSchedule()
         }
 
+        # The open orders of the simulation, filled by batches.
+        self.order_book = SimulatedOrderBook()
+
     def exchange_order(self, asset, amount, style=None):
         exchange = self.exchanges[asset.exchange]
         return exchange.order(
@@ -211,12 +222,105 @@ class ExchangeBlotter(Blotter):
                 args=(asset, amount, style),
             )
 
-            self.open_orders[order.asset].append(order)
-            self.orders[order.id] = order
-            self.new_orders.append(order)
-
+            self._track_order(order)
             return order.id
 
+    def _track_order(self, order):
+        self.open_orders[order.asset].append(order)
+        self.orders[order.id] = order
+        self.new_orders.append(order)
+
+    def _submit_order(self, leg):
+        asset, amount, style = leg
+        try:
+            return retry(
+                action=self.exchange_order,
+                attempts=self.attempts['order_attempts'],
+                sleeptime=self.attempts['retry_sleeptime'],
+                retry_exceptions=(ExchangeRequestError,),
+                cleanup=lambda: log.warn(
+                    'Ordering {} again.'.format(asset.symbol)
+                ),
+                args=(asset, amount, style),
+            ), None
+
+        except Exception as e:
+            return None, e
+
+    def batch_order(self, order_arg_lists):
+        """Place a batch of orders, sent concurrently to each exchange.
+
+        A failed order does not abort the rest of the batch.
+
+        Parameters
+        ----------
+        order_arg_lists : iterable[tuple]
+            Tuples of args that `order` expects.
+
+        Returns
+        -------
+        order_ids : list[str or None]
+            The unique identifier of each order in the order of the batch,
+            None for the orders which failed or were not placed.
+
+        """
+        order_arg_lists = list(order_arg_lists)
+        if self.simulate_orders:
+            return super(ExchangeBlotter, self).batch_order(order_arg_lists)
+
+        legs_by_exchange = OrderedDict()
+        for index, (asset, amount, style) in enumerate(order_arg_lists):
+            if amount == 0:
+                log.warn('skipping 0 amount orders')
+                continue
+
+            legs_by_exchange.setdefault(asset.exchange, []).append(
+                (index, (asset, amount, style))
+            )
+
+        pools = []
+        pending = []
+        for legs in legs_by_exchange.values():
+            pool = ThreadPool(min(len(legs), BATCH_ORDER_THREADS))
+            pools.append(pool)
+            pending.append((
+                [index for index, _ in legs],
+                pool.map_async(self._submit_order, [leg for _, leg in legs]),
+            ))
+
+        results = [(None, None)] * len(order_arg_lists)
+        try:
+            for indexes, async_result in pending:
+                for index, result in zip(indexes, async_result.get()):
+                    results[index] = result
+        finally:
+            for pool in pools:
+                pool.close()
+                pool.join()
+
+        order_ids = []
+        failed = 0
+        for (order, error), order_args in zip(results, order_arg_lists):
+            if error is not None:
+                failed += 1
+                log.error('unable to order {} {}: {}'.format(
+                    order_args[1], order_args[0].symbol, error
+                ))
+
+            if order is None:
+                order_ids.append(None)
+                continue
+
+            self._track_order(order)
+            order_ids.append(order.id)
+
+        if failed:
+            log.warn('{} of the {} orders of the batch failed'.format(
+                failed, len(order_arg_lists)
+            ))
+
+        return order_ids
+
     def check_open_orders(self):
         """
         Loop through the list of open orders in the Portfolio object.
@@ -287,9 +391,82 @@ class ExchangeBlotter(Blotter):
 
         return transactions, commissions, closed_orders
 
+    def process_splits(self, splits):
+        super(ExchangeBlotter, self).process_splits(splits)
+        self.order_book.invalidate()
+
+    def _can_batch_simulate(self):
+        slippage = self.slippage_models.get(TradingPair)
+        commission = self.commission_models.get(TradingPair)
+
+        # Custom models are simulated order by order.
+        return type(slippage) is TradingPairFixedSlippage and \
+            type(commission) is TradingPairFeeSchedule and \
+            all(type(asset) is TradingPair for asset in self.open_orders)
+
+    def get_simulated_transactions(self, bar_data):
+        """
+        The transactions of the simulated orders, computed by batches
+        against the current bar.
+
+        Parameters
+        ----------
+        bar_data: BarData
+
+        Returns
+        -------
+        tuple[list[Transaction], list[dict], list[Order]]
+            The same as Blotter.get_transactions.
+
+        """
+        transactions = []
+        commissions = []
+        closed_orders = []
+
+        if not self.open_orders:
+            return transactions, commissions, closed_orders
+
+        if not self._can_batch_simulate():
+            return super(ExchangeBlotter, self).get_transactions(bar_data)
+
+        self.order_book.sync(self.open_orders)
+        try:
+            fills = self.order_book.simulate(
+                bar_data,
+                slippage=self.slippage_models[TradingPair],
+                commission=self.commission_models[TradingPair],
+            )
+        except NoValueForField:
+            # The live data has no open, high or low.
+            self.order_book.invalidate()
+            return super(ExchangeBlotter, self).get_transactions(bar_data)
+
+        for order, txn, additional_commission in fills:
+            if additional_commission > 0:
+                commissions.append({
+                    "asset": order.asset,
+                    "order": order,
+                    "cost": additional_commission
+                })
+
+            order.filled += txn.amount
+            order.commission += additional_commission
+
+            order.dt = txn.dt
+
+            # added for stats
+            txn.commission = additional_commission
+
+            transactions.append(txn)
+
+            if not order.open:
+                closed_orders.append(order)
+
+        return transactions, commissions, closed_orders
+
     def get_transactions(self, bar_data):
         if self.simulate_orders:
-            return super(ExchangeBlotter, self).get_transactions(bar_data)
+            return self.get_simulated_transactions(bar_data)
 
         else:
             return retry(
@@ -14,8 +14,8 @@ from catalyst.constants import DATE_TIME_FORMAT, AUTO_INGEST
 from catalyst.constants import LOG_LEVEL
 from catalyst.data.minute_bars import BcolzMinuteOverlappingData, \
     BcolzMinuteBarMetadata
-from catalyst.exchange.exchange_bcolz import BcolzExchangeBarReader, \
-    BcolzExchangeBarWriter
+from catalyst.exchange.exchange_bcolz import BcolzExchangeBarWriter, \
+    import_daily_bundle, reader_registry
 from catalyst.exchange.exchange_errors import EmptyValuesInBundleError, \
     TempBundleNotFoundError, \
     NoDataAvailableOnExchange, \
@@ -36,6 +36,10 @@ log = Logger('exchange_bundle', level=LOG_LEVEL)
 
 BUNDLE_NAME_TEMPLATE = os.path.join('{root}', '{frequency}_bundle')
 
+# The daily bars of all the sids in one ctable, imported from the daily
+# bundle after each ingestion.
+DAILY_BARS_TEMPLATE = os.path.join('{root}', 'daily_bars')
+
 
 def _cachpath(symbol, type_):
     return '-'.join([symbol, type_])
@@ -53,11 +57,16 @@ class ExchangeBundle:
 
     def get_reader(self, data_frequency, path=None):
         """
-        Get a data writer object, either a new object or from cache
+        Get a data reader object from the process-wide registry, shared
+        with the other bundles of the exchange. A new reader is returned
+        after the bundle was written.
+
+        The daily bars are read from their columnar table while it is
+        up to date with the daily bundle.
 
         Returns
         -------
-        BcolzMinuteBarReader | BcolzDailyBarReader
+        BcolzExchangeBarReader | BcolzExchangeDailyBarReader
 
         """
         if path is None:
@@ -67,22 +76,68 @@ class ExchangeBundle:
                 frequency=data_frequency
             )
 
-        if path in self._readers and self._readers[path] is not None:
-            return self._readers[path]
+            if data_frequency == 'daily':
+                daily_bars_path = DAILY_BARS_TEMPLATE.format(root=root)
+                reader = self._acquire_reader(daily_bars_path, data_frequency)
+                if reader is not None and \
+                        reader.source_version == reader_registry.version(path):
+                    return reader
 
-        try:
-            self._readers[path] = BcolzExchangeBarReader(
-                rootdir=path,
-                data_frequency=data_frequency
-            )
-        except IOError:
-            self._readers[path] = None
+                # Stale until the next import.
+                reader_registry.release(
+                    self._readers.pop(daily_bars_path, None)
+                )
 
-        return self._readers[path]
+        return self._acquire_reader(path, data_frequency)
+
+    def _acquire_reader(self, path, data_frequency):
+        reader = reader_registry.acquire(path, data_frequency)
+        reader_registry.release(self._readers.pop(path, None))
+        if reader is not None:
+            self._readers[path] = reader
+
+        return reader
+
+    def release_reader(self, path):
+        """
+        Release the reader of a bundle path, e.g. a removed temp bundle.
+
+        Parameters
+        ----------
+        path: str
+
+        """
+        reader_registry.release(self._readers.pop(path, None))
+        reader_registry.invalidate(path)
 
     def update_metadata(self, writer, start_dt, end_dt):
         pass
 
+    def import_daily_bars(self):
+        """
+        Import the daily bundle into the columnar table of the daily bars,
+        if it changed since the last import.
+
+        """
+        root = get_exchange_folder(self.exchange_name)
+        path = BUNDLE_NAME_TEMPLATE.format(root=root, frequency='daily')
+        daily_bars_path = DAILY_BARS_TEMPLATE.format(root=root)
+
+        version = reader_registry.version(path)
+        if version is None:
+            return
+
+        reader = self._acquire_reader(daily_bars_path, 'daily')
+        if reader is not None and reader.source_version == version:
+            return
+
+        log.debug('importing the daily bundle of {}'.format(
+            self.exchange_name
+        ))
+        self.release_reader(daily_bars_path)
+        import_daily_bundle(path, daily_bars_path, source_version=version)
+        reader_registry.invalidate(daily_bars_path)
+
     def get_writer(self, start_dt, end_dt, data_frequency):
         """
         Get a data writer object, either a new object or from cache
@@ -194,6 +249,9 @@ class ExchangeBundle:
                 show_progress=False,
                 invalid_data_behavior='raise'
             )
+        finally:
+            # The open carrays of the readers do not see the new rows.
+            reader_registry.notify_write(writer._rootdir)
 
     def get_calendar_periods_range(self, start_dt, end_dt, data_frequency):
         """
@@ -397,6 +455,7 @@ class ExchangeBundle:
             ))
 
         if not arrays:
+            self.release_reader(path)
             return reader._rootdir
 
         periods = self.get_calendar_periods_range(
@@ -412,6 +471,7 @@ class ExchangeBundle:
             duplicates_threshold=duplicates_threshold
         )
 
+        self.release_reader(path)
         if cleanup:
             log.debug(
                 'removing bundle folder following ingestion: {}'.format(
@@ -648,6 +708,9 @@ class ExchangeBundle:
                 '\n'.join(problems)
             ))
 
+        if data_frequency == 'daily':
+            self.import_daily_bars()
+
     def ingest_csv(self, path, data_frequency, empty_rows_behavior='strip',
                    duplicates_threshold=100):
         """
@@ -782,6 +845,10 @@ class ExchangeBundle:
                 empty_rows_behavior=empty_rows_behavior,
                 duplicates_threshold=duplicates_threshold
             )
+
+        if data_frequency == 'daily':
+            self.import_daily_bars()
+
         return filter(partial(is_not, None), problems)
 
     def ingest(self, data_frequency, include_symbols=None,
@@ -886,7 +953,6 @@ class ExchangeBundle:
                     bar_count=bar_count,
                     field=field,
                     data_frequency=data_frequency,
-                    reset_reader=True,
                 )
                 return series
 
@@ -918,6 +984,7 @@ class ExchangeBundle:
         dt: pd.Timestamp
         data_frequency: str
         reset_reader:
+            Deprecated, the readers are renewed after each write.
 
         Returns
         -------
@@ -927,10 +994,6 @@ class ExchangeBundle:
         values = []
         try:
             reader = self.get_reader(data_frequency)
-            if reset_reader:
-                del self._readers[reader._rootdir]
-                reader = self.get_reader(data_frequency)
-
             for asset in assets:
                 value = reader.get_value(
                     sid=asset.sid,
@@ -966,14 +1029,9 @@ class ExchangeBundle:
             start_dt, end_dt, assets, data_frequency
         )
 
-        # This is an attempt to resolve some caching with the reader
-        # when auto-ingesting data.
-        # TODO: needs more work
+        # The registry renews the reader after an auto-ingestion, reset_reader
+        # is deprecated.
         reader = self.get_reader(data_frequency)
-        if reset_reader:
-            del self._readers[reader._rootdir]
-            reader = self.get_reader(data_frequency)
-
         if reader is None:
             symbols = [asset.symbol for asset in assets]
             raise PricingDataNotLoadedError(
@@ -987,11 +1045,10 @@ class ExchangeBundle:
                 end_dt=end_dt
             )
 
-        series = dict()
+        asset_start_dt, _ = self.get_adj_dates(
+            start_dt, end_dt, assets, data_frequency
+        )
         for asset in assets:
-            asset_start_dt, _ = self.get_adj_dates(
-                start_dt, end_dt, assets, data_frequency
-            )
             in_bundle = range_in_bundle(
                 asset, asset_start_dt, end_dt, reader
             )
@@ -1007,29 +1064,28 @@ class ExchangeBundle:
                     end_dt=end_dt
                 )
 
-            periods = self.get_calendar_periods_range(
-                asset_start_dt, end_dt, data_frequency
-            )
-            # This does not behave well when requesting multiple assets
-            # when the start or end date of one asset is outside of the range
-            # looking at the logic in load_raw_arrays(), we are not achieving
-            # any performance gain by requesting multiple sids at once. It's
-            # looping through the sids and making separate requests anyway.
-            arrays = reader.load_raw_arrays(
-                sids=[asset.sid],
-                fields=[field],
-                start_dt=start_dt,
+        periods = self.get_calendar_periods_range(
+            asset_start_dt, end_dt, data_frequency
+        )
+        # A (periods x assets) block in one read, the columnar daily bars
+        # slice all the sids at once.
+        arrays = reader.load_raw_arrays(
+            sids=[asset.sid for asset in assets],
+            fields=[field],
+            start_dt=start_dt,
+            end_dt=end_dt
+        )
+        if len(arrays) == 0:
+            raise DataCorruptionError(
+                exchange=self.exchange_name,
+                symbols=[asset.symbol for asset in assets],
+                start_dt=asset_start_dt,
                 end_dt=end_dt
             )
-            if len(arrays) == 0:
-                raise DataCorruptionError(
-                    exchange=self.exchange_name,
-                    symbols=asset.symbol,
-                    start_dt=asset_start_dt,
-                    end_dt=end_dt
-                )
 
-            field_values = arrays[0][:, 0]
+        series = dict()
+        for index, asset in enumerate(assets):
+            field_values = arrays[0][:, index]
 
             try:
                 value_series = pd.Series(field_values, index=periods)
@@ -1077,6 +1133,12 @@ class ExchangeBundle:
         frequencies = ['daily', 'minute'] if data_frequency is None \
             else [data_frequency]
 
+        if 'daily' in frequencies:
+            daily_bars = DAILY_BARS_TEMPLATE.format(root=root)
+            self.release_reader(daily_bars)
+            if os.path.isdir(daily_bars):
+                shutil.rmtree(daily_bars)
+
         for frequency in frequencies:
             label = '{}_bundle'.format(frequency)
             frequency_bundle = os.path.join(root, label)
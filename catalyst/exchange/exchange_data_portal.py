@@ -13,6 +13,7 @@ from catalyst.exchange.exchange_errors import (
 from catalyst.exchange.utils.exchange_utils import resample_history_df, \
     group_assets_by_exchange
 from catalyst.exchange.utils.datetime_utils import get_frequency, get_start_dt
+from catalyst.utils.bar_profiler import profile_span
 from logbook import Logger
 from redo import retry
 
@@ -82,19 +83,20 @@ class DataPortalExchangeBase(DataPortal):
         if field == 'price':
             field = 'close'
 
-        return retry(
-            action=self._get_history_window,
-            attempts=self.attempts['get_history_window_attempts'],
-            sleeptime=self.attempts['retry_sleeptime'],
-            retry_exceptions=(ExchangeRequestError,),
-            cleanup=lambda: log.warn('fetching history again.'),
-            args=(assets,
-                  end_dt,
-                  bar_count,
-                  frequency,
-                  field,
-                  data_frequency,
-                  ffill))
+        with profile_span('history'):
+            return retry(
+                action=self._get_history_window,
+                attempts=self.attempts['get_history_window_attempts'],
+                sleeptime=self.attempts['retry_sleeptime'],
+                retry_exceptions=(ExchangeRequestError,),
+                cleanup=lambda: log.warn('fetching history again.'),
+                args=(assets,
+                      end_dt,
+                      bar_count,
+                      frequency,
+                      field,
+                      data_frequency,
+                      ffill))
 
     @abc.abstractmethod
     def get_exchange_history_window(self,
@@ -132,22 +134,22 @@ class DataPortalExchangeBase(DataPortal):
                     exchange_name, assets, field, dt, data_frequency)
 
             else:
-                spot_values = []
+                asset_spot_values = dict()
                 for exchange_name in exchange_assets:
-                    assets = exchange_assets[exchange_name]
                     exchange_spot_values = self.get_exchange_spot_value(
                         exchange_name,
-                        assets,
+                        exchange_assets[exchange_name],
                         field,
                         dt,
                         data_frequency
                     )
-                    if len(assets) == 1:
-                        spot_values.append(exchange_spot_values)
-                    else:
-                        spot_values += exchange_spot_values
+                    asset_spot_values.update(
+                        zip(exchange_assets[exchange_name],
+                            exchange_spot_values)
+                    )
 
-                return spot_values
+                # The values are returned in the order of the assets.
+                return [asset_spot_values[asset] for asset in assets]
 
     def get_spot_value(self, assets, field, dt, data_frequency):
         if field == 'price':
@@ -178,8 +180,39 @@ class DataPortalExchangeBase(DataPortal):
 class DataPortalExchangeLive(DataPortalExchangeBase):
     def __init__(self, *args, **kwargs):
         self.exchanges = kwargs.pop('exchanges', None)
+        # Optional push feeds by exchange name, the REST api of each
+        # exchange is used as a fallback.
+        self.feeds = kwargs.pop('feeds', None) or dict()
         super(DataPortalExchangeLive, self).__init__(*args, **kwargs)
 
+    def start_feeds(self, assets=None):
+        """
+        Start the market data feeds.
+
+        Parameters
+        ----------
+        assets: list[TradingPair], optional
+            The assets to subscribe to.
+
+        """
+        exchange_assets = group_assets_by_exchange(assets) if assets else {}
+        for exchange_name in self.feeds:
+            feed = self.feeds[exchange_name]
+            if exchange_name in exchange_assets:
+                feed.subscribe(exchange_assets[exchange_name])
+
+            # The feeds of a market data daemon also serve the candles.
+            if hasattr(feed, 'get_candles') and \
+                    exchange_name in self.exchanges:
+                self.exchanges[exchange_name].candle_source = feed
+
+            if not feed.is_running:
+                feed.start()
+
+    def stop_feeds(self):
+        for exchange_name in self.feeds:
+            self.feeds[exchange_name].stop()
+
     def get_exchange_history_window(self,
                                     exchange_name,
                                     assets,
@@ -238,12 +271,53 @@ class DataPortalExchangeLive(DataPortalExchangeBase):
         float
 
         """
+        feed = self.feeds.get(exchange_name)
+        if feed is not None:
+            spot_values = feed.get_spot_values(assets, field)
+            if spot_values is not None:
+                return spot_values
+
+            log.debug(
+                'feed data not available for {}, using the REST api'.format(
+                    [asset.symbol for asset in assets]
+                )
+            )
+            # Subscribing lazily since the universe is only known
+            # once the algorithm requests data.
+            feed.subscribe(assets)
+
         exchange = self.exchanges[exchange_name]
         exchange_spot_values = exchange.get_spot_value(
             assets, field, dt, data_frequency)
 
         return exchange_spot_values
 
+    def get_orderbook(self, asset, order_type='all', limit=None):
+        """
+        The order book of the asset, from the feed when available.
+
+        Parameters
+        ----------
+        asset: TradingPair
+        order_type: str
+        limit: int
+
+        Returns
+        -------
+        dict[str, Object]
+
+        """
+        feed = self.feeds.get(asset.exchange)
+        if feed is not None:
+            order_book = feed.get_orderbook(asset, order_type, limit)
+            if order_book is not None:
+                return order_book
+
+            feed.subscribe([asset])
+
+        exchange = self.exchanges[asset.exchange]
+        return exchange.get_orderbook(asset, order_type, limit)
+
 
 class DataPortalExchangeBacktest(DataPortalExchangeBase):
     def __init__(self, *args, **kwargs):
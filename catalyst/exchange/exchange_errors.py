@@ -336,3 +336,17 @@ class NoCandlesReceivedFromExchange(ZiplineError):
         'Although requesting {bar_count} candles until {end_dt} of '
         'asset {asset}, an empty list of candles was received for {exchange}.'
     ).strip()
+
+
+class MarketDataFeedRequiresWebsocket(ZiplineError):
+    msg = (
+        'The websocket market data feed requires the websocket-client '
+        'package: pip install websocket-client'
+    ).strip()
+
+
+class InvalidBenchmarkError(ZiplineError):
+    msg = (
+        'Invalid benchmark {benchmark}: expected a constant daily return, '
+        'e.g. 0, or a trading pair with its exchange, e.g. bitfinex:btc_usd.'
+    ).strip()
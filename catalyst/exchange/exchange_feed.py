@@ -0,0 +1,515 @@
+import json
+import threading
+from abc import ABCMeta, abstractmethod
+from collections import defaultdict, deque
+from time import sleep
+
+import pandas as pd
+from catalyst.constants import LOG_LEVEL
+from catalyst.exchange.exchange_errors import MarketDataFeedRequiresWebsocket
+from logbook import Logger
+from six import string_types
+
+log = Logger('ExchangeFeed', level=LOG_LEVEL)
+
+FEED_EVENT_TYPES = ('ticker', 'order_book', 'order_book_delta', 'trade')
+
+
+def _get_symbol(asset_or_symbol):
+    return asset_or_symbol if isinstance(asset_or_symbol, string_types) \
+        else asset_or_symbol.symbol
+
+
+def _to_timestamp(value):
+    if value is None:
+        return pd.Timestamp.utcnow()
+
+    if isinstance(value, (int, float)):
+        return pd.to_datetime(value, unit='ms', utc=True)
+
+    dt = pd.Timestamp(value)
+    return dt.tz_localize('UTC') if dt.tzinfo is None else dt
+
+
+class MarketDataFeed(object):
+    """Push-based market data for live trading.
+
+    A feed keeps the latest tickers, order books and trades of an exchange
+    in memory. Concrete feeds push updates into this state as they arrive
+    and the live data portal reads from it instead of issuing REST
+    requests. Readers should fall back to the REST api when the feed does
+    not hold fresh data for a market.
+
+    Events are plain dictionaries shared by all feeds, which makes them
+    easy to record and replay:
+
+    - ``{'type': 'ticker', 'symbol': 'btc_usdt', 'timestamp': ...,
+      'last_price': 6500.0, 'volume': 10.2}``
+    - ``{'type': 'order_book', 'symbol': 'btc_usdt', 'timestamp': ...,
+      'bids': [[price, quantity], ...], 'asks': [[price, quantity], ...]}``
+    - ``{'type': 'order_book_delta', 'symbol': 'btc_usdt', 'timestamp': ...,
+      'side': 'bids', 'price': 6499.5, 'quantity': 0.0}``
+    - ``{'type': 'trade', 'symbol': 'btc_usdt', 'timestamp': ...,
+      'price': 6500.0, 'amount': 0.1, 'side': 'buy'}``
+
+    Parameters
+    ----------
+    exchange_name: str
+        The name of the exchange streamed by the feed.
+    max_age: str or Timedelta
+        The age after which the state of a market is considered stale.
+    max_trades: int
+        The number of recent trades kept in memory per market.
+
+    """
+    __metaclass__ = ABCMeta
+
+    def __init__(self, exchange_name, max_age='1min', max_trades=500):
+        self.exchange_name = exchange_name
+        self.max_age = pd.Timedelta(max_age)
+        self.max_trades = max_trades
+
+        self._tickers = dict()
+        self._order_books = dict()
+        self._trades = defaultdict(lambda: deque(maxlen=self.max_trades))
+        self._last_updates = dict()
+
+        self._listeners = []
+        self._lock = threading.RLock()
+        self.is_running = False
+
+    @abstractmethod
+    def start(self):
+        """
+        Start streaming market data.
+
+        """
+        pass
+
+    def stop(self):
+        """
+        Stop streaming market data.
+
+        """
+        self.is_running = False
+
+    def subscribe(self, assets):
+        """
+        Request market data for the specified assets.
+
+        Feeds which stream a fixed list of markets can ignore this.
+
+        Parameters
+        ----------
+        assets: list[TradingPair]
+
+        """
+        pass
+
+    def add_listener(self, callback):
+        """
+        Register a callable invoked with each processed event.
+
+        Callbacks run on the thread of the feed and should return quickly.
+
+        Parameters
+        ----------
+        callback: callable[dict -> None]
+
+        """
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback):
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def process_event(self, event):
+        """
+        Apply a market data event to the state of the feed.
+
+        Parameters
+        ----------
+        event: dict[str, Object]
+
+        """
+        event_type = event.get('type')
+        if event_type not in FEED_EVENT_TYPES:
+            log.warn('skipping unknown feed event: {}'.format(event))
+            return
+
+        symbol = event['symbol']
+        dt = _to_timestamp(event.get('timestamp'))
+
+        with self._lock:
+            if event_type == 'ticker':
+                ticker = dict(event)
+                ticker['last_traded'] = dt
+                if 'last_price' not in ticker and 'last' in ticker:
+                    ticker['last_price'] = ticker['last']
+                ticker['last'] = ticker.get('last_price')
+                ticker.setdefault('volume', 0)
+                self._tickers[symbol] = ticker
+
+            elif event_type == 'order_book':
+                self._order_books[symbol] = dict(
+                    bids={float(p): float(q) for p, q in event['bids']},
+                    asks={float(p): float(q) for p, q in event['asks']},
+                    last_traded=dt,
+                )
+
+            elif event_type == 'order_book_delta':
+                book = self._order_books.get(symbol)
+                if book is None:
+                    # A delta is meaningless without its snapshot.
+                    return
+
+                side = book[event['side']]
+                price = float(event['price'])
+                quantity = float(event['quantity'])
+                if quantity == 0:
+                    side.pop(price, None)
+                else:
+                    side[price] = quantity
+
+                book['last_traded'] = dt
+
+            else:
+                trade = dict(event)
+                trade['last_traded'] = dt
+                self._trades[symbol].append(trade)
+
+            self._last_updates[symbol] = dt
+
+        for callback in self._listeners:
+            try:
+                callback(event)
+            except Exception as e:
+                log.warn('feed listener failed: {}'.format(e))
+
+    def is_fresh(self, asset_or_symbol, dt=None):
+        """
+        Whether the feed received data for the market recently.
+
+        Parameters
+        ----------
+        asset_or_symbol: TradingPair or str
+        dt: Timestamp, optional
+
+        Returns
+        -------
+        bool
+
+        """
+        symbol = _get_symbol(asset_or_symbol)
+        last_update = self._last_updates.get(symbol)
+        if last_update is None:
+            return False
+
+        now = dt if dt is not None else pd.Timestamp.utcnow()
+        return now - last_update <= self.max_age
+
+    def get_ticker(self, asset_or_symbol, dt=None):
+        """
+        The latest ticker of the market, None if missing or stale.
+
+        Parameters
+        ----------
+        asset_or_symbol: TradingPair or str
+        dt: Timestamp, optional
+
+        Returns
+        -------
+        dict[str, Object]
+
+        """
+        symbol = _get_symbol(asset_or_symbol)
+        with self._lock:
+            ticker = self._tickers.get(symbol)
+            if ticker is None or ticker.get('last_price') is None:
+                return None
+
+            now = dt if dt is not None else pd.Timestamp.utcnow()
+            if now - ticker['last_traded'] > self.max_age:
+                return None
+
+            return dict(ticker)
+
+    def get_orderbook(self, asset_or_symbol, order_type='all', limit=None,
+                      dt=None):
+        """
+        The latest order book of the market, None if missing or stale.
+
+        The result follows the format of :meth:`Exchange.get_orderbook`.
+
+        Parameters
+        ----------
+        asset_or_symbol: TradingPair or str
+        order_type: str
+            The type of the orders: 'bids' or 'asks' or 'all'
+        limit: int
+        dt: Timestamp, optional
+
+        Returns
+        -------
+        dict[str, Object]
+
+        """
+        symbol = _get_symbol(asset_or_symbol)
+        with self._lock:
+            book = self._order_books.get(symbol)
+            if book is None:
+                return None
+
+            now = dt if dt is not None else pd.Timestamp.utcnow()
+            if now - book['last_traded'] > self.max_age:
+                return None
+
+            order_types = ['bids', 'asks'] \
+                if order_type == 'all' else [order_type]
+
+            result = dict(last_traded=book['last_traded'])
+            for side in order_types:
+                prices = sorted(book[side], reverse=(side == 'bids'))
+                if limit is not None:
+                    prices = prices[:limit]
+
+                result[side] = [
+                    dict(rate=price, quantity=book[side][price])
+                    for price in prices
+                ]
+
+            return result
+
+    def get_trades(self, asset_or_symbol, limit=None):
+        """
+        The most recent trades of the market, oldest first.
+
+        Parameters
+        ----------
+        asset_or_symbol: TradingPair or str
+        limit: int
+
+        Returns
+        -------
+        list[dict[str, Object]]
+
+        """
+        symbol = _get_symbol(asset_or_symbol)
+        with self._lock:
+            trades = list(self._trades[symbol]) \
+                if symbol in self._trades else []
+
+        return trades[-limit:] if limit else trades
+
+    def get_spot_values(self, assets, field, dt=None):
+        """
+        The spot values of the field for all assets, None if any of the
+        assets is not covered by the feed.
+
+        Parameters
+        ----------
+        assets: list[TradingPair]
+        field: str
+        dt: Timestamp, optional
+
+        Returns
+        -------
+        list[float]
+
+        """
+        if field not in ('close', 'price', 'volume'):
+            return None
+
+        key = 'volume' if field == 'volume' else 'last_price'
+        values = []
+        for asset in assets:
+            ticker = self.get_ticker(asset, dt)
+            if ticker is None:
+                return None
+
+            values.append(ticker[key])
+
+        return values
+
+
+class InMemoryMarketDataFeed(MarketDataFeed):
+    """A feed updated by the caller through :meth:`process_event`.
+
+    This is useful in tests and for integrations which already receive
+    market data through another channel.
+
+    """
+
+    def start(self):
+        self.is_running = True
+
+    def push(self, events):
+        """
+        Process a list of events.
+
+        Parameters
+        ----------
+        events: list[dict[str, Object]]
+
+        """
+        for event in events:
+            self.process_event(event)
+
+
+class ReplayMarketDataFeed(MarketDataFeed):
+    """A feed replaying recorded events on a background thread.
+
+    Parameters
+    ----------
+    exchange_name: str
+    events: list[dict[str, Object]] or str
+        The events, or the path to a file containing one JSON event per
+        line, sorted by timestamp.
+    speed: float
+        The replay speed relative to the recorded timestamps. Use None to
+        replay the events without pausing.
+    restamp: bool
+        Replace the recorded timestamps by the current time, which keeps
+        replayed data fresh for the readers of the feed.
+
+    """
+
+    def __init__(self, exchange_name, events, speed=1.0, restamp=True,
+                 **kwargs):
+        super(ReplayMarketDataFeed, self).__init__(exchange_name, **kwargs)
+
+        if isinstance(events, string_types):
+            with open(events) as f:
+                events = [json.loads(line) for line in f if line.strip()]
+
+        self.events = events
+        self.speed = speed
+        self.restamp = restamp
+        self._thread = None
+        self.done = threading.Event()
+
+    def start(self):
+        self.is_running = True
+        self._thread = threading.Thread(target=self._replay)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def _replay(self):
+        previous_dt = None
+        for event in self.events:
+            if not self.is_running:
+                break
+
+            dt = _to_timestamp(event.get('timestamp'))
+            if self.speed and previous_dt is not None and dt > previous_dt:
+                sleep((dt - previous_dt).total_seconds() / self.speed)
+
+            previous_dt = dt
+            if self.restamp:
+                event = dict(event, timestamp=pd.Timestamp.utcnow())
+
+            self.process_event(event)
+
+        self.done.set()
+
+
+class WebsocketMarketDataFeed(MarketDataFeed):
+    """A feed streaming events from a websocket endpoint.
+
+    Exchanges all use their own message formats so the conversion of
+    messages to feed events is delegated to the ``parse_message`` callable.
+
+    Parameters
+    ----------
+    exchange_name: str
+    url: str
+        The websocket endpoint, e.g. ``wss://api.exchange.com/ws``.
+    parse_message: callable[str -> list[dict[str, Object]]]
+        Converts a raw message into a list of feed events.
+    subscribe_message: callable[list[str] -> str], optional
+        Builds the subscription message for a list of catalyst symbols.
+    reconnect_sleeptime: int
+        The number of seconds to wait before reconnecting.
+
+    Notes
+    -----
+    Requires the ``websocket-client`` package.
+
+    """
+
+    def __init__(self, exchange_name, url, parse_message,
+                 subscribe_message=None, reconnect_sleeptime=5, **kwargs):
+        super(WebsocketMarketDataFeed, self).__init__(exchange_name, **kwargs)
+
+        self.url = url
+        self.parse_message = parse_message
+        self.subscribe_message = subscribe_message
+        self.reconnect_sleeptime = reconnect_sleeptime
+
+        self._symbols = set()
+        self._ws = None
+        self._thread = None
+
+    def subscribe(self, assets):
+        symbols = [
+            _get_symbol(asset) for asset in assets
+            if _get_symbol(asset) not in self._symbols
+        ]
+        if not symbols:
+            return
+
+        self._symbols.update(symbols)
+        if self._ws is not None and self.subscribe_message is not None:
+            self._ws.send(self.subscribe_message(symbols))
+
+    def start(self):
+        try:
+            import websocket
+        except ImportError:
+            raise MarketDataFeedRequiresWebsocket()
+
+        def on_open(ws):
+            if self._symbols and self.subscribe_message is not None:
+                ws.send(self.subscribe_message(sorted(self._symbols)))
+
+        def on_message(ws, message):
+            try:
+                events = self.parse_message(message)
+            except Exception as e:
+                log.warn('unable to parse message {}: {}'.format(message, e))
+                return
+
+            for event in events or []:
+                self.process_event(event)
+
+        def on_error(ws, error):
+            log.warn('websocket error on {}: {}'.format(
+                self.exchange_name, error
+            ))
+
+        def run():
+            while self.is_running:
+                self._ws = websocket.WebSocketApp(
+                    self.url,
+                    on_open=on_open,
+                    on_message=on_message,
+                    on_error=on_error,
+                )
+                self._ws.run_forever()
+                self._ws = None
+
+                if self.is_running:
+                    log.info('reconnecting to {} feed'.format(
+                        self.exchange_name
+                    ))
+                    sleep(self.reconnect_sleeptime)
+
+        self.is_running = True
+        self._thread = threading.Thread(target=run)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self):
+        super(WebsocketMarketDataFeed, self).stop()
+        if self._ws is not None:
+            self._ws.close()
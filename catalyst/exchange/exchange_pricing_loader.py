@@ -11,6 +11,8 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+from collections import OrderedDict
+
 from catalyst.constants import LOG_LEVEL
 from catalyst.data.us_equity_pricing import BcolzDailyBarReader
 from catalyst.errors import NoFurtherDataError
@@ -22,9 +24,11 @@ from catalyst.utils.calendars import get_calendar
 from catalyst.utils.numpy_utils import float64_dtype
 from logbook import Logger
 from numpy import (
+    empty,
     iinfo,
     uint32,
 )
+from six import iteritems
 
 UINT32_MAX = iinfo(uint32).max
 
@@ -102,20 +106,36 @@ class ExchangePricingLoader(PipelineLoader):
                 'Pipeline cannot load data with eligible assets.'
             )
 
-        exchange_names = []
-        for asset in assets:
-            if asset.exchange not in exchange_names:
-                exchange_names.append(asset.exchange)
-
-        exchange = get_exchange(exchange_names[0])
-        reader = exchange.bundle.get_reader(self.data_frequency)
-
-        raw_arrays = reader.load_raw_arrays(
-            colnames,
-            start_date,
-            end_date,
-            assets,
-        )
+        # The assets may come from several exchanges, each one with its own
+        # bundle.
+        positions = OrderedDict()
+        for index, asset in enumerate(assets):
+            positions.setdefault(asset.exchange, []).append(index)
+
+        raw_arrays = None
+        for exchange_name, indexes in iteritems(positions):
+            exchange = get_exchange(exchange_name)
+            reader = exchange.bundle.get_reader(self.data_frequency)
+
+            # One (dates x assets) block per exchange, the daily bars of
+            # all the assets come from the same columnar table.
+            exchange_arrays = reader.load_raw_arrays(
+                colnames,
+                start_date,
+                end_date,
+                [assets[index] for index in indexes],
+            )
+            if len(positions) == 1:
+                raw_arrays = exchange_arrays
+                break
+
+            if raw_arrays is None:
+                raw_arrays = [
+                    empty((len(array), len(assets)), dtype=array.dtype)
+                    for array in exchange_arrays
+                ]
+            for array, exchange_array in zip(raw_arrays, exchange_arrays):
+                array[:, indexes] = exchange_array
 
         out = {}
         for c, c_raw in zip(columns, raw_arrays):
@@ -0,0 +1,581 @@
+import itertools
+import json
+import os
+import socket
+import threading
+from collections import defaultdict
+
+import pandas as pd
+from logbook import Logger
+from six.moves import socketserver
+
+from catalyst.constants import LOG_LEVEL
+from catalyst.exchange.exchange_feed import MarketDataFeed, _get_symbol
+from catalyst.utils.paths import data_root
+
+log = Logger('MarketDataDaemon', level=LOG_LEVEL)
+
+DAEMON_CHANNELS = ('ticker', 'order_book')
+
+SOCKET_FILENAME = 'market_data.sock'
+
+
+def default_socket_path(environ=None):
+    """
+    The unix socket of the market data daemon in the data root.
+
+    Parameters
+    ----------
+    environ:
+
+    Returns
+    -------
+    str
+
+    """
+    return os.path.join(data_root(environ), SOCKET_FILENAME)
+
+
+def _to_ms(dt):
+    return None if dt is None else int(pd.Timestamp(dt).value // 10 ** 6)
+
+
+def _encode(message):
+    return (json.dumps(message) + '\n').encode('utf-8')
+
+
+class _Connection(object):
+    """A client of the daemon and its subscriptions."""
+
+    def __init__(self, sock):
+        self.sock = sock
+        self.subscriptions = set()
+        self._lock = threading.Lock()
+
+    def send(self, message):
+        with self._lock:
+            self.sock.sendall(_encode(message))
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        daemon = self.server.market_data_daemon
+        connection = _Connection(self.connection)
+        daemon.add_connection(connection)
+        try:
+            while True:
+                line = self.rfile.readline()
+                if not line:
+                    break
+
+                try:
+                    message = json.loads(line.decode('utf-8'))
+                except ValueError:
+                    log.warn('skipping invalid message: {}'.format(line))
+                    continue
+
+                daemon.handle_message(connection, message)
+
+        except socket.error:
+            pass
+
+        finally:
+            daemon.remove_connection(connection)
+
+
+class _UnixServer(socketserver.ThreadingMixIn,
+                  socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+class MarketDataDaemon(object):
+    """Shares the market data of the exchanges between the live algorithms
+    of a host.
+
+    The daemon owns the exchange connections. It polls the tickers and
+    order books of each (exchange, symbol) subscribed by any algorithm
+    once per interval and publishes them over a unix socket as the events
+    of :class:`MarketDataFeed`. The candles are fetched on request, the
+    algorithms requesting the same window share one fetch.
+
+    Parameters
+    ----------
+    exchanges: dict[str, Exchange]
+        The exchanges by name, any object implementing ``get_asset``,
+        ``tickers``, ``get_orderbook`` and ``get_candles`` like
+        :class:`Exchange`.
+    socket_path: str
+    poll_interval: str or Timedelta
+    order_book_limit: int
+        The number of levels of the published order books.
+    candles_ttl: str or Timedelta
+        How long the fetched candles are shared.
+
+    """
+
+    def __init__(self, exchanges, socket_path=None, poll_interval='5s',
+                 order_book_limit=20, candles_ttl='30s'):
+        self.exchanges = exchanges
+        self.socket_path = socket_path if socket_path is not None \
+            else default_socket_path()
+        self.poll_interval = pd.Timedelta(poll_interval).total_seconds()
+        self.order_book_limit = order_book_limit
+        self.candles_ttl = pd.Timedelta(candles_ttl)
+
+        self._connections = set()
+        self._subscribers = defaultdict(set)
+        self._latest = dict()
+        self._assets = dict()
+        self._lock = threading.RLock()
+
+        self._candles = dict()
+        self._candles_lock = threading.Lock()
+        self._fetch_locks = dict()
+
+        self._server = None
+        self._threads = []
+        self._stopped = threading.Event()
+
+    def start(self):
+        """
+        Serve the socket and poll the exchanges on background threads.
+
+        """
+        if os.path.exists(self.socket_path):
+            # The socket of a daemon which did not shut down.
+            os.remove(self.socket_path)
+
+        self._server = _UnixServer(self.socket_path, _RequestHandler)
+        self._server.market_data_daemon = self
+        self._stopped.clear()
+
+        self._threads = [
+            threading.Thread(target=self._server.serve_forever),
+            threading.Thread(target=self._poll_forever),
+        ]
+        for thread in self._threads:
+            thread.daemon = True
+            thread.start()
+
+        log.info('serving market data on {}'.format(self.socket_path))
+
+    def serve_forever(self):
+        self.start()
+        try:
+            while not self._stopped.wait(1):
+                pass
+        finally:
+            self.stop()
+
+    def stop(self):
+        self._stopped.set()
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+
+        # Disconnects the feeds, they fall back to the exchange api.
+        with self._lock:
+            connections = list(self._connections)
+        for connection in connections:
+            try:
+                connection.sock.shutdown(socket.SHUT_RDWR)
+            except socket.error:
+                pass
+
+        if os.path.exists(self.socket_path):
+            os.remove(self.socket_path)
+
+    def add_connection(self, connection):
+        with self._lock:
+            self._connections.add(connection)
+
+    def remove_connection(self, connection):
+        with self._lock:
+            self._connections.discard(connection)
+            for key in connection.subscriptions:
+                self._subscribers[key].discard(connection)
+                if not self._subscribers[key]:
+                    del self._subscribers[key]
+
+    def handle_message(self, connection, message):
+        method = message.get('method')
+        if method == 'subscribe':
+            self._subscribe(connection, message)
+
+        elif method == 'candles':
+            try:
+                result = self._get_candles(message)
+                response = dict(id=message['id'], result=result)
+            except Exception as e:
+                log.warn('unable to fetch candles: {}'.format(e))
+                response = dict(id=message['id'], error=str(e))
+
+            connection.send(response)
+
+        else:
+            log.warn('skipping unknown message: {}'.format(message))
+
+    def _subscribe(self, connection, message):
+        exchange_name = message['exchange']
+        if exchange_name not in self.exchanges:
+            log.warn('exchange {} not served'.format(exchange_name))
+            return
+
+        channels = message.get('channels') or DAEMON_CHANNELS
+        latest = []
+        with self._lock:
+            for symbol in message['symbols']:
+                for channel in channels:
+                    key = (exchange_name, symbol, channel)
+                    connection.subscriptions.add(key)
+                    self._subscribers[key].add(connection)
+                    if key in self._latest:
+                        latest.append(self._latest[key])
+
+        # The new subscribers do not wait for the next poll.
+        for event in latest:
+            connection.send(event)
+
+    def _get_asset(self, exchange_name, symbol):
+        key = (exchange_name, symbol)
+        if key not in self._assets:
+            self._assets[key] = \
+                self.exchanges[exchange_name].get_asset(symbol)
+
+        return self._assets[key]
+
+    def _publish(self, exchange_name, event):
+        key = (exchange_name, event['symbol'], event['type'])
+        with self._lock:
+            self._latest[key] = event
+            connections = list(self._subscribers.get(key, ()))
+
+        for connection in connections:
+            try:
+                connection.send(event)
+            except socket.error:
+                self.remove_connection(connection)
+
+    def _subscribed_symbols(self, exchange_name, channel):
+        with self._lock:
+            return sorted(
+                symbol for name, symbol, key_channel in self._subscribers
+                if name == exchange_name and key_channel == channel
+            )
+
+    def poll(self):
+        """
+        Poll the subscribed markets of all exchanges once.
+
+        """
+        for exchange_name, exchange in self.exchanges.items():
+            try:
+                self._poll_exchange(exchange_name, exchange)
+            except Exception as e:
+                log.warn('unable to poll {}: {}'.format(exchange_name, e))
+
+    def _poll_exchange(self, exchange_name, exchange):
+        now = _to_ms(pd.Timestamp.utcnow())
+
+        symbols = self._subscribed_symbols(exchange_name, 'ticker')
+        if symbols:
+            assets = [
+                self._get_asset(exchange_name, symbol) for symbol in symbols
+            ]
+            tickers = exchange.tickers(assets, on_ticker_error='warn')
+            for asset, ticker in tickers.items():
+                # The data is current as of the poll, like the REST api.
+                self._publish(exchange_name, dict(
+                    type='ticker',
+                    symbol=asset.symbol,
+                    timestamp=now,
+                    last_price=ticker['last_price'],
+                    volume=ticker.get('volume', 0),
+                ))
+
+        for symbol in self._subscribed_symbols(exchange_name, 'order_book'):
+            asset = self._get_asset(exchange_name, symbol)
+            book = exchange.get_orderbook(
+                asset, 'all', self.order_book_limit,
+            )
+            self._publish(exchange_name, dict(
+                type='order_book',
+                symbol=symbol,
+                timestamp=now,
+                bids=[[e['rate'], e['quantity']] for e in book['bids']],
+                asks=[[e['rate'], e['quantity']] for e in book['asks']],
+            ))
+
+    def _poll_forever(self):
+        while not self._stopped.wait(self.poll_interval):
+            self.poll()
+
+    def _get_candles(self, message):
+        exchange_name = message['exchange']
+        exchange = self.exchanges[exchange_name]
+
+        now = pd.Timestamp.utcnow()
+        end_ms = message.get('end_dt')
+        if end_ms is None:
+            # The current candles are shared for a minute.
+            end_key = _to_ms(now.floor('1min'))
+        else:
+            end_key = end_ms
+
+        def cache_key(symbol):
+            return (exchange_name, symbol, message['freq'],
+                    message['bar_count'], end_key)
+
+        # The requests of the same candles wait for the one fetching them
+        # and find them in the cache, the other requests are not blocked.
+        fetch_key = (exchange_name, message['freq'], message['bar_count'])
+        with self._candles_lock:
+            self._candles = {
+                key: value for key, value in self._candles.items()
+                if now - value[0] <= self.candles_ttl
+            }
+            fetch_lock = self._fetch_locks.setdefault(
+                fetch_key, threading.Lock()
+            )
+
+        with fetch_lock:
+            with self._candles_lock:
+                found = {
+                    symbol: self._candles[cache_key(symbol)][1]
+                    for symbol in message['symbols']
+                    if cache_key(symbol) in self._candles
+                }
+
+            missing = [
+                symbol for symbol in message['symbols']
+                if symbol not in found
+            ]
+            if missing:
+                assets = [
+                    self._get_asset(exchange_name, symbol)
+                    for symbol in missing
+                ]
+                candles = exchange.get_candles(
+                    freq=message['freq'],
+                    assets=assets,
+                    bar_count=message['bar_count'],
+                    end_dt=pd.to_datetime(end_ms, unit='ms', utc=True)
+                    if end_ms is not None else None,
+                )
+
+                fetched = dict()
+                for asset in assets:
+                    fetched[asset.symbol] = [
+                        dict(candle, last_traded=_to_ms(
+                            candle['last_traded']
+                        ))
+                        for candle in candles.get(asset, [])
+                    ]
+
+                with self._candles_lock:
+                    for symbol, symbol_candles in fetched.items():
+                        self._candles[cache_key(symbol)] = \
+                            (now, symbol_candles)
+
+                found.update(fetched)
+
+        return {symbol: found[symbol] for symbol in message['symbols']}
+
+
+class DaemonMarketDataFeed(MarketDataFeed):
+    """A feed receiving the market data of a :class:`MarketDataDaemon`.
+
+    Tickers and order books are pushed by the daemon, candles are
+    requested through :meth:`get_candles`. The exchange REST api remains
+    the fallback while the daemon is unreachable.
+
+    Parameters
+    ----------
+    exchange_name: str
+    socket_path: str, optional
+        Defaults to the socket of the daemon in the data root.
+    timeout: float
+        The seconds to wait for the candles.
+    reconnect_sleeptime: float
+        The seconds to wait before reconnecting.
+
+    """
+
+    def __init__(self, exchange_name, socket_path=None, timeout=30,
+                 reconnect_sleeptime=5, **kwargs):
+        super(DaemonMarketDataFeed, self).__init__(exchange_name, **kwargs)
+
+        self.socket_path = socket_path if socket_path is not None \
+            else default_socket_path()
+        self.timeout = timeout
+        self.reconnect_sleeptime = reconnect_sleeptime
+
+        self._symbols = set()
+        self._sock = None
+        self._send_lock = threading.Lock()
+        self._thread = None
+        self._connected = threading.Event()
+        self._wakeup = threading.Event()
+
+        self._request_ids = itertools.count()
+        self._pending = dict()
+
+    @property
+    def is_connected(self):
+        return self._connected.is_set()
+
+    def start(self):
+        self.is_running = True
+        self._wakeup.clear()
+        self._thread = threading.Thread(target=self._run)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self):
+        super(DaemonMarketDataFeed, self).stop()
+        self._wakeup.set()
+        sock = self._sock
+        if sock is not None:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except socket.error:
+                pass
+
+        if self._thread is not None:
+            self._thread.join()
+
+    def wait_connected(self, timeout=None):
+        return self._connected.wait(timeout)
+
+    def _send(self, message):
+        with self._send_lock:
+            if self._sock is None:
+                return False
+            try:
+                self._sock.sendall(_encode(message))
+                return True
+            except socket.error:
+                return False
+
+    def subscribe(self, assets):
+        symbols = [
+            _get_symbol(asset) for asset in assets
+            if _get_symbol(asset) not in self._symbols
+        ]
+        if not symbols:
+            return
+
+        self._symbols.update(symbols)
+        self._send(dict(
+            method='subscribe', exchange=self.exchange_name, symbols=symbols,
+        ))
+
+    def _run(self):
+        while self.is_running:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                sock.connect(self.socket_path)
+            except socket.error as e:
+                log.debug('market data daemon unreachable: {}'.format(e))
+                sock.close()
+                self._wakeup.wait(self.reconnect_sleeptime)
+                continue
+
+            with self._send_lock:
+                self._sock = sock
+            self._connected.set()
+            if self._symbols:
+                self._send(dict(
+                    method='subscribe',
+                    exchange=self.exchange_name,
+                    symbols=sorted(self._symbols),
+                ))
+
+            try:
+                reader = sock.makefile('rb')
+                for line in iter(reader.readline, b''):
+                    self._receive(json.loads(line.decode('utf-8')))
+
+            except (socket.error, ValueError) as e:
+                log.warn('market data daemon error: {}'.format(e))
+
+            finally:
+                self._connected.clear()
+                with self._send_lock:
+                    self._sock = None
+                sock.close()
+                for request_id in list(self._pending):
+                    self._pending[request_id][0].set()
+
+            if self.is_running:
+                log.info('reconnecting to the market data daemon')
+                self._wakeup.wait(self.reconnect_sleeptime)
+
+    def _receive(self, message):
+        if 'id' in message:
+            pending = self._pending.get(message['id'])
+            if pending is not None:
+                pending[1].append(message)
+                pending[0].set()
+        else:
+            self.process_event(message)
+
+    def get_candles(self, freq, assets, bar_count=1, start_dt=None,
+                    end_dt=None):
+        """
+        The candles of the assets, as returned by
+        :meth:`Exchange.get_candles`, None if the daemon did not return
+        them.
+
+        Parameters
+        ----------
+        freq: str
+        assets: list[TradingPair]
+        bar_count: int
+        start_dt: datetime, optional
+            Not supported by the daemon.
+        end_dt: datetime, optional
+
+        Returns
+        -------
+        dict[TradingPair, list[dict[str, Object]]]
+
+        """
+        if start_dt is not None or not self.is_connected:
+            return None
+
+        request_id = next(self._request_ids)
+        pending = self._pending[request_id] = (threading.Event(), [])
+        try:
+            sent = self._send(dict(
+                id=request_id,
+                method='candles',
+                exchange=self.exchange_name,
+                symbols=[asset.symbol for asset in assets],
+                freq=freq,
+                bar_count=bar_count,
+                end_dt=_to_ms(end_dt),
+            ))
+            if not sent or not pending[0].wait(self.timeout) or \
+                    not pending[1] or 'error' in pending[1][0]:
+                return None
+
+            result = pending[1][0]['result']
+
+        finally:
+            del self._pending[request_id]
+
+        return {
+            asset: [
+                dict(candle, last_traded=pd.to_datetime(
+                    candle['last_traded'], unit='ms', utc=True
+                ))
+                for candle in result[asset.symbol]
+            ]
+            for asset in assets
+        }
@@ -0,0 +1,554 @@
+import os
+from itertools import count
+
+import pandas as pd
+from logbook import Logger
+from six import string_types
+
+from catalyst.assets._assets import TradingPair
+from catalyst.constants import LOG_LEVEL
+from catalyst.exchange.exchange import Exchange
+from catalyst.exchange.exchange_errors import InvalidOrderStyle, \
+    OrderNotFound, SymbolNotFoundOnExchange, TickerNotFoundError
+from catalyst.exchange.exchange_execution import ExchangeLimitOrder
+from catalyst.finance.execution import MarketOrder
+from catalyst.finance.order import Order
+from catalyst.finance.transaction import Transaction
+from catalyst.gens.sim_engine import BAR, SESSION_START, SESSION_END
+from catalyst.utils.paths import ensure_directory
+
+log = Logger('replay', level=LOG_LEVEL)
+
+CANDLE_FIELDS = ['open', 'high', 'low', 'close', 'volume']
+TICKER_FIELDS = ['last_price', 'volume', 'bid', 'ask']
+ORDER_BOOK_FIELDS = ['side', 'rate', 'quantity']
+
+RECORD_FIELDS = dict(
+    candles=CANDLE_FIELDS,
+    tickers=TICKER_FIELDS,
+    order_books=ORDER_BOOK_FIELDS,
+)
+
+
+class RecordedMarketData(object):
+    """
+    The market data recorded for a replay, and the virtual time of the
+    replay.
+
+    The records of a market are csv files indexed by ``last_traded``:
+    ``{folder}/{exchange}/{symbol}/{kind}.csv``. The kinds are the minute
+    ``candles`` (labelled by their open, a candle is visible once closed),
+    the ``tickers`` and the ``order_books`` (one row per level). Only the
+    candles are required, the tickers and the order books default to
+    the last close.
+
+    Parameters
+    ----------
+    folder: str
+
+    """
+
+    def __init__(self, folder):
+        self.folder = folder
+        self.current_dt = None
+        self._records = dict()
+
+    def exchange_names(self):
+        return sorted(
+            name for name in os.listdir(self.folder)
+            if os.path.isdir(os.path.join(self.folder, name))
+        )
+
+    def symbols(self, exchange_name):
+        folder = os.path.join(self.folder, exchange_name)
+        return sorted(
+            symbol for symbol in os.listdir(folder)
+            if os.path.isfile(os.path.join(folder, symbol, 'candles.csv'))
+        )
+
+    def _path(self, exchange_name, symbol, kind):
+        return os.path.join(
+            self.folder, exchange_name, symbol, '{}.csv'.format(kind)
+        )
+
+    def get_records(self, exchange_name, symbol, kind):
+        """
+        All the records of a market.
+
+        Parameters
+        ----------
+        exchange_name: str
+        symbol: str
+        kind: str
+            candles, tickers or order_books
+
+        Returns
+        -------
+        DataFrame
+            None if nothing was recorded.
+
+        """
+        key = (exchange_name, symbol, kind)
+        if key not in self._records:
+            path = self._path(exchange_name, symbol, kind)
+            df = None
+            if os.path.isfile(path):
+                df = pd.read_csv(
+                    path, index_col='last_traded', parse_dates=True,
+                )
+                if df.index.tz is None:
+                    df.index = df.index.tz_localize('UTC')
+                df.sort_index(inplace=True, kind='mergesort')
+
+            self._records[key] = df
+
+        return self._records[key]
+
+    def write(self, exchange_name, symbol, kind, df):
+        """
+        Record the market data of a market, e.g. collected from a feed.
+
+        Parameters
+        ----------
+        exchange_name: str
+        symbol: str
+        kind: str
+            candles, tickers or order_books
+        df: DataFrame
+            Indexed by the last_traded dates.
+
+        """
+        path = self._path(exchange_name, symbol, kind)
+        ensure_directory(os.path.dirname(path))
+
+        df = df[RECORD_FIELDS[kind]].copy()
+        df.index.name = 'last_traded'
+        df.to_csv(path)
+        self._records.pop((exchange_name, symbol, kind), None)
+
+    def bounds(self):
+        """
+        The first and last minutes of the recorded candles.
+
+        Returns
+        -------
+        tuple[Timestamp, Timestamp]
+
+        """
+        starts, ends = [], []
+        for exchange_name in self.exchange_names():
+            for symbol in self.symbols(exchange_name):
+                candles = self.get_records(exchange_name, symbol, 'candles')
+                if len(candles):
+                    starts.append(candles.index[0])
+                    ends.append(candles.index[-1])
+
+        return min(starts), max(ends)
+
+    def visible(self, exchange_name, symbol, kind, dt=None):
+        """
+        The records of a market known at a date.
+
+        Parameters
+        ----------
+        exchange_name: str
+        symbol: str
+        kind: str
+        dt: Timestamp, optional
+            Defaults to the virtual time.
+
+        Returns
+        -------
+        DataFrame
+
+        """
+        df = self.get_records(exchange_name, symbol, kind)
+        if df is None:
+            return None
+
+        if dt is None:
+            dt = self.current_dt
+
+        # A candle is only known once closed, the other records as soon
+        # as they are received.
+        side = 'left' if kind == 'candles' else 'right'
+        return df.iloc[:df.index.searchsorted(dt, side=side)]
+
+
+class ReplayClock(object):
+    """
+    A drop-in replacement of the SimpleClock emitting the bars of recorded
+    market data as fast as they are processed.
+
+    Parameters
+    ----------
+    sessions: DatetimeIndex
+    market_data: RecordedMarketData
+        Its virtual time is set to each bar.
+    start: Timestamp
+    end: Timestamp
+    interval: str
+        The interval between two bars.
+
+    """
+
+    def __init__(self, sessions, market_data, start, end, interval='1T'):
+        self.sessions = sessions
+        self.market_data = market_data
+        self.start = start.floor(interval)
+        self.end = end
+        self.interval = interval
+
+    def __iter__(self):
+        self.market_data.current_dt = self.start
+        yield self.start, SESSION_START
+
+        minutes = pd.date_range(self.start, self.end, freq=self.interval)
+        for minute in minutes:
+            if minute >= self.end:
+                break
+
+            self.market_data.current_dt = minute
+            yield minute, BAR
+
+        self.market_data.current_dt = self.end
+        yield self.end, SESSION_END
+
+
+class ReplayExchange(Exchange):
+    """
+    An exchange serving recorded market data at the virtual time of the
+    replay, its orders are matched locally.
+
+    Market orders are filled when processed, at the top of the recorded
+    order book, or the last price. Limit orders are filled at their limit
+    once a later candle crosses it. The balances follow the fills.
+
+    Parameters
+    ----------
+    name: str
+    market_data: RecordedMarketData
+    quote_currency: str
+    balances: dict[str, float], optional
+        The initial total of each currency.
+    fee: float
+        The commission rate of the fills.
+
+    """
+
+    def __init__(self, name, market_data, quote_currency, balances=None,
+                 fee=0.002):
+        super(ReplayExchange, self).__init__()
+        self.name = name
+        self.market_data = market_data
+        self.quote_currency = quote_currency.lower()
+        self.fee = fee
+        self.balances = dict(balances) if balances else dict()
+
+        self.num_candles_limit = None
+        self.max_requests_per_minute = None
+
+        self._orders = dict()
+        self._trades = []
+        self._order_ids = count(1)
+
+        self.load_assets()
+
+    @property
+    def account(self):
+        return None
+
+    @property
+    def time_skew(self):
+        return pd.Timedelta('0s')
+
+    def init(self):
+        pass
+
+    def load_assets(self, is_local=False):
+        self.assets = []
+        for symbol in self.market_data.symbols(self.name):
+            candles = self.market_data.get_records(
+                self.name, symbol, 'candles'
+            )
+            self.assets.append(TradingPair(
+                symbol=symbol,
+                exchange=self.name,
+                data_source='catalyst',
+                exchange_symbol=symbol.replace('_', '').upper(),
+                start_date=candles.index[0].floor('1D'),
+                end_minute=candles.index[-1],
+                min_trade_size=0.00000001,
+                maker=self.fee,
+                taker=self.fee,
+            ))
+
+    def get_symbol(self, asset):
+        symbol = asset if isinstance(asset, string_types) else asset.symbol
+        for a in self.assets:
+            if a.symbol == symbol.lower():
+                return a.symbol
+
+        raise SymbolNotFoundOnExchange(
+            symbol=symbol,
+            exchange=self.name.title(),
+            supported_symbols=sorted([a.symbol for a in self.assets]),
+        )
+
+    def get_candles(self, freq, assets, bar_count=1, start_dt=None,
+                    end_dt=None):
+        is_single = isinstance(assets, TradingPair)
+        if is_single:
+            assets = [assets]
+
+        now = self.market_data.current_dt
+        if end_dt is None or end_dt > now:
+            end_dt = now
+
+        candles = dict()
+        for asset in assets:
+            df = self.market_data.visible(
+                self.name, asset.symbol, 'candles', end_dt
+            )
+            if freq not in ('1T', '1min'):
+                df = df.resample(freq, closed='left', label='left').agg(
+                    dict(open='first', high='max', low='min', close='last',
+                         volume='sum')
+                ).dropna()
+
+            if start_dt is not None:
+                df = df[df.index >= start_dt]
+            df = df.tail(bar_count)
+
+            candles[asset] = [
+                dict(
+                    last_traded=dt,
+                    open=row.open,
+                    high=row.high,
+                    low=row.low,
+                    close=row.close,
+                    volume=row.volume,
+                )
+                for dt, row in zip(df.index, df.itertuples())
+            ]
+
+        return candles[assets[0]] if is_single else candles
+
+    def tickers(self, assets, on_ticker_error='raise'):
+        tickers = dict()
+        for asset in assets:
+            recorded = self.market_data.visible(
+                self.name, asset.symbol, 'tickers'
+            )
+            if recorded is not None and len(recorded):
+                row = recorded.iloc[-1]
+                ticker = dict(
+                    last_traded=recorded.index[-1],
+                    last_price=row['last_price'],
+                    volume=row['volume'],
+                    bid=row['bid'],
+                    ask=row['ask'],
+                )
+            else:
+                candles = self.market_data.visible(
+                    self.name, asset.symbol, 'candles'
+                )
+                if not len(candles):
+                    if on_ticker_error == 'warn':
+                        log.warn('no ticker yet for {}'.format(asset.symbol))
+                        continue
+                    raise TickerNotFoundError(
+                        symbol=asset.symbol, exchange=self.name,
+                    )
+                row = candles.iloc[-1]
+                ticker = dict(
+                    last_traded=candles.index[-1],
+                    last_price=row['close'],
+                    volume=row['volume'],
+                    bid=row['close'],
+                    ask=row['close'],
+                )
+
+            ticker['last'] = ticker['last_price']
+            tickers[asset] = ticker
+
+        return tickers
+
+    def get_orderbook(self, asset, order_type='all', limit=None):
+        order_types = ['bids', 'asks'] if order_type == 'all' else [order_type]
+
+        recorded = self.market_data.visible(
+            self.name, asset.symbol, 'order_books'
+        )
+        if recorded is not None and len(recorded):
+            last_traded = recorded.index[-1]
+            levels = recorded.loc[recorded.index == last_traded]
+        else:
+            ticker = self.tickers([asset])[asset]
+            last_traded = ticker['last_traded']
+            levels = pd.DataFrame(dict(
+                side=['bids', 'asks'],
+                rate=[ticker['bid'], ticker['ask']],
+                quantity=[float('inf')] * 2,
+            ))
+
+        result = dict(last_traded=last_traded)
+        for side in order_types:
+            side_levels = levels[levels['side'] == side].sort_values(
+                'rate', ascending=(side == 'asks'),
+            )
+            result[side] = [
+                dict(rate=float(rate), quantity=float(quantity))
+                for rate, quantity in zip(
+                    side_levels['rate'], side_levels['quantity']
+                )
+            ][:limit]
+
+        return result
+
+    def get_balances(self):
+        balances = dict()
+        for currency, total in self.balances.items():
+            used = 0.0
+            if currency == self.quote_currency:
+                used = sum(
+                    order.open_amount * order.limit
+                    for order in self._orders.values()
+                    if order.open and order.limit is not None and
+                    order.amount > 0
+                )
+            balances[currency] = dict(
+                free=total - used, used=used, total=total,
+            )
+
+        return balances
+
+    def create_order(self, asset, amount, is_buy, style):
+        if isinstance(style, ExchangeLimitOrder):
+            limit = style.get_limit_price(is_buy)
+        elif isinstance(style, MarketOrder):
+            limit = None
+        else:
+            raise InvalidOrderStyle(
+                exchange=self.name,
+                style=style.__class__.__name__
+            )
+
+        order = Order(
+            dt=self.market_data.current_dt,
+            asset=asset,
+            amount=amount,
+            limit=limit,
+            id='{}-{}'.format(self.name, next(self._order_ids)),
+        )
+        self._orders[order.id] = order
+        return order
+
+    def _fill_price(self, order):
+        if order.limit is None:
+            book = self.get_orderbook(
+                order.asset, 'asks' if order.amount > 0 else 'bids', 1,
+            )
+            levels = book['asks' if order.amount > 0 else 'bids']
+            if levels:
+                return levels[0]['rate']
+
+            return self.tickers([order.asset])[order.asset]['last_price']
+
+        candles = self.market_data.visible(
+            self.name, order.asset.symbol, 'candles'
+        )
+        candles = candles[candles.index >= order.dt.floor('1T')]
+        if order.amount > 0 and (candles['low'] <= order.limit).any():
+            return order.limit
+        if order.amount < 0 and (candles['high'] >= order.limit).any():
+            return order.limit
+
+        return None
+
+    def _match(self, order):
+        """Fill an open order if the replayed market allows it."""
+        if not order.open:
+            return None
+
+        price = self._fill_price(order)
+        if price is None:
+            return None
+
+        amount = order.open_amount
+        commission = abs(amount) * price * self.fee
+        asset = order.asset
+
+        quote = self.balances.get(asset.quote_currency, 0.0)
+        base = self.balances.get(asset.base_currency, 0.0)
+        self.balances[asset.quote_currency] = \
+            quote - amount * price - commission
+        self.balances[asset.base_currency] = base + amount
+
+        dt = self.market_data.current_dt
+        order.filled += amount
+        order.commission = (order.commission or 0) + commission
+        order.broker_order_id = order.id
+
+        trade = Transaction(
+            asset=asset,
+            amount=amount,
+            dt=dt,
+            price=price,
+            order_id=order.id,
+            commission=commission,
+            fee_currency=asset.quote_currency,
+            is_quote_live=(asset.quote_currency == self.quote_currency),
+        )
+        self._trades.append(trade)
+        return trade
+
+    def process_order(self, order):
+        replay_order = self._orders.get(order.id)
+        if replay_order is None:
+            return []
+
+        trade = self._match(replay_order)
+        if trade is None:
+            return []
+
+        order.filled = replay_order.filled
+        order.commission = replay_order.commission
+        order.broker_order_id = replay_order.broker_order_id
+        return [trade]
+
+    def get_open_orders(self, asset=None):
+        return [
+            order for order in self._orders.values()
+            if order.open and (asset is None or order.asset == asset)
+        ]
+
+    def get_order(self, order_id, symbol_or_asset=None,
+                  return_price=False, params={}):
+        if order_id not in self._orders:
+            raise OrderNotFound(order_id=order_id, exchange=self.name)
+
+        order = self._orders[order_id]
+        if not return_price:
+            return order
+
+        prices = [t.price for t in self._trades if t.order_id == order_id]
+        return order, prices[-1] if prices else None
+
+    def cancel_order(self, order_param, symbol_or_asset=None, params={}):
+        order_id = order_param.id \
+            if isinstance(order_param, Order) else order_param
+        if order_id not in self._orders:
+            raise OrderNotFound(order_id=order_id, exchange=self.name)
+
+        self._orders[order_id].cancel()
+
+    def get_account(self):
+        return None
+
+    def get_trades(self, asset, my_trades=True, start_dt=None, limit=100):
+        trades = [t for t in self._trades if t.asset == asset]
+        if start_dt is not None:
+            trades = [t for t in trades if t.dt >= start_dt]
+
+        return trades[-limit:]
@@ -0,0 +1,247 @@
+import numpy as np
+
+from catalyst.finance.transaction import create_transaction
+
+
+class SimulatedOrderBook(object):
+    """
+    The open orders of a simulated blotter in columnar arrays, filled by
+    batches against the OHLC snapshot of the bar.
+
+    The fills are the same as the ones of TradingPairFixedSlippage and
+    TradingPairFeeSchedule applied to each order, but the resting orders
+    cost a few array operations instead of a slippage simulation each.
+
+    The arrays are rebuilt when the open orders of the blotter change.
+    The Order objects remain the reference, the triggers and fills
+    computed here are written back to them.
+    """
+
+    def __init__(self):
+        self._key = None
+
+        self.orders = []
+        self.assets = []
+
+        self.asset_index = None
+        self.group_start = None
+        self.amount = None
+        self.filled = None
+        self.limit = None
+        self.stop = None
+        self.has_limit = None
+        self.has_stop = None
+        self.limit_reached = None
+        self.stop_reached = None
+
+    def invalidate(self):
+        """Rebuild the arrays on the next bar, e.g. after a split."""
+        self._key = None
+
+    def sync(self, open_orders):
+        """
+        Rebuild the arrays if the open orders changed.
+
+        Parameters
+        ----------
+        open_orders: dict[TradingPair, list[Order]]
+
+        """
+        key = tuple(
+            id(order)
+            for asset_orders in open_orders.values()
+            for order in asset_orders
+        )
+        if key == self._key:
+            return
+
+        self._key = key
+        self.orders = []
+        self.assets = []
+
+        asset_index = []
+        group_start = []
+        for asset, asset_orders in open_orders.items():
+            if not asset_orders:
+                continue
+
+            start = len(self.orders)
+            for order in asset_orders:
+                self.orders.append(order)
+                asset_index.append(len(self.assets))
+                group_start.append(start)
+
+            self.assets.append(asset)
+
+        orders = self.orders
+        self.asset_index = np.array(asset_index, dtype=np.int64)
+        self.group_start = np.array(group_start, dtype=np.int64)
+        self.amount = np.array([o.amount for o in orders], dtype=np.float64)
+        self.filled = np.array([o.filled for o in orders], dtype=np.float64)
+        self.has_limit = np.array(
+            [o.limit is not None for o in orders], dtype=bool
+        )
+        self.has_stop = np.array(
+            [o.stop is not None for o in orders], dtype=bool
+        )
+        self.limit = np.array(
+            [o.limit if o.limit is not None else np.nan for o in orders],
+            dtype=np.float64,
+        )
+        self.stop = np.array(
+            [o.stop if o.stop is not None else np.nan for o in orders],
+            dtype=np.float64,
+        )
+        self.limit_reached = np.array(
+            [o.limit_reached for o in orders], dtype=bool
+        )
+        self.stop_reached = np.array(
+            [o.stop_reached for o in orders], dtype=bool
+        )
+
+    def _current(self, bar_data, field):
+        return np.asarray(
+            bar_data.current(self.assets, field), dtype=np.float64
+        )[self.asset_index]
+
+    def _check_triggers(self, active, trigger_price, dt):
+        """Order.check_triggers applied to all the orders at once."""
+        buy = self.amount > 0
+        price = trigger_price
+
+        with np.errstate(invalid='ignore'):
+            stop_cross = np.where(
+                buy, price >= self.stop, price <= self.stop
+            )
+            limit_cross = np.where(
+                buy, price <= self.limit, price >= self.limit
+            )
+
+        was_triggered = (~self.has_stop | self.stop_reached) & \
+            (~self.has_limit | self.limit_reached)
+        checked = active & ~was_triggered
+
+        # A stop limit order becomes a limit order once its stop is reached.
+        sl_stop_reached = checked & self.has_stop & self.has_limit & \
+            stop_cross
+        stop_reached = self.has_stop & ~self.has_limit & stop_cross
+        limit_reached = self.has_limit & np.where(
+            self.has_stop, stop_cross & limit_cross, limit_cross,
+        )
+
+        changed = checked & (
+            (stop_reached != self.stop_reached) |
+            (limit_reached != self.limit_reached)
+        )
+        self.stop_reached = np.where(checked, stop_reached, self.stop_reached)
+        self.limit_reached = np.where(
+            checked, limit_reached, self.limit_reached
+        )
+        self.has_stop = self.has_stop & ~sl_stop_reached
+        self.stop[sl_stop_reached] = np.nan
+
+        for row in np.flatnonzero(changed | sl_stop_reached):
+            order = self.orders[row]
+            if changed[row]:
+                order.dt = dt
+            order.stop_reached = bool(self.stop_reached[row])
+            order.limit_reached = bool(self.limit_reached[row])
+            if sl_stop_reached[row]:
+                order.stop = None
+
+    def simulate(self, bar_data, slippage, commission):
+        """
+        Fill the open orders against the current bar.
+
+        Parameters
+        ----------
+        bar_data: BarData
+        slippage: TradingPairFixedSlippage
+        commission: TradingPairFeeSchedule
+
+        Returns
+        -------
+        list[tuple[Order, Transaction, float]]
+            The filled orders, in the order of the blotter, with their
+            transaction and commission.
+
+        """
+        if not self.orders:
+            return []
+
+        open_price = self._current(bar_data, 'open')
+        high = self._current(bar_data, 'high')
+        low = self._current(bar_data, 'low')
+        dt = bar_data.current_dt
+
+        active = (self.amount - self.filled) != 0
+
+        # The limit orders are triggered by the low of the bar for a buy and
+        # its high for a sell. The other orders are checked against the
+        # price of the last limit order before them, or the open.
+        rows = np.arange(len(self.orders))
+        own_price = np.where(self.amount >= 0, low, high)
+        last_limit = np.maximum.accumulate(
+            np.where(active & self.has_limit, rows, -1)
+        )
+        trigger_price = np.where(
+            last_limit >= self.group_start,
+            own_price[np.maximum(last_limit, 0)],
+            open_price,
+        )
+        self._check_triggers(active, trigger_price, dt)
+
+        triggered = active & (~self.has_stop | self.stop_reached) & \
+            (~self.has_limit | self.limit_reached)
+        fill_rows = np.flatnonzero(triggered)
+        if not len(fill_rows):
+            return []
+
+        # The prices of TradingPairFixedSlippage.process_order.
+        amount = self.amount[fill_rows]
+        limit = self.limit[fill_rows]
+        has_limit = self.has_limit[fill_rows]
+        opened = open_price[fill_rows]
+        with np.errstate(invalid='ignore'):
+            price = np.where(
+                has_limit,
+                np.where(
+                    amount >= 0,
+                    np.where(opened < limit, opened, limit),
+                    np.where(opened > limit, opened, limit),
+                ),
+                opened,
+            )
+            price = np.where(
+                amount > 0,
+                price * (1 + slippage.slippage),
+                price * (1 - slippage.slippage),
+            )
+
+            # The fees of TradingPairFeeSchedule.calculate.
+            maker, taker = zip(*[
+                commission.get_maker_taker(asset) for asset in self.assets
+            ])
+            asset_index = self.asset_index[fill_rows]
+            is_maker = has_limit & self.limit_reached[fill_rows] & (
+                ((amount > 0) & (limit < price)) |
+                ((amount < 0) & (limit > price))
+            )
+            rate = np.where(
+                is_maker,
+                np.array(maker, dtype=np.float64)[asset_index],
+                np.array(taker, dtype=np.float64)[asset_index],
+            )
+            fees = np.abs(amount) * price * rate
+
+        fills = []
+        for row, fill_price, fee in zip(fill_rows, price, fees):
+            order = self.orders[row]
+            transaction = create_transaction(
+                order, dt, float(fill_price), order.amount
+            )
+            fills.append((order, transaction, float(fee)))
+
+            self.filled[row] += order.amount
+
+        return fills
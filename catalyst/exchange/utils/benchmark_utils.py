@@ -0,0 +1,285 @@
+import os
+
+import numpy as np
+import pandas as pd
+from logbook import Logger
+from six import string_types
+
+from catalyst.constants import LOG_LEVEL
+from catalyst.data.minute_bars import BcolzMinuteBarMetadata
+from catalyst.exchange.exchange_bcolz import reader_registry
+from catalyst.exchange.exchange_errors import InvalidBenchmarkError, \
+    PricingDataNotLoadedError
+from catalyst.exchange.utils.exchange_utils import get_exchange_folder, \
+    get_sid
+from catalyst.utils.calendars import get_calendar
+from catalyst.utils.paths import ensure_directory
+
+log = Logger('benchmark_utils', level=LOG_LEVEL)
+
+# The benchmark of the crypto backtests unless specified.
+DEFAULT_BENCHMARK = 'bitfinex:btc_usd'
+
+ZERO_BENCHMARKS = ('zero', 'none')
+
+
+def _session_bounds(start_dt, end_dt):
+    start_dt = pd.Timestamp(start_dt).floor('1d')
+    end_dt = pd.Timestamp(end_dt).floor('1d')
+    if start_dt.tzinfo is None:
+        start_dt = start_dt.tz_localize('UTC')
+    if end_dt.tzinfo is None:
+        end_dt = end_dt.tz_localize('UTC')
+
+    return start_dt, end_dt
+
+
+class ConstantBenchmark(object):
+    """
+    A benchmark returning the same amount every session.
+
+    Parameters
+    ----------
+    daily_return: float
+
+    """
+
+    def __init__(self, daily_return=0.0):
+        self.daily_return = float(daily_return)
+
+    def __repr__(self):
+        return 'ConstantBenchmark({})'.format(self.daily_return)
+
+    def get_returns(self, start_dt, end_dt):
+        """
+        The daily returns of the benchmark.
+
+        Parameters
+        ----------
+        start_dt: datetime
+        end_dt: datetime
+
+        Returns
+        -------
+        Series
+
+        """
+        start_dt, end_dt = _session_bounds(start_dt, end_dt)
+        sessions = get_calendar('OPEN').sessions_in_range(start_dt, end_dt)
+
+        return pd.Series(self.daily_return, index=sessions)
+
+
+class BundleBenchmark(object):
+    """
+    The returns of a trading pair read from the daily bundle of its
+    exchange, without connecting to the exchange.
+
+    The returns of a range are memoized on disk until the bundle is
+    written again.
+
+    Parameters
+    ----------
+    exchange_name: str
+    symbol: str
+        The catalyst symbol of the trading pair, e.g. btc_usd.
+    bundle_path: str, optional
+        Defaults to the daily bundle of the exchange.
+    cache_folder: str, optional
+        Defaults to the benchmarks folder of the exchange.
+
+    """
+
+    def __init__(self, exchange_name, symbol, bundle_path=None,
+                 cache_folder=None):
+        self.exchange_name = exchange_name
+        self.symbol = symbol.lower()
+
+        if bundle_path is None or cache_folder is None:
+            exchange_folder = get_exchange_folder(exchange_name)
+            if bundle_path is None:
+                bundle_path = os.path.join(exchange_folder, 'daily_bundle')
+            if cache_folder is None:
+                cache_folder = os.path.join(exchange_folder, 'benchmarks')
+
+        self.bundle_path = bundle_path
+        self.cache_folder = cache_folder
+
+    def __repr__(self):
+        return 'BundleBenchmark({}:{})'.format(
+            self.exchange_name, self.symbol,
+        )
+
+    def _bundle_version(self):
+        try:
+            return os.stat(
+                BcolzMinuteBarMetadata.metadata_path(self.bundle_path)
+            ).st_mtime
+        except OSError:
+            return None
+
+    def _cache_path(self, start_dt, end_dt):
+        return os.path.join(self.cache_folder, '{}_{}_{}.pickle'.format(
+            self.symbol,
+            start_dt.strftime('%Y%m%d'),
+            end_dt.strftime('%Y%m%d'),
+        ))
+
+    def _not_loaded(self, start_dt, end_dt):
+        return PricingDataNotLoadedError(
+            field='close',
+            first_trading_day=start_dt,
+            exchange=self.exchange_name,
+            symbols=self.symbol,
+            symbol_list=self.symbol,
+            data_frequency='daily',
+            start_dt=start_dt,
+            end_dt=end_dt,
+        )
+
+    def _read_returns(self, reader, start_dt, end_dt):
+        sid = get_sid(self.symbol)
+        if not os.path.isdir(reader.sidpath(sid)):
+            raise self._not_loaded(start_dt, end_dt)
+
+        # The close of the previous session gives the return of the first
+        # session of the range.
+        first = max(start_dt - pd.Timedelta(days=1), reader.first_trading_day)
+        last = min(end_dt, reader.last_available_dt.floor('1d'))
+        if first > last:
+            raise self._not_loaded(start_dt, end_dt)
+
+        closes = reader.load_raw_arrays(
+            fields=['close'],
+            start_dt=first,
+            end_dt=last,
+            sids=[sid],
+        )[0][:, 0]
+        closes = pd.Series(
+            closes,
+            index=reader.calendar.sessions_in_range(first, last),
+        )
+        if np.isnan(closes.values).any() or first > start_dt or \
+                last < end_dt:
+            log.warn(
+                'the bundle of {} misses some prices of {} between {} and '
+                '{}, their benchmark returns are 0'.format(
+                    self.exchange_name, self.symbol, start_dt, end_dt
+                )
+            )
+
+        sessions = get_calendar('OPEN').sessions_in_range(start_dt, end_dt)
+        returns = closes.fillna(method='ffill').pct_change()
+
+        return returns.reindex(sessions).fillna(0)
+
+    def get_returns(self, start_dt, end_dt):
+        """
+        The daily returns of the benchmark.
+
+        Parameters
+        ----------
+        start_dt: datetime
+        end_dt: datetime
+
+        Returns
+        -------
+        Series
+
+        """
+        start_dt, end_dt = _session_bounds(start_dt, end_dt)
+
+        version = self._bundle_version()
+        if version is None:
+            raise self._not_loaded(start_dt, end_dt)
+
+        path = self._cache_path(start_dt, end_dt)
+        try:
+            cached = pd.read_pickle(path)
+            if cached['version'] == version:
+                return cached['returns']
+
+        except Exception:
+            pass
+
+        reader = reader_registry.acquire(self.bundle_path, 'daily')
+        if reader is None:
+            raise self._not_loaded(start_dt, end_dt)
+
+        try:
+            returns = self._read_returns(reader, start_dt, end_dt)
+        finally:
+            reader_registry.release(reader)
+
+        ensure_directory(self.cache_folder)
+        temp_path = '{}.tmp'.format(path)
+        pd.to_pickle(dict(version=version, returns=returns), temp_path)
+        os.rename(temp_path, path)
+
+        return returns
+
+
+def get_benchmark(benchmark=None):
+    """
+    Resolve a benchmark.
+
+    Parameters
+    ----------
+    benchmark: str or float, optional
+        A constant daily return, 'zero', or a trading pair with its
+        exchange, e.g. 'bitfinex:btc_usd'. Defaults to DEFAULT_BENCHMARK.
+
+    Returns
+    -------
+    ConstantBenchmark or BundleBenchmark
+
+    """
+    if benchmark is None:
+        benchmark = DEFAULT_BENCHMARK
+
+    if isinstance(benchmark, (ConstantBenchmark, BundleBenchmark)):
+        return benchmark
+
+    if not isinstance(benchmark, string_types):
+        try:
+            return ConstantBenchmark(benchmark)
+        except (TypeError, ValueError):
+            raise InvalidBenchmarkError(benchmark=benchmark)
+
+    spec = benchmark.strip()
+    if spec.lower() in ZERO_BENCHMARKS:
+        return ConstantBenchmark(0)
+
+    try:
+        return ConstantBenchmark(spec)
+    except ValueError:
+        pass
+
+    try:
+        exchange_name, symbol = spec.split(':')
+    except ValueError:
+        raise InvalidBenchmarkError(benchmark=benchmark)
+
+    if not exchange_name or '_' not in symbol:
+        raise InvalidBenchmarkError(benchmark=benchmark)
+
+    return BundleBenchmark(exchange_name.lower(), symbol)
+
+
+def get_benchmark_returns(benchmark, start_dt, end_dt):
+    """
+    The daily returns of a benchmark for the sessions of a backtest.
+
+    Parameters
+    ----------
+    benchmark: str or float
+        See get_benchmark.
+    start_dt: datetime
+    end_dt: datetime
+
+    Returns
+    -------
+    Series
+
+    """
+    return get_benchmark(benchmark).get_returns(start_dt, end_dt)
@@ -0,0 +1,173 @@
+import threading
+from collections import OrderedDict
+from itertools import count
+from time import time
+
+from logbook import Logger
+
+from catalyst.constants import LOG_LEVEL
+
+log = Logger('persistence_worker', level=LOG_LEVEL)
+
+# The number of ordered tasks pending before the trading thread waits.
+MAX_PENDING = 256
+
+
+class PersistenceWorker(object):
+    """
+    Writes the stats and state of a live algorithm on a background thread.
+
+    The trading thread submits tasks holding snapshots which are not
+    mutated afterwards, e.g. a copy of the frame stats or the pickled
+    state, and the worker runs them in order.
+
+    A task submitted with a key replaces the pending task of the same key:
+    when the writes are slower than the bars, the intermediate snapshots
+    of the stats csv or the S3 upload are dropped and only the latest one
+    is written. The tasks without a key, the journal records, are never
+    dropped, the trading thread waits when ``max_pending`` of them are
+    pending.
+
+    Parameters
+    ----------
+    max_pending: int
+        The number of ordered tasks pending before `submit` blocks.
+    name: str
+        The name of the thread.
+
+    """
+
+    def __init__(self, max_pending=MAX_PENDING, name='persistence'):
+        self.max_pending = max_pending
+        self.name = name
+
+        self.dropped = 0
+
+        self._tasks = OrderedDict()
+        self._ordered = 0
+        self._sequence = count()
+        self._running = False
+        self._stopped = False
+        self._condition = threading.Condition()
+        self._thread = None
+
+    @property
+    def pending(self):
+        with self._condition:
+            return len(self._tasks) + (1 if self._running else 0)
+
+    def start(self):
+        if self._thread is not None:
+            return
+
+        self._thread = threading.Thread(target=self._run, name=self.name)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def submit(self, func, args=(), key=None):
+        """
+        Schedule a write.
+
+        Parameters
+        ----------
+        func: callable
+        args: tuple
+            The arguments of func, they must not be mutated by the caller
+            afterwards.
+        key: str, optional
+            The pending task of the same key is replaced by this one.
+
+        """
+        with self._condition:
+            stopped = self._stopped
+            if not stopped:
+                ordered = key is None
+                if ordered:
+                    while self._ordered >= self.max_pending:
+                        self._condition.wait()
+
+                    key = (None, next(self._sequence))
+                    self._ordered += 1
+
+                elif key in self._tasks:
+                    self.dropped += 1
+
+                # Replacing a key keeps its position in the queue.
+                self._tasks[key] = (func, args, ordered)
+                self._condition.notify_all()
+                self.start()
+
+        if stopped:
+            # The writes submitted after the shutdown are done inline.
+            self._execute(func, args)
+
+    def flush(self, timeout=None):
+        """
+        Wait until the tasks submitted so far are written.
+
+        Parameters
+        ----------
+        timeout: float, optional
+            The maximum number of seconds to wait.
+
+        Returns
+        -------
+        bool
+            Whether all the tasks were written.
+
+        """
+        deadline = time() + timeout if timeout is not None else None
+        with self._condition:
+            while self._tasks or self._running:
+                remaining = deadline - time() if deadline is not None \
+                    else None
+                if remaining is not None and remaining <= 0:
+                    log.warn(
+                        '{} writes of the algo state still pending'.format(
+                            len(self._tasks)
+                        )
+                    )
+                    return False
+
+                self._condition.wait(remaining)
+
+            return True
+
+    def stop(self, timeout=None):
+        """Flush the pending tasks and stop the thread."""
+        flushed = self.flush(timeout)
+        with self._condition:
+            self._stopped = True
+            self._condition.notify_all()
+
+        return flushed
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._tasks and not self._stopped:
+                    self._condition.wait()
+
+                if not self._tasks:
+                    return
+
+                _, (func, args, ordered) = self._tasks.popitem(last=False)
+                if ordered:
+                    self._ordered -= 1
+
+                self._running = True
+                self._condition.notify_all()
+
+            try:
+                self._execute(func, args)
+            finally:
+                with self._condition:
+                    self._running = False
+                    self._condition.notify_all()
+
+    @staticmethod
+    def _execute(func, args):
+        try:
+            func(*args)
+        except Exception as e:
+            log.warn('unable to persist the algo state: {}'.format(e))
@@ -0,0 +1,440 @@
+import copy
+import heapq
+import itertools
+import json
+import os
+import threading
+import time
+
+from logbook import Logger
+
+from catalyst.constants import LOG_LEVEL
+
+try:
+    import fcntl
+except ImportError:
+    # Windows, the requests are not coordinated across the processes.
+    fcntl = None
+
+log = Logger('request_scheduler', level=LOG_LEVEL)
+
+# The priority classes, the requests of the lowest class are sent first.
+PRIORITY_ORDERS = 0
+PRIORITY_BALANCES = 1
+PRIORITY_TICKERS = 2
+PRIORITY_CANDLES = 3
+
+# The ccxt methods sending requests: their priority class, their weight in
+# tokens and whether identical requests in flight can share a response.
+ENDPOINTS = dict(
+    create_order=(PRIORITY_ORDERS, 1, False),
+    cancel_order=(PRIORITY_ORDERS, 1, False),
+    fetch_order=(PRIORITY_ORDERS, 1, True),
+    fetch_orders=(PRIORITY_ORDERS, 2, True),
+    fetch_open_orders=(PRIORITY_ORDERS, 2, True),
+    fetch_closed_orders=(PRIORITY_ORDERS, 2, True),
+    fetch_my_trades=(PRIORITY_ORDERS, 2, True),
+    fetch_balance=(PRIORITY_BALANCES, 1, True),
+    fetch_ticker=(PRIORITY_TICKERS, 1, True),
+    fetch_tickers=(PRIORITY_TICKERS, 4, True),
+    fetch_order_book=(PRIORITY_TICKERS, 1, True),
+    fetch_trades=(PRIORITY_TICKERS, 1, True),
+    fetch_ohlcv=(PRIORITY_CANDLES, 1, True),
+    fetch_markets=(PRIORITY_CANDLES, 1, True),
+    load_markets=(PRIORITY_CANDLES, 1, True),
+)
+
+# The number of tokens which can be spent in a burst.
+DEFAULT_CAPACITY = 5
+
+# The seconds without requests after the exchange throttled us, per token
+# of the bucket.
+BACKOFF_INTERVALS = 10
+
+
+class FileLockCoordinator(object):
+    """
+    Shares a token bucket between the processes of a host through a
+    state file locked with flock.
+
+    Parameters
+    ----------
+    path: str
+        The state file, one per exchange.
+
+    """
+
+    def __init__(self, path):
+        self.path = path
+
+    def take(self, weight, rate, capacity, now):
+        """
+        Take tokens from the shared bucket.
+
+        Parameters
+        ----------
+        weight: float
+        rate: float
+            The tokens added per second.
+        capacity: float
+        now: float
+
+        Returns
+        -------
+        float
+            The seconds to wait before trying again, 0 if the tokens were
+            taken.
+
+        """
+        with open(self.path, 'a+') as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                f.seek(0)
+                try:
+                    state = json.loads(f.read())
+                except ValueError:
+                    state = dict(tokens=capacity, updated=now)
+
+                tokens = min(
+                    capacity,
+                    state['tokens'] + (now - state['updated']) * rate,
+                )
+                if tokens >= weight:
+                    tokens -= weight
+                    delay = 0
+                else:
+                    delay = (weight - tokens) / rate
+
+                f.seek(0)
+                f.truncate()
+                f.write(json.dumps(dict(tokens=tokens, updated=now)))
+                f.flush()
+
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+        return delay
+
+
+class _InFlight(object):
+    def __init__(self):
+        self.done = threading.Event()
+        self.followers = 0
+        self.result = None
+        self.error = None
+
+
+class RequestScheduler(object):
+    """
+    Paces the requests sent to an exchange by all the threads, and
+    optionally all the processes, of a host.
+
+    The requests take tokens from a bucket refilled at the rate limit of
+    the exchange. When the bucket is empty, the waiting requests are
+    released by priority class, orders before balances before tickers
+    before candles. Identical requests in flight share the response of
+    the first one.
+
+    Parameters
+    ----------
+    interval: float
+        The seconds between two requests of weight 1 once the bucket is
+        empty.
+    capacity: float
+        The number of tokens of the bucket.
+    coordinator: FileLockCoordinator, optional
+        Shares the bucket with the other processes.
+    clock: callable, optional
+    sleep: callable, optional
+
+    """
+
+    def __init__(self, interval, capacity=DEFAULT_CAPACITY, coordinator=None,
+                 clock=time.time, sleep=time.sleep):
+        self.rate = 1.0 / interval if interval > 0 else float('inf')
+        self.capacity = float(capacity)
+        self.coordinator = coordinator
+
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._blocked_until = 0
+
+        self._condition = threading.Condition()
+        self._waiting = []
+        self._counter = itertools.count()
+
+        self._in_flight = dict()
+        self._in_flight_lock = threading.Lock()
+
+    def _refill(self, now):
+        if self.rate == float('inf'):
+            self._tokens = self.capacity
+        else:
+            self._tokens = min(
+                self.capacity,
+                self._tokens + (now - self._updated) * self.rate,
+            )
+        self._updated = now
+
+    def _take(self, weight):
+        """The seconds to wait before the tokens can be taken."""
+        now = self._clock()
+        if now < self._blocked_until:
+            return self._blocked_until - now
+
+        self._refill(now)
+        if self._tokens < weight:
+            return (weight - self._tokens) / self.rate
+
+        if self.coordinator is not None:
+            delay = self.coordinator.take(
+                weight, self.rate, self.capacity, now,
+            )
+            if delay > 0:
+                return delay
+
+        self._tokens -= weight
+        return 0
+
+    def acquire(self, weight=1, priority=PRIORITY_CANDLES):
+        """
+        Block until a request can be sent.
+
+        Parameters
+        ----------
+        weight: float
+            The tokens of the request.
+        priority: int
+            The priority class of the request.
+
+        Returns
+        -------
+        float
+            The seconds spent waiting.
+
+        """
+        entry = (priority, next(self._counter))
+        waited = 0
+
+        with self._condition:
+            heapq.heappush(self._waiting, entry)
+            try:
+                slept = False
+                while True:
+                    delay = None
+                    # Only the first request in order of priority may take
+                    # the tokens.
+                    if self._waiting[0] == entry:
+                        delay = self._take(weight)
+                        if delay <= 0:
+                            return waited
+
+                    # The condition does not wait in the clock of the
+                    # scheduler, the lock is released while sleeping.
+                    if delay is None:
+                        if slept:
+                            # A request of higher priority arrived while
+                            # sleeping, it might be waiting for us.
+                            self._condition.notify_all()
+                            slept = False
+                        self._condition.wait()
+                    else:
+                        self._condition.release()
+                        try:
+                            self._sleep(delay)
+                        finally:
+                            self._condition.acquire()
+                        waited += delay
+                        slept = True
+
+            finally:
+                self._waiting.remove(entry)
+                heapq.heapify(self._waiting)
+                self._condition.notify_all()
+
+    def backoff(self, seconds=None):
+        """
+        Stop sending requests for a while, e.g. after the exchange
+        throttled us.
+
+        Parameters
+        ----------
+        seconds: float, optional
+            Defaults to BACKOFF_INTERVALS times the rate limit interval.
+
+        """
+        if seconds is None:
+            seconds = BACKOFF_INTERVALS / self.rate
+
+        with self._condition:
+            self._tokens = 0
+            self._blocked_until = max(
+                self._blocked_until, self._clock() + seconds,
+            )
+
+        log.warn('pausing the requests for {:.1f} seconds'.format(seconds))
+
+    def call(self, method, args=(), kwargs=None, weight=1,
+             priority=PRIORITY_CANDLES, coalesce=False, key=None):
+        """
+        Send a request once scheduled.
+
+        Parameters
+        ----------
+        method: callable
+        args: tuple
+        kwargs: dict
+        weight: float
+        priority: int
+        coalesce: bool
+            Whether an identical request in flight can share its response.
+        key: hashable, optional
+            Identifies identical requests.
+
+        Returns
+        -------
+        Object
+            The response of the method.
+
+        """
+        if kwargs is None:
+            kwargs = dict()
+
+        if not coalesce:
+            self.acquire(weight, priority)
+            return method(*args, **kwargs)
+
+        if key is None:
+            key = (method, repr(args), repr(sorted(kwargs.items())))
+
+        with self._in_flight_lock:
+            flight = self._in_flight.get(key)
+            is_leader = flight is None
+            if is_leader:
+                flight = self._in_flight[key] = _InFlight()
+            else:
+                flight.followers += 1
+
+        if not is_leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+
+            # The callers may modify their response, the followers copy a
+            # snapshot which nobody modifies.
+            return copy.deepcopy(flight.result)
+
+        result = None
+        try:
+            self.acquire(weight, priority)
+            result = method(*args, **kwargs)
+            return result
+
+        except Exception as e:
+            flight.error = e
+            raise
+
+        finally:
+            with self._in_flight_lock:
+                del self._in_flight[key]
+
+            # No follower can join once the request left the flights.
+            if flight.error is None and flight.followers:
+                flight.result = copy.deepcopy(result)
+            flight.done.set()
+
+
+class ScheduledExchangeAPI(object):
+    """
+    Sends the requests of a ccxt exchange through a scheduler, the other
+    attributes are those of the exchange.
+
+    Parameters
+    ----------
+    api: ccxt.Exchange
+    scheduler: RequestScheduler
+    backoff_exceptions: tuple[type]
+        The errors raised when the exchange throttles the requests.
+
+    """
+
+    def __init__(self, api, scheduler, backoff_exceptions=()):
+        object.__setattr__(self, '_api', api)
+        object.__setattr__(self, '_scheduler', scheduler)
+        object.__setattr__(self, '_backoff_exceptions', backoff_exceptions)
+
+    @property
+    def scheduler(self):
+        return self._scheduler
+
+    def __getattr__(self, name):
+        value = getattr(self._api, name)
+        if name not in ENDPOINTS or not callable(value):
+            return value
+
+        priority, weight, coalesce = ENDPOINTS[name]
+
+        def scheduled(*args, **kwargs):
+            try:
+                return self._scheduler.call(
+                    value, args, kwargs,
+                    weight=weight,
+                    priority=priority,
+                    coalesce=coalesce,
+                    # The responses of the authenticated endpoints belong
+                    # to the account of the api.
+                    key=(
+                        id(self._api),
+                        name,
+                        repr(args),
+                        repr(sorted(kwargs.items())),
+                    ),
+                )
+            except self._backoff_exceptions:
+                self._scheduler.backoff()
+                raise
+
+        return scheduled
+
+    def __setattr__(self, name, value):
+        setattr(self._api, name, value)
+
+
+_schedulers = dict()
+_schedulers_lock = threading.Lock()
+
+
+def get_scheduler(exchange_name, interval, shared_folder=None):
+    """
+    The scheduler of an exchange, shared by its instances in the process.
+
+    Parameters
+    ----------
+    exchange_name: str
+    interval: float
+        The rate limit interval of the exchange in seconds.
+    shared_folder: str, optional
+        The folder of the state files coordinating the processes, the
+        processes are not coordinated if None.
+
+    Returns
+    -------
+    RequestScheduler
+
+    """
+    with _schedulers_lock:
+        scheduler = _schedulers.get(exchange_name)
+        if scheduler is None:
+            coordinator = None
+            if shared_folder is not None and fcntl is not None:
+                coordinator = FileLockCoordinator(os.path.join(
+                    shared_folder, '{}.rate_limit'.format(exchange_name),
+                ))
+
+            scheduler = _schedulers[exchange_name] = RequestScheduler(
+                interval, coordinator=coordinator,
+            )
+
+        return scheduler
@@ -0,0 +1,395 @@
+import os
+import pickle
+import struct
+import zlib
+
+import logbook
+
+from catalyst.constants import LOG_LEVEL
+
+log = logbook.Logger('state_journal', level=LOG_LEVEL)
+
+# The number of bars journaled between two snapshots.
+SNAPSHOT_INTERVAL = 1440
+
+SNAPSHOT_FILENAME = 'snapshot.p'
+JOURNAL_FILENAME = 'journal.log'
+
+# The length and crc32 of each journal record.
+RECORD_HEADER = struct.Struct('<II')
+
+PERIOD_FIELDS = (
+    'pnl',
+    'returns',
+    'cash_flow',
+    'starting_value',
+    'starting_exposure',
+    'starting_cash',
+    'ending_value',
+    'ending_exposure',
+    'ending_cash',
+    'period_open',
+    'period_close',
+    'subperiod_divider',
+    '_total_intraperiod_capital_change',
+    '_payout_last_sale_prices',
+)
+
+PERIODS = ('cumulative', 'today')
+
+
+def _dumps(obj):
+    return pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def _run_inline(func, args=()):
+    func(*args)
+
+
+def _order_signature(order):
+    return (order.dt, order.status, order.filled, order.commission,
+            order.amount, order.limit, order.stop)
+
+
+def _position_signature(position):
+    return (position.amount, position.cost_basis, position.last_sale_price,
+            position.last_sale_date)
+
+
+class _PeriodCursor(object):
+    """What was journaled of a performance period."""
+
+    def __init__(self, period):
+        self.period = period
+        self.transactions = {
+            dt: len(txns)
+            for dt, txns in period.processed_transactions.items()
+        }
+        self.orders = {
+            order_id: _order_signature(order)
+            for order_id, order in period.orders_by_id.items()
+        }
+
+    def delta(self):
+        period = self.period
+
+        transactions = []
+        for dt, txns in period.processed_transactions.items():
+            count = self.transactions.get(dt, 0)
+            if len(txns) > count:
+                transactions.extend(txns[count:])
+                self.transactions[dt] = len(txns)
+
+        orders = []
+        for order_id, order in period.orders_by_id.items():
+            signature = _order_signature(order)
+            if self.orders.get(order_id) != signature:
+                orders.append(order)
+                self.orders[order_id] = signature
+
+        return dict(
+            fields={
+                field: getattr(period, field, None) for field in PERIOD_FIELDS
+            },
+            transactions=transactions,
+            orders=orders,
+        )
+
+
+class AlgoStateJournal(object):
+    """
+    Write-ahead journal of the state of a live algorithm.
+
+    Each bar appends the orders, transactions and positions which changed
+    since the previous bar to an append-only log, instead of pickling the
+    whole performance periods. The periods and the context state are
+    compacted in a snapshot every ``snapshot_interval`` bars and when the
+    day changes. The snapshot is written to a temporary file and renamed,
+    a record torn by a crash is dropped on recovery.
+
+    Parameters
+    ----------
+    folder: str
+        The folder of the snapshot and journal files.
+    snapshot_interval: int
+        The number of bars journaled between two snapshots.
+    fsync: bool
+        Whether each record is synced to disk.
+    submit: callable, optional
+        Runs the writes, e.g. `PersistenceWorker.submit` to write them off
+        the trading thread. The records and snapshots are pickled by the
+        caller, the writes must run in order. They run inline by default.
+
+    """
+
+    def __init__(self, folder, snapshot_interval=SNAPSHOT_INTERVAL,
+                 fsync=True, submit=None):
+        self.folder = folder
+        self.snapshot_interval = snapshot_interval
+        self.fsync = fsync
+        self._submit = submit if submit is not None else _run_inline
+
+        self.snapshot_path = os.path.join(folder, SNAPSHOT_FILENAME)
+        self.journal_path = os.path.join(folder, JOURNAL_FILENAME)
+
+        if not os.path.isdir(folder):
+            os.makedirs(folder)
+
+        self._journal = None
+        self._sequence = 0
+        self._bars = 0
+        self._day = None
+        self._tracker = None
+        self._cursors = None
+        self._positions = None
+        self._state = None
+
+    def exists(self):
+        return os.path.isfile(self.snapshot_path)
+
+    def recover(self):
+        """
+        The state of the last snapshot with the journal replayed over it.
+
+        Returns
+        -------
+        dict
+            The `cumulative` and `today` performance periods, the `day`
+            of today's period and the context `state`, None if nothing
+            was saved.
+
+        """
+        if not self.exists():
+            return None
+
+        with open(self.snapshot_path, 'rb') as f:
+            snapshot = pickle.load(f)
+
+        sequence = snapshot['sequence']
+        state = pickle.loads(snapshot['state'])
+        periods = dict(
+            cumulative=snapshot['cumulative'], today=snapshot['today'],
+        )
+
+        replayed = 0
+        for record in self._read_journal():
+            if record['sequence'] <= sequence:
+                continue
+
+            self._apply(record, periods)
+            if record['state'] is not None:
+                state = pickle.loads(record['state'])
+
+            sequence = record['sequence']
+            replayed += 1
+
+        log.debug(
+            'recovered the algo state of {} from its snapshot and {} '
+            'journal records'.format(snapshot['day'], replayed)
+        )
+        self._sequence = sequence
+
+        return dict(
+            cumulative=periods['cumulative'],
+            today=periods['today'],
+            day=snapshot['day'],
+            state=state,
+        )
+
+    def _read_journal(self):
+        if not os.path.isfile(self.journal_path):
+            return
+
+        with open(self.journal_path, 'rb') as f:
+            offset = 0
+            while True:
+                header = f.read(RECORD_HEADER.size)
+                if not header:
+                    break
+
+                record = None
+                if len(header) == RECORD_HEADER.size:
+                    length, crc = RECORD_HEADER.unpack(header)
+                    payload = f.read(length)
+                    if len(payload) == length and \
+                            zlib.crc32(payload) & 0xffffffff == crc:
+                        record = pickle.loads(payload)
+
+                if record is None:
+                    log.warn(
+                        'dropping the torn end of the journal {} at offset '
+                        '{}'.format(self.journal_path, offset)
+                    )
+                    break
+
+                offset = f.tell()
+                yield record
+
+        if offset != os.path.getsize(self.journal_path):
+            with open(self.journal_path, 'r+b') as f:
+                f.truncate(offset)
+
+    @staticmethod
+    def _apply(record, periods):
+        for name in PERIODS:
+            period = periods[name]
+            delta = record['periods'][name]
+
+            for field, value in delta['fields'].items():
+                setattr(period, field, value)
+
+            for txn in delta['transactions']:
+                try:
+                    period.processed_transactions[txn.dt].append(txn)
+                except KeyError:
+                    period.processed_transactions[txn.dt] = [txn]
+
+            for order in delta['orders']:
+                period.record_order(order)
+
+        # The periods share their position tracker.
+        tracker = periods['cumulative'].position_tracker
+        for asset, amount, cost_basis, last_sale_price, last_sale_date in \
+                record['positions']:
+            tracker.update_position(
+                asset,
+                amount=amount,
+                cost_basis=cost_basis,
+                last_sale_price=last_sale_price,
+                last_sale_date=last_sale_date,
+            )
+
+        for asset in record['closed']:
+            tracker.positions.pop(asset, None)
+            tracker._positions_store.pop(asset, None)
+
+    def record(self, dt, tracker, state):
+        """
+        Journal the changes of a bar, or write a snapshot when due.
+
+        Parameters
+        ----------
+        dt: pd.Timestamp
+        tracker: PerformanceTracker
+        state: dict
+            The context state of the algorithm.
+
+        """
+        day = dt.floor('1D')
+        if self._tracker is not tracker or day != self._day or \
+                self._bars >= self.snapshot_interval or \
+                self._cursors['cumulative'].period is not \
+                tracker.cumulative_performance or \
+                self._cursors['today'].period is not \
+                tracker.todays_performance:
+            self.snapshot(dt, tracker, state)
+            return
+
+        state_bytes = _dumps(state)
+        if state_bytes == self._state:
+            state_bytes = None
+        else:
+            self._state = state_bytes
+
+        positions, closed = self._positions_delta()
+
+        self._sequence += 1
+        self._append(dict(
+            sequence=self._sequence,
+            dt=dt,
+            periods={
+                name: cursor.delta() for name, cursor in self._cursors.items()
+            },
+            positions=positions,
+            closed=closed,
+            state=state_bytes,
+        ))
+        self._bars += 1
+
+    def _positions_delta(self):
+        positions = self._tracker.position_tracker.positions
+
+        changed = []
+        for asset, position in positions.items():
+            signature = _position_signature(position)
+            if self._positions.get(asset) != signature:
+                changed.append((asset,) + signature)
+                self._positions[asset] = signature
+
+        closed = [asset for asset in self._positions if asset not in positions]
+        for asset in closed:
+            del self._positions[asset]
+
+        return changed, closed
+
+    def _append(self, record):
+        self._submit(self._write_record, (_dumps(record),))
+
+    def _write_record(self, payload):
+        if self._journal is None:
+            self._journal = open(self.journal_path, 'ab')
+
+        self._journal.write(RECORD_HEADER.pack(
+            len(payload), zlib.crc32(payload) & 0xffffffff,
+        ))
+        self._journal.write(payload)
+        self._journal.flush()
+        if self.fsync:
+            os.fsync(self._journal.fileno())
+
+    def snapshot(self, dt, tracker, state):
+        """
+        Compact the state in a snapshot and restart the journal.
+
+        Parameters
+        ----------
+        dt: pd.Timestamp
+        tracker: PerformanceTracker
+        state: dict
+
+        """
+        self._state = _dumps(state)
+        self._day = dt.floor('1D')
+
+        payload = _dumps(dict(
+            sequence=self._sequence,
+            day=self._day,
+            # Pickled together to share their position tracker.
+            cumulative=tracker.cumulative_performance,
+            today=tracker.todays_performance,
+            state=self._state,
+        ))
+        self._submit(self._write_snapshot, (payload,))
+
+        self._tracker = tracker
+        self._cursors = dict(
+            cumulative=_PeriodCursor(tracker.cumulative_performance),
+            today=_PeriodCursor(tracker.todays_performance),
+        )
+        self._positions = {
+            asset: _position_signature(position)
+            for asset, position in tracker.position_tracker.positions.items()
+        }
+        self._bars = 0
+
+    def _write_snapshot(self, payload):
+        tmp_path = self.snapshot_path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.rename(tmp_path, self.snapshot_path)
+
+        # The records up to the sequence of the snapshot are ignored by
+        # the recovery until the journal is truncated.
+        if self._journal is not None:
+            self._journal.close()
+        self._journal = open(self.journal_path, 'wb')
+
+    def close(self):
+        self._submit(self._close)
+
+    def _close(self):
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
@@ -14,6 +14,7 @@
 # limitations under the License.
 import math
 import uuid
+from itertools import count
 
 from six import text_type
 
@@ -37,6 +38,11 @@ LIMIT = 1 << 3
 
 ORDER_FIELDS_TO_IGNORE = {'type', 'direction', '_status', 'asset'}
 
+# The ids of the orders created by this process: a random prefix, unique
+# across processes, followed by a counter.
+_ID_PREFIX = uuid.uuid4().hex[:16]
+_id_counter = count(1)
+
 
 class Order(object):
     # using __slots__ to save on memory usage.  Simulations can create many
@@ -57,8 +63,23 @@ class Order(object):
                   a negative sign indicates a sell
         @filled - how many shares of the order have been filled so far
         """
+        self._initialize(dt, asset, amount, stop, limit, filled, commission,
+                         id)
+
+    @classmethod
+    def trusted(cls, dt, asset, amount, stop=None, limit=None, filled=0,
+                commission=0, id=None):
+        """
+        Create an order without validating its arguments, for the callers
+        which already did, e.g. the blotter.
+        """
+        order = cls.__new__(cls)
+        order._initialize(dt, asset, amount, stop, limit, filled, commission,
+                          id)
+        return order
 
-        # get a string representation of the uuid.
+    def _initialize(self, dt, asset, amount, stop, limit, filled, commission,
+                    id):
         self.id = self.make_id() if id is None else id
         self.dt = dt
         self.reason = None
@@ -77,19 +98,31 @@ class Order(object):
         self.broker_order_id = None
 
     def make_id(self):
-        return uuid.uuid4().hex
+        return '{}{:x}'.format(_ID_PREFIX, next(_id_counter))
 
     def to_dict(self):
-        dct = {name: getattr(self, name)
-               for name in self.__slots__
-               if name not in ORDER_FIELDS_TO_IGNORE}
-
-        if self.broker_order_id is None:
-            del dct['broker_order_id']
-
-        # Adding 'sid' for backwards compatibility with downstream consumers.
-        dct['sid'] = self.asset
-        dct['status'] = self.status
+        # The fields of __slots__ but ORDER_FIELDS_TO_IGNORE, spelled out
+        # since the stats serialize the orders every bar.
+        dct = {
+            'id': self.id,
+            'dt': self.dt,
+            'reason': self.reason,
+            'created': self.created,
+            'amount': self.amount,
+            'filled': self.filled,
+            'commission': self.commission,
+            'stop': self.stop,
+            'limit': self.limit,
+            'stop_reached': self.stop_reached,
+            'limit_reached': self.limit_reached,
+            # Adding 'sid' for backwards compatibility with downstream
+            # consumers.
+            'sid': self.asset,
+            'status': self.status,
+        }
+
+        if self.broker_order_id is not None:
+            dct['broker_order_id'] = self.broker_order_id
 
         return dct
 
@@ -32,6 +32,7 @@ Position Tracking
 """
 
 from __future__ import division
+from copy import copy
 from math import copysign
 from collections import OrderedDict
 import numpy as np
@@ -45,6 +46,25 @@ from catalyst.constants import LOG_LEVEL
 log = logbook.Logger('Performance', level=LOG_LEVEL)
 
 
+def _slot_property(name, array_name):
+    """A Position attribute stored in the slot of its positiondict, or in
+    the position itself when it does not belong to one.
+    """
+    def fget(self):
+        if self._store is None:
+            return getattr(self, name)
+
+        return getattr(self._store, array_name)[self._slot]
+
+    def fset(self, value):
+        if self._store is None:
+            setattr(self, name, value)
+        else:
+            getattr(self._store, array_name)[self._slot] = value
+
+    return property(fget, fset)
+
+
 class Position(object):
 
     @expect_types(asset=Asset)
@@ -52,11 +72,44 @@ class Position(object):
                  last_sale_price=0.0, last_sale_date=None):
 
         self.asset = asset
-        self.amount = amount
-        self.cost_basis = cost_basis  # per share
-        self.last_sale_price = last_sale_price
+        self._store = None
+        self._slot = None
+        self._amount = amount
+        self._cost_basis = cost_basis  # per share
+        self._last_sale_price = last_sale_price
         self.last_sale_date = last_sale_date
 
+    amount = _slot_property('_amount', '_amounts')
+    cost_basis = _slot_property('_cost_basis', '_cost_bases')
+    last_sale_price = _slot_property('_last_sale_price', '_last_sale_prices')
+
+    def _detach(self):
+        self._amount = self.amount
+        self._cost_basis = self.cost_basis
+        self._last_sale_price = self.last_sale_price
+        self._store = None
+        self._slot = None
+
+    def __getstate__(self):
+        # Same state as the positions pickled before they were stored in
+        # arrays.
+        return {
+            'asset': self.asset,
+            'amount': self.amount,
+            'cost_basis': self.cost_basis,
+            'last_sale_price': self.last_sale_price,
+            'last_sale_date': self.last_sale_date,
+        }
+
+    def __setstate__(self, state):
+        self.asset = state['asset']
+        self._store = None
+        self._slot = None
+        self._amount = state['amount']
+        self._cost_basis = state['cost_basis']
+        self._last_sale_price = state['last_sale_price']
+        self.last_sale_date = state['last_sale_date']
+
     def earn_dividend(self, dividend):
         """
         Register the number of shares we held at this dividend's ex date so
@@ -215,5 +268,174 @@ last_sale_price: {last_sale_price}"
 
 
 class positiondict(OrderedDict):
+    """Positions by asset.
+
+    The amount, cost basis, last sale price and multipliers of the positions
+    are stored in parallel arrays, one slot per position, so that the stats
+    and the prices of all the positions are computed and updated at once.
+    The Position objects are views of their slot.
+
+    Free slots are zeroed, they do not contribute to the values and
+    exposures of the positions.
+    """
+
+    def __init__(self, *args, **kwargs):
+        # key => slot
+        self._slots = {}
+        self._free_slots = []
+        self._size = 0
+        self._allocate(8)
+
+        super(positiondict, self).__init__(*args, **kwargs)
+
     def __missing__(self, key):
         return None
+
+    def _allocate(self, capacity):
+        arrays = {}
+        for array_name in ('_amounts', '_cost_bases', '_last_sale_prices',
+                           '_value_multipliers', '_exposure_multipliers'):
+            array = np.zeros(capacity, dtype=np.float64)
+            if hasattr(self, array_name):
+                array[:self._size] = getattr(self, array_name)[:self._size]
+
+            arrays[array_name] = array
+
+        self.__dict__.update(arrays)
+
+    def _attach(self, key, position):
+        store = position._store
+        if store is not None:
+            # A position is stored in a single positiondict, the previous
+            # one keeps the object but no longer its values.
+            slot = position._slot
+            position._detach()
+            store._clear_slot(slot)
+
+        if self._free_slots:
+            slot = self._free_slots.pop()
+        else:
+            if self._size == len(self._amounts):
+                self._allocate(2 * self._size)
+
+            slot = self._size
+            self._size += 1
+
+        if isinstance(position.asset, Future):
+            # Futures don't have an inherent position value.
+            self._value_multipliers[slot] = 0.0
+            self._exposure_multipliers[slot] = position.asset.multiplier
+        else:
+            self._value_multipliers[slot] = 1.0
+            self._exposure_multipliers[slot] = 1.0
+
+        self._amounts[slot] = position.amount
+        self._cost_bases[slot] = position.cost_basis
+        self._last_sale_prices[slot] = position.last_sale_price
+
+        position._store = self
+        position._slot = slot
+        self._slots[key] = slot
+
+    def _release(self, key, position):
+        slot = self._slots.pop(key, None)
+        if slot is None:
+            return
+
+        if position is not None and position._store is self:
+            position._detach()
+
+        self._clear_slot(slot)
+        self._free_slots.append(slot)
+
+    def _clear_slot(self, slot):
+        self._amounts[slot] = 0.0
+        self._cost_bases[slot] = 0.0
+        self._last_sale_prices[slot] = 0.0
+        self._value_multipliers[slot] = 0.0
+        self._exposure_multipliers[slot] = 0.0
+
+    def __setitem__(self, key, position):
+        if key in self:
+            self._release(key, OrderedDict.__getitem__(self, key))
+
+        super(positiondict, self).__setitem__(key, position)
+
+        if position is not None:
+            self._attach(key, position)
+
+    def __delitem__(self, key):
+        position = OrderedDict.__getitem__(self, key)
+        super(positiondict, self).__delitem__(key)
+        self._release(key, position)
+
+    _marker = object()
+
+    def pop(self, key, default=_marker):
+        if key in self:
+            position = OrderedDict.__getitem__(self, key)
+            del self[key]
+            return position
+
+        if default is self._marker:
+            raise KeyError(key)
+
+        return default
+
+    def popitem(self, last=True):
+        key, position = super(positiondict, self).popitem(last)
+        self._release(key, position)
+        return key, position
+
+    def clear(self):
+        for key, position in list(self.items()):
+            self._release(key, position)
+
+        super(positiondict, self).clear()
+
+    def __reduce__(self):
+        # The positions are detached and stored again on load.
+        return self.__class__, (list(self.items()),)
+
+    def __copy__(self):
+        return self.__class__(
+            (key, copy(position)) for key, position in self.items()
+        )
+
+    @property
+    def amounts(self):
+        return self._amounts[:self._size]
+
+    @property
+    def cost_bases(self):
+        return self._cost_bases[:self._size]
+
+    @property
+    def last_sale_prices(self):
+        return self._last_sale_prices[:self._size]
+
+    @property
+    def value_multipliers(self):
+        return self._value_multipliers[:self._size]
+
+    @property
+    def exposure_multipliers(self):
+        return self._exposure_multipliers[:self._size]
+
+    def update_last_sale_prices(self, keys, last_sale_prices):
+        """
+        Set the last sale price of many positions at once.
+
+        Parameters
+        ----------
+        keys: list
+            The keys of the positions.
+        last_sale_prices: array-like[float]
+            The prices, NaN values are ignored.
+
+        """
+        slots = np.array([self._slots[key] for key in keys], dtype=np.intp)
+        prices = np.asarray(last_sale_prices, dtype=np.float64)
+
+        has_price = ~np.isnan(prices)
+        self._last_sale_prices[slots[has_price]] = prices[has_price]
@@ -20,16 +20,13 @@ import numpy as np
 from collections import namedtuple
 from math import isnan
 
-from six import iteritems, itervalues
+from six import iteritems
 
 from catalyst.finance.performance.position import Position
 from catalyst.finance.transaction import Transaction
 from catalyst.utils.input_validation import expect_types
 import catalyst.protocol as zp
-from catalyst.assets import (
-    Future,
-    Asset
-)
+from catalyst.assets import Asset
 from . position import positiondict
 
 from catalyst.constants import LOG_LEVEL
@@ -50,60 +47,43 @@ PositionStats = namedtuple('PositionStats',
                             'net_value'])
 
 
-def calc_position_values(positions):
-    values = []
-
-    for position in positions:
-        if isinstance(position.asset, Future):
-            # Futures don't have an inherent position value.
-            values.append(0.0)
-        else:
-            values.append(position.last_sale_price * position.amount)
-
-    return values
+def calc_position_values(amounts, last_sale_prices, value_multipliers):
+    # Futures don't have an inherent position value, their value multiplier
+    # is 0.
+    return amounts * last_sale_prices * value_multipliers
 
 
 def calc_net(values):
     # Returns 0.0 if there are no values.
-    return sum(values, np.float64())
-
-
-def calc_position_exposures(positions):
-    exposures = []
+    return values.sum(dtype=np.float64)
 
-    for position in positions:
-        exposure = position.amount * position.last_sale_price
 
-        if isinstance(position.asset, Future):
-            exposure *= position.asset.multiplier
-
-        exposures.append(exposure)
-
-    return exposures
+def calc_position_exposures(amounts, last_sale_prices, exposure_multipliers):
+    return amounts * last_sale_prices * exposure_multipliers
 
 
 def calc_long_value(position_values):
-    return sum(i for i in position_values if i > 0)
+    return position_values[position_values > 0].sum(dtype=np.float64)
 
 
 def calc_short_value(position_values):
-    return sum(i for i in position_values if i < 0)
+    return position_values[position_values < 0].sum(dtype=np.float64)
 
 
 def calc_long_exposure(position_exposures):
-    return sum(i for i in position_exposures if i > 0)
+    return position_exposures[position_exposures > 0].sum(dtype=np.float64)
 
 
 def calc_short_exposure(position_exposures):
-    return sum(i for i in position_exposures if i < 0)
+    return position_exposures[position_exposures < 0].sum(dtype=np.float64)
 
 
 def calc_longs_count(position_exposures):
-    return sum(1 for i in position_exposures if i > 0)
+    return int(np.count_nonzero(position_exposures > 0))
 
 
 def calc_shorts_count(position_exposures):
-    return sum(1 for i in position_exposures if i < 0)
+    return int(np.count_nonzero(position_exposures < 0))
 
 
 def calc_gross_exposure(long_exposure, short_exposure):
@@ -312,16 +292,17 @@ class PositionTracker(object):
                     pass
                 continue
 
-            position = zp.Position(asset)
+            # Reuse the position of the previous call, if any.
+            position = positions.get(asset)
+            if position is None:
+                # Adds the new position if we didn't have one before
+                position = positions[asset] = zp.Position(asset)
+
             position.amount = pos.amount
             position.cost_basis = pos.cost_basis
             position.last_sale_price = pos.last_sale_price
             position.last_sale_date = pos.last_sale_date
 
-            # Adds the new position if we didn't have one before, or overwrite
-            # one we have currently
-            positions[asset] = position
-
         return positions
 
     def get_positions_list(self):
@@ -333,14 +314,19 @@ class PositionTracker(object):
 
     def sync_last_sale_prices(self, dt, handle_non_market_minutes,
                               data_portal):
-        if not handle_non_market_minutes:
-            for asset, position in iteritems(self.positions):
-                last_sale_price = data_portal.get_spot_value(
-                    asset, 'price', dt, self.data_frequency
-                )
+        if not self.positions:
+            return
 
-                if not np.isnan(last_sale_price):
-                    position.last_sale_price = last_sale_price
+        if not handle_non_market_minutes:
+            # A single read for the prices of all the positions.
+            assets = list(self.positions)
+            last_sale_prices = data_portal.get_spot_value(
+                assets,
+                'price',
+                dt,
+                self.data_frequency,
+            )
+            self.positions.update_last_sale_prices(assets, last_sale_prices)
         else:
             for asset, position in iteritems(self.positions):
                 last_sale_price = data_portal.get_adjusted_value(
@@ -355,27 +341,31 @@ class PositionTracker(object):
                     position.last_sale_price = last_sale_price
 
     def stats(self):
-        amounts = []
-        last_sale_prices = []
-        for pos in itervalues(self.positions):
-            amounts.append(pos.amount)
-            last_sale_prices.append(pos.last_sale_price)
+        positions = self.positions
 
-        position_values = calc_position_values(itervalues(self.positions))
+        amounts = positions.amounts
+        last_sale_prices = positions.last_sale_prices
+
+        position_values = calc_position_values(
+            amounts, last_sale_prices, positions.value_multipliers,
+        )
         position_exposures = calc_position_exposures(
-            itervalues(self.positions)
+            amounts, last_sale_prices, positions.exposure_multipliers,
         )
 
-        long_value = calc_long_value(position_values)
-        short_value = calc_short_value(position_values)
-        gross_value = calc_gross_value(long_value, short_value)
-        long_exposure = calc_long_exposure(position_exposures)
-        short_exposure = calc_short_exposure(position_exposures)
-        gross_exposure = calc_gross_exposure(long_exposure, short_exposure)
-        net_exposure = calc_net(position_exposures)
-        longs_count = calc_longs_count(position_exposures)
-        shorts_count = calc_shorts_count(position_exposures)
-        net_value = calc_net(position_values)
+        with np.errstate(invalid='ignore'):
+            long_value = calc_long_value(position_values)
+            short_value = calc_short_value(position_values)
+            gross_value = calc_gross_value(long_value, short_value)
+            long_exposure = calc_long_exposure(position_exposures)
+            short_exposure = calc_short_exposure(position_exposures)
+            gross_exposure = calc_gross_exposure(
+                long_exposure, short_exposure
+            )
+            net_exposure = calc_net(position_exposures)
+            longs_count = calc_longs_count(position_exposures)
+            shorts_count = calc_shorts_count(position_exposures)
+            net_value = calc_net(position_values)
 
         return PositionStats(
             long_value=long_value,
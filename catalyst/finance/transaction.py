@@ -14,8 +14,6 @@
 # limitations under the License.
 from __future__ import division
 
-from copy import copy
-
 from catalyst.assets import Asset
 from catalyst.protocol import DATASOURCE_TYPE
 from catalyst.utils.input_validation import expect_types
@@ -38,6 +36,23 @@ class Transaction(object):
         :param is_quote_live: bool; is the fee_currency the quote_currency
                                     of the algorithm and running on live mode
         """
+        self._initialize(asset, amount, dt, price, order_id, commission,
+                         fee_currency, is_quote_live)
+
+    @classmethod
+    def trusted(cls, asset, amount, dt, price, order_id, commission=None,
+                fee_currency=None, is_quote_live=False):
+        """
+        Create a transaction without validating its arguments, e.g. the
+        fill of an order.
+        """
+        transaction = cls.__new__(cls)
+        transaction._initialize(asset, amount, dt, price, order_id,
+                                commission, fee_currency, is_quote_live)
+        return transaction
+
+    def _initialize(self, asset, amount, dt, price, order_id, commission,
+                    fee_currency, is_quote_live):
         self.asset = asset
         self.amount = amount
         self.dt = dt
@@ -66,14 +81,18 @@ class Transaction(object):
         )
 
     def to_dict(self):
-        py = copy(self.__dict__)
-        del py['type']
-        del py['asset']
-
-        # Adding 'sid' for backwards compatibility with downstrean consumers.
-        py['sid'] = self.asset
-
-        return py
+        return {
+            'amount': self.amount,
+            'dt': self.dt,
+            'price': self.price,
+            'order_id': self.order_id,
+            'commission': self.commission,
+            'fee_currency': self.fee_currency,
+            'is_quote_live': self.is_quote_live,
+            # Adding 'sid' for backwards compatibility with downstrean
+            # consumers.
+            'sid': self.asset,
+        }
 
 
 def create_transaction(order, dt, price, amount):
@@ -82,7 +101,7 @@ def create_transaction(order, dt, price, amount):
     # TODO: Investigate whether we can add a robust check in blotter
     # and/or tradesimulation, as well.
 
-    transaction = Transaction(
+    transaction = Transaction.trusted(
         asset=order.asset,
         amount=amount,
         dt=dt,
@@ -30,10 +30,18 @@ cpdef enum:
     BEFORE_TRADING_START_BAR = 4
 
 cdef class MinuteSimulationClock:
+    """Emits the bars of a minute simulation.
+
+    The minutes of each session are generated from the int64 nanoseconds of
+    its open and close while iterating, they are only boxed into Timestamps
+    when emitted. The position of the clock is exposed as int64 values for
+    the lookups of the data portal.
+    """
     cdef bool minute_emission
     cdef np.int64_t[:] market_opens_nanos, market_closes_nanos, bts_nanos, \
         sessions_nanos
-    cdef dict minutes_by_session
+    cdef readonly np.int64_t current_minute_nanos, current_session_nanos
+    cdef readonly Py_ssize_t current_session_idx
 
     def __init__(self,
                  sessions,
@@ -48,70 +56,101 @@ cdef class MinuteSimulationClock:
         self.sessions_nanos = sessions.values.astype(np.int64)
         self.bts_nanos = before_trading_start_minutes.values.astype(np.int64)
 
-        self.minutes_by_session = self.calc_minutes_by_session()
-
-    @cython.boundscheck(False)
-    @cython.wraparound(False)
-    cdef dict calc_minutes_by_session(self):
-        cdef dict minutes_by_session
-        cdef int session_idx
-        cdef np.int64_t session_nano
-        cdef np.ndarray[np.int64_t, ndim=1] minutes_nanos
-
-        minutes_by_session = {}
-        for session_idx, session_nano in enumerate(self.sessions_nanos):
-            minutes_nanos = np.arange(
-                self.market_opens_nanos[session_idx],
-                self.market_closes_nanos[session_idx] + _nanos_in_minute,
-                _nanos_in_minute
-            )
-            minutes_by_session[session_nano] = pd.to_datetime(
-                minutes_nanos, utc=True, box=True
-            )
-        return minutes_by_session
+        self.current_minute_nanos = -1
+        self.current_session_nanos = -1
+        self.current_session_idx = -1
+
+    @property
+    def current_minute_index(self):
+        """The position of the current minute in its session."""
+        if self.current_session_idx < 0:
+            return -1
+
+        return (
+            self.current_minute_nanos -
+            self.market_opens_nanos[self.current_session_idx]
+        ) // _nanos_in_minute
+
+    def minutes_for_session(self, Py_ssize_t session_idx):
+        """The int64 nanoseconds of the minutes of a session."""
+        return np.arange(
+            self.market_opens_nanos[session_idx],
+            self.market_closes_nanos[session_idx] + _nanos_in_minute,
+            _nanos_in_minute,
+        )
 
     def __iter__(self):
+        cdef Py_ssize_t idx
+        cdef np.int64_t session_nano, open_nano, close_nano, bts_nano, \
+            bts_idx_nano
+
         minute_emission = self.minute_emission
 
-        for idx, session_nano in enumerate(self.sessions_nanos):
-            yield pd.Timestamp(session_nano, tz='UTC'), SESSION_START
+        for idx in range(len(self.sessions_nanos)):
+            session_nano = self.sessions_nanos[idx]
+            open_nano = self.market_opens_nanos[idx]
+            close_nano = self.market_closes_nanos[idx]
+            bts_nano = self.bts_nanos[idx]
 
-            bts_minute = pd.Timestamp(self.bts_nanos[idx], tz='UTC')
-            regular_minutes = self.minutes_by_session[session_nano]
+            self.current_session_idx = idx
+            self.current_session_nanos = session_nano
+            self.current_minute_nanos = open_nano
 
-            if bts_minute > regular_minutes[-1]:
+            yield pd.Timestamp(session_nano, tz='UTC'), SESSION_START
+
+            if bts_nano > close_nano:
                 # before_trading_start is after the last close,
                 # so don't emit it
-                for minute, evt in self._get_minutes_for_list(
-                    regular_minutes,
+                for minute, evt in self._get_minutes_in_range(
+                    open_nano,
+                    close_nano + _nanos_in_minute,
                     minute_emission
                 ):
                     yield minute, evt
             else:
-                # we have to search anew every session, because there is no
-                # guarantee that any two session start on the same minute
-                bts_idx = regular_minutes.searchsorted(bts_minute)
+                # the first minute at or after before_trading_start, there
+                # is no guarantee that any two session start on the same
+                # minute
+                if bts_nano <= open_nano:
+                    bts_idx_nano = open_nano
+                else:
+                    bts_idx_nano = open_nano + (
+                        (bts_nano - open_nano + _nanos_in_minute - 1) //
+                        _nanos_in_minute
+                    ) * _nanos_in_minute
 
                 # emit all the minutes before bts_minute
-                for minute, evt in self._get_minutes_for_list(
-                    regular_minutes[0:bts_idx],
+                for minute, evt in self._get_minutes_in_range(
+                    open_nano,
+                    bts_idx_nano,
                     minute_emission
                 ):
                     yield minute, evt
 
-                yield bts_minute, BEFORE_TRADING_START_BAR
+                self.current_minute_nanos = bts_nano
+                yield pd.Timestamp(bts_nano, tz='UTC'), \
+                    BEFORE_TRADING_START_BAR
 
                 # emit all the minutes after bts_minute
-                for minute, evt in self._get_minutes_for_list(
-                    regular_minutes[bts_idx:],
+                for minute, evt in self._get_minutes_in_range(
+                    bts_idx_nano,
+                    close_nano + _nanos_in_minute,
                     minute_emission
                 ):
                     yield minute, evt
 
-            yield regular_minutes[-1], SESSION_END
+            self.current_minute_nanos = close_nano
+            yield pd.Timestamp(close_nano, tz='UTC'), SESSION_END
+
+    def _get_minutes_in_range(self, np.int64_t start_nano,
+                              np.int64_t end_nano, minute_emission):
+        cdef np.int64_t minute_nano = start_nano
 
-    def _get_minutes_for_list(self, minutes, minute_emission):
-        for minute in minutes:
+        while minute_nano < end_nano:
+            self.current_minute_nanos = minute_nano
+            minute = pd.Timestamp(minute_nano, tz='UTC')
             yield minute, BAR
             if minute_emission:
                 yield minute, MINUTE_END
+
+            minute_nano += _nanos_in_minute
@@ -28,6 +28,7 @@ from catalyst.gens.sim_engine import (
 )
 
 from catalyst.constants import LOG_LEVEL
+from catalyst.utils.bar_profiler import get_profiler
 
 log = Logger('Trade Simulation', level=LOG_LEVEL)
 
@@ -102,6 +103,7 @@ class AlgorithmSimulator(object):
         """
         algo = self.algo
         emission_rate = algo.perf_tracker.emission_rate
+        profiler = get_profiler()
 
         def every_bar(dt_to_use, current_data=self.current_data,
                       handle_data=algo.event_manager.handle_data):
@@ -118,8 +120,9 @@ class AlgorithmSimulator(object):
 
             # handle any transactions and commissions coming out new orders
             # placed in the last bar
-            new_transactions, new_commissions, closed_orders = \
-                blotter.get_transactions(current_data)
+            with profiler.span('get_transactions'):
+                new_transactions, new_commissions, closed_orders = \
+                    blotter.get_transactions(current_data)
 
             blotter.prune_orders(closed_orders)
 
@@ -219,11 +222,24 @@ class AlgorithmSimulator(object):
                 def calculate_minute_capital_changes(dt):
                     return []
 
-            for dt, action in self.clock:
+            # The clocks of the simulations expose their position as int64.
+            clock = self.clock
+            track_minute = hasattr(clock, 'current_session_nanos') and \
+                hasattr(self.data_portal, 'set_current_minute')
+            session_label = None
+
+            for dt, action in clock:
                 if action == BAR:
-                    for capital_change_packet in every_bar(dt):
-                        yield capital_change_packet
+                    if track_minute:
+                        self.data_portal.set_current_minute(
+                            clock.current_minute_nanos, session_label,
+                        )
+                    with profiler.span('bar'):
+                        for capital_change_packet in every_bar(dt):
+                            yield capital_change_packet
+                    profiler.on_bar(dt)
                 elif action == SESSION_START:
+                    session_label = dt
                     for capital_change_packet in once_a_day(dt):
                         yield capital_change_packet
                 elif action == SESSION_END:
@@ -287,9 +303,10 @@ class AlgorithmSimulator(object):
         """
         Get a perf message for the given datetime.
         """
-        perf_message = perf_tracker.handle_market_close(
-            dt, self.data_portal,
-        )
+        with get_profiler().span('risk'):
+            perf_message = perf_tracker.handle_market_close(
+                dt, self.data_portal,
+            )
         perf_message['daily_perf']['recorded_vars'] = algo.recorded_vars
         return perf_message
 
@@ -299,9 +316,10 @@ class AlgorithmSimulator(object):
         """
         rvars = algo.recorded_vars
 
-        minute_message = perf_tracker.handle_minute_close(
-            dt, self.data_portal,
-        )
+        with get_profiler().span('risk'):
+            minute_message = perf_tracker.handle_minute_close(
+                dt, self.data_portal,
+            )
 
         minute_message['minute_perf']['recorded_vars'] = rvars
         return minute_message
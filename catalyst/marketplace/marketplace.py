@@ -3,7 +3,6 @@ from __future__ import print_function
 import glob
 import json
 import os
-import re
 import shutil
 import sys
 import time
@@ -13,7 +12,6 @@ import bcolz
 import logbook
 import pandas as pd
 import requests
-from requests_toolbelt import MultipartDecoder
 from requests_toolbelt.multipart.decoder import \
     NonMultipartContentTypeException
 
@@ -28,8 +26,12 @@ from catalyst.marketplace.marketplace_errors import (
     MarketplaceNoCSVFiles, MarketplaceRequiresPython3)
 from catalyst.marketplace.utils.auth_utils import get_key_secret, \
     get_signed_headers
+from catalyst.marketplace.utils.bundle_utils import INDEX_FILENAME, \
+    merge_bundles, open_indexed_bundle, read_bundle, sort_bundle
 from catalyst.marketplace.utils.eth_utils import bin_hex, from_grains, \
     to_grains
+from catalyst.marketplace.utils.multipart import DEFAULT_CHUNK_SIZE, \
+    StreamingMultipartDecoder
 from catalyst.marketplace.utils.path_utils import get_bundle_folder, \
     get_data_source_folder, get_marketplace_folder, \
     get_user_pubaddr, get_temp_bundles_folder, extract_bundle, \
@@ -134,6 +136,9 @@ class Marketplace:
             abi=abi,
         )
 
+        # The opened bundles and the time of their index, by folder.
+        self._indexed_bundles = dict()
+
     # def get_data_sources_map(self):
     #     return [
     #         dict(
@@ -471,14 +476,17 @@ class Marketplace:
         tmp_bundle = extract_bundle(path)
         bundle_folder = get_data_source_folder(ds_name)
         ensure_directory(bundle_folder)
+        zsource = bcolz.ctable(rootdir=tmp_bundle, mode='a')
         if os.listdir(bundle_folder):
-            zsource = bcolz.ctable(rootdir=tmp_bundle, mode='r')
             ztarget = bcolz.ctable(rootdir=bundle_folder, mode='a')
-            ztarget.append(zsource)
+            merge_bundles(zsource, ztarget)
 
         else:
             shutil.rmtree(bundle_folder, ignore_errors=True)
-            os.rename(tmp_bundle, bundle_folder)
+            sort_bundle(zsource, bundle_folder)
+
+        shutil.rmtree(tmp_bundle, ignore_errors=True)
+        os.remove(path)
 
     def ingest(self, ds_name=None, start=None, end=None, force_download=False):
 
@@ -560,29 +568,21 @@ class Marketplace:
             shutil.rmtree(bundle_folder, ignore_errors=True)
             target_path = get_temp_bundles_folder()
             try:
-                decoder = MultipartDecoder.from_response(r)
-                # with maybe_show_progress(
-                #     iter(decoder.parts),
-                #     True,
-                #     label='Processing files') as part:
-                counter = 1
-                for part in decoder.parts:
-                    log.info("Processing file {} of {}".format(
-                        counter, len(decoder.parts)))
-                    h = part.headers[b'Content-Disposition'].decode('utf-8')
-                    # Extracting the filename from the header
-                    name = re.search(r'filename="(.*)"', h).group(1)
-
-                    filename = os.path.join(target_path, name)
-                    with open(filename, 'wb') as f:
-                        # for chunk in part.content.iter_content(
-                        #         chunk_size=1024):
-                        #     if chunk: # filter out keep-alive new chunks
-                        #         f.write(chunk)
-                        f.write(part.content)
-
-                    self.process_temp_bundle(ds_name, filename)
-                    counter += 1
+                # The parts are written to disk as they are downloaded and
+                # merged one at a time, the dataset is never held in memory.
+                decoder = StreamingMultipartDecoder.from_response(r)
+                parts = decoder.iter_parts(
+                    r.iter_content(chunk_size=DEFAULT_CHUNK_SIZE),
+                    target_path,
+                )
+                for counter, part in enumerate(parts, 1):
+                    log.info('Processing file {}: {}'.format(
+                        counter, os.path.basename(part.path)))
+                    self.process_temp_bundle(ds_name, part.path)
+
+                # Index the dataset once all the parts are merged.
+                if os.path.isdir(bundle_folder) and os.listdir(bundle_folder):
+                    open_indexed_bundle(bundle_folder)
 
             except NonMultipartContentTypeException:
                 response = r.json()
@@ -598,27 +598,44 @@ class Marketplace:
 
         log.info('{} ingested successfully'.format(ds_name))
 
-    def get_dataset(self, ds_name, start=None, end=None):
+    def get_dataset(self, ds_name, start=None, end=None, symbols=None):
+        """
+        Read an ingested dataset.
+
+        Parameters
+        ----------
+        ds_name: str
+        start: str or pd.Timestamp, optional
+            The first date, included.
+        end: str or pd.Timestamp, optional
+            The last date, excluded.
+        symbols: list[str], optional
+            Only read the rows of these symbols.
+
+        Returns
+        -------
+        pd.DataFrame
+            The dataset indexed by date and symbol.
+
+        """
         ds_name = ds_name.lower()
 
-        # TODO: filter ctable by start and end date
         bundle_folder = get_data_source_folder(ds_name)
-        z = bcolz.ctable(rootdir=bundle_folder, mode='r')
-
-        if start is not None and end is not None:
-            z = z.fetchwhere('(date>=start_date) & (date<end_date)',
-                             user_dict={'start_date': start.encode(),
-                                        'end_date': end.encode()})
-        elif start is not None:
-            z = z.fetchwhere('(date>=start_date)',
-                             user_dict={'start_date': start.encode()})
-        elif end is not None:
-            z = z.fetchwhere('(date<end_date)',
-                             user_dict={'end_date': end.encode()})
-        df = z.todataframe()  # type: pd.DataFrame
-        df.set_index(['date', 'symbol'], drop=True, inplace=True)
-
-        return df
+        index_path = os.path.join(bundle_folder, INDEX_FILENAME)
+        mtime = os.path.getmtime(index_path) \
+            if os.path.isfile(index_path) else None
+
+        # The bundle is reopened when it was ingested again.
+        cached_mtime, z, index = self._indexed_bundles.get(
+            bundle_folder, (None, None, None)
+        )
+        if mtime is None or mtime != cached_mtime:
+            z, index = open_indexed_bundle(bundle_folder)
+            self._indexed_bundles[bundle_folder] = (
+                os.path.getmtime(index_path), z, index,
+            )
+
+        return read_bundle(z, index, start, end, symbols)
 
     def clean(self, ds_name=None, data_frequency=None):
 
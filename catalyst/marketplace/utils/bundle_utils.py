@@ -9,39 +9,416 @@ import pandas as pd
 from six import string_types
 
 
-def merge_bundles(zsource, ztarget):
+# The key of the rows of the marketplace bundles, which are sorted by it.
+BUNDLE_KEY = ('date', 'symbol')
+
+# The number of rows copied at once when merging bundles.
+MERGE_CHUNK_SIZE = 100000
+
+# The sidecar index of a bundle, in its rootdir.
+INDEX_FILENAME = '__index__.npz'
+
+
+def _merge_order(tables):
     """
-    Merge
+    The rows of the merged tables, sorted and unique by key.
+
+    Only the key columns are loaded. The rows of the last tables replace
+    the rows of the first ones with the same key.
+
     Parameters
     ----------
-    zsource
-    ztarget
+    tables: list[ctable]
 
     Returns
     -------
+    tuple[ndarray, ndarray]
+        The table and the row of each merged row.
 
     """
-    # TODO: find a way to do this iteratively instead of in-memory
-    df_source = zsource.todataframe()
-    df_target = ztarget.todataframe()
+    dates = np.concatenate([t.cols[BUNDLE_KEY[0]][:] for t in tables])
+    symbols = np.concatenate([t.cols[BUNDLE_KEY[1]][:] for t in tables])
+    origins = np.concatenate([
+        np.full(len(t), index, dtype='int64')
+        for index, t in enumerate(tables)
+    ])
+    rows = np.concatenate([np.arange(len(t)) for t in tables])
+
+    # lexsort is stable, the duplicates stay in the order of the tables
+    order = np.lexsort((origins, symbols, dates))
+    dates = dates[order]
+    symbols = symbols[order]
+
+    last = np.ones(len(order), dtype=bool)
+    last[:-1] = (dates[1:] != dates[:-1]) | (symbols[1:] != symbols[:-1])
+    order = order[last]
+
+    return origins[order], rows[order]
+
+
+def _take(column, rows):
+    # Decompress the range of the rows when it is dense enough, fancy
+    # indexing decompresses the chunks of each row.
+    start, stop = rows.min(), rows.max() + 1
+    if stop - start <= 4 * len(rows):
+        return column[start:stop][rows - start]
+
+    return column[rows]
+
+
+def _write_merged(tables, origins, rows, rootdir, chunk_size):
+    names = list(tables[0].names)
+    dtypes = [
+        np.result_type(*[t.cols[name].dtype for t in tables])
+        for name in names
+    ]
 
-    df = pd.concat(
-        [df_source, df_target], ignore_index=True
-    )  # type: pd.DataFrame
-    df.drop_duplicates(inplace=True)
-    df.set_index(['date', 'symbol'], drop=False, inplace=True)
+    z = bcolz.ctable(
+        columns=[np.empty(0, dtype=dtype) for dtype in dtypes],
+        names=names,
+        rootdir=rootdir,
+        mode='w',
+    )
+    for start in range(0, len(rows), chunk_size):
+        chunk_origins = origins[start:start + chunk_size]
+        chunk_rows = rows[start:start + chunk_size]
 
-    sanitize_df(df)
+        columns = []
+        for name, dtype in zip(names, dtypes):
+            values = np.empty(len(chunk_rows), dtype=dtype)
+            for index, table in enumerate(tables):
+                mask = chunk_origins == index
+                if mask.any():
+                    values[mask] = _take(table.cols[name], chunk_rows[mask])
 
-    dirname = os.path.basename(ztarget.rootdir)
-    bak_dir = ztarget.rootdir.replace(dirname, '.{}'.format(dirname))
-    shutil.move(ztarget.rootdir, bak_dir)
+            columns.append(values)
 
-    z = bcolz.ctable.fromdataframe(df=df, rootdir=ztarget.rootdir)
-    shutil.rmtree(bak_dir)
+        z.append(columns)
+
+    z.attrs['sorted_by'] = list(BUNDLE_KEY)
+    z.flush()
     return z
 
 
+def _is_appendable(origins, rows, tables):
+    # The merged rows are the rows of the tables one after the other.
+    return len(origins) == sum(len(t) for t in tables) and (
+        np.all(origins[1:] >= origins[:-1])
+    ) and all(
+        np.all(np.diff(rows[origins == index]) > 0)
+        for index in range(len(tables))
+    )
+
+
+def _replace_rootdir(z, rootdir):
+    if os.path.abspath(z.rootdir) == os.path.abspath(rootdir):
+        return bcolz.open(rootdir, mode='a')
+
+    bak_dir = os.path.join(
+        os.path.dirname(rootdir), '.{}'.format(os.path.basename(rootdir))
+    )
+    if os.path.isdir(rootdir):
+        shutil.move(rootdir, bak_dir)
+
+    shutil.move(z.rootdir, rootdir)
+    shutil.rmtree(bak_dir, ignore_errors=True)
+    return bcolz.open(rootdir, mode='a')
+
+
+def merge_bundles(zsource, ztarget, chunk_size=MERGE_CHUNK_SIZE):
+    """
+    Merge a bundle into another one, chunk by chunk.
+
+    The merged bundle is sorted by date and symbol, the rows of the source
+    replace the rows of the target with the same key. When the source
+    follows the target, its rows are appended in place.
+
+    Parameters
+    ----------
+    zsource: ctable
+    ztarget: ctable
+    chunk_size: int
+        The number of rows copied at once.
+
+    Returns
+    -------
+    ctable
+        The merged bundle, in the rootdir of the target.
+
+    """
+    tables = [ztarget, zsource]
+    origins, rows = _merge_order(tables)
+
+    if _is_appendable(origins, rows, tables):
+        names = list(ztarget.names)
+        for start in range(0, len(zsource), chunk_size):
+            ztarget.append([
+                zsource.cols[name][start:start + chunk_size]
+                for name in names
+            ])
+
+        ztarget.flush()
+        return ztarget
+
+    z = _write_merged(
+        tables, origins, rows, ztarget.rootdir + '.merge', chunk_size
+    )
+    return _replace_rootdir(z, ztarget.rootdir)
+
+
+def sort_bundle(zsource, rootdir, chunk_size=MERGE_CHUNK_SIZE):
+    """
+    Move a bundle to a rootdir, sorted and unique by date and symbol.
+
+    Parameters
+    ----------
+    zsource: ctable
+    rootdir: str
+    chunk_size: int
+        The number of rows copied at once.
+
+    Returns
+    -------
+    ctable
+
+    """
+    tables = [zsource]
+    origins, rows = _merge_order(tables)
+
+    if _is_appendable(origins, rows, tables):
+        zsource.attrs['sorted_by'] = list(BUNDLE_KEY)
+        zsource.flush()
+        return _replace_rootdir(zsource, rootdir)
+
+    z = _write_merged(tables, origins, rows, rootdir + '.merge', chunk_size)
+    return _replace_rootdir(z, rootdir)
+
+
+class BundleIndex(object):
+    """
+    The sidecar index of a bundle sorted by date and symbol.
+
+    Parameters
+    ----------
+    length: int
+        The number of rows of the indexed bundle.
+    dates: ndarray[datetime64[ns]]
+        The distinct dates of the bundle.
+    date_offsets: ndarray[int64]
+        The first row of each date, followed by the length.
+    symbols: ndarray[unicode]
+        The distinct symbols of the bundle.
+    symbol_codes: ndarray[int32]
+        The position in ``symbols`` of the symbol of each row.
+    symbol_offsets: ndarray[int64]
+        The bounds of the rows of each symbol in ``symbol_rows``.
+    symbol_rows: ndarray[int64]
+        The sorted rows of each symbol, one symbol after the other.
+
+    """
+
+    def __init__(self, length, dates, date_offsets, symbols, symbol_codes,
+                 symbol_offsets, symbol_rows):
+        self.length = length
+        self.dates = dates
+        self.date_offsets = date_offsets
+        self.symbols = symbols
+        self.symbol_codes = symbol_codes
+        self.symbol_offsets = symbol_offsets
+        self.symbol_rows = symbol_rows
+
+    @classmethod
+    def from_bundle(cls, z):
+        raw_dates = z.cols[BUNDLE_KEY[0]][:]
+        raw_symbols = z.cols[BUNDLE_KEY[1]][:]
+
+        # Only the distinct values are parsed.
+        starts = np.flatnonzero(
+            np.concatenate([[True], raw_dates[1:] != raw_dates[:-1]])
+        ) if len(raw_dates) else np.array([], dtype='int64')
+        dates = pd.to_datetime(
+            [_decode(value) for value in raw_dates[starts]]
+        ).values.astype('datetime64[ns]')
+
+        symbols, symbol_codes = np.unique(raw_symbols, return_inverse=True)
+        symbol_rows = np.argsort(symbol_codes, kind='mergesort')
+        symbol_offsets = np.searchsorted(
+            symbol_codes[symbol_rows], np.arange(len(symbols) + 1),
+        )
+
+        return cls(
+            length=len(z),
+            dates=dates,
+            date_offsets=np.append(starts, len(z)).astype('int64'),
+            symbols=np.array([_decode(value) for value in symbols],
+                             dtype='U'),
+            symbol_codes=symbol_codes.astype('int32'),
+            symbol_offsets=symbol_offsets.astype('int64'),
+            symbol_rows=symbol_rows.astype('int64'),
+        )
+
+    @classmethod
+    def load(cls, z):
+        """
+        The index of a bundle, None if it is missing or stale.
+
+        """
+        path = os.path.join(z.rootdir, INDEX_FILENAME)
+        if not os.path.isfile(path):
+            return None
+
+        with np.load(path) as data:
+            index = cls(**{
+                name: data[name] if name != 'length' else int(data[name])
+                for name in data.files
+            })
+
+        return index if index.length == len(z) else None
+
+    def save(self, z):
+        path = os.path.join(z.rootdir, INDEX_FILENAME)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            np.savez(
+                f,
+                length=self.length,
+                dates=self.dates,
+                date_offsets=self.date_offsets,
+                symbols=self.symbols,
+                symbol_codes=self.symbol_codes,
+                symbol_offsets=self.symbol_offsets,
+                symbol_rows=self.symbol_rows,
+            )
+
+        os.rename(tmp_path, path)
+
+    def date_range(self, start=None, end=None):
+        """
+        The rows from the start date included to the end date excluded.
+
+        """
+        first = 0 if start is None else np.searchsorted(
+            self.dates, np.datetime64(pd.Timestamp(start).value, 'ns'),
+        )
+        last = len(self.dates) if end is None else np.searchsorted(
+            self.dates, np.datetime64(pd.Timestamp(end).value, 'ns'),
+        )
+        return self.date_offsets[first], self.date_offsets[max(first, last)]
+
+    def symbol_rows_in_range(self, symbols, start_row, end_row):
+        """
+        The sorted rows of the symbols between two rows.
+
+        """
+        positions = np.searchsorted(self.symbols, symbols)
+        rows = []
+        for symbol, position in zip(symbols, positions):
+            if position == len(self.symbols) or \
+                    self.symbols[position] != symbol:
+                continue
+
+            symbol_rows = self.symbol_rows[
+                self.symbol_offsets[position]:self.symbol_offsets[position + 1]
+            ]
+            rows.append(symbol_rows[
+                np.searchsorted(symbol_rows, start_row):
+                np.searchsorted(symbol_rows, end_row)
+            ])
+
+        if not rows:
+            return np.array([], dtype='int64')
+
+        return np.sort(np.concatenate(rows))
+
+
+def _decode(value):
+    return value.decode('utf-8') if isinstance(value, bytes) else value
+
+
+def open_indexed_bundle(rootdir):
+    """
+    Open a bundle with its index.
+
+    The bundles ingested before they were sorted are sorted in place, the
+    missing or stale indexes are written.
+
+    Parameters
+    ----------
+    rootdir: str
+
+    Returns
+    -------
+    tuple[ctable, BundleIndex]
+
+    """
+    z = bcolz.open(rootdir, mode='r')
+    index = BundleIndex.load(z)
+    if index is not None:
+        return z, index
+
+    z = bcolz.open(rootdir, mode='a')
+    if z.attrs.getall().get('sorted_by') != list(BUNDLE_KEY):
+        z = sort_bundle(z, rootdir)
+
+    index = BundleIndex.from_bundle(z)
+    index.save(z)
+    return z, index
+
+
+def read_bundle(z, index, start=None, end=None, symbols=None):
+    """
+    Read the rows of a bundle between two dates.
+
+    Only the chunks of the requested rows are decompressed, the dates and
+    the symbols come from the index.
+
+    Parameters
+    ----------
+    z: ctable
+    index: BundleIndex
+    start: str or pd.Timestamp, optional
+        The first date, included.
+    end: str or pd.Timestamp, optional
+        The last date, excluded.
+    symbols: list[str], optional
+        Only read the rows of these symbols.
+
+    Returns
+    -------
+    pd.DataFrame
+        The columns of the bundle indexed by date and symbol.
+
+    """
+    start_row, end_row = index.date_range(start, end)
+    if symbols is None:
+        rows = np.arange(start_row, end_row)
+        columns = {
+            name: z.cols[name][start_row:end_row]
+            for name in z.names if name not in BUNDLE_KEY
+        }
+
+    else:
+        rows = index.symbol_rows_in_range(
+            np.array(sorted(set(symbols)), dtype='U'), start_row, end_row,
+        )
+        columns = {
+            name: _take(z.cols[name], rows) if len(rows)
+            else z.cols[name][0:0]
+            for name in z.names if name not in BUNDLE_KEY
+        }
+
+    date_codes = np.searchsorted(index.date_offsets, rows, side='right') - 1
+    return pd.DataFrame(
+        columns,
+        index=pd.MultiIndex(
+            levels=[pd.DatetimeIndex(index.dates), index.symbols],
+            labels=[date_codes, index.symbol_codes[rows]],
+            names=list(BUNDLE_KEY),
+        ),
+        columns=[name for name in z.names if name not in BUNDLE_KEY],
+    )
+
+
 def sanitize_df(df):
     # Using a sampling method to identify dates for efficiency with
     # large datasets
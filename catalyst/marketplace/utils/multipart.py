@@ -0,0 +1,172 @@
+import os
+import re
+from email.parser import HeaderParser
+
+from requests_toolbelt.multipart.decoder import \
+    NonMultipartContentTypeException, ImproperBodyPartContentException
+
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+
+
+class StreamedPart(object):
+    """A part of a multipart response written to disk.
+
+    Parameters
+    ----------
+    headers: dict[str, str]
+        The headers of the part.
+    path: str
+        The file containing the content of the part.
+    """
+
+    def __init__(self, headers, path):
+        self.headers = headers
+        self.path = path
+
+    @property
+    def filename(self):
+        disposition = self.headers.get('Content-Disposition', '')
+        match = re.search(r'filename="(.*)"', disposition)
+        return match.group(1) if match else None
+
+
+class StreamingMultipartDecoder(object):
+    """Decode a multipart body as it is downloaded.
+
+    Unlike ``requests_toolbelt.MultipartDecoder``, the body is never held
+    in memory: the content of each part is written to a file of the target
+    folder as the chunks arrive, at most one delimiter of the body is
+    buffered.
+
+    Parameters
+    ----------
+    content_type: str
+        The Content-Type header of the response.
+    encoding: str
+        The encoding of the part headers.
+    """
+
+    def __init__(self, content_type, encoding='utf-8'):
+        mimetype, _, params = content_type.partition(';')
+        if not mimetype.strip().lower().startswith('multipart'):
+            raise NonMultipartContentTypeException(
+                'Unexpected mimetype in content-type header: {}'.format(
+                    mimetype
+                )
+            )
+
+        match = re.search(r'boundary="?([^";]+)"?', params)
+        if match is None:
+            raise NonMultipartContentTypeException(
+                'No boundary in content-type header: {}'.format(content_type)
+            )
+
+        self.encoding = encoding
+        self.boundary = match.group(1).encode(encoding)
+
+    @classmethod
+    def from_response(cls, response, encoding='utf-8'):
+        return cls(response.headers.get('content-type', ''), encoding)
+
+    def _parse_headers(self, data):
+        headers = HeaderParser().parsestr(data.decode(self.encoding))
+        return dict(headers.items())
+
+    def iter_parts(self, chunks, target_folder):
+        """Write the parts of a body to the target folder.
+
+        Parameters
+        ----------
+        chunks: iterable[bytes]
+            The body, as returned by ``response.iter_content``.
+        target_folder: str
+            The folder of the part files, named after the filename of
+            their Content-Disposition header.
+
+        Returns
+        -------
+        iterable[StreamedPart]
+            Each part once its content is entirely written.
+        """
+        opening = b'--' + self.boundary
+        delimiter = b'\r\n' + opening
+
+        buffer = b''
+        chunks = iter(chunks)
+
+        def read(buffer):
+            for chunk in chunks:
+                if chunk:
+                    return buffer + chunk, True
+
+            return buffer, False
+
+        # Skip the preamble.
+        while True:
+            index = buffer.find(opening)
+            if index != -1:
+                buffer = buffer[index + len(opening):]
+                break
+
+            buffer, more = read(buffer[-len(opening):])
+            if not more:
+                raise ImproperBodyPartContentException(
+                    'The body does not contain the boundary.'
+                )
+
+        counter = 0
+        while True:
+            # The boundary is followed by -- after the last part.
+            while len(buffer) < 2:
+                buffer, more = read(buffer)
+                if not more:
+                    raise ImproperBodyPartContentException(
+                        'The body ended before its closing boundary.'
+                    )
+
+            if buffer.startswith(b'--'):
+                return
+
+            while True:
+                index = buffer.find(b'\r\n\r\n')
+                if index != -1:
+                    break
+
+                buffer, more = read(buffer)
+                if not more:
+                    raise ImproperBodyPartContentException(
+                        'The body ended in the headers of a part.'
+                    )
+
+            headers = self._parse_headers(buffer[:index].lstrip())
+            buffer = buffer[index + 4:]
+
+            counter += 1
+            part = StreamedPart(headers, None)
+            part.path = os.path.join(
+                target_folder,
+                os.path.basename(part.filename or '')
+                or 'part-{}'.format(counter),
+            )
+
+            with open(part.path, 'wb') as f:
+                while True:
+                    index = buffer.find(delimiter)
+                    if index != -1:
+                        f.write(buffer[:index])
+                        buffer = buffer[index + len(delimiter):]
+                        break
+
+                    # Keep what could be the beginning of the delimiter.
+                    keep = len(delimiter) - 1
+                    if len(buffer) > keep:
+                        f.write(buffer[:-keep])
+                        buffer = buffer[-keep:]
+
+                    buffer, more = read(buffer)
+                    if not more:
+                        raise ImproperBodyPartContentException(
+                            'The body ended in the content of a part.'
+                        )
+
+            yield part
@@ -0,0 +1,305 @@
+"""
+Synthetic exchange data for tests and benchmarks.
+
+The generators follow :mod:`catalyst.pipeline.loaders.synthetic` but target
+the OPEN calendar used by the exchanges: seeded OHLCV bars are written to
+the exchange bundles and the asset caches are filled so that exchanges
+initialize without any network access.
+"""
+import numpy as np
+import pandas as pd
+from numpy.random import RandomState
+
+from catalyst import get_calendar
+from catalyst.assets._assets import TradingPair
+from catalyst.data.loader import INDEX_MAPPING, get_data_filepath
+from catalyst.exchange.exchange_asset_cache import ExchangeAssetCache, \
+    get_etag, get_files_etag
+from catalyst.exchange.exchange_bundle import ExchangeBundle
+from catalyst.exchange.utils.exchange_utils import \
+    get_exchange_symbols_filename
+
+OHLCV = ['open', 'high', 'low', 'close', 'volume']
+
+
+def make_ohlcv_frame(dts, seed=0, start_price=100.0, volatility=0.001,
+                     mean_volume=10.0):
+    """
+    Random walk OHLCV bars.
+
+    The same seed always yields the same bars, regardless of the platform.
+
+    Parameters
+    ----------
+    dts: pd.DatetimeIndex
+        The label of each bar.
+    seed: int
+    start_price: float
+        The open price of the first bar.
+    volatility: float
+        The standard deviation of the log return of each bar.
+    mean_volume: float
+
+    Returns
+    -------
+    DataFrame
+
+    """
+    rand = RandomState(seed)
+    size = len(dts)
+
+    close = start_price * np.exp(
+        np.cumsum(rand.normal(0, volatility, size=size))
+    )
+    open_ = np.empty(size)
+    open_[:1] = start_price
+    open_[1:] = close[:-1]
+
+    spread = np.abs(rand.normal(0, volatility, size=size)) * close
+    high = np.maximum(open_, close) + spread
+    low = np.minimum(open_, close) - spread
+    volume = rand.uniform(0.5, 1.5, size=size) * mean_volume
+
+    return pd.DataFrame(
+        dict(open=open_, high=high, low=low, close=close, volume=volume),
+        index=dts,
+        columns=OHLCV,
+    )
+
+
+def make_trading_pair_params(exchange_name, symbol, start_date,
+                             end_daily=None, end_minute=None):
+    """
+    The parameters of a synthetic TradingPair, as cached by the exchanges.
+
+    Parameters
+    ----------
+    exchange_name: str
+    symbol: str
+        The catalyst symbol, e.g. btc_usdt.
+    start_date: pd.Timestamp
+    end_daily: pd.Timestamp, optional
+        The last daily bar in the bundle.
+    end_minute: pd.Timestamp, optional
+        The last minute bar in the bundle.
+
+    Returns
+    -------
+    dict[str, Object]
+
+    """
+    return dict(
+        exchange=exchange_name,
+        data_source='catalyst',
+        symbol=symbol,
+        exchange_symbol=symbol.replace('_', '').upper(),
+        start_date=start_date,
+        end_daily=end_daily,
+        end_minute=end_minute,
+        leverage=1.0,
+        min_trade_size=0.0001,
+        maker=0.001,
+        taker=0.002,
+    )
+
+
+def make_market(params):
+    """
+    The CCXT market matching synthetic TradingPair parameters.
+
+    Parameters
+    ----------
+    params: dict[str, Object]
+
+    Returns
+    -------
+    dict[str, Object]
+
+    """
+    base, quote = params['symbol'].upper().split('_')
+    return dict(
+        id=params['exchange_symbol'],
+        symbol='{}/{}'.format(base, quote),
+        base=base,
+        quote=quote,
+        active=True,
+        maker=params['maker'],
+        taker=params['taker'],
+        precision=dict(amount=8, price=8),
+        limits=dict(
+            amount=dict(min=params['min_trade_size'], max=None),
+            price=dict(min=None, max=None),
+        ),
+    )
+
+
+def write_exchange_asset_cache(exchange_name, assets_params):
+    """
+    Save the asset cache of an exchange, used by ``CCXT.init()`` instead
+    of fetching the markets.
+
+    Parameters
+    ----------
+    exchange_name: str
+    assets_params: list[dict[str, Object]]
+
+    """
+    markets = [make_market(params) for params in assets_params]
+    symbols_etag = get_files_etag([
+        get_exchange_symbols_filename(exchange_name, is_local)
+        for is_local in (False, True)
+    ])
+
+    ExchangeAssetCache(exchange_name).save(
+        markets, assets_params, get_etag(markets), symbols_etag
+    )
+
+
+def write_exchange_bundle(exchange_name, assets, start, end, data_frequency,
+                          seed=0):
+    """
+    Write random walk bars of the assets to the bundle of an exchange.
+
+    Parameters
+    ----------
+    exchange_name: str
+    assets: list[TradingPair]
+    start: pd.Timestamp
+    end: pd.Timestamp
+    data_frequency: str
+        'daily' or 'minute'
+    seed: int
+        The seed of the first asset, incremented for each asset.
+
+    """
+    calendar = get_calendar('OPEN')
+    if data_frequency == 'minute':
+        dts = calendar.minutes_for_sessions_in_range(start, end)
+    else:
+        dts = calendar.sessions_in_range(start, end)
+
+    bundle = ExchangeBundle(exchange_name)
+    writer = bundle.get_writer(dts[0], dts[-1], data_frequency)
+    for index, asset in enumerate(assets):
+        df = make_ohlcv_frame(
+            dts,
+            seed=seed + index,
+            start_price=100.0 * (index + 1),
+            volatility=0.001 if data_frequency == 'minute' else 0.03,
+        )
+        bundle.ingest_df(
+            ohlcv_df=df,
+            data_frequency=data_frequency,
+            asset=asset,
+            writer=writer,
+            empty_rows_behavior='ignore',
+        )
+
+
+def make_treasury_curves(start, end, rate=0.02):
+    """
+    Flat daily treasury curves.
+
+    Parameters
+    ----------
+    start: pd.Timestamp
+    end: pd.Timestamp
+    rate: float
+        The rate of every duration.
+
+    Returns
+    -------
+    DataFrame
+
+    """
+    dts = pd.date_range(
+        pd.Timestamp(start).date(), pd.Timestamp(end).date(), freq='D',
+    )
+    durations = ['1month', '3month', '6month', '1year', '2year', '3year',
+                 '5year', '7year', '10year', '20year', '30year']
+
+    return pd.DataFrame(rate, index=dts.tz_localize('UTC'), columns=durations)
+
+
+def write_treasury_curves(start, end, environ=None):
+    """
+    Save flat treasury curves, loaded with the benchmark returns instead
+    of being downloaded.
+
+    Parameters
+    ----------
+    start: pd.Timestamp
+    end: pd.Timestamp
+    environ: dict, optional
+
+    """
+    _, filename, _ = INDEX_MAPPING['SPY']
+    curves = make_treasury_curves(start, end)
+    curves.index = curves.index.tz_localize(None)
+    curves.to_csv(get_data_filepath(filename, environ))
+
+
+def make_synthetic_exchanges(symbols, start, end, daily_start=None,
+                             data_frequencies=('daily', 'minute'), seed=0,
+                             environ=None):
+    """
+    Create synthetic exchanges under the current catalyst root.
+
+    Parameters
+    ----------
+    symbols: dict[str, list[str]]
+        The catalyst symbols of each exchange.
+    start: pd.Timestamp
+        The first session of the minute bars.
+    end: pd.Timestamp
+        The last session of the bundles.
+    daily_start: pd.Timestamp, optional
+        The first session of the daily bars. The first session of the
+        OPEN calendar by default, as required by the benchmark returns.
+    data_frequencies: tuple[str]
+    seed: int
+    environ: dict, optional
+
+    Returns
+    -------
+    dict[str, list[TradingPair]]
+        The assets of each exchange.
+
+    """
+    calendar = get_calendar('OPEN')
+    if daily_start is None:
+        daily_start = calendar.first_session
+
+    end_minute = calendar.session_close(end) \
+        if 'minute' in data_frequencies else None
+    end_daily = end if 'daily' in data_frequencies else None
+
+    exchanges = dict()
+    for exchange_name in sorted(symbols):
+        assets_params = [
+            make_trading_pair_params(
+                exchange_name, symbol,
+                start_date=daily_start,
+                end_daily=end_daily,
+                end_minute=end_minute,
+            ) for symbol in symbols[exchange_name]
+        ]
+        write_exchange_asset_cache(exchange_name, assets_params)
+
+        assets = [TradingPair(**params) for params in assets_params]
+        for data_frequency in data_frequencies:
+            write_exchange_bundle(
+                exchange_name,
+                assets,
+                start=start if data_frequency == 'minute' else daily_start,
+                end=end,
+                data_frequency=data_frequency,
+                seed=seed,
+            )
+            seed += len(assets)
+
+        exchanges[exchange_name] = assets
+
+    write_treasury_curves(pd.Timestamp('1990-01-02'), end, environ)
+
+    return exchanges
@@ -0,0 +1,348 @@
+"""
+Measure the time spent in the stages of each bar.
+
+The hot path of the simulation opens named spans, e.g.
+``with profile_span('history'):``. Unless a profiler is installed with
+``set_profiler``, the spans are a shared object doing nothing.
+
+The durations of each stage are aggregated into histograms which can be
+exported in the Prometheus text format or as JSON lines.
+"""
+import json
+import os
+from bisect import bisect_left
+from threading import Lock
+from time import time
+
+from catalyst.utils.paths import ensure_directory
+
+# The upper bounds, in seconds, of the buckets of the histograms.
+BUCKETS = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1,
+    0.25, 0.5, 1.0, 2.5, 5.0, 10.0, float('inf'),
+)
+
+EXPORT_FORMATS = ('prometheus', 'jsonl')
+
+METRIC_NAME = 'catalyst_bar_stage_seconds'
+
+
+class StageHistogram(object):
+    """The durations of a stage, bucketed by BUCKETS."""
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.buckets = [0] * len(BUCKETS)
+
+    def add(self, elapsed):
+        self.count += 1
+        self.total += elapsed
+        if elapsed > self.max:
+            self.max = elapsed
+
+        self.buckets[bisect_left(BUCKETS, elapsed)] += 1
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+    def quantile(self, q):
+        """
+        An upper bound of a quantile, the bound of its bucket.
+
+        Parameters
+        ----------
+        q: float
+            Between 0 and 1.
+
+        Returns
+        -------
+        float
+
+        """
+        rank = q * self.count
+        cumulative = 0
+        for bound, count in zip(BUCKETS, self.buckets):
+            cumulative += count
+            if count and cumulative >= rank:
+                return min(bound, self.max)
+
+        return self.max
+
+    def to_dict(self):
+        return dict(
+            count=self.count,
+            sum=self.total,
+            mean=self.mean,
+            p50=self.quantile(0.5),
+            p95=self.quantile(0.95),
+            p99=self.quantile(0.99),
+            max=self.max,
+        )
+
+
+class _Span(object):
+    __slots__ = ('profiler', 'name', 'start')
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+        self.start = None
+
+    def __enter__(self):
+        self.start = time()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.profiler.record(self.name, time() - self.start)
+
+
+class _NoopSpan(object):
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+class NullProfiler(object):
+    """The profiler in place when profiling is disabled."""
+
+    enabled = False
+
+    def span(self, name):
+        return NOOP_SPAN
+
+    def record(self, name, elapsed):
+        pass
+
+    def on_bar(self, dt):
+        pass
+
+
+class BarProfiler(object):
+    """
+    Aggregate the durations of the stages of the bars.
+
+    Parameters
+    ----------
+    folder: str, optional
+        The folder where the histograms are exported, typically in the
+        folder of the algorithm. Nothing is exported otherwise.
+    export_format: str
+        'prometheus' rewrites a text file in the Prometheus exposition
+        format, 'jsonl' appends a summary of each stage as JSON lines.
+    export_interval: float
+        The minimum number of seconds between two exports.
+
+    """
+
+    enabled = True
+
+    def __init__(self, folder=None, export_format='prometheus',
+                 export_interval=60):
+        if export_format not in EXPORT_FORMATS:
+            raise ValueError(
+                'invalid export format {}, expected one of {}'.format(
+                    export_format, ', '.join(EXPORT_FORMATS)
+                )
+            )
+
+        self.folder = folder
+        self.export_format = export_format
+        self.export_interval = export_interval
+
+        self.histograms = dict()
+        self.order = []
+
+        self._lock = Lock()
+        self._last_export = time()
+        self._last_dt = None
+
+    @property
+    def export_path(self):
+        if self.folder is None:
+            return None
+
+        extension = 'prom' if self.export_format == 'prometheus' else 'jsonl'
+        return os.path.join(
+            self.folder, 'bar_stages.{}'.format(extension)
+        )
+
+    def span(self, name):
+        return _Span(self, name)
+
+    def record(self, name, elapsed):
+        with self._lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = StageHistogram()
+                self.order.append(name)
+
+            histogram.add(elapsed)
+
+    def on_bar(self, dt):
+        """Export the histograms if due, called at the end of each bar."""
+        self._last_dt = dt
+        if self.folder is not None and \
+                time() - self._last_export >= self.export_interval:
+            self.export()
+
+    def to_prometheus(self):
+        """
+        The histograms in the Prometheus text format.
+
+        Returns
+        -------
+        str
+
+        """
+        lines = [
+            '# HELP {} Time spent in the stages of a bar.'.format(
+                METRIC_NAME
+            ),
+            '# TYPE {} histogram'.format(METRIC_NAME),
+        ]
+        with self._lock:
+            for name in self.order:
+                histogram = self.histograms[name]
+
+                cumulative = 0
+                for bound, count in zip(BUCKETS, histogram.buckets):
+                    cumulative += count
+                    lines.append(
+                        '{}_bucket{{stage="{}",le="{}"}} {}'.format(
+                            METRIC_NAME, name,
+                            '+Inf' if bound == float('inf') else repr(bound),
+                            cumulative,
+                        )
+                    )
+                lines.append('{}_sum{{stage="{}"}} {!r}'.format(
+                    METRIC_NAME, name, histogram.total,
+                ))
+                lines.append('{}_count{{stage="{}"}} {}'.format(
+                    METRIC_NAME, name, histogram.count,
+                ))
+
+        return '\n'.join(lines) + '\n'
+
+    def to_json(self):
+        """
+        A summary of each stage as a JSON line.
+
+        Returns
+        -------
+        str
+
+        """
+        with self._lock:
+            stages = dict(
+                (name, self.histograms[name].to_dict()) for name in self.order
+            )
+
+        return json.dumps(dict(
+            dt=str(self._last_dt) if self._last_dt is not None else None,
+            stages=stages,
+        ), sort_keys=True)
+
+    def export(self):
+        """Write the histograms to the folder of the profiler."""
+        path = self.export_path
+        if path is None:
+            return
+
+        ensure_directory(self.folder)
+        if self.export_format == 'prometheus':
+            temp_path = '{}.tmp'.format(path)
+            with open(temp_path, 'w') as f:
+                f.write(self.to_prometheus())
+            os.rename(temp_path, path)
+
+        else:
+            with open(path, 'a') as f:
+                f.write(self.to_json() + '\n')
+
+        self._last_export = time()
+
+    def get_report(self):
+        """
+        A human readable summary of the stages.
+
+        Returns
+        -------
+        str
+
+        """
+        bar = self.histograms.get('bar')
+        lines = [
+            'Profiled {} bars'.format(bar.count if bar is not None else 0),
+            '{:<24} {:>8} {:>10} {:>10} {:>10} {:>10} {:>7}'.format(
+                'stage', 'count', 'total', 'mean', 'p95', 'max', 'share',
+            ),
+        ]
+
+        stages = sorted(
+            self.order, key=lambda n: self.histograms[n].total, reverse=True
+        )
+        for name in stages:
+            histogram = self.histograms[name]
+            share = histogram.total / bar.total \
+                if bar is not None and bar.total else 0.0
+            lines.append(
+                '{:<24} {:>8} {:>9.3f}s {:>8.2f}ms {:>8.2f}ms {:>8.2f}ms '
+                '{:>6.1%}'.format(
+                    name,
+                    histogram.count,
+                    histogram.total,
+                    histogram.mean * 1000,
+                    histogram.quantile(0.95) * 1000,
+                    histogram.max * 1000,
+                    share,
+                )
+            )
+
+        return '\n'.join(lines)
+
+
+_profiler = NullProfiler()
+
+
+def get_profiler():
+    return _profiler
+
+
+def set_profiler(profiler):
+    """
+    Install the profiler of the bars.
+
+    Parameters
+    ----------
+    profiler: BarProfiler
+        None disables the profiling.
+
+    """
+    global _profiler
+    _profiler = profiler if profiler is not None else NullProfiler()
+
+
+def profile_span(name):
+    """
+    A span timing a stage of the bar with the installed profiler.
+
+    Parameters
+    ----------
+    name: str
+
+    Returns
+    -------
+    context manager
+
+    """
+    return _profiler.span(name)
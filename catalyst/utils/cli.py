@@ -1,7 +1,6 @@
 from itertools import count
 
 import click
-import pandas as pd
 
 from .context_tricks import CallbackManager
 
@@ -70,6 +69,8 @@ class _DatetimeParam(click.ParamType):
         self.tz = tz
 
     def parser(self, value):
+        # pandas is imported on use to keep the command line startup fast.
+        import pandas as pd
         return pd.Timestamp(value, tz=self.tz)
 
     @property
@@ -144,4 +145,5 @@ class Timedelta(_DatetimeParam):
         self.unit = unit
 
     def parser(self, value):
+        import pandas as pd
         return pd.Timedelta(value, unit=self.unit)
@@ -59,6 +59,15 @@ __all__ = [
 MAX_MONTH_RANGE = 23
 MAX_WEEK_RANGE = 5
 
+# The wake up time of the events which never trigger again.
+NEVER = np.iinfo(np.int64).max
+
+_ONE_NANOSECOND = pd.Timedelta(1, unit='ns')
+
+# The number of refinements of the next trigger of a composed rule before
+# falling back to evaluating it.
+MAX_COMPOSED_ITERATIONS = 64
+
 
 def naive_to_utc(ts):
     """
@@ -179,11 +188,49 @@ def lossless_float_to_int(funcname, func, argname, arg):
     raise TypeError(arg)
 
 
+def _next_session_trigger(cal, trigger_for_session, dt):
+    """
+    The first trigger at or after dt of a rule triggering once per session.
+    """
+    session = cal.minute_to_session_label(dt)
+    trigger = trigger_for_session(session)
+    if trigger < dt:
+        try:
+            session = cal.next_session_label(session)
+        except ValueError:
+            return None
+
+        trigger = trigger_for_session(session)
+
+    return trigger
+
+
+def _next_execution_period(cal, execution_period_values, dt):
+    """
+    The earliest time at or after dt within one of the execution periods.
+    """
+    session = cal.minute_to_session_label(dt)
+    index = np.searchsorted(execution_period_values, session.value)
+    if index == len(execution_period_values):
+        return None
+
+    if execution_period_values[index] == session.value:
+        return dt
+
+    # The label of a session is at or before its first minute.
+    return pd.Timestamp(execution_period_values[index], tz='UTC')
+
+
 class EventManager(object):
     """Manages a list of Event objects.
     This manages the logic for checking the rules and dispatching to the
     handle_data function of the Events.
 
+    Each event wakes up at the next time its rule may trigger, as reported
+    by ``EventRule.next_trigger``. The rules are only evaluated for the
+    events due on a bar, the bars without any due event are skipped with a
+    single comparison.
+
     Parameters
     ----------
     create_context : (BarData) -> context manager, optional
@@ -192,6 +239,10 @@ class EventManager(object):
     """
     def __init__(self, create_context=None):
         self._events = []
+        # The time, as nanoseconds since the epoch, of the next bar at which
+        # each event must be evaluated.
+        self._wakes = np.empty(0, dtype=np.int64)
+        self._next_wake = NEVER
         self._create_context = (
             create_context
             if create_context is not None else
@@ -202,20 +253,53 @@ class EventManager(object):
         """
         Adds an event to the manager.
         """
+        # The lists are replaced rather than modified, events may be added
+        # by a callback while handle_data iterates over the events.
         if prepend:
-            self._events.insert(0, event)
+            self._events = [event] + self._events
+            self._wakes = np.insert(self._wakes, 0, 0)
         else:
-            self._events.append(event)
+            self._events = self._events + [event]
+            self._wakes = np.append(self._wakes, 0)
+
+        self._next_wake = 0
 
     def handle_data(self, context, data, dt):
+        dt = pd.Timestamp(dt)
+        value = dt.value
+        if value < self._next_wake:
+            return
+
+        events = self._events
+        wakes = self._wakes
+        due = np.flatnonzero(wakes <= value)
+
         with self._create_context(data):
-            for event in self._events:
-                event.handle_data(
+            for index in due:
+                events[index].handle_data(
                     context,
                     data,
                     dt,
                 )
 
+        after = dt + _ONE_NANOSECOND
+        for index in due:
+            trigger = events[index].rule.next_trigger(after)
+            wakes[index] = trigger.value if trigger is not None else NEVER
+
+        if events is not self._events:
+            # Events were added by a callback, the new ones are due on
+            # the next bar.
+            known = dict(
+                (id(event), wake) for event, wake in zip(events, wakes)
+            )
+            self._wakes = np.array(
+                [known.get(id(event), 0) for event in self._events],
+                dtype=np.int64,
+            )
+
+        self._next_wake = self._wakes.min() if len(self._wakes) else NEVER
+
 
 class Event(namedtuple('Event', ['rule', 'callback'])):
     """
@@ -244,6 +328,21 @@ class EventRule(six.with_metaclass(ABCMeta)):
         """
         raise NotImplementedError('should_trigger')
 
+    def next_trigger(self, dt):
+        """
+        The earliest time, at or after dt, at which the rule may trigger.
+
+        The EventManager does not evaluate the rule before this time. An
+        earlier time is always correct, the default is to evaluate the rule
+        on every bar.
+
+        Returns
+        -------
+        pd.Timestamp
+            None if the rule never triggers again.
+        """
+        return dt
+
 
 class StatelessRule(EventRule):
     """
@@ -293,6 +392,24 @@ class ComposedRule(StatelessRule):
             dt
         )
 
+    def next_trigger(self, dt):
+        if self.composer is not ComposedRule.lazy_and:
+            return dt
+
+        # Alternate between the two rules until they agree on a time.
+        for _ in range(MAX_COMPOSED_ITERATIONS):
+            first = self.first.next_trigger(dt)
+            if first is None:
+                return None
+
+            second = self.second.next_trigger(first)
+            if second is None or second == first:
+                return second
+
+            dt = second
+
+        return dt
+
     @staticmethod
     def lazy_and(first_should_trigger, second_should_trigger, dt):
         """
@@ -327,6 +444,9 @@ class Never(StatelessRule):
         return False
     should_trigger = never_trigger
 
+    def next_trigger(self, dt):
+        return None
+
 
 class AfterOpen(StatelessRule):
     """
@@ -365,6 +485,15 @@ class AfterOpen(StatelessRule):
 
         self._period_end = self._period_start + self.offset - self._one_minute
 
+    def _trigger_for_session(self, session):
+        period_start = self.cal.execution_time_from_open(
+            self.cal.open_and_close_for_session(session)[0],
+        )
+        return period_start + self.offset - self._one_minute
+
+    def next_trigger(self, dt):
+        return _next_session_trigger(self.cal, self._trigger_for_session, dt)
+
     def should_trigger(self, dt):
         # There are two reasons why we might want to recalculate the dates.
         # One is the first time we ever call should_trigger, when
@@ -421,6 +550,15 @@ class BeforeClose(StatelessRule):
         self._period_start = self._period_end - self.offset
         self._period_close = self._period_end
 
+    def _trigger_for_session(self, session):
+        period_end = self.cal.execution_time_from_close(
+            self.cal.open_and_close_for_session(session)[1],
+        )
+        return period_end - self.offset
+
+    def next_trigger(self, dt):
+        return _next_session_trigger(self.cal, self._trigger_for_session, dt)
+
     def should_trigger(self, dt):
         # There are two reasons why we might want to recalculate the dates.
         # One is the first time we ever call should_trigger, when
@@ -445,6 +583,18 @@ class NotHalfDay(StatelessRule):
         return self.cal.minute_to_session_label(dt) \
             not in self.cal.early_closes
 
+    def next_trigger(self, dt):
+        session = self.cal.minute_to_session_label(dt)
+        while session in self.cal.early_closes:
+            try:
+                session = self.cal.next_session_label(session)
+            except ValueError:
+                return None
+
+            dt = max(dt, session)
+
+        return dt
+
 
 class TradingDayOfWeekRule(six.with_metaclass(ABCMeta, StatelessRule)):
     @preprocess(n=lossless_float_to_int('TradingDayOfWeekRule'))
@@ -459,6 +609,15 @@ class TradingDayOfWeekRule(six.with_metaclass(ABCMeta, StatelessRule)):
         val = self.cal.minute_to_session_label(dt, direction="none").value
         return val in self.execution_period_values
 
+    def next_trigger(self, dt):
+        return _next_execution_period(
+            self.cal, self.sorted_execution_period_values, dt,
+        )
+
+    @lazyval
+    def sorted_execution_period_values(self):
+        return np.array(sorted(self.execution_period_values), dtype=np.int64)
+
     @lazyval
     def execution_period_values(self):
         # calculate the list of periods that match the given criteria
@@ -504,6 +663,15 @@ class TradingDayOfMonthRule(six.with_metaclass(ABCMeta, StatelessRule)):
         value = self.cal.minute_to_session_label(dt, direction="none").value
         return value in self.execution_period_values
 
+    def next_trigger(self, dt):
+        return _next_execution_period(
+            self.cal, self.sorted_execution_period_values, dt,
+        )
+
+    @lazyval
+    def sorted_execution_period_values(self):
+        return np.array(sorted(self.execution_period_values), dtype=np.int64)
+
     @lazyval
     def execution_period_values(self):
         # calculate the list of periods that match the given criteria
@@ -576,6 +744,22 @@ class OncePerDay(StatefulRule):
             self.triggered = True
             return True
 
+    def next_trigger(self, dt):
+        if self.date is None or 'should_trigger' in self.__dict__:
+            return dt
+
+        # The day is reset on the first bar after next_date, the rule must
+        # be evaluated on that bar even when the wrapped rule does not
+        # trigger.
+        if self.triggered or dt >= self.next_date:
+            return max(dt, self.next_date)
+
+        trigger = self.rule.next_trigger(dt)
+        if trigger is None or trigger > self.next_date:
+            return self.next_date
+
+        return trigger
+
 
 # Factory API
 
@@ -0,0 +1,50 @@
+import threading
+import time
+
+
+class RateLimiter(object):
+    """Spaces out the requests sent to a data source by several threads.
+
+    Each call to ``wait`` reserves the next free slot under a lock and
+    sleeps outside of it, so concurrent callers are started at least
+    ``interval`` apart without serializing the requests themselves.
+
+    Parameters
+    ----------
+    interval : float or pd.Timedelta
+        The minimum time between the start of two requests, in seconds.
+    clock : callable, optional
+        Returns the current time in seconds.
+    sleep : callable, optional
+        Sleeps for the given number of seconds.
+    """
+
+    def __init__(self, interval, clock=time.time, sleep=time.sleep):
+        if hasattr(interval, 'total_seconds'):
+            interval = interval.total_seconds()
+
+        self.interval = float(interval)
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._next_slot = None
+
+    def wait(self):
+        """Block until the caller may send its request.
+
+        Returns
+        -------
+        delay : float
+            The number of seconds spent waiting.
+        """
+        with self._lock:
+            now = self._clock()
+            slot = now if self._next_slot is None \
+                else max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+
+        delay = slot - now
+        if delay > 0:
+            self._sleep(delay)
+
+        return max(delay, 0)
@@ -8,8 +8,8 @@ from hashlib import md5
 from logbook import Logger
 
 from catalyst.utils.remote_utils import BACKTEST_PATH, STATUS_PATH, POST, \
-    GET, EXCEPTION_LOG, convert_date, prepare_args, handle_status, \
-    is_valid_uuid
+    GET, EXCEPTION_LOG, COLUMNAR, RemoteResults, convert_date, \
+    prepare_args, handle_status, is_valid_uuid
 from catalyst.exchange.utils.exchange_utils import get_remote_auth,\
     get_remote_folder
 from catalyst.exchange.exchange_errors import RemoteAuthEmpty
@@ -23,12 +23,13 @@ BACKTEST = 'backtest'
 STATUS = 'status'
 
 
-def handle_response(response, mode):
+def handle_response(response, mode, results=None):
     """
     handles the response given by the server according to it's status code
 
     :param response: the format returned from a request
     :param mode: Backtest/ status
+    :param results: RemoteResults, the results downloaded so far
     :return: DataFrame/ str
     """
     if response.status_code == 500:
@@ -54,7 +55,7 @@ def handle_response(response, mode):
                      + algo_id)
             return algo_id
         elif mode == STATUS:
-            return handle_status(response.json())
+            return handle_status(response.json(), results)
 
 
 def remote_backtest(
@@ -129,15 +130,40 @@ def remote_backtest(
     return handle_response(response, BACKTEST)
 
 
-def get_remote_status(algo_id):
+def get_remote_status(algo_id, results_folder=None):
+    """
+    The status of a remote algorithm, with its results so far.
+
+    Only the rows of the stats and the lines of the log added since the
+    last call are downloaded, chunk by chunk, and appended to the
+    results kept locally.
+
+    :param algo_id: str
+    :param results_folder: str, defaults to the remote folder
+    :return: the status, or the status, the stats and the log
+    """
     if not is_valid_uuid(algo_id):
         raise Exception("the id you entered is invalid! "
                         "please enter a valid id.")
-    json_file = {'algo_id': algo_id}
-    response = send_digest_request(
-        json_file=json_file, path=STATUS_PATH, method=GET
+
+    results = RemoteResults(
+        algo_id,
+        results_folder if results_folder is not None
+        else get_remote_folder(),
     )
-    return handle_response(response, STATUS)
+    while True:
+        json_file = {
+            'algo_id': algo_id,
+            'cursor': results.cursor,
+            'log_cursor': results.log_cursor,
+            'encoding': COLUMNAR,
+        }
+        response = send_digest_request(
+            json_file=json_file, path=STATUS_PATH, method=GET
+        )
+        status_response = handle_response(response, STATUS, results)
+        if not isinstance(status_response, tuple) or not results.has_more:
+            return status_response
 
 
 def send_digest_request(json_file, path, method):
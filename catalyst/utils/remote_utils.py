@@ -1,11 +1,17 @@
 import base64
+import json
+import os
 import pickle
+import struct
 import zlib
 from uuid import UUID
 
+import numpy as np
 import pandas as pd
 from logbook import Logger
 
+from catalyst.utils.paths import ensure_directory
+
 
 log = Logger('remote')
 
@@ -16,6 +22,10 @@ POST = 'POST'
 GET = 'GET'
 NONEXISTENT = 'nonexistent'
 
+# The binary columnar encoding of the chunks of stats.
+COLUMNAR = 'columnar-v1'
+INDEX_KEY = '__index__'
+
 EXCEPTION_LOG = "please contact Catalyst support to fix this issue at\n" \
                 "https://github.com/enigmampc/catalyst/issues/"
 
@@ -64,14 +74,261 @@ def decompress_data(encoded_data):
     return zlib.decompress(compressed_file)
 
 
-def handle_status(received_content):
+def _encode_array(values):
+    tz = getattr(values.dtype, 'tz', None)
+    if tz is not None:
+        # The dates are sent in UTC along with their timezone.
+        values = pd.DatetimeIndex(values).asi8.view('M8[ns]')
+    else:
+        values = np.asarray(values)
+
+    if values.dtype.kind in 'biufcmM':
+        spec = dict(dtype=values.dtype.str)
+        data = np.ascontiguousarray(values).tobytes()
+    else:
+        # The lists of orders, transactions and positions.
+        spec = dict(dtype='object')
+        data = pickle.dumps(list(values), protocol=2)
+
+    if tz is not None:
+        spec['tz'] = str(tz)
+    spec['nbytes'] = len(data)
+    return spec, data
+
+
+def _decode_array(spec, data):
+    if spec['dtype'] == 'object':
+        items = pickle.loads(data)
+        values = np.empty(len(items), dtype=object)
+        values[:] = items
+        return values
+
+    values = np.frombuffer(data, dtype=np.dtype(str(spec['dtype']))).copy()
+    if 'tz' in spec:
+        values = pd.DatetimeIndex(values).tz_localize('UTC').tz_convert(
+            spec['tz']
+        )
+    return values
+
+
+def encode_columnar(df):
+    """
+    Encode the rows of a DataFrame column by column.
+
+    The numeric and date columns are sent as their raw buffers, the
+    others are pickled. The payload is compressed and base64 encoded to
+    be embedded in json.
+
+    Parameters
+    ----------
+    df: DataFrame
+
+    Returns
+    -------
+    str
+
+    """
+    columns = [(INDEX_KEY, df.index)] + [
+        (column, df[column]) for column in df.columns
+    ]
+
+    specs, buffers = [], []
+    for name, values in columns:
+        spec, data = _encode_array(values)
+        spec['name'] = name
+        specs.append(spec)
+        buffers.append(data)
+
+    header = json.dumps(dict(rows=len(df), columns=specs)).encode('utf-8')
+    payload = b''.join(
+        [struct.pack('>I', len(header)), header] + buffers
+    )
+    return base64.b64encode(zlib.compress(payload)).decode('ascii')
+
+
+def decode_columnar(encoded_data):
+    """
+    Decode a DataFrame encoded by encode_columnar.
+
+    Parameters
+    ----------
+    encoded_data: str
+
+    Returns
+    -------
+    DataFrame
+
+    """
+    payload = decompress_data(encoded_data)
+    header_size = struct.unpack('>I', payload[:4])[0]
+    header = json.loads(payload[4:4 + header_size].decode('utf-8'))
+
+    offset = 4 + header_size
+    index = None
+    data = dict()
+    names = []
+    for spec in header['columns']:
+        values = _decode_array(
+            spec, payload[offset:offset + spec['nbytes']]
+        )
+        offset += spec['nbytes']
+
+        if spec['name'] == INDEX_KEY:
+            index = values
+        else:
+            names.append(spec['name'])
+            data[spec['name']] = values
+
+    return pd.DataFrame(data, index=index, columns=names)
+
+
+class RemoteResults(object):
+    """
+    The results of a remote algorithm downloaded so far.
+
+    The server sends the rows of the stats and the lines of the log
+    added since a cursor. Each chunk is kept as received in the remote
+    folder, so that the download resumes where it stopped.
+
+    Parameters
+    ----------
+    algo_id: str
+    folder: str
+
+    """
+
+    def __init__(self, algo_id, folder):
+        self.algo_id = algo_id
+        self.folder = os.path.join(folder, 'results', algo_id)
+
+        self.cursor = 0
+        self.log_cursor = 0
+        self.has_more = False
+
+        self._frames = []
+        self._perf = None
+        self._log = []
+        self._log_size = 0
+        self._chunks = 0
+
+        self._load()
+
+    @property
+    def _state_path(self):
+        return os.path.join(self.folder, 'state.json')
+
+    def _chunk_path(self, number):
+        return os.path.join(self.folder, 'chunk_{}.bin'.format(number))
+
+    @property
+    def _log_path(self):
+        return os.path.join(self.folder, 'log.txt')
+
+    def _load(self):
+        if not os.path.isfile(self._state_path):
+            return
+
+        with open(self._state_path) as f:
+            state = json.load(f)
+
+        for number in range(state['chunks']):
+            with open(self._chunk_path(number)) as f:
+                self._frames.append(decode_columnar(f.read()))
+
+        # The lines appended after the state was saved are ignored, they
+        # are received again from the saved log cursor.
+        self._log_size = state.get('log_size')
+        if os.path.isfile(self._log_path):
+            with open(self._log_path, 'rb') as f:
+                data = f.read() if self._log_size is None \
+                    else f.read(self._log_size)
+            self._log.append(data.decode('utf-8'))
+            self._log_size = len(data)
+        else:
+            self._log_size = 0
+
+        self.cursor = state['cursor']
+        self.log_cursor = state['log_cursor']
+        self._chunks = state['chunks']
+
+    def _save_state(self):
+        temp_path = '{}.tmp'.format(self._state_path)
+        with open(temp_path, 'w') as f:
+            json.dump(dict(
+                cursor=self.cursor,
+                log_cursor=self.log_cursor,
+                log_size=self._log_size,
+                chunks=self._chunks,
+            ), f)
+        os.rename(temp_path, self._state_path)
+
+    def append(self, content):
+        """
+        Append a chunk received from the status endpoint.
+
+        Parameters
+        ----------
+        content: dict
+            The data of the new rows, their cursor, the new lines of the
+            log, its cursor and whether more chunks are ready.
+
+        """
+        ensure_directory(self.folder)
+
+        if content.get('data') is not None:
+            # Decoded as it arrives, the chunk is only written once valid.
+            self._frames.append(decode_columnar(content['data']))
+            self._perf = None
+            with open(self._chunk_path(self._chunks), 'w') as f:
+                f.write(content['data'])
+            self._chunks += 1
+
+        if content.get('log') is not None:
+            text = decompress_data(content['log']).decode('utf-8')
+            data = text.encode('utf-8')
+            self._log.append(text)
+            with open(self._log_path, 'ab') as f:
+                # Drop the lines of an append interrupted before its state
+                # was saved, which would be written twice otherwise.
+                f.truncate(self._log_size)
+                f.write(data)
+            self._log_size += len(data)
+
+        self.cursor = content['cursor']
+        self.log_cursor = content.get('log_cursor', self.log_cursor)
+        self.has_more = content.get('has_more', False)
+        self._save_state()
+
+    @property
+    def perf(self):
+        if not self._frames:
+            return None
+
+        if self._perf is None:
+            self._perf = pd.concat(self._frames) \
+                if len(self._frames) > 1 else self._frames[0]
+            self._frames = [self._perf]
+
+        return self._perf
+
+    @property
+    def log(self):
+        return ''.join(self._log)
+
+
+def handle_status(received_content, results=None):
     status = received_content['status']
     if status == NONEXISTENT:
         log.error(received_content['message'])
         return status
 
-    perf, log_file = load_response(received_content)
-    return status, perf, log_file
+    if results is None or 'cursor' not in received_content:
+        # The full results, as sent by the servers without cursors.
+        perf, log_file = load_response(received_content)
+        return status, perf, log_file
+
+    results.append(received_content)
+    return status, results.perf, results.log
 
 
 def is_valid_uuid(uuid_to_test, version=4):
@@ -1,9 +1,7 @@
 import os
 import re
 import sys
-import warnings
 from datetime import timedelta
-from runpy import run_path
 
 import click
 import pandas as pd
@@ -12,8 +10,6 @@ from six import string_types
 import catalyst
 from catalyst.data.bundles import load
 from catalyst.data.data_portal import DataPortal
-from catalyst.exchange.exchange_pricing_loader import ExchangePricingLoader, \
-    TradingPairPricing
 from catalyst.exchange.utils.factory import get_exchange
 from logbook import Logger
 
@@ -25,14 +21,15 @@ try:
     PYGMENTS = True
 except ImportError:
     PYGMENTS = False
-from toolz import valfilter, concatv
+from toolz import valfilter
 from functools import partial
 
 from catalyst.finance.trading import TradingEnvironment
+from catalyst.utils.bar_profiler import BarProfiler, set_profiler
 from catalyst.utils.calendars import get_calendar
 from catalyst.utils.factory import create_simulation_parameters
 from catalyst.data.loader import load_crypto_market_data
-import catalyst.utils.paths as pth
+from catalyst.utils.extensions import load_extensions
 from catalyst.utils.remote import remote_backtest
 
 from catalyst.exchange.exchange_algorithm import (
@@ -42,6 +39,8 @@ from catalyst.exchange.exchange_algorithm import (
 from catalyst.exchange.exchange_data_portal import DataPortalExchangeLive, \
     DataPortalExchangeBacktest
 from catalyst.exchange.exchange_asset_finder import ExchangeAssetFinder
+from catalyst.exchange.utils.benchmark_utils import get_benchmark_returns
+from catalyst.exchange.utils.exchange_utils import get_algo_folder
 
 from catalyst.constants import LOG_LEVEL, ALPHA_WARNING_MESSAGE, \
     DISABLE_ALPHA_WARNING
@@ -97,7 +96,15 @@ def _run(handle_data,
          analyze_live,
          simulate_orders,
          auth_aliases,
-         stats_output):
+         stats_output,
+         bar_interval=None,
+         trigger_on_data=False,
+         feeds=None,
+         market_data_socket=None,
+         benchmark=None,
+         replay_folder=None,
+         profile=False,
+         profile_format='prometheus'):
     """Run a backtest for the given algorithm.
 
     This is shared between the cli and :func:`catalyst.run_algo`.
@@ -151,7 +158,17 @@ def _run(handle_data,
     if not DISABLE_ALPHA_WARNING:
         log.warn(ALPHA_WARNING_MESSAGE)
 
-    if live:
+    market_data = None
+    if replay_folder is not None:
+        from catalyst.exchange.replay import RecordedMarketData
+
+        # A replay drives the live algorithm, its orders are matched
+        # locally against the recorded market data.
+        market_data = RecordedMarketData(replay_folder)
+        live = True
+        simulate_orders = False
+        mode = 'replay'
+    elif live:
         if simulate_orders:
             mode = 'paper-trading'
         else:
@@ -184,6 +201,17 @@ def _run(handle_data,
         else:
             auth_alias = None
 
+        if market_data is not None:
+            from catalyst.exchange.replay import ReplayExchange
+
+            exchanges[name] = ReplayExchange(
+                name=name,
+                market_data=market_data,
+                quote_currency=quote_currency,
+                balances={quote_currency.lower(): capital_base},
+            )
+            continue
+
         exchanges[name] = get_exchange(
             exchange_name=name,
             quote_currency=quote_currency,
@@ -207,7 +235,15 @@ def _run(handle_data,
     )
     env.asset_finder = ExchangeAssetFinder(exchanges=exchanges)
 
+    if benchmark is not None and not live:
+        # Read from the local bundles, the backtests can start offline.
+        env.benchmark_returns = get_benchmark_returns(benchmark, start, end)
+
     def choose_loader(column):
+        # Only the algorithms using pipelines import them.
+        from catalyst.exchange.exchange_pricing_loader import \
+            ExchangePricingLoader, TradingPairPricing
+
         bound_cols = TradingPairPricing.columns
         if column in bound_cols:
             return ExchangePricingLoader(data_frequency)
@@ -220,8 +256,20 @@ def _run(handle_data,
         # is_start checks if a start date was specified by user
         # needed for live clock
         is_start = True
+        is_end = True
 
-        if start is None:
+        if market_data is not None:
+            first_minute, last_minute = market_data.bounds()
+            if start is None:
+                start = first_minute
+            if end is None:
+                end = last_minute + timedelta(minutes=1)
+            assert start < end, "start date is later than end date."
+
+            feeds = None
+            market_data_socket = None
+
+        elif start is None:
             start = pd.Timestamp.utcnow()
             is_start = False
         elif start:
@@ -233,17 +281,26 @@ def _run(handle_data,
         # TODO: fix the end data.
         # is_end checks if an end date was specified by user
         # needed for live clock
-        is_end = True
-
         if end is None:
             end = start + timedelta(hours=8760)
             is_end = False
 
+        if market_data_socket is not None and feeds is None:
+            from catalyst.exchange.market_data_daemon import \
+                DaemonMarketDataFeed
+
+            feeds = {
+                name: DaemonMarketDataFeed(name, market_data_socket)
+                for name in exchanges
+            }
+
         data = DataPortalExchangeLive(
             exchanges=exchanges,
             asset_finder=env.asset_finder,
             trading_calendar=open_calendar,
             first_trading_day=pd.to_datetime('today', utc=True)
+            if market_data is None else start.floor('1D'),
+            feeds=feeds,
         )
 
         sim_params = create_simulation_parameters(
@@ -269,7 +326,25 @@ def _run(handle_data,
             is_start=is_start,
             end=end,
             is_end=is_end,
+            bar_interval=bar_interval,
+            trigger_on_data=trigger_on_data,
         )
+
+        if market_data is not None:
+            from catalyst.exchange.replay import ReplayClock
+
+            algorithm_class = partial(
+                algorithm_class,
+                clock=ReplayClock(
+                    sim_params.sessions,
+                    market_data=market_data,
+                    start=start,
+                    end=end,
+                    interval=bar_interval
+                    if bar_interval is not None else '1T',
+                ),
+                mode_name='replay',
+            )
     elif exchanges:
         # Removed the existing Poloniex fork to keep things simple
         # We can add back the complexity if required.
@@ -340,7 +415,19 @@ def _run(handle_data,
             adjustment_reader=bundle_data.adjustment_reader,
         )
 
-    perf = algorithm_class(
+    profiler = None
+    if profile:
+        # The histograms are exported in the folder of the algorithm, or
+        # in the working directory when the run has no namespace.
+        profile_root = get_algo_folder(algo_namespace) \
+            if algo_namespace is not None else os.getcwd()
+        profiler = BarProfiler(
+            folder=os.path.join(profile_root, 'profile'),
+            export_format=profile_format,
+        )
+        set_profiler(profiler)
+
+    algorithm = algorithm_class(
         namespace=namespace,
         env=env,
         get_pipeline_loader=choose_loader,
@@ -354,10 +441,17 @@ def _run(handle_data,
             'algo_filename': getattr(algofile, 'name', '<algorithm>'),
             'script': algotext,
         }
-    ).run(
-        data,
-        overwrite_sim_params=False,
     )
+    try:
+        perf = algorithm.run(
+            data,
+            overwrite_sim_params=False,
+        )
+    finally:
+        if profiler is not None:
+            set_profiler(None)
+            profiler.export()
+            click.echo(profiler.get_report(), sys.stderr)
 
     if output == '-':
         click.echo(str(perf))
@@ -367,59 +461,6 @@ def _run(handle_data,
     return perf
 
 
-# All of the loaded extensions. We don't want to load an extension twice.
-_loaded_extensions = set()
-
-
-def load_extensions(default, extensions, strict, environ, reload=False):
-    """Load all of the given extensions. This should be called by run_algo
-    or the cli.
-
-    Parameters
-    ----------
-    default : bool
-        Load the default exension (~/.catalyst/extension.py)?
-    extension : iterable[str]
-        The paths to the extensions to load. If the path ends in ``.py`` it is
-        treated as a script and executed. If it does not end in ``.py`` it is
-        treated as a module to be imported.
-    strict : bool
-        Should failure to load an extension raise. If this is false it will
-        still warn.
-    environ : mapping
-        The environment to use to find the default extension path.
-    reload : bool, optional
-        Reload any extensions that have already been loaded.
-    """
-    if default:
-        default_extension_path = pth.default_extension(environ=environ)
-        pth.ensure_file(default_extension_path)
-        # put the default extension first so other extensions can depend on
-        # the order they are loaded
-        extensions = concatv([default_extension_path], extensions)
-
-    for ext in extensions:
-        if ext in _loaded_extensions and not reload:
-            continue
-        try:
-            # load all of the catalyst extensionss
-            if ext.endswith('.py'):
-                run_path(ext, run_name='<extension>')
-            else:
-                __import__(ext)
-        except Exception as e:
-            if strict:
-                # if `strict` we should raise the actual exception and fail
-                raise
-            # without `strict` we should just log the failure
-            warnings.warn(
-                'Failed to load extension: %r\n%s' % (ext, e),
-                stacklevel=2
-            )
-        else:
-            _loaded_extensions.add(ext)
-
-
 def run_algorithm(initialize,
                   capital_base=None,
                   start=None,
@@ -446,7 +487,15 @@ def run_algorithm(initialize,
                   simulate_orders=True,
                   auth_aliases=None,
                   stats_output=None,
-                  output=os.devnull):
+                  output=os.devnull,
+                  bar_interval=None,
+                  trigger_on_data=False,
+                  feeds=None,
+                  market_data_socket=None,
+                  benchmark=None,
+                  replay_folder=None,
+                  profile=False,
+                  profile_format='prometheus'):
     """
     Run a trading algorithm.
 
@@ -532,6 +581,32 @@ def run_algorithm(initialize,
     output: str, optional
         The output file path to which the algorithm performance
         is serialized.
+    bar_interval: str, optional
+        The interval between bars in live mode, e.g. '15s'. Defaults to
+        one minute.
+    trigger_on_data: bool, optional
+        Should bars also be triggered by market data feed events
+        in live mode.
+    feeds: dict[str, MarketDataFeed], optional
+        Push market data feeds by exchange name used in live mode. The
+        REST api of each exchange remains the fallback.
+    market_data_socket: str, optional
+        The unix socket of a market data daemon shared by the live
+        algorithms of the host, used when no feeds are specified.
+    benchmark: str or float, optional
+        The benchmark of a backtest: a constant daily return, 'zero', or a
+        trading pair with its exchange, e.g. 'bitfinex:btc_usd', whose
+        returns are read from the local daily bundle.
+    replay_folder: str, optional
+        Replay the market data recorded in this folder with the live
+        algorithm, as fast as possible. The orders are matched locally.
+        See catalyst.exchange.replay.RecordedMarketData for the layout.
+    profile: bool, optional
+        Time the stages of each bar and print a summary at exit. The
+        histograms are exported in the profile folder of the algorithm,
+        or in ./profile when the algorithm has no namespace.
+    profile_format: str, optional
+        The format of the exported histograms, 'prometheus' or 'jsonl'.
 
     Returns
     -------
@@ -638,5 +713,13 @@ def run_algorithm(initialize,
         analyze_live=analyze_live,
         simulate_orders=simulate_orders,
         auth_aliases=auth_aliases,
-        stats_output=stats_output
+        stats_output=stats_output,
+        bar_interval=bar_interval,
+        trigger_on_data=trigger_on_data,
+        feeds=feeds,
+        market_data_socket=market_data_socket,
+        benchmark=benchmark,
+        replay_folder=replay_folder,
+        profile=profile,
+        profile_format=profile_format,
     )
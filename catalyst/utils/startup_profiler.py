@@ -0,0 +1,154 @@
+"""
+Measure the time spent importing modules.
+
+``python -X importtime`` is only available on recent versions of Python,
+this module provides the same breakdown for the catalyst command line.
+"""
+import sys
+from time import time
+
+from six.moves import builtins
+
+
+class ImportProfiler(object):
+    """Record the time spent importing each module.
+
+    The profiler wraps ``__import__``. Only the first import of a module is
+    timed, subsequent imports are cache lookups.
+
+    The cumulative time of a module includes the modules it imports, its
+    own time does not.
+    """
+
+    def __init__(self):
+        self.timings = dict()
+        self.order = []
+
+        self._stack = []
+        self._original_import = None
+
+    @property
+    def is_installed(self):
+        return self._original_import is not None
+
+    def install(self):
+        if self.is_installed:
+            return
+
+        self._original_import = builtins.__import__
+        builtins.__import__ = self._import
+
+    def uninstall(self):
+        if not self.is_installed:
+            return
+
+        builtins.__import__ = self._original_import
+        self._original_import = None
+
+    def __enter__(self):
+        self.install()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.uninstall()
+
+    @staticmethod
+    def _resolve_name(name, globals, level):
+        if level <= 0 or not globals:
+            return name
+
+        package = globals.get('__package__')
+        if package is None:
+            package = globals.get('__name__', '')
+            if '__path__' not in globals:
+                package = package.rpartition('.')[0]
+
+        for _ in range(level - 1):
+            package = package.rpartition('.')[0]
+
+        return '{}.{}'.format(package, name) if name else package
+
+    def _import(self, name, globals=None, locals=None, fromlist=(),
+                level=0):
+        module_name = self._resolve_name(name, globals, level)
+        if module_name in sys.modules:
+            return self._original_import(
+                name, globals, locals, fromlist, level
+            )
+
+        # The time spent importing children is subtracted from the
+        # time of their parent.
+        self._stack.append(0.0)
+        start = time()
+        try:
+            return self._original_import(
+                name, globals, locals, fromlist, level
+            )
+
+        finally:
+            elapsed = time() - start
+            children = self._stack.pop()
+            if self._stack:
+                self._stack[-1] += elapsed
+
+            if module_name not in self.timings:
+                self.order.append(module_name)
+                self.timings[module_name] = (
+                    elapsed, elapsed - children, len(self._stack)
+                )
+
+    def get_report(self, limit=30, threshold=0.001):
+        """
+        A human readable breakdown of the import time.
+
+        Parameters
+        ----------
+        limit: int
+            The maximum number of modules listed.
+        threshold: float
+            The minimum cumulative time, in seconds, of the modules listed.
+
+        Returns
+        -------
+        str
+
+        """
+        total = sum(
+            timing[0] for timing in self.timings.values() if timing[2] == 0
+        )
+        lines = [
+            'Imported {} modules in {:.3f}s'.format(
+                len(self.timings), total
+            ),
+            '{:>12} {:>12}  {}'.format('cumulative', 'self', 'module'),
+        ]
+
+        modules = sorted(
+            self.order, key=lambda m: self.timings[m][0], reverse=True
+        )
+        for module_name in modules[:limit]:
+            cumulative, own, depth = self.timings[module_name]
+            if cumulative < threshold:
+                break
+
+            lines.append('{:>11.1f}ms {:>10.1f}ms  {}{}'.format(
+                cumulative * 1000, own * 1000, '  ' * depth, module_name,
+            ))
+
+        by_package = dict()
+        for module_name, (_, own, _) in self.timings.items():
+            package = module_name.split('.')[0]
+            by_package[package] = by_package.get(package, 0) + own
+
+        lines.append('')
+        lines.append('{:>12}  {}'.format('self', 'package'))
+        packages = sorted(
+            by_package.items(), key=lambda item: item[1], reverse=True
+        )
+        for package, own in packages[:limit]:
+            if own < threshold:
+                break
+
+            lines.append('{:>11.1f}ms  {}'.format(own * 1000, package))
+
+        return '\n'.join(lines)
@@ -0,0 +1,124 @@
+import numpy as np
+import pandas as pd
+
+from catalyst.data.bundles.base_pricing import BaseCryptoPricingBundle
+from catalyst.data.bundles.symbol_store import SymbolFrameStore
+from catalyst.testing.fixtures import WithInstanceTmpDir, CatalystTestCase
+from catalyst.utils.memoize import lazyval
+from catalyst.utils.rate_limit import RateLimiter
+
+
+def make_frame(start, periods):
+    dts = pd.date_range(start, periods=periods, freq='D', tz='UTC')
+    values = np.arange(periods, dtype='float64')
+    return pd.DataFrame(
+        dict(open=values, high=values, low=values, close=values,
+             volume=values),
+        index=dts,
+        columns=['open', 'high', 'low', 'close', 'volume'],
+    )
+
+
+class FakeBundle(BaseCryptoPricingBundle):
+    def __init__(self, history):
+        super(FakeBundle, self).__init__()
+        self.history = history
+        self.requests = []
+
+    @lazyval
+    def name(self):
+        return 'fake'
+
+    @lazyval
+    def wait_time(self):
+        return pd.Timedelta(0)
+
+    def fetch_raw_symbol_frame(self,
+                               api_key,
+                               symbol,
+                               calendar,
+                               start_date,
+                               end_date,
+                               frequency):
+        self.requests.append((symbol, start_date))
+        return self.history[
+            (self.history.index >= start_date) &
+            (self.history.index <= end_date)
+        ]
+
+
+class SymbolFrameStoreTestCase(WithInstanceTmpDir, CatalystTestCase):
+    def init_instance_fixtures(self):
+        super(SymbolFrameStoreTestCase, self).init_instance_fixtures()
+        self.store = SymbolFrameStore(self.instance_tmpdir.getpath('symbols'))
+
+    def test_append(self):
+        assert self.store.last_dt('btc_usdt', 'daily') is None
+        assert self.store.read('btc_usdt', 'daily') is None
+
+        frame = make_frame('2017-01-01', 5)
+        self.store.append('btc_usdt', 'daily', frame)
+        assert ('btc_usdt', 'daily') in self.store
+        assert self.store.last_dt('btc_usdt', 'daily') == frame.index[-1]
+
+        # The overlapping last bar is replaced.
+        update = make_frame('2017-01-05', 3) + 10
+        self.store.append('btc_usdt', 'daily', update)
+
+        result = self.store.read('btc_usdt', 'daily')
+        assert len(result) == 7
+        assert result.index.equals(
+            pd.date_range('2017-01-01', '2017-01-07', tz='UTC')
+        )
+        assert result['close'].tolist() == [0, 1, 2, 3, 10, 11, 12]
+
+        self.store.append('btc_usdt', 'daily', update.iloc[:0])
+        assert len(self.store.read('btc_usdt', 'daily')) == 7
+
+    def test_incremental_update(self):
+        history = make_frame('2017-01-01', 10)
+        bundle = FakeBundle(history)
+        start_session = pd.Timestamp('2017-01-01', tz='UTC')
+        end_session = pd.Timestamp('2017-12-31', tz='UTC')
+
+        def update(now, symbol='btc_usdt'):
+            return bundle._maybe_update_symbol_frame(
+                now, None, self.store, symbol, None, start_session,
+                end_session, 'daily', 1,
+            )
+
+        bundle.history = history.iloc[:5]
+        result = update(pd.Timestamp('2017-01-06', tz='UTC'))
+        assert len(result) == 5
+        assert bundle.requests == [('btc_usdt', start_session)]
+
+        # The stored data is fresh enough.
+        update(pd.Timestamp('2017-01-07', tz='UTC'))
+        assert len(bundle.requests) == 1
+
+        # Only the bars from the last stored one are requested.
+        bundle.history = history
+        result = update(pd.Timestamp('2017-01-11', tz='UTC'))
+        assert bundle.requests[-1] == (
+            'btc_usdt', pd.Timestamp('2017-01-05', tz='UTC'),
+        )
+        assert result.equals(history.rename_axis('date'))
+
+
+class RateLimiterTestCase(CatalystTestCase):
+    def test_wait(self):
+        now = [0.0]
+        sleeps = []
+
+        limiter = RateLimiter(
+            pd.Timedelta(milliseconds=500),
+            clock=lambda: now[0],
+            sleep=sleeps.append,
+        )
+        assert limiter.wait() == 0
+        assert limiter.wait() == 0.5
+        assert limiter.wait() == 1.0
+
+        now[0] = 10.0
+        assert limiter.wait() == 0
+        assert sleeps == [0.5, 1.0]
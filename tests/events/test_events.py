@@ -170,6 +170,39 @@ class TestEventManager(TestCase):
 
         self.assertEqual(CountingRule.count, 5)
 
+    def test_skips_bars_until_next_trigger(self):
+        cal = get_calendar('NYSE')
+
+        class CountingRule(AfterOpen):
+            count = 0
+
+            def should_trigger(self, dt):
+                CountingRule.count += 1
+                return super(CountingRule, self).should_trigger(dt)
+
+        rule = CountingRule(minutes=30)
+        rule.cal = cal
+        triggered = []
+        self.em.add_event(
+            Event(rule, lambda context, data: triggered.append(data))
+        )
+
+        sessions = cal.sessions_in_range(
+            pd.Timestamp('2014-09-22', tz='UTC'),
+            pd.Timestamp('2014-09-26', tz='UTC'),
+        )
+        for minute in cal.minutes_for_sessions_in_range(
+                sessions[0], sessions[-1]):
+            self.em.handle_data(None, minute, minute)
+
+        self.assertEqual(
+            triggered,
+            [cal.session_open(session) + datetime.timedelta(minutes=29)
+             for session in sessions],
+        )
+        # The first bar and the triggers
+        self.assertEqual(CountingRule.count, len(sessions) + 1)
+
 
 class TestEventRule(TestCase):
     def test_is_abstract(self):
@@ -292,6 +325,38 @@ class StatelessRulesTests(RuleTestCase):
         cls.HALF_SESSION = None
         cls.FULL_SESSION = None
 
+    def test_next_trigger(self):
+        composed = NthTradingDayOfWeek(2) & AfterOpen(minutes=30)
+        composed.first.cal = composed.second.cal = self.cal
+        rules = [
+            Always(),
+            Never(),
+            AfterOpen(hours=1, minutes=5),
+            BeforeClose(minutes=10),
+            NotHalfDay(),
+            NthTradingDayOfWeek(1),
+            NDaysBeforeLastTradingDayOfWeek(0),
+            composed,
+        ]
+        one_nanosecond = pd.Timedelta(1, unit='ns')
+
+        for rule in rules:
+            rule.cal = self.cal
+            expected = [m for m in self.sept_week if rule.should_trigger(m)]
+
+            # Only evaluate the rule when the next trigger is reached.
+            triggered = []
+            wake = self.sept_week[0]
+            for minute in self.sept_week:
+                if wake is None or minute < wake:
+                    continue
+
+                if rule.should_trigger(minute):
+                    triggered.append(minute)
+                wake = rule.next_trigger(minute + one_nanosecond)
+
+            self.assertEqual(triggered, expected, msg=type(rule).__name__)
+
     def test_Always(self):
         should_trigger = Always().should_trigger
         for session_minutes in minutes_for_days(self.cal):
@@ -0,0 +1,97 @@
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from catalyst.exchange.exchange_bcolz import BcolzExchangeBarWriter, \
+    reader_registry
+from catalyst.exchange.exchange_errors import InvalidBenchmarkError, \
+    PricingDataNotLoadedError
+from catalyst.exchange.utils.benchmark_utils import BundleBenchmark, \
+    ConstantBenchmark, get_benchmark
+from catalyst.exchange.utils.exchange_utils import get_sid
+from catalyst.testing.fixtures import WithLogger, CatalystTestCase
+
+
+class TestBenchmark(WithLogger, CatalystTestCase):
+    def setUp(self):
+        self.root_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.root_dir, 'daily_bundle')
+
+        self.start = pd.Timestamp('2017-01-01', tz='UTC')
+        self.end = pd.Timestamp('2017-01-10', tz='UTC')
+
+        self.benchmark = BundleBenchmark(
+            'bitfinex', 'btc_usd',
+            bundle_path=self.path,
+            cache_folder=os.path.join(self.root_dir, 'benchmarks'),
+        )
+
+    def tearDown(self):
+        reader_registry.invalidate(self.path)
+        shutil.rmtree(self.root_dir)
+
+    def write(self, closes):
+        # A new bundle, as if ingested again.
+        shutil.rmtree(self.path, ignore_errors=True)
+        writer = BcolzExchangeBarWriter(
+            rootdir=self.path,
+            start_session=self.start,
+            end_session=self.end,
+            data_frequency='daily',
+            write_metadata=True,
+        )
+
+        index = pd.date_range(self.start, self.end, freq='D')
+        df = pd.DataFrame(
+            dict(
+                open=closes, high=closes, low=closes, close=closes,
+                volume=1.0,
+            ),
+            index=index,
+            columns=['open', 'high', 'low', 'close', 'volume'],
+        )
+        writer.write([(get_sid('btc_usd'), df)])
+        reader_registry.notify_write(self.path)
+
+    def test_get_benchmark(self):
+        assert get_benchmark('zero').daily_return == 0
+        assert get_benchmark(0.001).daily_return == 0.001
+
+        benchmark = get_benchmark('Poloniex:eth_btc')
+        assert (benchmark.exchange_name, benchmark.symbol) == \
+            ('poloniex', 'eth_btc')
+
+        for spec in ('btc_usd', 'poloniex:', 'a:b:c'):
+            with self.assertRaises(InvalidBenchmarkError):
+                get_benchmark(spec)
+
+    def test_constant_returns(self):
+        returns = ConstantBenchmark(0.5).get_returns(self.start, self.end)
+        assert len(returns) == 10
+        assert (returns == 0.5).all()
+
+    def test_bundle_returns(self):
+        with self.assertRaises(PricingDataNotLoadedError):
+            self.benchmark.get_returns(self.start, self.end)
+
+        self.write(np.arange(1.0, 11.0))
+        start = pd.Timestamp('2017-01-04', tz='UTC')
+        end = pd.Timestamp('2017-01-06', tz='UTC')
+
+        returns = self.benchmark.get_returns(start, end)
+        assert list(returns.index) == list(pd.date_range(start, end))
+        np.testing.assert_allclose(returns.values, [1 / 3., 1 / 4., 1 / 5.])
+
+        # The returns are memoized until the bundle is written again.
+        cached = os.listdir(self.benchmark.cache_folder)
+        assert cached == ['btc_usd_20170104_20170106.pickle']
+        assert self.benchmark.get_returns(start, end).equals(returns)
+
+        self.write(np.full(10, 5.0))
+        metadata = os.path.join(self.path, 'metadata.json')
+        mtime = os.stat(metadata).st_mtime
+        os.utime(metadata, (mtime + 10, mtime + 10))
+        assert (self.benchmark.get_returns(start, end) == 0).all()
@@ -0,0 +1,97 @@
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from catalyst.exchange.exchange_bcolz import BcolzExchangeBarReader, \
+    BcolzExchangeBarWriter, BcolzExchangeDailyBarReader, \
+    BundleReaderRegistry, import_daily_bundle
+from catalyst.testing.fixtures import WithLogger, CatalystTestCase
+
+
+class TestExchangeDailyBars(WithLogger, CatalystTestCase):
+    def setUp(self):
+        self.root_dir = tempfile.mkdtemp()
+        self.source = os.path.join(self.root_dir, 'daily_bundle')
+        self.path = os.path.join(self.root_dir, 'daily_bars')
+
+        self.start = pd.Timestamp('2017-01-01', tz='UTC')
+        self.end = pd.Timestamp('2017-01-10', tz='UTC')
+        writer = BcolzExchangeBarWriter(
+            rootdir=self.source,
+            start_session=self.start,
+            end_session=self.end,
+            data_frequency='daily',
+            write_metadata=True,
+        )
+
+        # The sid 2 starts on the 4th and has no bar on the 6th.
+        closes = {
+            1: np.arange(1.0, 11.0),
+            2: np.array([np.nan] * 3 + [0.5, 0.25, np.nan, 0.125, 1.5]),
+        }
+        for sid, close in closes.items():
+            index = pd.date_range(self.start, periods=len(close), freq='D')
+            frame = pd.DataFrame(
+                dict(
+                    open=close, high=close * 2, low=close / 2, close=close,
+                    volume=np.where(np.isnan(close), 0.0, 100.0),
+                ),
+                index=index,
+                columns=['open', 'high', 'low', 'close', 'volume'],
+            ).dropna()
+            writer.write([(sid, frame)])
+
+        import_daily_bundle(self.source, self.path, source_version=1.0)
+        self.reader = BcolzExchangeDailyBarReader(self.path)
+        self.sid_reader = BcolzExchangeBarReader(
+            rootdir=self.source, data_frequency='daily',
+        )
+
+    def tearDown(self):
+        shutil.rmtree(self.root_dir)
+
+    def test_layout(self):
+        assert self.reader.source_version == 1.0
+        assert self.reader._calendar_offsets == {1: 0, 2: 3}
+        assert self.reader._last_rows[2] - self.reader._first_rows[2] == 4
+
+    def test_same_bars(self):
+        fields = ['open', 'high', 'close', 'volume']
+        start = self.start + pd.Timedelta(days=2)
+        end = self.end
+
+        arrays = self.reader.load_raw_arrays(fields, start, end, [1, 2, 3])
+        expected = self.sid_reader.load_raw_arrays(fields, start, end, [1, 2])
+
+        for array, expected_array in zip(arrays, expected):
+            assert array.shape == (8, 3)
+            np.testing.assert_allclose(array[:, :2], expected_array)
+
+        # An unknown sid has no bars.
+        assert np.isnan(arrays[0][:, 2]).all()
+        assert (arrays[3][:, 2] == 0).all()
+
+    def test_get_value(self):
+        day = self.start + pd.Timedelta(days=4)
+        assert np.isclose(self.reader.get_value(2, day, 'close'), 0.25)
+        assert np.isnan(self.reader.get_value(2, self.start, 'close'))
+        assert self.reader.get_value(2, self.end, 'volume') == 0
+        assert np.isnan(
+            self.reader.get_value(2, day + pd.Timedelta(days=1), 'close')
+        )
+
+    def test_registry(self):
+        registry = BundleReaderRegistry()
+        reader = registry.acquire(self.path, 'daily')
+        assert isinstance(reader, BcolzExchangeDailyBarReader)
+        assert isinstance(
+            registry.acquire(self.source, 'daily'), BcolzExchangeBarReader
+        )
+
+        # A new import replaces the table and its reader.
+        import_daily_bundle(self.source, self.path, source_version=2.0)
+        registry.invalidate(self.path)
+        assert registry.acquire(self.path, 'daily').source_version == 2.0
@@ -0,0 +1,75 @@
+import os
+import shutil
+import tempfile
+
+import pandas as pd
+
+from catalyst.exchange.exchange_asset_cache import ExchangeAssetCache, \
+    get_etag, get_files_etag
+from catalyst.testing.fixtures import WithLogger, CatalystTestCase
+
+
+class TestExchangeAssetCache(WithLogger, CatalystTestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.path = os.path.join(self.folder, 'assets_cache.sqlite')
+
+    def tearDown(self):
+        shutil.rmtree(self.folder)
+
+    def test_save_and_load(self):
+        cache = ExchangeAssetCache('binance', path=self.path)
+        assert cache.load() is None
+
+        markets = [dict(id='ETHBTC', symbol='ETH/BTC', base='ETH',
+                        quote='BTC', maker=0.001, taker=0.001)]
+        params = [dict(
+            exchange='binance',
+            symbol='eth_btc',
+            exchange_symbol='ETHBTC',
+            start_date=pd.Timestamp('2017-07-14', tz='UTC'),
+            end_minute=None,
+            maker=0.001,
+            taker=0.001,
+        )]
+        cache.save(markets, params, get_etag(markets), 'symbols-etag')
+
+        cached = cache.load()
+        assert cached.markets == markets
+        assert cached.markets_etag == get_etag(markets)
+        assert cached.symbols_etag == 'symbols-etag'
+        assert cached.assets_params[0]['symbol'] == 'eth_btc'
+        assert cached.assets_params[0]['start_date'] == \
+            pd.Timestamp('2017-07-14', tz='UTC')
+        assert not cache.is_expired(cached)
+
+        later = pd.Timestamp.utcnow() + pd.Timedelta('2D')
+        assert cache.is_expired(cached, now=later)
+
+    def test_raw_objects_in_markets(self):
+        cache = ExchangeAssetCache('binance', path=self.path)
+        listed = pd.Timestamp('2017-07-14', tz='UTC')
+        markets = [dict(id='ETHBTC', info=dict(listed=listed))]
+        cache.save(markets, [], get_etag(markets), 'symbols-etag')
+
+        cached = cache.load()
+        assert cached.markets[0]['info']['listed'] == str(listed)
+
+    def test_touch(self):
+        cache = ExchangeAssetCache('binance', ttl='1H', path=self.path)
+        cache.save([], [], get_etag([]), 'symbols-etag')
+
+        validated = cache.load().validated
+        cache.touch()
+        assert cache.load().validated >= validated
+
+    def test_etags(self):
+        assert get_etag([dict(a=1, b=2)]) == get_etag([dict(b=2, a=1)])
+        assert get_etag([dict(a=1)]) != get_etag([dict(a=2)])
+
+        filename = os.path.join(self.folder, 'symbols.json')
+        missing_etag = get_files_etag([filename])
+        with open(filename, 'w') as f:
+            f.write('{}')
+
+        assert get_files_etag([filename]) != missing_etag
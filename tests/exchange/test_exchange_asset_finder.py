@@ -0,0 +1,82 @@
+from collections import OrderedDict
+
+import pandas as pd
+
+from catalyst.assets._assets import TradingPair
+from catalyst.exchange.exchange_asset_finder import ExchangeAssetFinder
+from catalyst.testing.fixtures import WithLogger, CatalystTestCase
+
+
+class FakeExchange(object):
+    def __init__(self, name, assets):
+        self.name = name
+        self.assets = assets
+        self.init_count = 0
+
+    def has_bundle(self, data_frequency):
+        return True
+
+    def init(self):
+        self.init_count += 1
+
+
+class TestExchangeAssetFinder(WithLogger, CatalystTestCase):
+    def setUp(self):
+        def pair(exchange, symbol, start, end_minute):
+            return TradingPair(
+                symbol=symbol,
+                exchange=exchange,
+                start_date=pd.Timestamp(start, tz='UTC'),
+                end_minute=pd.Timestamp(end_minute, tz='UTC')
+                if end_minute is not None else None,
+            )
+
+        self.poloniex = FakeExchange('poloniex', [
+            pair('poloniex', 'btc_usdt', '2017-01-02', '2017-01-05'),
+            pair('poloniex', 'eth_usdt', '2017-01-04', '2017-02-01'),
+        ])
+        self.bitfinex = FakeExchange('bitfinex', [
+            # Same sid as the poloniex market
+            pair('bitfinex', 'btc_usdt', '2017-01-01', '2017-02-01'),
+            pair('bitfinex', 'ltc_usd', '2017-01-01', '2017-02-01'),
+            pair('bitfinex', 'xrp_usd', '2017-01-01', None),
+        ])
+        self.finder = ExchangeAssetFinder(exchanges=OrderedDict([
+            ('poloniex', self.poloniex),
+            ('bitfinex', self.bitfinex),
+        ]))
+
+    def test_lifetimes(self):
+        dates = pd.date_range('2017-01-01', '2017-01-06', tz='UTC')
+        lifetimes = self.finder.lifetimes(dates, include_start_date=True)
+
+        symbols = [(a.exchange, a.symbol) for a in lifetimes.columns]
+        assert sorted(symbols) == [
+            ('bitfinex', 'ltc_usd'),
+            ('bitfinex', 'xrp_usd'),
+            ('poloniex', 'btc_usdt'),
+            ('poloniex', 'eth_usdt'),
+        ]
+        assert lifetimes.columns.is_unique
+
+        def alive(symbol, df=lifetimes):
+            column = [a for a in df.columns if a.symbol == symbol][0]
+            return df[column].tolist()
+
+        assert alive('btc_usdt') == [False, True, True, True, False, False]
+        assert alive('eth_usdt') == [False, False, False, True, True, True]
+        assert alive('ltc_usd') == [True] * 6
+        assert alive('xrp_usd') == [False] * 6
+
+        excluded = self.finder.lifetimes(dates, include_start_date=False)
+        assert alive('btc_usdt', excluded) == \
+            [False, False, True, True, False, False]
+
+    def test_lifetimes_cache(self):
+        dates = pd.date_range('2017-01-01', '2017-01-06', tz='UTC')
+        lifetimes = self.finder.lifetimes(dates, include_start_date=True)
+
+        assert self.finder.lifetimes(dates, True) is lifetimes
+        assert self.finder.lifetimes(dates[1:], True) is not lifetimes
+        assert self.poloniex.init_count == 1
+        assert self.bitfinex.init_count == 1
@@ -0,0 +1,75 @@
+import threading
+
+import pandas as pd
+
+from catalyst.assets._assets import TradingPair
+from catalyst.exchange.exchange_blotter import ExchangeBlotter
+from catalyst.exchange.exchange_errors import CreateOrderError
+from catalyst.finance.execution import MarketOrder
+from catalyst.finance.order import Order
+from catalyst.testing.fixtures import WithLogger, CatalystTestCase
+from catalyst.testing.synthetic_exchange import make_trading_pair_params
+
+
+class FakeExchange(object):
+    """Creates orders once all the expected orders were received."""
+
+    def __init__(self, name, concurrent_orders):
+        self.name = name
+        self.all_received = threading.Event()
+        self.concurrent_orders = concurrent_orders
+        self.received = []
+        self.lock = threading.Lock()
+
+    def order(self, asset, amount, style):
+        with self.lock:
+            self.received.append(asset.symbol)
+            if len(self.received) == self.concurrent_orders:
+                self.all_received.set()
+
+        # Times out unless the orders are sent concurrently.
+        assert self.all_received.wait(5)
+        if amount < 0:
+            raise CreateOrderError(exchange=self.name, error='rejected')
+
+        return Order(
+            dt=pd.Timestamp.utcnow(),
+            asset=asset,
+            amount=amount,
+            id='{}-{}'.format(self.name, asset.symbol),
+        )
+
+
+class TestExchangeBlotter(WithLogger, CatalystTestCase):
+    def make_asset(self, exchange_name, symbol):
+        return TradingPair(**make_trading_pair_params(
+            exchange_name, symbol, pd.Timestamp('2017-01-01', tz='UTC'),
+        ))
+
+    def test_batch_order(self):
+        exchanges = dict(
+            poloniex=FakeExchange('poloniex', 3),
+            bitfinex=FakeExchange('bitfinex', 1),
+        )
+        blotter = ExchangeBlotter(
+            data_frequency='minute',
+            exchanges=exchanges,
+            attempts=dict(order_attempts=1, retry_sleeptime=0),
+        )
+
+        style = MarketOrder()
+        order_args = [
+            (self.make_asset('poloniex', 'eth_btc'), 1, style),
+            (self.make_asset('bitfinex', 'btc_usd'), 2, style),
+            (self.make_asset('poloniex', 'xmr_btc'), -3, style),
+            (self.make_asset('poloniex', 'ltc_btc'), 4, style),
+        ]
+        order_ids = blotter.batch_order(order_args)
+
+        # The rejected order does not abort the batch.
+        assert order_ids == [
+            'poloniex-eth_btc', 'bitfinex-btc_usd', None, 'poloniex-ltc_btc',
+        ]
+        assert [order.id for order in blotter.new_orders] == \
+            [order_id for order_id in order_ids if order_id is not None]
+        assert len(blotter.open_orders) == 3
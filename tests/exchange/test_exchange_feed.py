@@ -0,0 +1,114 @@
+import pandas as pd
+
+from catalyst.exchange.event_clock import EventClock
+from catalyst.exchange.exchange_feed import InMemoryMarketDataFeed, \
+    ReplayMarketDataFeed
+from catalyst.gens.sim_engine import BAR, SESSION_START, SESSION_END
+from catalyst.testing.fixtures import WithLogger, CatalystTestCase
+
+
+class TestExchangeFeed(WithLogger, CatalystTestCase):
+    def test_ticker_state(self):
+        feed = InMemoryMarketDataFeed('binance', max_age='10s')
+        feed.start()
+
+        now = pd.Timestamp.utcnow()
+        feed.push([
+            dict(type='ticker', symbol='btc_usdt', timestamp=now,
+                 last_price=6500.0, volume=12.5),
+            dict(type='ticker', symbol='eth_usdt', timestamp=now,
+                 last=210.0),
+        ])
+
+        ticker = feed.get_ticker('btc_usdt')
+        assert ticker['last_price'] == 6500.0
+        assert ticker['last_traded'] == now
+
+        assert feed.get_spot_values(
+            ['btc_usdt', 'eth_usdt'], 'price'
+        ) == [6500.0, 210.0]
+        assert feed.get_spot_values(['btc_usdt', 'eth_usdt'], 'volume') \
+            == [12.5, 0]
+
+        # Missing markets and unsupported fields fall back to REST.
+        assert feed.get_spot_values(['btc_usdt', 'xrp_usdt'], 'price') \
+            is None
+        assert feed.get_spot_values(['btc_usdt'], 'high') is None
+
+        later = now + pd.Timedelta('1min')
+        assert feed.get_ticker('btc_usdt', dt=later) is None
+        assert not feed.is_fresh('btc_usdt', dt=later)
+
+    def test_order_book_deltas(self):
+        feed = InMemoryMarketDataFeed('binance')
+        feed.start()
+
+        # Deltas received before the snapshot are ignored.
+        feed.push([
+            dict(type='order_book_delta', symbol='btc_usdt', side='bids',
+                 price=6499.0, quantity=1.0),
+        ])
+        assert feed.get_orderbook('btc_usdt') is None
+
+        feed.push([
+            dict(type='order_book', symbol='btc_usdt',
+                 bids=[[6499.0, 1.0], [6498.0, 2.0]],
+                 asks=[[6501.0, 0.5], [6502.0, 3.0]]),
+            dict(type='order_book_delta', symbol='btc_usdt', side='bids',
+                 price=6499.5, quantity=0.7),
+            dict(type='order_book_delta', symbol='btc_usdt', side='asks',
+                 price=6501.0, quantity=0),
+        ])
+
+        order_book = feed.get_orderbook('btc_usdt', limit=2)
+        assert [b['rate'] for b in order_book['bids']] == [6499.5, 6499.0]
+        assert [a['rate'] for a in order_book['asks']] == [6502.0]
+
+        asks = feed.get_orderbook('btc_usdt', order_type='asks')
+        assert 'bids' not in asks
+
+    def test_replay_feed(self):
+        start = pd.Timestamp('2018-01-01 00:00', tz='UTC')
+        events = [
+            dict(type='trade', symbol='btc_usdt', price=6500.0 + i,
+                 amount=0.1, side='buy',
+                 timestamp=start + pd.Timedelta(seconds=i))
+            for i in range(5)
+        ]
+        feed = ReplayMarketDataFeed('binance', events, speed=None)
+
+        received = []
+        feed.add_listener(received.append)
+        feed.start()
+        assert feed.done.wait(5)
+
+        assert len(received) == 5
+        trades = feed.get_trades('btc_usdt', limit=2)
+        assert [t['price'] for t in trades] == [6503.0, 6504.0]
+
+    def test_event_clock(self):
+        feed = InMemoryMarketDataFeed('binance')
+        end = pd.Timestamp.utcnow() + pd.Timedelta('1s')
+        clock = EventClock(
+            sessions=None,
+            interval='200ms',
+            feeds=[feed],
+            on_data=True,
+            min_interval='10ms',
+            end=end,
+        )
+
+        bars = []
+        for dt, event in clock:
+            if event == BAR:
+                bars.append(dt)
+                if len(bars) == 1:
+                    feed.push([dict(type='ticker', symbol='btc_usdt',
+                                    last_price=6500.0)])
+            else:
+                assert event in (SESSION_START, SESSION_END)
+
+        assert bars == sorted(bars)
+        # Roughly five interval bars plus the one triggered by data.
+        assert len(bars) >= 5
+        assert any(dt != dt.floor('200ms') for dt in bars)
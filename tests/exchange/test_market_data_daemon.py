@@ -0,0 +1,177 @@
+import os
+import shutil
+import tempfile
+import threading
+import time
+
+import pandas as pd
+
+from catalyst.assets._assets import TradingPair
+from catalyst.exchange.market_data_daemon import DaemonMarketDataFeed, \
+    MarketDataDaemon
+from catalyst.testing.fixtures import WithLogger, CatalystTestCase
+from catalyst.testing.synthetic_exchange import make_trading_pair_params
+
+
+class FakeExchange(object):
+    """The market data methods of an exchange, counting the requests."""
+
+    def __init__(self):
+        self.requests = []
+
+    def get_asset(self, symbol):
+        return TradingPair(**make_trading_pair_params(
+            'poloniex', symbol, pd.Timestamp('2017-01-01', tz='UTC'),
+        ))
+
+    def tickers(self, assets, on_ticker_error='raise'):
+        self.requests.append(('tickers', [asset.symbol for asset in assets]))
+        return {
+            asset: dict(last_price=100.0 + index, volume=10.0)
+            for index, asset in enumerate(assets)
+        }
+
+    def get_orderbook(self, asset, order_type='all', limit=None):
+        self.requests.append(('order_book', asset.symbol))
+        return dict(
+            bids=[dict(rate=99.0, quantity=1.0)],
+            asks=[dict(rate=101.0, quantity=2.0)],
+        )
+
+    def get_candles(self, freq, assets, bar_count=1, start_dt=None,
+                    end_dt=None):
+        self.requests.append(('candles', [asset.symbol for asset in assets]))
+        dts = pd.date_range(end=end_dt, periods=bar_count, freq=freq)
+        return {
+            asset: [
+                dict(last_traded=dt, open=1.0, high=2.0, low=0.5, close=1.5,
+                     volume=3.0)
+                for dt in dts
+            ]
+            for asset in assets
+        }
+
+
+class SlowExchange(FakeExchange):
+    """An exchange whose candles are fetched once released."""
+
+    def __init__(self):
+        super(SlowExchange, self).__init__()
+        self.fetching = threading.Event()
+        self.release = threading.Event()
+
+    def get_candles(self, *args, **kwargs):
+        self.fetching.set()
+        self.release.wait(5)
+        return super(SlowExchange, self).get_candles(*args, **kwargs)
+
+
+def wait_for(condition, timeout=5):
+    start = time.time()
+    while not condition():
+        if time.time() - start > timeout:
+            raise AssertionError('timed out')
+        time.sleep(0.01)
+
+
+class TestMarketDataDaemon(WithLogger, CatalystTestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.socket_path = os.path.join(self.folder, 'md.sock')
+
+        self.exchange = FakeExchange()
+        self.daemon = MarketDataDaemon(
+            exchanges=dict(poloniex=self.exchange),
+            socket_path=self.socket_path,
+            # Polled by the tests.
+            poll_interval='1h',
+        )
+        self.daemon.start()
+
+        self.feeds = [
+            DaemonMarketDataFeed(
+                'poloniex', self.socket_path, reconnect_sleeptime=0.1,
+            )
+            for _ in range(2)
+        ]
+        for feed in self.feeds:
+            feed.start()
+            assert feed.wait_connected(5)
+
+    def tearDown(self):
+        for feed in self.feeds:
+            feed.stop()
+        self.daemon.stop()
+        shutil.rmtree(self.folder, ignore_errors=True)
+
+    def test_shared_polling(self):
+        btc, eth = [
+            self.exchange.get_asset(symbol)
+            for symbol in ('btc_usdt', 'eth_usdt')
+        ]
+        self.feeds[0].subscribe([btc, eth])
+        self.feeds[1].subscribe([btc])
+        wait_for(lambda: len(self.daemon._subscribers) == 4)
+
+        self.daemon.poll()
+        assert self.exchange.requests == [
+            ('tickers', ['btc_usdt', 'eth_usdt']),
+            ('order_book', 'btc_usdt'),
+            ('order_book', 'eth_usdt'),
+        ]
+
+        for feed in self.feeds:
+            wait_for(lambda: feed.get_ticker(btc) is not None and
+                     feed.get_orderbook(btc) is not None)
+            assert feed.get_spot_values([btc], 'price') == [100.0]
+            assert feed.get_orderbook(btc)['asks'] == \
+                [dict(rate=101.0, quantity=2.0)]
+
+        wait_for(lambda: self.feeds[0].get_ticker(eth) is not None)
+        assert self.feeds[1].get_ticker(eth) is None
+
+    def test_shared_candles(self):
+        btc = self.exchange.get_asset('btc_usdt')
+        end_dt = pd.Timestamp('2018-01-01 12:00', tz='UTC')
+
+        results = [
+            feed.get_candles('1T', [btc], bar_count=3, end_dt=end_dt)
+            for feed in self.feeds
+        ]
+        assert self.exchange.requests == [('candles', ['btc_usdt'])]
+        for candles in results:
+            assert [candle['last_traded'] for candle in candles[btc]] == \
+                list(pd.date_range(end=end_dt, periods=3, freq='1T'))
+
+    def test_candles_of_exchanges_fetched_concurrently(self):
+        slow = SlowExchange()
+        daemon = MarketDataDaemon(
+            exchanges=dict(poloniex=slow, bitfinex=FakeExchange()),
+            socket_path=self.socket_path,
+        )
+        message = dict(
+            freq='1T', symbols=['btc_usdt'], bar_count=3,
+            end_dt=1514808000000,
+        )
+
+        thread = threading.Thread(
+            target=daemon._get_candles,
+            args=(dict(message, exchange='poloniex'),),
+        )
+        thread.start()
+        try:
+            assert slow.fetching.wait(5)
+
+            # The slow exchange does not hold the candles of the others.
+            candles = daemon._get_candles(dict(message, exchange='bitfinex'))
+            assert len(candles['btc_usdt']) == 3
+        finally:
+            slow.release.set()
+            thread.join()
+
+    def test_daemon_unreachable(self):
+        self.daemon.stop()
+        btc = self.exchange.get_asset('btc_usdt')
+
+        wait_for(lambda: not self.feeds[0].is_connected)
+        assert self.feeds[0].get_candles('1T', [btc], bar_count=3) is None
@@ -0,0 +1,60 @@
+import threading
+
+from catalyst.exchange.utils.persistence_worker import PersistenceWorker
+from catalyst.testing.fixtures import WithLogger, CatalystTestCase
+
+
+class TestPersistenceWorker(WithLogger, CatalystTestCase):
+    def setUp(self):
+        self.written = []
+        self.release = threading.Event()
+        self.worker = PersistenceWorker(max_pending=2)
+
+    def tearDown(self):
+        self.release.set()
+        self.worker.stop(timeout=5)
+
+    def block(self):
+        self.release.wait(5)
+
+    def write(self, value):
+        self.written.append(value)
+
+    def test_coalescing(self):
+        # The worker is busy while the bars submit their stats.
+        self.worker.submit(self.block)
+        for bar in range(5):
+            self.worker.submit(self.write, args=(bar,), key='stats')
+        self.worker.submit(self.write, args=('journal',))
+
+        self.release.set()
+        assert self.worker.flush(timeout=5)
+
+        assert self.written == [4, 'journal']
+        assert self.worker.dropped == 4
+
+    def test_ordered_tasks_are_kept(self):
+        self.release.set()
+        for bar in range(10):
+            self.worker.submit(self.write, args=(bar,))
+
+        assert self.worker.stop(timeout=5)
+        assert self.written == list(range(10))
+
+        # The writes after the shutdown are done inline.
+        self.worker.submit(self.write, args=('late',), key='stats')
+        assert self.written[-1] == 'late'
+
+    def test_flush_timeout(self):
+        self.worker.submit(self.block)
+        assert not self.worker.flush(timeout=0.01)
+        assert self.worker.pending == 1
+
+    def test_errors_are_logged(self):
+        def fail():
+            raise IOError('disk full')
+
+        self.worker.submit(fail)
+        self.worker.submit(self.write, args=('next',))
+        assert self.worker.flush(timeout=5)
+        assert self.written == ['next']
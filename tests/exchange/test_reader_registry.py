@@ -0,0 +1,92 @@
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from catalyst.exchange.exchange_bcolz import BcolzExchangeBarWriter, \
+    BundleReaderRegistry, reader_registry
+from catalyst.exchange.exchange_bundle import ExchangeBundle
+from catalyst.testing.fixtures import WithLogger, CatalystTestCase
+
+
+class TestBundleReaderRegistry(WithLogger, CatalystTestCase):
+    def setUp(self):
+        self.root_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.root_dir, 'daily_bundle')
+
+        self.start = pd.Timestamp('2017-01-01', tz='UTC')
+        self.end = pd.Timestamp('2017-01-10', tz='UTC')
+        self.writer = BcolzExchangeBarWriter(
+            rootdir=self.path,
+            start_session=self.start,
+            end_session=self.end,
+            data_frequency='daily',
+            write_metadata=True,
+        )
+
+    def tearDown(self):
+        reader_registry.invalidate(self.path)
+        shutil.rmtree(self.root_dir)
+
+    def make_frame(self, close):
+        index = pd.date_range(self.start, self.end, freq='D')
+        return pd.DataFrame(
+            dict(
+                open=close, high=close, low=close, close=close, volume=1.0,
+            ),
+            index=index,
+            columns=['open', 'high', 'low', 'close', 'volume'],
+        )
+
+    def write(self, sid, close):
+        self.writer.write([(sid, self.make_frame(close))])
+
+    def test_shared_reader(self):
+        self.write(1, 10.0)
+        registry = BundleReaderRegistry(max_unused=1)
+
+        reader = registry.acquire(self.path, 'daily')
+        assert registry.acquire(self.path, 'daily') is reader
+        assert registry.acquire(
+            os.path.join(self.root_dir, 'missing'), 'daily'
+        ) is None
+
+        # Unused readers stay open up to max_unused.
+        registry.release(reader)
+        registry.release(reader)
+        assert registry.acquire(self.path, 'daily') is reader
+
+    def test_invalidated_after_write(self):
+        self.write(1, 10.0)
+        registry = BundleReaderRegistry()
+
+        reader = registry.acquire(self.path, 'daily')
+        assert reader.get_value(1, self.end, 'close') == 10.0
+
+        self.write(2, 20.0)
+        registry.notify_write(self.path)
+
+        new_reader = registry.acquire(self.path, 'daily')
+        assert new_reader is not reader
+        assert new_reader.get_value(2, self.end, 'close') == 20.0
+
+        # A write by another process changes the mtime of the metadata.
+        metadata = os.path.join(self.path, 'metadata.json')
+        mtime = os.stat(metadata).st_mtime
+        os.utime(metadata, (mtime + 10, mtime + 10))
+        assert registry.acquire(self.path, 'daily') is not new_reader
+
+    def test_bundles_share_readers(self):
+        self.write(1, 10.0)
+        first = ExchangeBundle('bitfinex')
+        second = ExchangeBundle('poloniex')
+
+        reader = first.get_reader('daily', path=self.path)
+        assert second.get_reader('daily', path=self.path) is reader
+
+        first._write([(3, self.make_frame(30.0))], self.writer, 'daily')
+        new_reader = second.get_reader('daily', path=self.path)
+        assert new_reader is not reader
+        assert np.isclose(new_reader.get_value(3, self.end, 'close'), 30.0)
@@ -0,0 +1,94 @@
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from catalyst.exchange.exchange_execution import ExchangeLimitOrder
+from catalyst.exchange.replay import RecordedMarketData, ReplayClock, \
+    ReplayExchange
+from catalyst.finance.execution import MarketOrder
+from catalyst.gens.sim_engine import BAR, SESSION_START, SESSION_END
+from catalyst.testing.fixtures import WithLogger, CatalystTestCase
+
+
+class TestReplay(WithLogger, CatalystTestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.start = pd.Timestamp('2018-01-01 00:00', tz='UTC')
+
+        closes = np.arange(100.0, 110.0)
+        index = pd.date_range(self.start, periods=10, freq='1T')
+        candles = pd.DataFrame(
+            dict(
+                open=closes, high=closes + 0.5, low=closes - 0.5,
+                close=closes, volume=1.0,
+            ),
+            index=index,
+        )
+
+        self.market_data = RecordedMarketData(self.folder)
+        self.market_data.write('poloniex', 'btc_usdt', 'candles', candles)
+
+        self.exchange = ReplayExchange(
+            'poloniex', self.market_data, 'usdt',
+            balances=dict(usdt=1000.0), fee=0.0,
+        )
+        self.asset = self.exchange.get_asset('btc_usdt')
+
+    def tearDown(self):
+        shutil.rmtree(self.folder, ignore_errors=True)
+
+    def at(self, minutes):
+        self.market_data.current_dt = \
+            self.start + pd.Timedelta(minutes=minutes)
+
+    def test_visible_candles(self):
+        assert self.market_data.bounds() == \
+            (self.start, self.start + pd.Timedelta(minutes=9))
+
+        # The candle opened at 00:03 is still open.
+        self.at(3)
+        candles = self.exchange.get_candles('1T', self.asset, bar_count=5)
+        assert [candle['close'] for candle in candles] == \
+            [100.0, 101.0, 102.0]
+
+        ticker = self.exchange.tickers([self.asset])[self.asset]
+        assert ticker['last_price'] == 102.0
+
+    def test_order_matching(self):
+        self.at(3)
+        market_order = self.exchange.create_order(
+            self.asset, 2, True, MarketOrder(),
+        )
+        limit_order = self.exchange.create_order(
+            self.asset, 1, True, ExchangeLimitOrder(100.0),
+        )
+        assert self.exchange.get_balances()['usdt']['used'] == 100.0
+
+        transactions = self.exchange.process_order(market_order)
+        assert [t.price for t in transactions] == [102.0]
+        assert not market_order.open
+
+        # No later candle has crossed the limit yet.
+        self.at(5)
+        assert self.exchange.process_order(limit_order) == []
+
+        self.exchange.cancel_order(limit_order)
+        assert self.exchange.get_open_orders() == []
+
+        balances = self.exchange.get_balances()
+        assert balances['usdt']['total'] == 1000.0 - 2 * 102.0
+        assert balances['btc']['total'] == 2
+
+    def test_clock(self):
+        end = self.start + pd.Timedelta(minutes=3)
+        clock = ReplayClock(
+            pd.DatetimeIndex([self.start]), self.market_data, self.start, end,
+        )
+
+        events = list(clock)
+        assert [event for _, event in events] == \
+            [SESSION_START, BAR, BAR, BAR, SESSION_END]
+        assert events[-2][0] == self.start + pd.Timedelta(minutes=2)
+        assert self.market_data.current_dt == end
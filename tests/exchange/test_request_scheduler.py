@@ -0,0 +1,152 @@
+import os
+import shutil
+import tempfile
+import threading
+import time
+
+from catalyst.exchange.utils.request_scheduler import FileLockCoordinator, \
+    PRIORITY_ORDERS, RequestScheduler, ScheduledExchangeAPI
+from catalyst.testing.fixtures import WithLogger, CatalystTestCase
+
+
+class FakeClock(object):
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+class FakeAPI(object):
+    def __init__(self):
+        self.calls = []
+        self.markets = {'ETH/BTC': {}}
+
+    def fetch_ticker(self, symbol):
+        self.calls.append(('fetch_ticker', symbol))
+        return dict(symbol=symbol)
+
+    def create_order(self, symbol, type, side, amount):
+        self.calls.append(('create_order', symbol))
+        return dict(id='1')
+
+
+class TestRequestScheduler(WithLogger, CatalystTestCase):
+    def make_scheduler(self, **kwargs):
+        clock = FakeClock()
+        scheduler = RequestScheduler(
+            interval=0.5, clock=clock, sleep=clock.sleep, **kwargs
+        )
+        return scheduler, clock
+
+    def test_token_bucket(self):
+        scheduler, clock = self.make_scheduler(capacity=2)
+
+        # The burst is free, then one request per interval.
+        assert [scheduler.acquire() for _ in range(4)] == [0, 0, 0.5, 0.5]
+        assert scheduler.acquire(weight=2) == 1.0
+
+        clock.now += 10
+        assert scheduler.acquire() == 0
+
+        scheduler.backoff(3)
+        assert scheduler.acquire(priority=PRIORITY_ORDERS) == 3
+
+    def test_coalesce(self):
+        scheduler = RequestScheduler(interval=0)
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+
+        def fetch(symbol):
+            calls.append(symbol)
+            started.set()
+            release.wait()
+            return dict(symbol=symbol)
+
+        results = []
+
+        def call():
+            results.append(scheduler.call(
+                fetch, ('eth_btc',), coalesce=True, key='eth_btc',
+            ))
+
+        threads = [threading.Thread(target=call) for _ in range(3)]
+        threads[0].start()
+        started.wait()
+        for thread in threads[1:]:
+            thread.start()
+
+        # Lets the other requests find the request in flight.
+        time.sleep(0.1)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        assert calls == ['eth_btc']
+        assert results == [dict(symbol='eth_btc')] * 3
+
+        # Each caller gets its own response.
+        assert len(set(id(result) for result in results)) == 3
+
+    def test_coalesce_per_account(self):
+        scheduler = RequestScheduler(interval=0)
+        release = threading.Event()
+
+        class Account(FakeAPI):
+            def fetch_ticker(self, symbol):
+                release.wait()
+                return super(Account, self).fetch_ticker(symbol)
+
+        apis = [Account(), Account()]
+        threads = [
+            threading.Thread(
+                target=ScheduledExchangeAPI(api, scheduler).fetch_ticker,
+                args=('ETH/BTC',),
+            )
+            for api in apis
+        ]
+        for thread in threads:
+            thread.start()
+
+        time.sleep(0.1)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        assert [api.calls for api in apis] == \
+            [[('fetch_ticker', 'ETH/BTC')]] * 2
+
+    def test_scheduled_api(self):
+        scheduler, clock = self.make_scheduler(capacity=1)
+        api = FakeAPI()
+        scheduled = ScheduledExchangeAPI(api, scheduler)
+
+        assert scheduled.markets is api.markets
+        scheduled.enableRateLimit = False
+        assert api.enableRateLimit is False
+
+        assert scheduled.fetch_ticker('ETH/BTC') == dict(symbol='ETH/BTC')
+        assert scheduled.create_order('ETH/BTC', 'limit', 'buy', 1)
+        assert api.calls == [
+            ('fetch_ticker', 'ETH/BTC'), ('create_order', 'ETH/BTC'),
+        ]
+        assert clock.now == 1000.5
+
+    def test_file_coordinator(self):
+        folder = tempfile.mkdtemp()
+        try:
+            path = os.path.join(folder, 'poloniex.rate_limit')
+            first = FileLockCoordinator(path)
+            second = FileLockCoordinator(path)
+
+            assert first.take(1, rate=2, capacity=2, now=0) == 0
+            assert second.take(1, rate=2, capacity=2, now=0) == 0
+            assert first.take(1, rate=2, capacity=2, now=0) == 0.5
+            assert second.take(1, rate=2, capacity=2, now=0.5) == 0
+
+        finally:
+            shutil.rmtree(folder)
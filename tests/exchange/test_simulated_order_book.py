@@ -0,0 +1,111 @@
+import pandas as pd
+
+from catalyst.assets._assets import TradingPair
+from catalyst.exchange.exchange_blotter import ExchangeBlotter
+from catalyst.exchange.exchange_execution import ExchangeLimitOrder, \
+    ExchangeStopLimitOrder, ExchangeStopOrder
+from catalyst.finance.blotter import Blotter
+from catalyst.finance.execution import MarketOrder
+from catalyst.testing.fixtures import WithLogger, CatalystTestCase
+from catalyst.testing.synthetic_exchange import make_trading_pair_params
+
+
+class FakeBarData(object):
+    def __init__(self, dt, prices):
+        self.current_dt = dt
+        self.prices = prices
+
+    def current(self, assets, field):
+        if isinstance(assets, TradingPair):
+            return self.prices[assets.symbol][field]
+
+        return pd.Series(
+            [self.prices[asset.symbol][field] for asset in assets],
+            index=assets,
+        )
+
+
+def make_bar(open_, high, low, close):
+    return dict(open=open_, high=high, low=low, close=close, volume=1.0)
+
+
+class TestSimulatedOrderBook(WithLogger, CatalystTestCase):
+    def make_blotter(self):
+        blotter = ExchangeBlotter(
+            data_frequency='minute',
+            exchanges=dict(poloniex=None),
+            simulate_orders=True,
+        )
+        blotter.current_dt = pd.Timestamp('2018-01-01', tz='UTC')
+        blotter.commission_models[TradingPair].maker = 0.001
+        blotter.commission_models[TradingPair].taker = 0.002
+        return blotter
+
+    def place_orders(self, blotter):
+        assets = [
+            TradingPair(**make_trading_pair_params(
+                'poloniex', symbol, pd.Timestamp('2017-01-01', tz='UTC'),
+            ))
+            for symbol in ('btc_usdt', 'eth_usdt')
+        ]
+        orders = [
+            (assets[0], 1, ExchangeLimitOrder(99.0)),
+            (assets[0], -1, ExchangeLimitOrder(104.0)),
+            # Checked against the high of the previous limit order.
+            (assets[0], 2, ExchangeStopOrder(103.0)),
+            (assets[0], 3, MarketOrder()),
+            (assets[1], -2, ExchangeStopOrder(9.5)),
+            (assets[1], 1, ExchangeStopLimitOrder(10.5, 10.2)),
+            (assets[1], 4, ExchangeLimitOrder(9.0)),
+        ]
+        for index, (asset, amount, style) in enumerate(orders):
+            blotter.order(asset, amount, style, order_id=str(index))
+
+    def test_same_fills_as_the_slippage_model(self):
+        batched, reference = self.make_blotter(), self.make_blotter()
+        self.place_orders(batched)
+        self.place_orders(reference)
+
+        bars = [
+            dict(btc_usdt=make_bar(100.0, 101.0, 99.5, 100.5),
+                 eth_usdt=make_bar(10.0, 10.1, 9.9, 10.0)),
+            dict(btc_usdt=make_bar(100.5, 104.5, 100.0, 104.0),
+                 eth_usdt=make_bar(10.0, 10.3, 9.8, 10.2)),
+            dict(btc_usdt=make_bar(104.0, 104.2, 98.0, 98.5),
+                 eth_usdt=make_bar(10.2, 10.6, 9.4, 9.5)),
+            dict(btc_usdt=make_bar(98.5, 99.0, 97.0, 97.5),
+                 eth_usdt=make_bar(9.5, 9.6, 8.9, 9.0)),
+            # Reaches the stop then the limit of the stop limit order.
+            dict(btc_usdt=make_bar(97.5, 98.0, 97.0, 97.5),
+                 eth_usdt=make_bar(10.3, 10.6, 10.25, 10.4)),
+        ]
+        for minute, prices in enumerate(bars):
+            dt = pd.Timestamp('2018-01-01', tz='UTC') + \
+                pd.Timedelta(minutes=minute + 1)
+            bar_data = FakeBarData(dt, prices)
+
+            results = [
+                batched.get_transactions(bar_data),
+                Blotter.get_transactions(reference, bar_data),
+            ]
+            fills = []
+            for (transactions, commissions, closed), blotter in \
+                    zip(results, [batched, reference]):
+                fills.append((
+                    [(t.order_id, t.price, t.amount, t.commission)
+                     for t in transactions],
+                    [c['cost'] for c in commissions],
+                    [o.id for o in closed],
+                ))
+                blotter.prune_orders(closed)
+
+            assert fills[0] == fills[1]
+
+            for order_id, order in reference.orders.items():
+                other = batched.orders[order_id]
+                assert (other.filled, other.commission, other.stop,
+                        other.stop_reached, other.limit_reached, other.dt) == \
+                    (order.filled, order.commission, order.stop,
+                     order.stop_reached, order.limit_reached, order.dt)
+
+        assert not batched.open_orders
@@ -0,0 +1,127 @@
+import os
+import shutil
+import tempfile
+
+import pandas as pd
+
+from catalyst.assets._assets import TradingPair
+from catalyst.exchange.utils.state_journal import AlgoStateJournal
+from catalyst.finance.order import Order
+from catalyst.finance.performance.period import PerformancePeriod
+from catalyst.finance.performance.position_tracker import PositionTracker
+from catalyst.finance.transaction import Transaction
+from catalyst.testing.fixtures import WithLogger, CatalystTestCase
+from catalyst.testing.synthetic_exchange import make_trading_pair_params
+
+
+class Tracker(object):
+    """The performance objects of a PerformanceTracker."""
+
+    def __init__(self):
+        self.position_tracker = PositionTracker('minute')
+        self.cumulative_performance = PerformancePeriod(
+            1000.0, 'minute', keep_orders=True, name='cumulative',
+        )
+        self.todays_performance = PerformancePeriod(
+            1000.0, 'minute', keep_orders=True, name='daily',
+        )
+        self.cumulative_performance.position_tracker = self.position_tracker
+        self.todays_performance.position_tracker = self.position_tracker
+
+    def execute(self, order, amount, price):
+        order.filled += amount
+        order.dt = order.dt + pd.Timedelta('1min')
+        txn = Transaction(
+            asset=order.asset,
+            amount=amount,
+            dt=order.dt,
+            price=price,
+            order_id=order.id,
+            commission=0.0,
+        )
+
+        self.position_tracker.execute_transaction(txn)
+        for period in (self.cumulative_performance, self.todays_performance):
+            period.handle_execution(txn)
+            period.record_order(order)
+            period.calculate_performance()
+
+
+class TestAlgoStateJournal(WithLogger, CatalystTestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.asset = TradingPair(**make_trading_pair_params(
+            'poloniex', 'eth_btc', pd.Timestamp('2017-01-01', tz='UTC'),
+        ))
+
+    def tearDown(self):
+        shutil.rmtree(self.folder, ignore_errors=True)
+
+    def make_order(self, dt, amount):
+        return Order(dt=dt, asset=self.asset, amount=amount, id=str(amount))
+
+    def test_recover(self):
+        dt = pd.Timestamp('2018-01-01 00:00', tz='UTC')
+        tracker = Tracker()
+        state = dict()
+
+        journal = AlgoStateJournal(self.folder, fsync=False)
+        assert journal.recover() is None
+        journal.record(dt, tracker, state)
+        assert os.path.isfile(journal.snapshot_path)
+
+        buy = self.make_order(dt, 10)
+        tracker.execute(buy, 4, 0.05)
+        state['count'] = 1
+        journal.record(dt + pd.Timedelta('1min'), tracker, state)
+
+        tracker.execute(buy, 6, 0.06)
+        sell = self.make_order(dt, -10)
+        tracker.execute(sell, -10, 0.07)
+        journal.record(dt + pd.Timedelta('2min'), tracker, state)
+        journal.close()
+
+        # A record torn by a crash.
+        with open(journal.journal_path, 'ab') as f:
+            f.write(b'\x10\x00')
+
+        recovered = AlgoStateJournal(self.folder).recover()
+        assert recovered['day'] == dt
+        assert recovered['state'] == dict(count=1)
+
+        for name, period in (('cumulative', tracker.cumulative_performance),
+                             ('today', tracker.todays_performance)):
+            recovered_period = recovered[name]
+            assert recovered_period.cash_flow == period.cash_flow
+            assert recovered_period.ending_cash == period.ending_cash
+            assert sum(
+                len(txns) for txns in
+                recovered_period.processed_transactions.values()
+            ) == 3
+            assert [
+                (order.id, order.filled)
+                for order in recovered_period.orders_by_id.values()
+            ] == [('10', 10), ('-10', -10)]
+
+        assert not recovered['cumulative'].position_tracker.positions
+        assert os.path.getsize(journal.journal_path) > 0
+
+    def test_snapshot_on_new_day(self):
+        dt = pd.Timestamp('2018-01-01 23:58', tz='UTC')
+        tracker = Tracker()
+
+        journal = AlgoStateJournal(self.folder, fsync=False)
+        journal.record(dt, tracker, dict())
+
+        tracker.execute(self.make_order(dt, 10), 10, 0.05)
+        journal.record(dt + pd.Timedelta('1min'), tracker, dict())
+        assert os.path.getsize(journal.journal_path) > 0
+
+        journal.record(dt + pd.Timedelta('2min'), tracker, dict())
+        assert os.path.getsize(journal.journal_path) == 0
+
+        journal.close()
+        recovered = AlgoStateJournal(self.folder).recover()
+        assert recovered['day'] == pd.Timestamp('2018-01-02', tz='UTC')
+        positions = recovered['cumulative'].position_tracker.positions
+        assert positions[self.asset].amount == 10
@@ -0,0 +1,48 @@
+import pandas as pd
+
+from catalyst.assets._assets import TradingPair
+from catalyst.testing.synthetic_exchange import make_ohlcv_frame, \
+    make_trading_pair_params, make_market, make_treasury_curves
+from catalyst.testing.fixtures import WithLogger, CatalystTestCase
+
+
+class TestSyntheticExchange(WithLogger, CatalystTestCase):
+    def test_ohlcv_frame(self):
+        dts = pd.date_range('2017-09-01', periods=1440, freq='T', tz='UTC')
+        df = make_ohlcv_frame(dts, seed=1, start_price=50.0)
+
+        assert list(df.columns) == ['open', 'high', 'low', 'close', 'volume']
+        assert df.index.equals(dts)
+        assert df['open'].iloc[0] == 50.0
+        assert (df['open'].iloc[1:].values == df['close'].iloc[:-1].values) \
+            .all()
+        assert (df['high'] >= df[['open', 'close']].max(axis=1)).all()
+        assert (df['low'] <= df[['open', 'close']].min(axis=1)).all()
+        assert (df['volume'] > 0).all()
+
+        assert df.equals(make_ohlcv_frame(dts, seed=1, start_price=50.0))
+        assert not df.equals(make_ohlcv_frame(dts, seed=2, start_price=50.0))
+
+    def test_trading_pair_params(self):
+        start = pd.Timestamp('2015-03-01', tz='UTC')
+        end = pd.Timestamp('2017-09-24', tz='UTC')
+        params = make_trading_pair_params(
+            'poloniex', 'btc_usdt', start, end_daily=end,
+        )
+
+        asset = TradingPair(**params)
+        assert asset.symbol == 'btc_usdt'
+        assert asset.exchange_symbol == 'BTCUSDT'
+        assert asset.end_daily == end
+        assert asset.end_minute is None
+
+        market = make_market(params)
+        assert market['id'] == 'BTCUSDT'
+        assert market['symbol'] == 'BTC/USDT'
+
+    def test_treasury_curves(self):
+        curves = make_treasury_curves('2017-01-01', '2017-01-31')
+
+        assert len(curves) == 31
+        assert str(curves.index.tz) == 'UTC'
+        assert (curves == 0.02).all().all()
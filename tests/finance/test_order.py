@@ -0,0 +1,40 @@
+import pandas as pd
+from unittest import TestCase
+
+from catalyst.assets import Equity
+from catalyst.finance.order import Order
+
+
+class OrderTestCase(TestCase):
+
+    def test_ids(self):
+        dt = pd.Timestamp('2017-01-01')
+        asset = Equity(1, exchange='test')
+
+        ids = [Order(dt=dt, asset=asset, amount=1).id for _ in range(3)]
+        self.assertEqual(len(set(ids)), 3)
+        self.assertEqual(
+            Order(dt=dt, asset=asset, amount=1, id='abc').id, 'abc',
+        )
+
+    def test_trusted_order(self):
+        dt = pd.Timestamp('2017-01-01')
+        asset = Equity(1, exchange='test')
+
+        order = Order(dt=dt, asset=asset, amount=-5, limit=10.0, id='a')
+        trusted = Order.trusted(
+            dt=dt, asset=asset, amount=-5, limit=10.0, id='a',
+        )
+        self.assertEqual(trusted.to_dict(), order.to_dict())
+        self.assertEqual(trusted.direction, -1)
+
+        dct = order.to_dict()
+        self.assertNotIn('broker_order_id', dct)
+        self.assertIs(dct['sid'], asset)
+        self.assertEqual(dct['status'], order.status)
+
+        order.broker_order_id = 'b'
+        self.assertEqual(order.to_dict()['broker_order_id'], 'b')
+
+        with self.assertRaises(TypeError):
+            Order(dt=dt, asset=1, amount=1)
@@ -33,3 +33,20 @@ class TransactionTestCase(TestCase):
         )
 
         self.assertEqual(repr(txn), expected)
+
+    def test_trusted_transaction(self):
+        dt = pd.Timestamp('2017-01-01')
+
+        asset = Equity(1, exchange='test')
+        txn = Transaction(asset, amount=100, dt=dt, price=10, order_id=0)
+        trusted = Transaction.trusted(
+            asset, amount=100, dt=dt, price=10, order_id=0,
+        )
+
+        self.assertEqual(trusted.__dict__, txn.__dict__)
+        self.assertEqual(trusted.to_dict(), txn.to_dict())
+        self.assertNotIn('asset', txn.to_dict())
+        self.assertIs(txn.to_dict()['sid'], asset)
+
+        with self.assertRaises(TypeError):
+            Transaction(1, amount=100, dt=dt, price=10, order_id=0)
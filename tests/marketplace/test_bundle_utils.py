@@ -0,0 +1,124 @@
+import os
+import shutil
+import tempfile
+
+import bcolz
+import numpy as np
+import pandas as pd
+
+from catalyst.marketplace.utils.bundle_utils import BundleIndex, \
+    INDEX_FILENAME, merge_bundles, open_indexed_bundle, read_bundle, \
+    sort_bundle
+from catalyst.testing.fixtures import WithLogger, CatalystTestCase
+
+
+class TestBundleUtils(WithLogger, CatalystTestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.folder, ignore_errors=True)
+
+    def make_bundle(self, name, rows):
+        dates, symbols, values = zip(*rows)
+        z = bcolz.ctable(
+            columns=[
+                np.array(dates, dtype='S10'),
+                np.array(symbols, dtype='S8'),
+                np.array(values, dtype='float64'),
+            ],
+            names=['date', 'symbol', 'value'],
+            rootdir=os.path.join(self.folder, name),
+            mode='w',
+        )
+        z.flush()
+        return z
+
+    def rows(self, z):
+        return [
+            (date, symbol, value) for date, symbol, value in zip(
+                z.cols['date'][:], z.cols['symbol'][:], z.cols['value'][:],
+            )
+        ]
+
+    def test_merge_overlapping(self):
+        target = self.make_bundle('target', [
+            (b'2018-01-01', b'btc', 1.0),
+            (b'2018-01-02', b'btc', 2.0),
+            (b'2018-01-02', b'eth', 3.0),
+        ])
+        source = self.make_bundle('source', [
+            (b'2018-01-03', b'btc', 5.0),
+            (b'2018-01-01', b'eth', 4.0),
+            # Replaces the row of the target
+            (b'2018-01-02', b'btc', 6.0),
+        ])
+
+        merged = merge_bundles(source, target, chunk_size=2)
+        assert merged.rootdir == target.rootdir
+        assert self.rows(merged) == [
+            (b'2018-01-01', b'btc', 1.0),
+            (b'2018-01-01', b'eth', 4.0),
+            (b'2018-01-02', b'btc', 6.0),
+            (b'2018-01-02', b'eth', 3.0),
+            (b'2018-01-03', b'btc', 5.0),
+        ]
+        assert merged.attrs['sorted_by'] == ['date', 'symbol']
+        assert not os.path.exists(os.path.join(self.folder, '.target'))
+
+    def test_merge_appends(self):
+        target = self.make_bundle('target', [
+            (b'2018-01-01', b'btc', 1.0),
+        ])
+        source = self.make_bundle('source', [
+            (b'2018-01-02', b'btc', 2.0),
+            (b'2018-01-02', b'eth', 3.0),
+        ])
+
+        merged = merge_bundles(source, target, chunk_size=1)
+        assert merged is target
+        assert len(self.rows(merged)) == 3
+
+    def test_sort_bundle(self):
+        source = self.make_bundle('source', [
+            (b'2018-01-02', b'btc', 2.0),
+            (b'2018-01-01', b'btc', 1.0),
+        ])
+        rootdir = os.path.join(self.folder, 'bundle')
+
+        z = sort_bundle(source, rootdir)
+        assert z.rootdir == rootdir
+        assert [row[2] for row in self.rows(z)] == [1.0, 2.0]
+
+    def test_indexed_read(self):
+        # Not sorted, as the bundles ingested before the index.
+        self.make_bundle('bundle', [
+            (b'2018-01-02', b'eth', 4.0),
+            (b'2018-01-01', b'btc', 1.0),
+            (b'2018-01-01', b'eth', 2.0),
+            (b'2018-01-02', b'btc', 3.0),
+            (b'2018-01-03', b'btc', 5.0),
+        ])
+        rootdir = os.path.join(self.folder, 'bundle')
+
+        z, index = open_indexed_bundle(rootdir)
+        assert os.path.isfile(os.path.join(rootdir, INDEX_FILENAME))
+        assert index.date_offsets.tolist() == [0, 2, 4, 5]
+        assert BundleIndex.load(z).symbols.tolist() == ['btc', 'eth']
+
+        df = read_bundle(z, index)
+        assert df['value'].tolist() == [1.0, 2.0, 3.0, 4.0, 5.0]
+        assert df.index.names == ['date', 'symbol']
+        assert df.index.get_level_values(0)[0] == pd.Timestamp('2018-01-01')
+        assert df.index.get_level_values(1).tolist() == \
+            ['btc', 'eth', 'btc', 'eth', 'btc']
+
+        df = read_bundle(z, index, start='2018-01-02', end='2018-01-03')
+        assert df['value'].tolist() == [3.0, 4.0]
+
+        df = read_bundle(z, index, start='2018-01-02', symbols=['btc', 'xrp'])
+        assert df['value'].tolist() == [3.0, 5.0]
+        assert df.index.get_level_values(1).tolist() == ['btc', 'btc']
+
+        df = read_bundle(z, index, start='2018-01-04')
+        assert df.empty
@@ -0,0 +1,104 @@
+import os
+import shutil
+import tempfile
+import threading
+
+import requests
+from six.moves.BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+
+from catalyst.marketplace.utils.multipart import StreamingMultipartDecoder
+from catalyst.testing.fixtures import WithLogger, CatalystTestCase
+
+BOUNDARY = 'catalyst-boundary'
+PARTS = [
+    ('bundle-1.tar.gz', os.urandom(100000)),
+    # Looks like the beginning of the delimiter.
+    ('bundle-2.tar.gz', b'\r\n--catalyst-bound\r\n' + os.urandom(1000)),
+    ('bundle-3.tar.gz', b''),
+]
+
+
+def make_body(parts):
+    body = b''
+    for filename, content in parts:
+        body += (
+            '--{}\r\n'
+            'Content-Disposition: form-data; name="file"; '
+            'filename="{}"\r\n'
+            'Content-Type: application/gzip\r\n\r\n'.format(
+                BOUNDARY, filename,
+            )
+        ).encode('utf-8') + content + b'\r\n'
+
+    return body + '--{}--\r\n'.format(BOUNDARY).encode('utf-8')
+
+
+class MultipartHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        body = make_body(PARTS)
+
+        self.send_response(200)
+        self.send_header(
+            'Content-Type',
+            'multipart/form-data; boundary={}'.format(BOUNDARY),
+        )
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+
+        for start in range(0, len(body), 4096):
+            self.wfile.write(body[start:start + 4096])
+
+    def log_message(self, *args):
+        pass
+
+
+class TestStreamingMultipartDecoder(WithLogger, CatalystTestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.folder, ignore_errors=True)
+
+    def _check_parts(self, parts):
+        assert [os.path.basename(part.path) for part in parts] == \
+            [filename for filename, _ in PARTS]
+
+        for part, (_, content) in zip(parts, PARTS):
+            with open(part.path, 'rb') as f:
+                assert f.read() == content
+
+    def test_small_chunks(self):
+        body = make_body(PARTS)
+        decoder = StreamingMultipartDecoder(
+            'multipart/form-data; boundary="{}"'.format(BOUNDARY)
+        )
+
+        for chunk_size in (1, 7, 1024):
+            chunks = (
+                body[start:start + chunk_size]
+                for start in range(0, len(body), chunk_size)
+            )
+            self._check_parts(list(decoder.iter_parts(chunks, self.folder)))
+
+    def test_response(self):
+        server = HTTPServer(('127.0.0.1', 0), MultipartHandler)
+        thread = threading.Thread(target=server.handle_request)
+        thread.start()
+
+        try:
+            r = requests.post(
+                'http://127.0.0.1:{}/marketplace/ingest'.format(
+                    server.server_port
+                ),
+                stream=True,
+            )
+            decoder = StreamingMultipartDecoder.from_response(r)
+            parts = list(decoder.iter_parts(
+                r.iter_content(chunk_size=1000), self.folder,
+            ))
+
+        finally:
+            thread.join()
+            server.server_close()
+
+        self._check_parts(parts)
@@ -178,3 +178,26 @@ class TestClock(TestCase):
                 self.sessions[i],
                 all_events[(i * 392): ((i + 1) * 392)]
             )
+
+    def test_clock_position(self):
+        clock = MinuteSimulationClock(
+            self.sessions,
+            self.opens,
+            self.closes,
+            days_at_time(self.sessions, time(6, 17), "US/Eastern"),
+            False
+        )
+        assert clock.current_minute_index == -1
+
+        minutes = self.nyse_calendar.minutes_for_session(self.sessions[1])
+        assert (clock.minutes_for_session(1) == minutes.asi8).all()
+
+        for dt, event in clock:
+            if event == BAR:
+                assert clock.current_minute_nanos == dt.value
+                assert clock.current_session_nanos == \
+                    self.sessions[clock.current_session_idx].value
+
+                if dt == minutes[10]:
+                    assert clock.current_session_idx == 1
+                    assert clock.current_minute_index == 10
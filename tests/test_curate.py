@@ -0,0 +1,142 @@
+import json
+import shutil
+import tempfile
+import threading
+
+import pandas as pd
+from six.moves.BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+from six.moves.urllib.parse import parse_qs, urlparse
+
+from catalyst.curate.poloniex import PoloniexCurator
+from catalyst.testing.fixtures import WithLogger, CatalystTestCase
+
+LIMIT = 100
+
+
+def make_trades(start, count, first_trade_id=1, freq='7min'):
+    dates = pd.date_range(start, periods=count, freq=freq)
+    return [
+        dict(
+            globalTradeID=1000 + first_trade_id + index,
+            tradeID=first_trade_id + index,
+            date=dt.strftime('%Y-%m-%d %H:%M:%S'),
+            type='buy' if index % 2 else 'sell',
+            rate=str(1.0 + index * 0.01),
+            amount='2.0',
+            total=str(2.0 * (1.0 + index * 0.01)),
+        )
+        for index, dt in enumerate(dates)
+    ]
+
+
+class TradeHistoryHandler(BaseHTTPRequestHandler):
+    """Serves returnTradeHistory like Poloniex: newest trades first, at
+    most LIMIT per request."""
+    trades = []
+    requests = []
+
+    def do_GET(self):
+        query = parse_qs(urlparse(self.path).query)
+        start = int(query['start'][0])
+        end = int(query['end'][0])
+        self.requests.append((start, end))
+
+        trades = [
+            trade for trade in reversed(self.trades)
+            if start <= pd.Timestamp(trade['date']).value // 10 ** 9 <= end
+        ][:LIMIT]
+
+        body = json.dumps(trades).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestPoloniexCurator(WithLogger, CatalystTestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        TradeHistoryHandler.requests = []
+        TradeHistoryHandler.trades = make_trades('2017-01-30', 2000)
+
+        self.server = HTTPServer(('127.0.0.1', 0), TradeHistoryHandler)
+        self.thread = threading.Thread(target=self.server.serve_forever)
+        self.thread.start()
+
+        self.curator = PoloniexCurator(
+            folder=self.folder,
+            api_path='http://127.0.0.1:{}/public?'.format(
+                self.server.server_port
+            ),
+            wait_time=0,
+            trade_history_limit=LIMIT,
+        )
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join()
+        shutil.rmtree(self.folder, ignore_errors=True)
+
+    def test_incremental_curation(self):
+        now = pd.Timestamp('2017-02-15').value // 10 ** 9
+        start = pd.Timestamp('2016-12-01').value // 10 ** 9
+
+        self.curator.retrieve_trade_history('BTC_ETH', start=start, end=now)
+        state = self.curator.get_state('BTC_ETH')
+        assert state['complete']
+        assert state['oldest_trade_id'] == 1
+        assert state['newest_trade_id'] == 2000
+        assert state['dirty_months'] == ['2017-01', '2017-02']
+
+        self.curator.write_ohlcv_file('BTC_ETH')
+        df = self.curator.onemin_to_dataframe(
+            'BTC_ETH',
+            pd.Timestamp('2017-01-01', tz='UTC'),
+            pd.Timestamp('2017-03-01', tz='UTC'),
+        )
+        assert df.index[0] == pd.Timestamp('2017-01-30')
+        assert (df.index[1:] - df.index[:-1] == pd.Timedelta('1min')).all()
+        assert df['close'].notnull().all()
+        assert abs(df['volume'].sum() - sum(
+            float(trade['total']) for trade in TradeHistoryHandler.trades
+        )) < 1e-6
+
+        # Only the newer trades are requested, only February is generated.
+        TradeHistoryHandler.trades += make_trades(
+            '2017-02-15', 10, first_trade_id=2001,
+        )
+        TradeHistoryHandler.requests = []
+        self.curator.retrieve_trade_history(
+            'BTC_ETH',
+            start=start,
+            end=pd.Timestamp('2017-02-16').value // 10 ** 9,
+        )
+        assert TradeHistoryHandler.requests == [(
+            state['newest_date'], pd.Timestamp('2017-02-16').value // 10 ** 9,
+        )]
+
+        state = self.curator.get_state('BTC_ETH')
+        assert state['newest_trade_id'] == 2010
+        assert state['dirty_months'] == ['2017-02']
+
+        self.curator.write_ohlcv_file('BTC_ETH')
+        df = self.curator.onemin_to_dataframe(
+            'BTC_ETH',
+            pd.Timestamp('2017-02-15'),
+            pd.Timestamp('2017-03-01'),
+        )
+        assert df['volume'].iloc[-1] > 0
+        assert df.index[-1] == pd.Timestamp('2017-02-15 01:03')
+
+    def test_curate_concurrently(self):
+        self.curator.threads = 2
+        failed = self.curator.curate(['BTC_ETH', 'BTC_LTC'])
+
+        assert failed == []
+        for pair in ('BTC_ETH', 'BTC_LTC'):
+            assert self.curator.get_state(pair)['newest_trade_id'] == 2000
@@ -2168,3 +2168,49 @@ class TestPositionTracker(WithTradingEnvironment,
         # Test gross and net exposures.
         self.assertEqual(100, pos_stats.gross_exposure)
         self.assertEqual(100, pos_stats.net_exposure)
+
+    def test_position_slots(self):
+        pt = perf.PositionTracker(None)
+        dt = pd.Timestamp('2017/01/04 3:00PM')
+
+        pt.update_position(
+            asset=self.EQUITY1, amount=np.float64(10.0),
+            last_sale_date=dt, last_sale_price=10
+        )
+        pt.update_position(
+            asset=self.EQUITY2, amount=np.float64(-20.0),
+            last_sale_date=dt, last_sale_price=10
+        )
+
+        position = pt.positions[self.EQUITY1]
+        position.last_sale_price = 12
+        self.assertEqual(120, pt.stats().long_value)
+
+        # Closing a position frees its slot, the position keeps its values.
+        txn = create_txn(self.EQUITY2, dt, 10, 20)
+        pt.execute_transaction(txn)
+        self.assertEqual(0, pt.stats().shorts_count)
+
+        pt.update_position(
+            asset=self.FUTURE5, amount=np.float64(30.0),
+            last_sale_date=dt, last_sale_price=100
+        )
+        self.assertEqual(2, len(pt.positions.amounts))
+
+        pos_stats = pt.stats()
+        self.assertEqual(120, pos_stats.long_value)
+        self.assertEqual(120 + 150000, pos_stats.long_exposure)
+        self.assertEqual(2, pos_stats.longs_count)
+
+        copied = copy.copy(pt.positions)
+        copied[self.EQUITY1].amount = 0
+        self.assertEqual(10, pt.positions[self.EQUITY1].amount)
+
+        restored = loads_with_persistent_ids(
+            dumps_with_persistent_ids(pt.positions), env=self.env
+        )
+        self.assertEqual(list(restored), [self.EQUITY1, self.FUTURE5])
+        self.assertEqual(12, restored[self.EQUITY1].last_sale_price)
+        np.testing.assert_array_equal(
+            restored.amounts, pt.positions.amounts,
+        )
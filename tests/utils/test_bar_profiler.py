@@ -0,0 +1,82 @@
+import json
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+
+from catalyst.utils.bar_profiler import BarProfiler, NOOP_SPAN, \
+    StageHistogram, get_profiler, profile_span, set_profiler
+
+
+class BarProfilerTestCase(TestCase):
+
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.folder, True)
+        self.addCleanup(set_profiler, None)
+
+    def test_disabled(self):
+        self.assertFalse(get_profiler().enabled)
+        self.assertIs(profile_span('history'), NOOP_SPAN)
+
+    def test_histogram(self):
+        histogram = StageHistogram()
+        for elapsed in (0.0002, 0.002, 0.002, 0.02, 3.0):
+            histogram.add(elapsed)
+
+        self.assertEqual(histogram.count, 5)
+        self.assertAlmostEqual(histogram.total, 3.0242)
+        self.assertEqual(histogram.max, 3.0)
+        self.assertEqual(histogram.quantile(0.5), 0.0025)
+        self.assertEqual(histogram.quantile(1), 3.0)
+
+    def test_spans(self):
+        profiler = BarProfiler(folder=self.folder)
+        set_profiler(profiler)
+
+        for _ in range(3):
+            with profile_span('bar'):
+                with profile_span('history'):
+                    pass
+        profiler.record('history', 0.5)
+
+        # The inner spans complete first.
+        self.assertEqual(profiler.order, ['history', 'bar'])
+        self.assertEqual(profiler.histograms['bar'].count, 3)
+        self.assertEqual(profiler.histograms['history'].count, 4)
+
+        report = profiler.get_report()
+        self.assertIn('Profiled 3 bars', report)
+        self.assertIn('history', report)
+
+        profiler.export()
+        with open(os.path.join(self.folder, 'bar_stages.prom')) as f:
+            text = f.read()
+
+        self.assertIn('# TYPE catalyst_bar_stage_seconds histogram', text)
+        self.assertIn(
+            'catalyst_bar_stage_seconds_bucket{stage="history",le="+Inf"} 4',
+            text,
+        )
+        self.assertIn(
+            'catalyst_bar_stage_seconds_count{stage="bar"} 3', text,
+        )
+
+    def test_json_lines(self):
+        profiler = BarProfiler(
+            folder=self.folder, export_format='jsonl', export_interval=0,
+        )
+        profiler.record('handle_data', 0.01)
+        profiler.on_bar('2018-01-01 00:00:00+00:00')
+        profiler.on_bar('2018-01-01 00:01:00+00:00')
+
+        with open(os.path.join(self.folder, 'bar_stages.jsonl')) as f:
+            lines = [json.loads(line) for line in f]
+
+        self.assertEqual(len(lines), 2)
+        self.assertEqual(lines[-1]['dt'], '2018-01-01 00:01:00+00:00')
+        self.assertEqual(lines[-1]['stages']['handle_data']['count'], 1)
+
+    def test_invalid_format(self):
+        with self.assertRaises(ValueError):
+            BarProfiler(export_format='csv')
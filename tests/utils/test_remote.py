@@ -0,0 +1,170 @@
+import base64
+import json
+import shutil
+import tempfile
+import threading
+import zlib
+from uuid import uuid4
+
+import numpy as np
+import pandas as pd
+from mock import patch
+from six.moves.BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+
+from catalyst.testing.fixtures import WithLogger, CatalystTestCase
+from catalyst.utils import remote
+from catalyst.utils.remote_utils import RemoteResults, decode_columnar, \
+    encode_columnar
+
+
+def make_stats(start, periods):
+    index = pd.date_range(
+        '2018-01-01', periods=periods, freq='1T', tz='UTC'
+    )[start:]
+    return pd.DataFrame(
+        dict(
+            portfolio_value=np.arange(start, periods, dtype=float),
+            trades=np.arange(start, periods),
+            period_close=index,
+            orders=[[dict(id=str(i))] for i in range(start, periods)],
+        ),
+        index=index,
+        columns=['portfolio_value', 'trades', 'period_close', 'orders'],
+    )
+
+
+class StatusHandler(BaseHTTPRequestHandler):
+    """A status endpoint sending the new rows by chunks of two."""
+    stats = None
+    log_text = u''
+    requests = []
+
+    def do_GET(self):
+        if 'response=' not in self.headers.get('Authorization', ''):
+            self.send_response(401)
+            self.send_header(
+                'WWW-Authenticate',
+                'Digest realm="catalyst", nonce="nonce", opaque="opaque"',
+            )
+            self.end_headers()
+            return
+
+        length = int(self.headers.get('Content-Length'))
+        request = json.loads(json.loads(self.rfile.read(length)))
+        self.requests.append((request['cursor'], request['log_cursor']))
+
+        cursor = request['cursor']
+        chunk = self.stats.iloc[cursor:cursor + 2]
+        log_text = self.log_text[request['log_cursor']:]
+        body = json.dumps(dict(
+            status='running',
+            data=encode_columnar(chunk) if len(chunk) else None,
+            cursor=cursor + len(chunk),
+            has_more=cursor + len(chunk) < len(self.stats),
+            log=base64.b64encode(
+                zlib.compress(log_text.encode('utf-8'))
+            ).decode('ascii'),
+            log_cursor=len(self.log_text),
+        )).encode('utf-8')
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestRemoteStatus(WithLogger, CatalystTestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.algo_id = str(uuid4())
+
+        StatusHandler.requests = []
+        self.server = HTTPServer(('127.0.0.1', 0), StatusHandler)
+        thread = threading.Thread(target=self.server.serve_forever)
+        thread.daemon = True
+        thread.start()
+
+        self.patches = [
+            patch.object(
+                remote, 'AUTH_SERVER',
+                'http://127.0.0.1:{}'.format(self.server.server_port),
+            ),
+            patch.object(
+                remote, 'retrieve_remote_auth',
+                return_value=('key', 'secret'),
+            ),
+        ]
+        for p in self.patches:
+            p.start()
+
+    def tearDown(self):
+        for p in self.patches:
+            p.stop()
+        self.server.shutdown()
+        self.server.server_close()
+        shutil.rmtree(self.folder, ignore_errors=True)
+
+    def test_columnar_encoding(self):
+        stats = make_stats(0, 3)
+        decoded = decode_columnar(encode_columnar(stats))
+
+        assert list(decoded.columns) == list(stats.columns)
+        assert decoded.index.equals(stats.index)
+        assert decoded['period_close'].equals(stats['period_close'])
+        assert decoded['trades'].dtype == stats['trades'].dtype
+        assert list(decoded['orders']) == list(stats['orders'])
+
+    def test_incremental_status(self):
+        StatusHandler.stats = make_stats(0, 5)
+        StatusHandler.log_text = u'started\n'
+
+        status, perf, log = remote.get_remote_status(
+            self.algo_id, results_folder=self.folder,
+        )
+        assert status == 'running'
+        assert StatusHandler.requests == [(0, 0), (2, 8), (4, 8)]
+        assert list(perf['portfolio_value']) == [0.0, 1.0, 2.0, 3.0, 4.0]
+        assert log == 'started\n'
+
+        # The next poll resumes from the results kept locally.
+        StatusHandler.requests = []
+        StatusHandler.stats = make_stats(0, 7)
+        StatusHandler.log_text += u'ordered\n'
+
+        status, perf, log = remote.get_remote_status(
+            self.algo_id, results_folder=self.folder,
+        )
+        assert StatusHandler.requests == [(5, 8)]
+        assert perf.index.equals(make_stats(0, 7).index)
+        assert list(perf['orders'])[-1] == [dict(id='6')]
+        assert log == 'started\nordered\n'
+
+    def test_interrupted_log_append(self):
+        def chunk(text, log_cursor):
+            return dict(
+                cursor=0,
+                log=base64.b64encode(
+                    zlib.compress(text.encode('utf-8'))
+                ).decode('ascii'),
+                log_cursor=log_cursor,
+            )
+
+        results = RemoteResults(self.algo_id, self.folder)
+        results.append(chunk(u'started\n', 8))
+
+        # The log is written but the state is not saved.
+        with open(results._log_path, 'ab') as f:
+            f.write(b'ordered\n')
+
+        results = RemoteResults(self.algo_id, self.folder)
+        assert results.log_cursor == 8
+        assert results.log == 'started\n'
+
+        results.append(chunk(u'ordered\n', 16))
+        assert results.log == 'started\nordered\n'
+        with open(results._log_path, 'rb') as f:
+            assert f.read() == b'started\nordered\n'
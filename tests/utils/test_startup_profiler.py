@@ -0,0 +1,50 @@
+import sys
+from unittest import TestCase
+
+from six.moves import builtins
+
+from catalyst.utils.startup_profiler import ImportProfiler
+
+
+class ImportProfilerTestCase(TestCase):
+
+    def setUp(self):
+        self.original_import = builtins.__import__
+        # Force a fresh import of json, restored after the test.
+        for name in list(sys.modules):
+            if name == 'json' or name.startswith('json.'):
+                self.addCleanup(
+                    sys.modules.__setitem__, name, sys.modules.pop(name),
+                )
+
+    def test_records_new_imports(self):
+        with ImportProfiler() as profiler:
+            json = __import__('json')
+            os = __import__('os')
+
+        self.assertIs(builtins.__import__, self.original_import)
+        self.assertIs(sys.modules['json'], json)
+        self.assertIs(sys.modules['os'], os)
+        self.assertIn('json', profiler.timings)
+        self.assertIn('json.decoder', profiler.timings)
+        # Modules already imported are not timed.
+        self.assertNotIn('os', profiler.timings)
+
+        cumulative, own, depth = profiler.timings['json']
+        self.assertEqual(depth, 0)
+        self.assertLessEqual(own, cumulative)
+        self.assertGreater(profiler.timings['json.decoder'][2], 0)
+
+        report = profiler.get_report(threshold=0)
+        self.assertIn('json.decoder', report)
+
+    def test_resolve_relative_name(self):
+        package = {'__package__': 'catalyst.exchange', '__name__': ''}
+        self.assertEqual(
+            ImportProfiler._resolve_name('event_clock', package, 1),
+            'catalyst.exchange.event_clock',
+        )
+        self.assertEqual(
+            ImportProfiler._resolve_name('utils', package, 2),
+            'catalyst.utils',
+        )